@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from django.apps import apps as django_apps
+from django.db import connections, transaction
+from tqdm import tqdm
+
+from edc_utils.process_pool import get_mp_context, init_worker
+from edc_visit_schedule.exceptions import NotOnScheduleError, SiteVisitScheduleError
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+from .utils import get_appointment_model_cls, offschedule, update_appt_status_for_timepoint
+
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+OFFSCHEDULE = "offschedule"
+NOT_ON_SCHEDULE = "not_on_schedule"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class SubjectRefreshResult:
+    subject_identifier: str
+    status: str
+    error: str | None = None
+
+
+@dataclass
+class AppointmentsRefresherSummary:
+    results: list[SubjectRefreshResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def counts(self) -> Counter:
+        return Counter(result.status for result in self.results)
+
+    @property
+    def changed(self) -> list[SubjectRefreshResult]:
+        return [result for result in self.results if result.status == CHANGED]
+
+    @property
+    def failed(self) -> list[SubjectRefreshResult]:
+        return [result for result in self.results if result.status == FAILED]
+
+    @property
+    def subjects_per_second(self) -> float:
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+
+def refresh_subject_appointments(
+    subject_identifier: str,
+    visit_schedule_name: str,
+    schedule_name: str,
+    skip_unchanged: bool | None = None,
+) -> SubjectRefreshResult:
+    """Refreshes the appointments of one subject in its own
+    transaction and, if changed, updates the appt_status of
+    appointments with a related visit.
+
+    A subject never put on the schedule is returned as a
+    NOT_ON_SCHEDULE result. Any other error rolls back this subject
+    only and is returned as a FAILED result.
+    """
+    schedule = site_visit_schedules.get_visit_schedule(visit_schedule_name).schedules.get(
+        schedule_name
+    )
+    try:
+        if offschedule(subject_identifier, schedule.offschedule_model, request=None):
+            return SubjectRefreshResult(subject_identifier, OFFSCHEDULE)
+        with transaction.atomic():
+            changed = schedule.refresh_schedule(
+                subject_identifier,
+                skip_get_current_site=True,
+                skip_unchanged=skip_unchanged,
+            )
+            if changed:
+                for appointment in get_appointment_model_cls().objects.filter(
+                    subject_identifier=subject_identifier,
+                    visit_schedule_name=visit_schedule_name,
+                    schedule_name=schedule_name,
+                ):
+                    if appointment.related_visit:
+                        update_appt_status_for_timepoint(appointment.related_visit)
+    except NotOnScheduleError:
+        return SubjectRefreshResult(subject_identifier, NOT_ON_SCHEDULE)
+    except Exception as e:
+        return SubjectRefreshResult(
+            subject_identifier, FAILED, error=f"{e.__class__.__name__}: {e}"
+        )
+    return SubjectRefreshResult(subject_identifier, CHANGED if changed else UNCHANGED)
+
+
+def refresh_appointments_for_subjects(
+    subject_identifiers: list[str],
+    visit_schedule_name: str,
+    schedule_name: str,
+    skip_unchanged: bool | None = None,
+) -> list[SubjectRefreshResult]:
+    """Refreshes the appointments of a chunk of subjects, one
+    transaction per subject.
+    """
+    return [
+        refresh_subject_appointments(
+            subject_identifier,
+            visit_schedule_name,
+            schedule_name,
+            skip_unchanged=skip_unchanged,
+        )
+        for subject_identifier in subject_identifiers
+    ]
+
+
+class AppointmentsRefresher:
+    """A class to be `run` to refresh the appointments of all
+    registered subjects for a schedule, for example, after the
+    schedule is amended.
+
+    Subjects are partitioned into chunks of `chunk_size` subjects and
+    the chunks are processed across a pool of `workers` processes.
+    Each subject is refreshed in its own transaction so that one
+    failure does not affect the others.
+
+    If `skip_unchanged` is True (default), a subject's appointments
+    are planned in memory first and nothing is written if the plan
+    matches the stored appointments.
+
+    `run` returns an `AppointmentsRefresherSummary` of the result per
+    subject.
+    """
+
+    registered_subject_model = "edc_registration.registeredsubject"
+
+    def __init__(
+        self,
+        visit_schedule_name: str,
+        schedule_name: str,
+        *,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        skip_unchanged: bool | None = None,
+        subject_identifiers: list[str] | None = None,
+        verbose: bool | None = None,
+    ):
+        self.visit_schedule_name = visit_schedule_name
+        self.schedule_name = schedule_name
+        visit_schedule = site_visit_schedules.get_visit_schedule(visit_schedule_name)
+        if not visit_schedule.schedules.get(schedule_name):
+            raise SiteVisitScheduleError(
+                f"Invalid schedule name. Got '{schedule_name}'. "
+                f"See visit schedule '{visit_schedule_name}'."
+            )
+        self.workers = workers or 1
+        self.chunk_size = chunk_size or 100
+        self.skip_unchanged = True if skip_unchanged is None else skip_unchanged
+        self._subject_identifiers = subject_identifiers
+        self.verbose = verbose
+
+    @property
+    def subject_identifiers(self) -> list[str]:
+        if self._subject_identifiers is None:
+            self._subject_identifiers = list(
+                django_apps.get_model(self.registered_subject_model)
+                .objects.values_list("subject_identifier", flat=True)
+                .order_by("subject_identifier")
+            )
+        return self._subject_identifiers
+
+    def get_chunks(self) -> list[list[str]]:
+        return [
+            self.subject_identifiers[i : i + self.chunk_size]
+            for i in range(0, len(self.subject_identifiers), self.chunk_size)
+        ]
+
+    def run(self) -> AppointmentsRefresherSummary:
+        """Refreshes appointments per chunk of subjects, in this
+        process or across a process pool.
+        """
+        start = time.perf_counter()
+        chunks = self.get_chunks()
+        self._message(
+            f"Refreshing appointments for {len(self.subject_identifiers)} subjects "
+            f"in {len(chunks)} chunks of up to {self.chunk_size} "
+            f"({self.workers} workers) ...\n"
+        )
+        results: list[SubjectRefreshResult] = []
+        args = (self.visit_schedule_name, self.schedule_name)
+        if self.workers > 1 and len(chunks) > 1:
+            # workers must not share the parent's DB connection
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_mp_context(),
+                initializer=init_worker,
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        refresh_appointments_for_subjects,
+                        chunk,
+                        *args,
+                        skip_unchanged=self.skip_unchanged,
+                    )
+                    for chunk in chunks
+                ]
+                for future in tqdm(
+                    as_completed(futures), total=len(futures), disable=not self.verbose
+                ):
+                    results.extend(future.result())
+        else:
+            for chunk in tqdm(chunks, total=len(chunks), disable=not self.verbose):
+                results.extend(
+                    refresh_appointments_for_subjects(
+                        chunk, *args, skip_unchanged=self.skip_unchanged
+                    )
+                )
+        results.sort(key=lambda result: result.subject_identifier)
+        return AppointmentsRefresherSummary(
+            results=results, seconds=time.perf_counter() - start
+        )
+
+    def _message(self, msg: str) -> None:
+        if self.verbose:
+            sys.stdout.write(msg)
@@ -1,10 +1,12 @@
 from .appointment_creator import AppointmentCreator
 from .appointments_creator import AppointmentsCreator
+from .appointments_plan import AppointmentsPlan
 from .unscheduled_appointment_creator import UnscheduledAppointmentCreator
 from .utils import create_next_appointment_as_interim, create_unscheduled_appointment
 
 __all__ = [
     "AppointmentCreator",
+    "AppointmentsPlan",
     "UnscheduledAppointmentCreator",
     "create_next_appointment_as_interim",
     "create_unscheduled_appointment",
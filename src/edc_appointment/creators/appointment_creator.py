@@ -12,6 +12,7 @@ from django.utils.timezone import is_naive
 
 from edc_facility.facility import Facility, FacilityError
 from edc_sites.utils import valid_site_for_subject_or_raise
+from edc_utils.date import to_local
 from edc_visit_schedule.utils import is_baseline
 
 from ..constants import NEW_APPT, SCHEDULED_APPT
@@ -24,6 +25,8 @@ from ..utils import (
 )
 
 if TYPE_CHECKING:
+    from edc_facility.booked_slots import BookedSlots
+
     from ..models import Appointment, AppointmentType
 
 
@@ -57,6 +60,7 @@ class AppointmentCreator:
         skip_baseline: bool | None = None,
         ignore_window_period: bool | None = None,
         skip_get_current_site: bool | None = None,
+        booked_slots: BookedSlots | None = None,
     ):
         self._appointment = None
         self._appointment_model_cls = None
@@ -71,6 +75,9 @@ class AppointmentCreator:
         self.appointment_model: str = appointment_model or "edc_appointment.appointment"
         # already taken appt_datetimes for this subject
         self.taken_datetimes = taken_datetimes or []
+        # appointments booked per day at the facility, shared by the
+        # creators of a schedule. See AppointmentsCreator.
+        self.booked_slots = booked_slots
         self.visit = visit
         self.visit_code_sequence = visit_code_sequence or 0
         self.timepoint = timepoint or self.visit.timepoint
@@ -171,6 +178,7 @@ class AppointmentCreator:
         except IntegrityError as e:
             raise IntegrityError(f"{errmsg} Got {e}.") from e
         else:
+            self.reserve_slot(appointment)
             if appointment.visit_code_sequence > 0:
                 appointment = reset_visit_code_sequence_or_pass(
                     subject_identifier=self.subject_identifier,
@@ -188,12 +196,30 @@ class AppointmentCreator:
         ):
             pass
         else:
+            if self.booked_slots is None and self.facility.counts_booked_slots:
+                # select the index here so the appointment's own slot
+                # is released before a day is selected
+                self.booked_slots = self.facility.get_booked_slots(self.site)
+            self.release_slot(appointment)
             appointment.appt_datetime = self.appt_datetime
             appointment.timepoint_datetime = self.timepoint_datetime
             appointment.save()
             appointment.refresh_from_db()
+            self.reserve_slot(appointment)
         return appointment
 
+    def reserve_slot(self, appointment: Appointment) -> None:
+        """Adds the appointment to `booked_slots`, if given."""
+        if self.booked_slots is not None:
+            self.booked_slots.reserve(to_local(appointment.appt_datetime).date())
+
+    def release_slot(self, appointment: Appointment) -> None:
+        """Removes the appointment from `booked_slots`, if given,
+        before it is moved.
+        """
+        if self.booked_slots is not None:
+            self.booked_slots.release(to_local(appointment.appt_datetime).date())
+
     @property
     def appt_datetime(self) -> datetime:
         """Returns an available appointment datetime.
@@ -212,6 +238,7 @@ class AppointmentCreator:
                     taken_datetimes=self.taken_datetimes,
                     schedule_on_holidays=self.visit.schedule_on_holidays,
                     site=self.site,
+                    booked_slots=self.booked_slots,
                 )
             except FacilityError as e:
                 raise CreateAppointmentDateError(
@@ -1,39 +1,78 @@
 from __future__ import annotations
 
 import contextlib
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
 from django.apps import apps as django_apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import router, transaction
 from django.db.models.deletion import ProtectedError
+from django.db.models.signals import pre_save
+from django.utils import timezone
+from django_audit_fields.constants import AUDIT_MODEL_UPDATE_FIELDS
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
+from edc_facility.booked_slots import BookedSlots
 from edc_facility.exceptions import FacilityError
 from edc_facility.utils import get_facility
+from edc_offstudy.utils import raise_if_offstudy
+from edc_sites.utils import valid_site_for_subject_or_raise
+from edc_timepoint.constants import OPEN_TIMEPOINT
+from edc_utils.date import to_local
+from edc_visit_schedule.utils import is_baseline
 
+from ..constants import NEW_APPT, SCHEDULED_APPT
 from ..exceptions import CreateAppointmentError
-from .appointment_creator import AppointmentCreator
+from ..signals import appointments_refreshed
+from ..utils import (
+    get_appointment_type_model_cls,
+    get_appointments_bulk_create,
+    get_appt_reason_default,
+    get_appt_type_default,
+)
+from .appointment_creator import AppointmentCreator, CreateAppointmentDateError
+from .appointments_plan import AppointmentsPlan
 
 if TYPE_CHECKING:
+    from django.contrib.sites.models import Site
     from django.db.models import QuerySet
 
     from edc_consent.consent_definition import ConsentDefinition
-    from edc_visit_schedule.schedule import Schedule
+    from edc_facility.facility import Facility
+    from edc_visit_schedule.schedule import Schedule, TimepointPlan
+    from edc_visit_schedule.visit import Visit
     from edc_visit_schedule.visit_schedule import VisitSchedule
 
-    from ..models import Appointment
+    from ..models import Appointment, AppointmentType
 
 
 class AppointmentsCreator:
     """Note: Appointments are created using this class by
     the visit schedule.
 
+    If `bulk` is True (default: settings.EDC_APPOINTMENT_BULK_CREATE),
+    the appointments of the schedule are planned in memory and
+    written in one transaction instead of one `AppointmentCreator`
+    per visit. See `plan_appointments`.
+
     See also: edc_visit_schedule SubjectSchedule
 
     """
 
     appointment_creator_cls = AppointmentCreator
 
+    # fields written when updating an existing appointment in bulk
+    bulk_update_fields: tuple[str, ...] = (
+        "appt_datetime",
+        "timepoint_datetime",
+        "timepoint_opened_datetime",
+        "timepoint_status",
+        *AUDIT_MODEL_UPDATE_FIELDS,
+    )
+
     def __init__(
         self,
         subject_identifier: str | None = None,
@@ -43,6 +82,8 @@ class AppointmentsCreator:
         appointment_model: str | None = None,
         site_id: int | None = None,
         skip_baseline: bool | None = None,
+        *,
+        bulk: bool | None = None,
     ):
         self.subject_identifier: str = subject_identifier
         self.visit_schedule: VisitSchedule = visit_schedule
@@ -51,6 +92,7 @@ class AppointmentsCreator:
         self.appointment_model: str = appointment_model
         self.site_id = site_id
         self.skip_baseline: bool | None = skip_baseline
+        self.bulk: bool = get_appointments_bulk_create() if bulk is None else bulk
 
     @property
     def appointment_model_cls(self) -> Appointment:
@@ -69,29 +111,23 @@ class AppointmentsCreator:
         days in the facility.
         """
         taken_datetimes = taken_datetimes or []
-        base_appt_datetime = (base_appt_datetime or self.report_datetime).astimezone(
-            ZoneInfo("UTC")
+        timepoint_dates = self.get_timepoint_dates(
+            base_appt_datetime, consent_definition=consent_definition
         )
-
-        timepoint_dates = self.schedule.visits_for_subject(
-            subject_identifier=self.subject_identifier,
-            report_datetime=base_appt_datetime,
-            site_id=self.site_id,
-            consent_definition=consent_definition,
-        ).timepoint_dates(dt=base_appt_datetime)
-
+        if self.bulk:
+            plan = self.plan_appointments(
+                timepoint_dates,
+                taken_datetimes=taken_datetimes,
+                skip_get_current_site=skip_get_current_site,
+            )
+            self.apply_plan(plan)
+            return self.get_appointments()
         for visit, timepoint_datetime in timepoint_dates.items():
-            try:
-                facility = get_facility(visit.facility_name)
-            except FacilityError as e:
-                raise CreateAppointmentError(
-                    f"{e} See {visit!r}. Got facility_name={visit.facility_name}"
-                ) from e
             appointment = self.update_or_create_appointment(
                 visit=visit,
                 taken_datetimes=taken_datetimes,
                 timepoint_datetime=timepoint_datetime,
-                facility=facility,
+                facility=self.get_facility(visit),
                 skip_get_current_site=skip_get_current_site,
             )
             taken_datetimes.append(appointment.appt_datetime)
@@ -103,7 +139,36 @@ class AppointmentsCreator:
             pass
         else:
             self.delete_appointments_after_timepoint(last_timepoint)
+        return self.get_appointments()
 
+    def get_timepoint_dates(
+        self,
+        base_appt_datetime: datetime | None = None,
+        consent_definition: ConsentDefinition | None = None,
+    ) -> TimepointPlan:
+        """Returns the timepoint datetime of each visit of the
+        schedule for this subject relative to `base_appt_datetime`.
+        """
+        base_appt_datetime = (base_appt_datetime or self.report_datetime).astimezone(
+            ZoneInfo("UTC")
+        )
+        return self.schedule.visits_for_subject(
+            subject_identifier=self.subject_identifier,
+            report_datetime=base_appt_datetime,
+            site_id=self.site_id,
+            consent_definition=consent_definition,
+        ).timepoint_dates(dt=base_appt_datetime)
+
+    @staticmethod
+    def get_facility(visit: Visit) -> Facility:
+        try:
+            return get_facility(visit.facility_name)
+        except FacilityError as e:
+            raise CreateAppointmentError(
+                f"{e} See {visit!r}. Got facility_name={visit.facility_name}"
+            ) from e
+
+    def get_appointments(self) -> QuerySet[Appointment]:
         return self.appointment_model_cls.objects.filter(
             subject_identifier=self.subject_identifier,
             site_id=self.site_id,
@@ -111,6 +176,257 @@ class AppointmentsCreator:
             schedule_name=self.schedule.name,
         ).order_by("timepoint")
 
+    def plan_appointments(
+        self,
+        timepoint_dates: dict[Visit, datetime],
+        taken_datetimes: list[datetime] | None = None,
+        booked_slots: dict[str, BookedSlots] | None = None,
+        skip_get_current_site: bool | None = None,
+    ) -> AppointmentsPlan:
+        """Returns a plan of the appointments to create, update and
+        delete for the schedule without writing to the database.
+
+        Existing appointments are selected with one query. The
+        facility-adjusted `appt_datetime` of each timepoint is
+        calculated in memory as in `AppointmentCreator`. As there,
+        existing appointments are not changed if no longer NEW_APPT
+        or if baseline and `skip_baseline` is True.
+
+        `booked_slots`, if given, must be loaded for the site
+        validated for the subject.
+        """
+        plan = AppointmentsPlan()
+        taken_datetimes = taken_datetimes if taken_datetimes is not None else []
+        site = valid_site_for_subject_or_raise(
+            self.subject_identifier, skip_get_current_site=skip_get_current_site
+        )
+        if booked_slots is None:
+            booked_slots = self.get_booked_slots(timepoint_dates, site_id=site.id)
+        existing: dict[tuple[str, Decimal], Appointment] = {}
+        for appointment in self.appointment_model_cls.objects.filter(
+            subject_identifier=self.subject_identifier,
+            site_id=site.id,
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+        ).order_by("timepoint", "visit_code_sequence"):
+            if appointment.visit_code_sequence == 0:
+                existing[(appointment.visit_code, appointment.timepoint)] = appointment
+        default_appt_type = self.get_default_appt_type()
+        default_appt_reason = self.get_default_appt_reason()
+        for visit, timepoint_datetime in timepoint_dates.items():
+            timepoint = Decimal(str(visit.timepoint))
+            appointment = existing.pop((visit.code, timepoint), None)
+            if appointment and (
+                (self.skip_baseline and is_baseline(instance=appointment))
+                or appointment.appt_status != NEW_APPT
+            ):
+                plan.unchanged.append(appointment)
+                taken_datetimes.append(appointment.appt_datetime)
+                continue
+            facility_booked_slots = booked_slots.get(visit.facility_name)
+            if appointment and facility_booked_slots is not None:
+                facility_booked_slots.release(to_local(appointment.appt_datetime).date())
+            appt_datetime = self.get_appt_datetime(
+                visit,
+                self.get_facility(visit),
+                timepoint_datetime=timepoint_datetime,
+                taken_datetimes=taken_datetimes,
+                booked_slots=facility_booked_slots,
+                site=site,
+            )
+            if facility_booked_slots is not None:
+                facility_booked_slots.reserve(to_local(appt_datetime).date())
+            taken_datetimes.append(appt_datetime)
+            if not appointment:
+                plan.created.append(
+                    self.appointment_model_cls(
+                        subject_identifier=self.subject_identifier,
+                        visit_schedule_name=self.visit_schedule.name,
+                        schedule_name=self.schedule.name,
+                        visit_code=visit.code,
+                        visit_code_sequence=0,
+                        timepoint=timepoint,
+                        site=site,
+                        facility_name=visit.facility_name,
+                        timepoint_datetime=timepoint_datetime,
+                        appt_datetime=appt_datetime,
+                        appt_type=default_appt_type,
+                        appt_reason=default_appt_reason,
+                        appt_status=NEW_APPT,
+                        ignore_window_period=False,
+                    )
+                )
+            elif (
+                appointment.appt_datetime != appt_datetime
+                or appointment.timepoint_datetime != timepoint_datetime
+            ):
+                appointment.appt_datetime = appt_datetime
+                appointment.timepoint_datetime = timepoint_datetime
+                plan.updated.append(appointment)
+            else:
+                plan.unchanged.append(appointment)
+        if timepoint_dates:
+            last_timepoint = list(timepoint_dates)[-1].timepoint
+            plan.deleted = [
+                obj
+                for obj in self.appointment_model_cls.objects.filter(
+                    subject_identifier=self.subject_identifier,
+                    site_id=site.id,
+                    timepoint__gt=last_timepoint,
+                    visit_schedule_name=self.visit_schedule.name,
+                    schedule_name=self.schedule.name,
+                )
+            ]
+        return plan
+
+    def apply_plan(self, plan: AppointmentsPlan) -> None:
+        """Writes a plan in one transaction.
+
+        New and updated appointments are written with
+        `bulk_create_with_history` and `bulk_update_with_history`.
+        `pre_save` is sent per appointment, `post_save` is not. Instead
+        `appointments_refreshed` is sent once after the transaction
+        block. The work of the appointment's `save` and `post_save`
+        relevant to a NEW_APPT appointment (audit fields, offstudy
+        check, opening the timepoint) is done here.
+
+        Deleted appointments are deleted one by one, as in
+        `delete_appointments_after_timepoint`, so that the delete
+        signals and protected relations are respected.
+        """
+        if not plan:
+            return
+        model_cls = self.appointment_model_cls
+        using = router.db_for_write(model_cls)
+        changed = [*plan.created, *plan.updated]
+        if changed:
+            raise_if_offstudy(
+                subject_identifier=self.subject_identifier,
+                report_datetime=max(obj.appt_datetime for obj in changed),
+                source_obj=changed[0],
+            )
+        now = timezone.now()
+        with transaction.atomic(using=using):
+            for obj in plan.created:
+                obj.created = obj.modified = now
+                self.open_timepoint(obj)
+                pre_save.send(
+                    sender=model_cls, instance=obj, raw=False, using=using, update_fields=None
+                )
+                # UUIDAutoField sets the pk on pre_save
+                obj._meta.pk.pre_save(obj, add=True)
+            for obj in plan.updated:
+                obj.modified = now
+                self.open_timepoint(obj)
+                pre_save.send(
+                    sender=model_cls, instance=obj, raw=False, using=using, update_fields=None
+                )
+                for field_name in AUDIT_MODEL_UPDATE_FIELDS:
+                    obj._meta.get_field(field_name).pre_save(obj, add=False)
+            if plan.created:
+                bulk_create_with_history(plan.created, model_cls)
+            if plan.updated:
+                bulk_update_with_history(
+                    plan.updated, model_cls, fields=list(self.bulk_update_fields)
+                )
+            for obj in plan.deleted:
+                with contextlib.suppress(ProtectedError):
+                    obj.delete()
+        appointments_refreshed.send(
+            sender=model_cls,
+            subject_identifier=self.subject_identifier,
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+            created=plan.created,
+            updated=plan.updated,
+            deleted=plan.deleted,
+        )
+
+    @staticmethod
+    def get_appt_datetime(
+        visit: Visit,
+        facility: Facility,
+        *,
+        timepoint_datetime: datetime,
+        taken_datetimes: list[datetime],
+        booked_slots: BookedSlots | None,
+        site: Site,
+    ) -> datetime:
+        """Returns the facility-adjusted appointment datetime for
+        the timepoint. See also `AppointmentCreator.appt_datetime`.
+        """
+        try:
+            arw = facility.available_arr(
+                suggested_datetime=timepoint_datetime,
+                forward_delta=visit.rupper,
+                reverse_delta=visit.rlower,
+                taken_datetimes=taken_datetimes,
+                schedule_on_holidays=visit.schedule_on_holidays,
+                site=site,
+                booked_slots=booked_slots,
+            )
+        except FacilityError as e:
+            raise CreateAppointmentDateError(
+                f"{e} Visit={visit!r}. "
+                f"Try setting 'best_effort_available_datetime=True' on facility."
+            ) from e
+        return arw.datetime
+
+    @staticmethod
+    def open_timepoint(appointment: Appointment) -> None:
+        """Sets the timepoint fields as `update_timepoint` would on
+        post_save.
+        """
+        if appointment.enabled_as_timepoint:
+            appointment.timepoint_opened_datetime = appointment.appt_datetime
+            appointment.timepoint_status = OPEN_TIMEPOINT
+
+    @staticmethod
+    def get_default_appt_type() -> AppointmentType | None:
+        try:
+            return get_appointment_type_model_cls().objects.get(name=get_appt_type_default())
+        except ObjectDoesNotExist:
+            return None
+
+    @staticmethod
+    def get_default_appt_reason() -> str:
+        try:
+            return get_appt_reason_default()
+        except AttributeError:
+            return SCHEDULED_APPT
+
+    def get_booked_slots(
+        self, timepoint_dates: dict[Visit, datetime], site_id: int
+    ) -> dict[str, BookedSlots]:
+        """Returns an index of the site's booked appointments per
+        facility, loaded for the window periods of all visits in one
+        query per facility.
+
+        Only facilities that count booked slots are included (see
+        `Facility.counts_booked_slots`).
+
+        The index is shared by the appointments of the schedule so
+        that each slot reserved is counted when allocating the next.
+        """
+        booked_slots: dict[str, BookedSlots] = {}
+        date_ranges: dict[str, tuple[date, date]] = {}
+        for visit, timepoint_datetime in timepoint_dates.items():
+            if not self.get_facility(visit).counts_booked_slots:
+                continue
+            min_date = to_local(timepoint_datetime - visit.rlower).date()
+            max_date = to_local(timepoint_datetime + visit.rupper).date()
+            if visit.facility_name in date_ranges:
+                lower, upper = date_ranges[visit.facility_name]
+                min_date, max_date = min(lower, min_date), max(upper, max_date)
+            date_ranges[visit.facility_name] = (min_date, max_date)
+            booked_slots.setdefault(
+                visit.facility_name,
+                BookedSlots(facility_name=visit.facility_name, site_id=site_id),
+            )
+        for facility_name, (min_date, max_date) in date_ranges.items():
+            booked_slots[facility_name].load(min_date, max_date)
+        return booked_slots
+
     def update_or_create_appointment(self, **kwargs) -> Appointment:
         """Updates or creates an appointment for this subject
         for the visit.
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models import Appointment
+
+
+@dataclass
+class AppointmentsPlan:
+    """The appointments of a subject's schedule, planned in memory
+    by `AppointmentsCreator.plan_appointments` and written by
+    `AppointmentsCreator.apply_plan`.
+
+    * created: new, unsaved appointments to insert;
+    * updated: existing appointments with a new `appt_datetime`
+      and/or `timepoint_datetime`;
+    * unchanged: existing appointments left as is;
+    * deleted: existing appointments after the last timepoint.
+    """
+
+    created: list[Appointment] = field(default_factory=list)
+    updated: list[Appointment] = field(default_factory=list)
+    unchanged: list[Appointment] = field(default_factory=list)
+    deleted: list[Appointment] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+    @property
+    def appointments(self) -> list[Appointment]:
+        """Returns the created, updated and unchanged appointments
+        ordered by timepoint.
+        """
+        return sorted(
+            [*self.created, *self.updated, *self.unchanged],
+            key=lambda obj: (obj.timepoint, obj.visit_code_sequence),
+        )
@@ -16,6 +16,7 @@ from edc_visit_schedule.exceptions import (
 from edc_visit_schedule.utils import get_lower_datetime
 
 from ..constants import COMPLETE_APPT, INCOMPLETE_APPT
+from ..subject_timeline import SubjectTimeline
 from ..utils import allow_extended_window_period
 
 if TYPE_CHECKING:
@@ -26,6 +27,24 @@ SCHEDULED_WINDOW_ERROR = "scheduled_window_error"
 
 
 class WindowPeriodFormValidatorMixin:
+    _timeline: SubjectTimeline | None = None
+
+    def get_timeline(self, appointment: Appointment) -> SubjectTimeline:
+        """Returns the timeline of the subject's appointments for the
+        appointment's schedule, loaded once per form validator.
+        """
+        if not self._timeline or (
+            self._timeline.subject_identifier,
+            self._timeline.visit_schedule_name,
+            self._timeline.schedule_name,
+        ) != (
+            appointment.subject_identifier,
+            appointment.visit_schedule_name,
+            appointment.schedule_name,
+        ):
+            self._timeline = SubjectTimeline.from_appointment(appointment)
+        return self._timeline
+
     def validate_appt_datetime_in_window_period(
         self,
         appointment: Appointment,
@@ -43,7 +62,9 @@ class WindowPeriodFormValidatorMixin:
 
     @staticmethod
     def ignore_window_period_for_unscheduled(
-        appointment: Appointment, proposed_appt_datetime: datetime
+        appointment: Appointment,
+        proposed_appt_datetime: datetime,
+        timeline: SubjectTimeline | None = None,
     ) -> bool:
         """Returns True if this is an unscheduled appt
 
@@ -53,14 +74,15 @@ class WindowPeriodFormValidatorMixin:
         Normally, 'allow_unscheduled_extended' is False.
         """
         if appointment:
+            next_appt = timeline.next(appointment) if timeline else appointment.next
             normal_case = bool(
                 appointment.visit_code_sequence > 0
-                and appointment.next
-                and appointment.next.appt_status in [INCOMPLETE_APPT, COMPLETE_APPT]
-                and proposed_appt_datetime < appointment.next.appt_datetime
+                and next_appt
+                and next_appt.appt_status in [INCOMPLETE_APPT, COMPLETE_APPT]
+                and proposed_appt_datetime < next_appt.appt_datetime
             )
             special_case = bool(
-                appointment.next is None and appointment.visit.allow_unscheduled_extended
+                next_appt is None and appointment.visit.allow_unscheduled_extended
             )
             return bool(special_case or normal_case)
         return False
@@ -73,15 +95,15 @@ class WindowPeriodFormValidatorMixin:
     ):
         if proposed_appt_datetime:
             proposed_appt_datetime = to_local(proposed_appt_datetime)
+            timeline = self.get_timeline(appointment)
+            next_appt = timeline.next(appointment)
             try:
                 appointment.schedule.datetime_in_window(
                     dt=proposed_appt_datetime,
-                    baseline_timepoint_datetime=to_local(
-                        self.baseline_timepoint_datetime(appointment)
-                    ),
+                    baseline_timepoint_datetime=to_local(timeline.first.timepoint_datetime),
                     timepoint_datetime=to_local(appointment.timepoint_datetime),
                     visit=appointment.visit,
-                    next_visit=getattr(appointment.next, "visit", None),
+                    next_visit=getattr(next_appt, "visit", None),
                     visit_code_sequence=appointment.visit_code_sequence,
                 )
             except UnScheduledVisitWindowError:
@@ -90,19 +112,19 @@ class WindowPeriodFormValidatorMixin:
                 # the next appt must be INCOMPLETE, COMPLETE,
                 # or visit.allow_unscheduled_extended.
                 if not self.ignore_window_period_for_unscheduled(
-                    appointment, proposed_appt_datetime
+                    appointment, proposed_appt_datetime, timeline=timeline
                 ):
                     # TODO: fix the dates on this message to match e.message
                     lower = floor_secs(get_lower_datetime(appointment))
                     try:
                         # one day less than the next related_visit, if it exists
                         upper = floor_secs(
-                            to_local(appointment.next.related_visit.report_datetime)
+                            to_local(next_appt.related_visit.report_datetime)
                             - relativedelta(days=1)
                         )
                     except AttributeError:
                         # lower bound of next appointment
-                        upper = floor_secs(to_local(get_lower_datetime(appointment.next)))
+                        upper = floor_secs(to_local(get_lower_datetime(next_appt)))
                     dt_lower = formatted_date(to_local(lower))
                     dt_upper = formatted_date(to_local(upper))
                     self.raise_validation_error(
@@ -56,13 +56,13 @@ from ..exceptions import (
 from ..form_validator_mixins import WindowPeriodFormValidatorMixin
 from ..utils import (
     get_allow_skipped_appt_using,
-    get_previous_appointment,
     raise_on_appt_may_not_be_missed,
 )
 from .utils import validate_appt_datetime_unique
 
 if TYPE_CHECKING:
     from ..models import Appointment
+    from ..subject_timeline import SubjectTimeline
 
 
 class AppointmentFormValidator(
@@ -78,6 +78,14 @@ class AppointmentFormValidator(
 
     appointment_model = "edc_appointment.appointment"
 
+    @property
+    def timeline(self) -> SubjectTimeline:
+        """Returns the timeline of this subject's appointments for the
+        schedule, loaded once instead of querying for the previous
+        and next appointment in each validation method.
+        """
+        return self.get_timeline(self.instance)
+
     def clean(self: Any):
         # TODO: do not allow a missed appt (in window) to be followed by an unscheduled appt
         #  that is also within window.
@@ -91,7 +99,7 @@ class AppointmentFormValidator(
                         )
                     }
                 )
-            if self.instance.next:
+            if self.timeline.next(self.instance):
                 raise forms.ValidationError(
                     {
                         "appt_timing": (
@@ -159,7 +167,7 @@ class AppointmentFormValidator(
         if self.cleaned_data.get("appt_status") == IN_PROGRESS_APPT and getattr(
             self.instance, "id", None
         ):
-            previous_appt = get_previous_appointment(self.instance, include_interim=True)
+            previous_appt = self.timeline.previous(self.instance, include_interim=True)
             if (
                 previous_appt
                 and previous_appt.appt_status
@@ -193,7 +201,7 @@ class AppointmentFormValidator(
                 INCOMPLETE_APPT,
                 COMPLETE_APPT,
             ]
-            and self.instance.previous
+            and self.timeline.previous(self.instance)
         ) and (
             obj := (
                 self.appointment_model_cls.objects.filter(
@@ -332,15 +340,15 @@ class AppointmentFormValidator(
             appt_datetime
             and appt_status
             and appt_status != NEW_APPT
-            and self.instance.relative_previous
-            and appt_datetime < self.instance.relative_previous.appt_datetime
+            and (previous_appt := self.timeline.previous(self.instance, include_interim=True))
+            and appt_datetime < previous_appt.appt_datetime
         ):
-            formatted_date = formatted_datetime(self.instance.relative_previous.appt_datetime)
+            formatted_date = formatted_datetime(previous_appt.appt_datetime)
             self.raise_validation_error(
                 {
                     "appt_datetime": (
                         "Cannot be before previous appointment. Previous appointment "
-                        f"is {self.instance.relative_previous.visit_label} "
+                        f"is {previous_appt.visit_label} "
                         f"on {formatted_date}."
                     )
                 },
@@ -354,15 +362,15 @@ class AppointmentFormValidator(
             appt_datetime
             and appt_status
             and appt_status != NEW_APPT
-            and self.instance.relative_next
-            and appt_datetime > self.instance.relative_next.appt_datetime
+            and (next_appt := self.timeline.next(self.instance, include_interim=True))
+            and appt_datetime > next_appt.appt_datetime
         ):
-            formatted_date = formatted_datetime(self.instance.relative_next.appt_datetime)
+            formatted_date = formatted_datetime(next_appt.appt_datetime)
             self.raise_validation_error(
                 {
                     "appt_datetime": (
                         "Cannot be after next appointment. Next appointment is "
-                        f"{self.instance.relative_next.visit_label} "
+                        f"{next_appt.visit_label} "
                         f"on {formatted_date}."
                     )
                 },
@@ -600,15 +608,14 @@ class AppointmentFormValidator(
     def validate_scheduled_parent_not_missed(self):
         if (
             self.cleaned_data.get("appt_reason") == UNSCHEDULED_APPT
-            and get_previous_appointment(self.instance, include_interim=True)
-            and get_previous_appointment(self.instance, include_interim=True).appt_status
-            == MISSED_APPT
+            and (previous_appt := self.timeline.previous(self.instance, include_interim=True))
+            and previous_appt.appt_status == MISSED_APPT
         ):
             self.raise_validation_error(
                 {
                     "__all__": "Please completed the scheduled appointment instead. "
-                    f"See {self.instance.previous.visit_code}."
-                    f"{self.instance.previous.visit_code_sequence}"
+                    f"See {self.timeline.previous(self.instance).visit_code}."
+                    f"{self.timeline.previous(self.instance).visit_code_sequence}"
                 },
                 INVALID_APPT_STATUS,
             )
@@ -1,8 +1,14 @@
 from django.core.management.base import BaseCommand, CommandError
-from tqdm import tqdm
 
-from edc_appointment.utils import refresh_appointments
-from edc_registration.models import RegisteredSubject
+from edc_appointment.appointments_refresher import (
+    CHANGED,
+    FAILED,
+    NOT_ON_SCHEDULE,
+    OFFSCHEDULE,
+    UNCHANGED,
+    AppointmentsRefresher,
+)
+from edc_visit_schedule.exceptions import SiteVisitScheduleError
 
 
 class Command(BaseCommand):
@@ -26,6 +32,30 @@ class Command(BaseCommand):
             help="Schedule name",
         )
 
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=1,
+            help="Number of worker processes (Default: 1)",
+        )
+
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=100,
+            help="Number of subjects per chunk of work (Default: 100)",
+        )
+
+        parser.add_argument(
+            "--force",
+            dest="force",
+            action="store_true",
+            default=False,
+            help="Refresh all subjects, including those whose appointments are unchanged",
+        )
+
     def handle(self, *args, **options):
         visit_schedule_name = options.get("visit_schedule_name")
         if not visit_schedule_name:
@@ -33,12 +63,29 @@ class Command(BaseCommand):
         schedule_name = options.get("schedule_name")
         if not schedule_name:
             raise CommandError("--schedule-name is required")
-        qs = RegisteredSubject.objects.all()
-        for obj in tqdm(qs, total=qs.count()):
-            refresh_appointments(
-                obj.subject_identifier,
-                visit_schedule_name,
-                schedule_name,
-                warn_only=True,
-                skip_get_current_site=True,
+        try:
+            refresher = AppointmentsRefresher(
+                visit_schedule_name=visit_schedule_name,
+                schedule_name=schedule_name,
+                workers=options.get("workers"),
+                chunk_size=options.get("chunk_size"),
+                skip_unchanged=not options.get("force"),
+                verbose=True,
             )
+        except SiteVisitScheduleError as e:
+            raise CommandError(e) from e
+        summary = refresher.run()
+        counts = summary.counts
+        self.stdout.write(
+            f"Refreshed {len(summary.results)} subjects in {summary.seconds:.1f}s "
+            f"({summary.subjects_per_second:.1f} subjects/s).\n"
+            f"  {CHANGED}: {counts[CHANGED]}\n"
+            f"  {UNCHANGED}: {counts[UNCHANGED]}\n"
+            f"  {OFFSCHEDULE}: {counts[OFFSCHEDULE]}\n"
+            f"  {NOT_ON_SCHEDULE}: {counts[NOT_ON_SCHEDULE]}\n"
+            f"  {FAILED}: {counts[FAILED]}\n"
+        )
+        for result in summary.changed:
+            self.stdout.write(f"  {CHANGED} {result.subject_identifier}\n")
+        for result in summary.failed:
+            self.stderr.write(f"  {FAILED} {result.subject_identifier}: {result.error}\n")
@@ -0,0 +1,11 @@
+from django.dispatch import Signal
+
+# Sent once by `AppointmentsCreator` in bulk mode after the
+# appointments of a subject's schedule are written, in place of
+# the per-appointment post_save signals.
+#
+# Sent with the appointment model class as `sender` and keyword
+# arguments `subject_identifier`, `visit_schedule_name`,
+# `schedule_name`, `created`, `updated` and `deleted` (lists of
+# appointment model instances).
+appointments_refreshed = Signal()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+from .utils import (
+    appt_datetime_in_gap,
+    appt_datetime_in_next_window_adjusted_for_gap,
+    check_appointment_required_values_or_raise,
+    get_appointment_by_datetime,
+    get_appointment_model_cls,
+    get_window_gap_days,
+    raise_on_appt_datetime_not_in_window,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from .models import Appointment
+
+
+class SubjectTimeline:
+    """The appointments of a subject for a schedule, loaded once and
+    sorted by (timepoint, visit_code_sequence).
+
+    Answers previous/next/in-window/in-gap/by-datetime queries
+    without further queries to the DB, for example, in a form
+    validator or in a bulk validation job:
+
+        timeline = SubjectTimeline.from_appointment(appointment)
+        timeline.previous(appointment, include_interim=True)
+        timeline.get_appointment_by_datetime(suggested_appt_datetime)
+
+        timelines = SubjectTimeline.for_subjects(visit_schedule_name, schedule_name)
+
+    Note: the timeline is a snapshot. Create a new instance after
+    appointments are added, removed or rescheduled.
+    """
+
+    def __init__(
+        self,
+        subject_identifier: str,
+        visit_schedule_name: str,
+        schedule_name: str,
+        appointments: Iterable[Appointment] | None = None,
+    ):
+        self.subject_identifier = subject_identifier
+        self.visit_schedule_name = visit_schedule_name
+        self.schedule_name = schedule_name
+        if appointments is None:
+            appointments = get_appointment_model_cls().objects.filter(
+                subject_identifier=subject_identifier,
+                visit_schedule_name=visit_schedule_name,
+                schedule_name=schedule_name,
+            )
+        self.appointments: list[Appointment] = sorted(
+            appointments, key=lambda obj: (obj.timepoint, obj.visit_code_sequence)
+        )
+        self._keys = [(obj.timepoint, obj.visit_code_sequence) for obj in self.appointments]
+        self._positions = {obj.id: pos for pos, obj in enumerate(self.appointments)}
+        self.scheduled: list[Appointment] = [
+            obj for obj in self.appointments if obj.visit_code_sequence == 0
+        ]
+        self._scheduled_timepoints = [obj.timepoint for obj in self.scheduled]
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.subject_identifier}, "
+            f"{self.visit_schedule_name}.{self.schedule_name})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.appointments)
+
+    def __iter__(self):
+        return iter(self.appointments)
+
+    @classmethod
+    def from_appointment(cls, appointment: Appointment) -> SubjectTimeline:
+        return cls(
+            appointment.subject_identifier,
+            appointment.visit_schedule_name,
+            appointment.schedule_name,
+        )
+
+    @classmethod
+    def for_subjects(
+        cls,
+        visit_schedule_name: str,
+        schedule_name: str,
+        subject_identifiers: Iterable[str] | None = None,
+    ) -> dict[str, SubjectTimeline]:
+        """Returns a dictionary of {subject_identifier: timeline}
+        loaded with one query.
+        """
+        qs = get_appointment_model_cls().objects.filter(
+            visit_schedule_name=visit_schedule_name, schedule_name=schedule_name
+        )
+        if subject_identifiers is not None:
+            qs = qs.filter(subject_identifier__in=list(subject_identifiers))
+        appointments: dict[str, list[Appointment]] = {}
+        for obj in qs:
+            appointments.setdefault(obj.subject_identifier, []).append(obj)
+        return {
+            subject_identifier: cls(
+                subject_identifier, visit_schedule_name, schedule_name, appointments=objs
+            )
+            for subject_identifier, objs in appointments.items()
+        }
+
+    @property
+    def first(self) -> Appointment | None:
+        """Returns the first scheduled appointment or None."""
+        return self.scheduled[0] if self.scheduled else None
+
+    def previous(
+        self, appointment: Appointment, include_interim: bool | None = None
+    ) -> Appointment | None:
+        """Returns the previous appointment or None.
+
+        Same as `utils.get_previous_appointment`.
+        """
+        check_appointment_required_values_or_raise(appointment)
+        if not include_interim:
+            pos = bisect_left(self._scheduled_timepoints, appointment.timepoint)
+            return self.scheduled[pos - 1] if pos else None
+        if appointment.visit_code_sequence == 0:
+            pos = bisect_left(self._keys, (appointment.timepoint,))
+            return self.appointments[pos - 1] if pos else None
+        pos = bisect_left(self._keys, (appointment.timepoint, appointment.visit_code_sequence))
+        for obj in reversed(self.appointments[:pos]):
+            if obj.visit_code_sequence < appointment.visit_code_sequence:
+                return obj
+        return None
+
+    def next(
+        self, appointment: Appointment, include_interim: bool | None = None
+    ) -> Appointment | None:
+        """Returns the next appointment or None.
+
+        Same as `utils.get_next_appointment`.
+        """
+        check_appointment_required_values_or_raise(appointment)
+        if not include_interim:
+            pos = bisect_right(self._scheduled_timepoints, appointment.timepoint)
+            return self.scheduled[pos] if pos < len(self.scheduled) else None
+        pos = self._positions.get(appointment.id)
+        if pos is None or pos + 1 >= len(self.appointments):
+            return None
+        return self.appointments[pos + 1]
+
+    def get_window_gap_days(self, appointment: Appointment) -> int:
+        return get_window_gap_days(appointment, timeline=self)
+
+    def appt_datetime_in_gap(
+        self, appointment: Appointment, suggested_appt_datetime: datetime
+    ) -> bool:
+        return appt_datetime_in_gap(appointment, suggested_appt_datetime, timeline=self)
+
+    def appt_datetime_in_next_window_adjusted_for_gap(
+        self, appointment: Appointment, suggested_appt_datetime: datetime
+    ) -> bool:
+        return appt_datetime_in_next_window_adjusted_for_gap(
+            appointment, suggested_appt_datetime, timeline=self
+        )
+
+    def raise_on_appt_datetime_not_in_window(
+        self, appointment: Appointment, appt_datetime: datetime | None = None
+    ) -> None:
+        raise_on_appt_datetime_not_in_window(
+            appointment, appt_datetime=appt_datetime, timeline=self
+        )
+
+    def get_appointment_by_datetime(
+        self, suggested_appt_datetime: datetime, raise_if_in_gap: bool | None = None
+    ) -> Appointment | None:
+        return get_appointment_by_datetime(
+            suggested_appt_datetime,
+            self.subject_identifier,
+            self.visit_schedule_name,
+            self.schedule_name,
+            raise_if_in_gap=raise_if_in_gap,
+            timeline=self,
+        )
@@ -7,16 +7,19 @@ from zoneinfo import ZoneInfo
 import time_machine
 from clinicedc_constants import FEMALE, MALE
 from clinicedc_tests.helper import Helper
-from dateutil.relativedelta import relativedelta
+from dateutil.relativedelta import FR, MO, SA, SU, TH, TU, WE, relativedelta
 from django.conf import settings
+from django.db.models.signals import post_save
 from django.test import TestCase
 from django.test.utils import override_settings, tag
 from django.utils import timezone
 
-from edc_appointment.creators import AppointmentCreator
+from edc_appointment.creators import AppointmentCreator, AppointmentsCreator
 from edc_appointment.models import Appointment
+from edc_appointment.signals import appointments_refreshed
 from edc_consent.consent_definition import ConsentDefinition
 from edc_consent.site_consents import site_consents
+from edc_facility.booked_slots import BookedSlots
 from edc_facility.facility import Facility
 from edc_facility.import_holidays import import_holidays
 from edc_protocol.research_protocol_config import ResearchProtocolConfig
@@ -281,6 +284,222 @@ class TestAppointmentCreator2(AppointmentCreatorTestCase):
         traveller.stop()
 
 
+@tag("appointment")
+class TestAppointmentCreatorSlots(AppointmentCreatorTestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_holidays()
+        return super().setUpClass()
+
+    @override_settings(
+        EDC_FACILITY_DEFINITIONS={
+            "7-day-clinic": dict(days=[MO, TU, WE, TH, FR, SA, SU], slots=[1] * 7)
+        }
+    )
+    def test_appointments_respect_slots_per_day(self):
+        traveller = time_machine.travel(self.study_open_datetime)
+        traveller.start()
+        subject_identifiers = [
+            self.put_on_schedule(timezone.now()).subject_identifier for _ in range(2)
+        ]
+        appt_dates = {
+            subject_identifier: [
+                obj.appt_datetime.date()
+                for obj in Appointment.objects.filter(
+                    subject_identifier=subject_identifier
+                ).order_by("timepoint")
+            ]
+            for subject_identifier in subject_identifiers
+        }
+        first, second = appt_dates.values()
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 3)
+        # one slot per day, no day is double booked
+        for appt_date_first, appt_date_second in zip(first[1:], second[1:], strict=True):
+            self.assertNotEqual(appt_date_first, appt_date_second)
+        booked_slots = BookedSlots(facility_name="7-day-clinic", site_id=10)
+        for appt_date in first[1:] + second[1:]:
+            self.assertEqual(booked_slots.count(appt_date), 1)
+        traveller.stop()
+
+
+@tag("appointment")
+class TestAppointmentsCreatorBulk(AppointmentCreatorTestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_holidays()
+        return super().setUpClass()
+
+    def get_appointments_creator(self, subject_identifier: str) -> AppointmentsCreator:
+        return AppointmentsCreator(
+            subject_identifier=subject_identifier,
+            visit_schedule=self.visit_schedule,
+            schedule=self.schedule,
+            report_datetime=timezone.now(),
+            appointment_model="edc_appointment.appointment",
+            site_id=10,
+            bulk=True,
+        )
+
+    def test_bulk_same_as_per_visit(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        with override_settings(EDC_APPOINTMENT_BULK_CREATE=True):
+            bulk_subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        appointments = Appointment.objects.filter(
+            subject_identifier=subject_identifier
+        ).order_by("timepoint")
+        bulk_appointments = Appointment.objects.filter(
+            subject_identifier=bulk_subject_identifier
+        ).order_by("timepoint")
+        self.assertEqual(bulk_appointments.count(), 3)
+        for obj, bulk_obj in zip(appointments, bulk_appointments, strict=True):
+            for attr in [
+                "visit_code",
+                "timepoint",
+                "appt_datetime",
+                "timepoint_datetime",
+                "appt_status",
+                "appt_type",
+                "appt_reason",
+                "timepoint_status",
+                "timepoint_opened_datetime",
+                "facility_name",
+                "site_id",
+            ]:
+                with self.subTest(attr=attr):
+                    self.assertEqual(getattr(obj, attr), getattr(bulk_obj, attr))
+            self.assertEqual(bulk_obj.history.count(), 1)
+        traveller.stop()
+
+    def test_bulk_sends_one_signal(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        refreshed = mock.Mock()
+        saved = mock.Mock()
+        appointments_refreshed.connect(refreshed, weak=False)
+        post_save.connect(saved, sender=Appointment, weak=False)
+        try:
+            with override_settings(EDC_APPOINTMENT_BULK_CREATE=True):
+                subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        finally:
+            appointments_refreshed.disconnect(refreshed)
+            post_save.disconnect(saved, sender=Appointment)
+        saved.assert_not_called()
+        refreshed.assert_called_once()
+        kwargs = refreshed.call_args.kwargs
+        self.assertEqual(kwargs["subject_identifier"], subject_identifier)
+        self.assertEqual(len(kwargs["created"]), 3)
+        self.assertEqual(kwargs["updated"], [])
+        traveller.stop()
+
+    def test_plan_is_empty_if_unchanged(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        with override_settings(EDC_APPOINTMENT_BULK_CREATE=True):
+            subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        creator = self.get_appointments_creator(subject_identifier)
+        timepoint_dates = self.schedule.visits.timepoint_dates(dt=timezone.now())
+        plan = creator.plan_appointments(timepoint_dates)
+        self.assertFalse(plan)
+        self.assertEqual(len(plan.unchanged), 3)
+        self.assertEqual(
+            [obj.appt_datetime for obj in plan.appointments],
+            [
+                obj.appt_datetime
+                for obj in Appointment.objects.filter(
+                    subject_identifier=subject_identifier
+                ).order_by("timepoint")
+            ],
+        )
+        traveller.stop()
+
+    def test_plan_counts_slots_of_validated_site(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        with override_settings(EDC_APPOINTMENT_BULK_CREATE=True):
+            subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        creator = self.get_appointments_creator(subject_identifier)
+        creator.site_id = None
+        timepoint_dates = self.schedule.visits.timepoint_dates(dt=timezone.now())
+        with mock.patch.object(
+            AppointmentsCreator,
+            "get_booked_slots",
+            autospec=True,
+            side_effect=AppointmentsCreator.get_booked_slots,
+        ) as get_booked_slots:
+            plan = creator.plan_appointments(timepoint_dates)
+        self.assertEqual(get_booked_slots.call_args.kwargs["site_id"], 10)
+        self.assertFalse(plan)
+        traveller.stop()
+
+    def test_booked_slots_only_for_facilities_counting_slots(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        creator = self.get_appointments_creator(subject_identifier)
+        timepoint_dates = self.schedule.visits.timepoint_dates(dt=timezone.now())
+        days = [MO, TU, WE, TH, FR, SA, SU]
+        with override_settings(EDC_FACILITY_DEFINITIONS={"7-day-clinic": dict(days=days)}):
+            self.assertEqual(creator.get_booked_slots(timepoint_dates, site_id=10), {})
+        with override_settings(
+            EDC_FACILITY_DEFINITIONS={"7-day-clinic": dict(days=days, slots=[1] * 7)}
+        ):
+            booked_slots = creator.get_booked_slots(timepoint_dates, site_id=10)
+        self.assertEqual(list(booked_slots), ["7-day-clinic"])
+        traveller.stop()
+
+    def test_plan_updates_moved_timepoint(self):
+        traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        traveller.start()
+        with override_settings(EDC_APPOINTMENT_BULK_CREATE=True):
+            subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        creator = self.get_appointments_creator(subject_identifier)
+        timepoint_dates = self.schedule.visits.timepoint_dates(
+            dt=timezone.now() + relativedelta(days=2)
+        )
+        creator.skip_baseline = True
+        plan = creator.plan_appointments(timepoint_dates)
+        self.assertEqual(plan.created, [])
+        self.assertEqual(len(plan.updated), 2)
+        creator.apply_plan(plan)
+        appointment = Appointment.objects.get(
+            subject_identifier=subject_identifier, visit_code=self.visit1001.code
+        )
+        self.assertEqual(appointment.timepoint_datetime, timepoint_dates[self.visit1001])
+        self.assertEqual(appointment.history.count(), 2)
+        traveller.stop()
+
+    @override_settings(
+        EDC_FACILITY_DEFINITIONS={
+            "7-day-clinic": dict(days=[MO, TU, WE, TH, FR, SA, SU], slots=[1] * 7)
+        }
+    )
+    def test_update_on_full_day_keeps_date(self):
+        """Assert a standalone update does not count the appointment
+        being updated against its own day.
+        """
+        traveller = time_machine.travel(self.study_open_datetime)
+        traveller.start()
+        subject_identifier = self.put_on_schedule(timezone.now()).subject_identifier
+        appointment = Appointment.objects.get(
+            subject_identifier=subject_identifier, visit_code=self.visit1001.code
+        )
+        AppointmentCreator(
+            subject_identifier=subject_identifier,
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+            visit=self.visit1001,
+            timepoint_datetime=appointment.timepoint_datetime,
+        )
+        self.assertEqual(
+            Appointment.objects.get(pk=appointment.pk).appt_datetime.date(),
+            appointment.appt_datetime.date(),
+        )
+        traveller.stop()
+
+
 class TestAppointmentCreatorScheduleOnHolidays(AppointmentCreatorTestCase):
     """Assert Visit.schedule_on_holidays is forwarded to Facility.available_arr."""
 
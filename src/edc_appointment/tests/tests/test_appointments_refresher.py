@@ -0,0 +1,209 @@
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import time_machine
+from clinicedc_tests.consents import consent_v1
+from clinicedc_tests.helper import Helper
+from clinicedc_tests.sites import all_sites
+from clinicedc_tests.visit_schedules.visit_schedule import get_visit_schedule
+from dateutil.relativedelta import relativedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, tag
+from django.utils import timezone
+
+from edc_appointment.appointments_refresher import (
+    CHANGED,
+    FAILED,
+    NOT_ON_SCHEDULE,
+    UNCHANGED,
+    AppointmentsRefresher,
+)
+from edc_appointment.models import Appointment
+from edc_consent import site_consents
+from edc_facility.import_holidays import import_holidays
+from edc_registration.models import RegisteredSubject
+from edc_sites.site import sites as site_sites
+from edc_sites.utils import add_or_update_django_sites
+from edc_utils.tests.utils import SerialThreadPoolExecutor
+from edc_visit_schedule.exceptions import SiteVisitScheduleError
+from edc_visit_schedule.schedule import Schedule
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+from .test_appointment_creator import AppointmentCreatorTestCase
+
+utc_tz = ZoneInfo("UTC")
+
+
+@tag("appointment")
+class TestAppointmentsRefresher(AppointmentCreatorTestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_holidays()
+        return super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.traveller = time_machine.travel(self.study_open_datetime, tick=False)
+        self.traveller.start()
+        self.subject_identifiers = sorted(
+            self.put_on_schedule(timezone.now()).subject_identifier for _ in range(2)
+        )
+
+    def tearDown(self):
+        self.traveller.stop()
+        super().tearDown()
+
+    def get_refresher(self, **kwargs) -> AppointmentsRefresher:
+        kwargs.setdefault("subject_identifiers", self.subject_identifiers)
+        return AppointmentsRefresher(
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+            **kwargs,
+        )
+
+    def test_invalid_schedule_raises(self):
+        self.assertRaises(
+            SiteVisitScheduleError,
+            AppointmentsRefresher,
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name="blah",
+        )
+
+    def test_chunks(self):
+        refresher = self.get_refresher(chunk_size=1)
+        self.assertEqual(
+            refresher.get_chunks(), [[subject] for subject in self.subject_identifiers]
+        )
+
+    def test_unchanged_subjects_skipped(self):
+        modified = list(Appointment.objects.values_list("modified", flat=True))
+        summary = self.get_refresher().run()
+        self.assertEqual(
+            [(r.subject_identifier, r.status) for r in summary.results],
+            [(subject, UNCHANGED) for subject in self.subject_identifiers],
+        )
+        self.assertEqual(
+            list(Appointment.objects.values_list("modified", flat=True)), modified
+        )
+
+    def test_changed_subject_refreshed(self):
+        subject_identifier = self.subject_identifiers[0]
+        appointment = Appointment.objects.get(
+            subject_identifier=subject_identifier, visit_code=self.visit1010.code
+        )
+        timepoint_datetime = appointment.timepoint_datetime
+        Appointment.objects.filter(id=appointment.id).update(
+            timepoint_datetime=timepoint_datetime + relativedelta(days=1)
+        )
+        summary = self.get_refresher().run()
+        self.assertEqual([r.subject_identifier for r in summary.changed], [subject_identifier])
+        self.assertEqual(summary.counts[UNCHANGED], 1)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.timepoint_datetime, timepoint_datetime)
+
+    def test_force_refreshes_all(self):
+        summary = self.get_refresher(skip_unchanged=False).run()
+        self.assertEqual(summary.counts[CHANGED], 2)
+
+    def test_failed_subject_isolated(self):
+        failing_subject, other_subject = self.subject_identifiers
+        refresh_schedule = Schedule.refresh_schedule
+
+        def side_effect(schedule, subject_identifier, **kwargs):
+            if subject_identifier == failing_subject:
+                raise ValueError("Boom")
+            return refresh_schedule(schedule, subject_identifier, **kwargs)
+
+        with mock.patch.object(Schedule, "refresh_schedule", autospec=True) as mock_refresh:
+            mock_refresh.side_effect = side_effect
+            summary = self.get_refresher(skip_unchanged=False).run()
+        self.assertEqual([r.subject_identifier for r in summary.failed], [failing_subject])
+        self.assertEqual(summary.failed[0].error, "ValueError: Boom")
+        self.assertEqual([r.subject_identifier for r in summary.changed], [other_subject])
+
+    def test_not_on_schedule_subject_reported(self):
+        RegisteredSubject.objects.create(subject_identifier="12345")
+        summary = self.get_refresher(
+            subject_identifiers=[*self.subject_identifiers, "12345"]
+        ).run()
+        self.assertEqual(summary.counts[NOT_ON_SCHEDULE], 1)
+        self.assertEqual(summary.counts[UNCHANGED], 2)
+        self.assertEqual(summary.failed, [])
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "refresh_appointments",
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+            stdout=out,
+            stderr=StringIO(),
+        )
+        self.assertIn(f"{UNCHANGED}: 2", out.getvalue())
+        self.assertIn(f"{FAILED}: 0", out.getvalue())
+
+
+@tag("appointment")
+@override_settings(SITE_ID=10)
+@time_machine.travel(datetime(2019, 8, 11, 8, 00, tzinfo=utc_tz))
+class TestAppointmentsRefresherWorkers(TransactionTestCase):
+    def setUp(self):
+        import_holidays()
+        site_sites._registry = {}
+        site_sites.loaded = False
+        site_sites.register(*all_sites)
+        add_or_update_django_sites()
+        site_consents.registry = {}
+        site_consents.register(consent_v1)
+        site_visit_schedules._registry = {}
+        site_visit_schedules.loaded = False
+        site_visit_schedules.register(get_visit_schedule(consent_v1))
+        self.visit_schedule, self.schedule = site_visit_schedules.get_by_onschedule_model(
+            "edc_visit_schedule.onschedule"
+        )
+        self.subject_identifiers = sorted(
+            Helper()
+            .consent_and_put_on_schedule(
+                visit_schedule_name=self.visit_schedule.name,
+                schedule_name=self.schedule.name,
+            )
+            .subject_identifier
+            for _ in range(3)
+        )
+
+    def assert_refreshed_by_workers(self):
+        subject_identifier = self.subject_identifiers[1]
+        appointment = Appointment.objects.filter(
+            subject_identifier=subject_identifier
+        ).order_by("timepoint")[1]
+        timepoint_datetime = appointment.timepoint_datetime
+        Appointment.objects.filter(id=appointment.id).update(
+            timepoint_datetime=timepoint_datetime + relativedelta(days=1)
+        )
+        summary = AppointmentsRefresher(
+            visit_schedule_name=self.visit_schedule.name,
+            schedule_name=self.schedule.name,
+            workers=2,
+            chunk_size=1,
+        ).run()
+        self.assertEqual(
+            [r.subject_identifier for r in summary.results], self.subject_identifiers
+        )
+        self.assertEqual([r.subject_identifier for r in summary.changed], [subject_identifier])
+        self.assertEqual(summary.counts[UNCHANGED], 2)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.timepoint_datetime, timepoint_datetime)
+
+    @mock.patch(
+        "edc_appointment.appointments_refresher.ProcessPoolExecutor", SerialThreadPoolExecutor
+    )
+    def test_workers(self):
+        self.assert_refreshed_by_workers()
+
+    def test_workers_process_pool(self):
+        if connection.vendor == "sqlite":
+            self.skipTest("Worker processes cannot open the SQLite test database.")
+        self.assert_refreshed_by_workers()
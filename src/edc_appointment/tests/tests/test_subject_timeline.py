@@ -0,0 +1,130 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import time_machine
+from clinicedc_tests.consents import consent_v1
+from clinicedc_tests.helper import Helper
+from clinicedc_tests.visit_schedules.visit_schedule_appointment import (
+    get_visit_schedule1,
+)
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, override_settings, tag
+
+from edc_appointment.models import Appointment
+from edc_appointment.subject_timeline import SubjectTimeline
+from edc_appointment.utils import (
+    get_appointment_by_datetime,
+    get_next_appointment,
+    get_previous_appointment,
+    get_window_gap_days,
+)
+from edc_consent.site_consents import site_consents
+from edc_facility.import_holidays import import_holidays
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+utc_tz = ZoneInfo("UTC")
+
+
+@tag("appointment")
+@override_settings(SITE_ID=10)
+@time_machine.travel(datetime(2025, 6, 11, 8, 00, tzinfo=utc_tz))
+class TestSubjectTimeline(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        import_holidays()
+
+    def setUp(self):
+        site_consents.registry = {}
+        site_consents.register(consent_v1)
+        site_visit_schedules._registry = {}
+        self.visit_schedule = get_visit_schedule1(consent_v1)
+        self.schedule = self.visit_schedule.schedules.get("schedule1")
+        site_visit_schedules.register(visit_schedule=self.visit_schedule)
+        self.helper = Helper(now=datetime(2025, 1, 7, tzinfo=utc_tz))
+        self.subject_identifiers = []
+        for _ in range(2):
+            consent = self.helper.consent_and_put_on_schedule(
+                visit_schedule_name=self.visit_schedule.name,
+                schedule_name=self.schedule.name,
+                consent_definition=consent_v1,
+            )
+            self.subject_identifiers.append(consent.subject_identifier)
+        self.subject_identifier = self.subject_identifiers[0]
+        first = Appointment.objects.filter(
+            subject_identifier=self.subject_identifier
+        ).order_by("timepoint", "visit_code_sequence")[0]
+        # add interim appointments
+        for i in [0, 1]:
+            Appointment.objects.create(
+                subject_identifier=first.subject_identifier,
+                appt_datetime=first.appt_datetime + relativedelta(hours=i + 1),
+                timepoint=first.timepoint,
+                visit_code=first.visit_code,
+                visit_code_sequence=i + 1,
+                visit_schedule_name=first.visit_schedule_name,
+                schedule_name=first.schedule_name,
+            )
+        self.timeline = SubjectTimeline(
+            self.subject_identifier, self.visit_schedule.name, self.schedule.name
+        )
+
+    def test_appointments(self):
+        self.assertEqual(
+            [f"{obj.visit_code}.{obj.visit_code_sequence}" for obj in self.timeline],
+            ["1000.0", "1000.1", "1000.2", "2000.0", "3000.0", "4000.0"],
+        )
+        self.assertEqual(self.timeline.first.visit_code, "1000")
+
+    def test_previous_and_next(self):
+        for appointment in self.timeline:
+            for include_interim in [False, True]:
+                with self.subTest(appointment=appointment, include_interim=include_interim):
+                    self.assertEqual(
+                        self.timeline.previous(appointment, include_interim=include_interim),
+                        get_previous_appointment(appointment, include_interim=include_interim),
+                    )
+                    self.assertEqual(
+                        self.timeline.next(appointment, include_interim=include_interim),
+                        get_next_appointment(appointment, include_interim=include_interim),
+                    )
+
+    def test_no_queries(self):
+        appointment = self.timeline.appointments[3]
+        with self.assertNumQueries(0):
+            self.timeline.previous(appointment, include_interim=True)
+            self.timeline.next(appointment)
+            self.timeline.get_window_gap_days(appointment)
+
+    def test_window_gap_days(self):
+        for appointment in self.timeline.scheduled:
+            with self.subTest(appointment=appointment):
+                self.assertEqual(
+                    self.timeline.get_window_gap_days(appointment),
+                    get_window_gap_days(appointment),
+                )
+
+    def test_get_appointment_by_datetime(self):
+        for appointment in self.timeline.scheduled[1:]:
+            with self.subTest(appointment=appointment):
+                self.assertEqual(
+                    self.timeline.get_appointment_by_datetime(appointment.timepoint_datetime),
+                    appointment,
+                )
+                self.assertEqual(
+                    get_appointment_by_datetime(
+                        appointment.timepoint_datetime,
+                        self.subject_identifier,
+                        self.visit_schedule.name,
+                        self.schedule.name,
+                    ),
+                    appointment,
+                )
+
+    def test_for_subjects(self):
+        with self.assertNumQueries(1):
+            timelines = SubjectTimeline.for_subjects(
+                self.visit_schedule.name, self.schedule.name
+            )
+        self.assertEqual(sorted(timelines), sorted(self.subject_identifiers))
+        self.assertEqual(len(timelines[self.subject_identifier]), 6)
+        self.assertEqual(len(timelines[self.subject_identifiers[1]]), 4)
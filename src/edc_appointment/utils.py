@@ -73,6 +73,7 @@ if TYPE_CHECKING:
     from edc_metadata.model_mixins.creates import CreatesMetadataModelMixin
 
     from .models import Appointment, AppointmentType
+    from .subject_timeline import SubjectTimeline
 
     class RelatedVisitModel(CreatesMetadataModelMixin, Base):
         appointment: Appointment
@@ -140,6 +141,15 @@ def allow_clinic_on_weekend():
     return getattr(settings, "EDC_APPOINTMENT_ALLOW_CLINIC_ON_WEEKENDS", False)
 
 
+def get_appointments_bulk_create() -> bool:
+    """Returns True if `AppointmentsCreator` should plan and write
+    the appointments of a schedule in bulk.
+
+    See `AppointmentsCreator.plan_appointments`.
+    """
+    return getattr(settings, "EDC_APPOINTMENT_BULK_CREATE", False)
+
+
 def get_max_months_to_next_appointment_as_rdelta():
     max_months = get_max_months_to_next_appointment()
     return relativedelta(months=max_months)
@@ -508,26 +518,38 @@ def check_appointment_required_values_or_raise(appointment: Appointment) -> None
         )
 
 
+def get_next(appointment: Appointment, timeline: SubjectTimeline | None = None):
+    """Returns `appointment.next` or, if given, the next appointment
+    from the timeline.
+    """
+    return timeline.next(appointment) if timeline else appointment.next
+
+
 def raise_on_appt_datetime_not_in_window(
     appointment: Appointment,
     appt_datetime: datetime | None = None,
     baseline_timepoint_datetime: datetime | None = None,
+    timeline: SubjectTimeline | None = None,
 ) -> None:
     if appointment.appt_status != CANCELLED_APPT and not is_baseline(instance=appointment):
-        baseline_timepoint_datetime = baseline_timepoint_datetime or (
-            appointment.__class__.objects.first_appointment(
-                subject_identifier=appointment.subject_identifier,
-                visit_schedule_name=appointment.visit_schedule_name,
-                schedule_name=appointment.schedule_name,
-            ).timepoint_datetime
-        )
+        if not baseline_timepoint_datetime:
+            first_appointment = (
+                timeline.first
+                if timeline
+                else appointment.__class__.objects.first_appointment(
+                    subject_identifier=appointment.subject_identifier,
+                    visit_schedule_name=appointment.visit_schedule_name,
+                    schedule_name=appointment.schedule_name,
+                )
+            )
+            baseline_timepoint_datetime = first_appointment.timepoint_datetime
         try:
             appointment.schedule.datetime_in_window(
                 dt=appt_datetime or appointment.appt_datetime,
                 baseline_timepoint_datetime=baseline_timepoint_datetime,
                 timepoint_datetime=appointment.timepoint_datetime,
                 visit=appointment.visit,
-                next_visit=getattr(appointment.next, "visit", None),
+                next_visit=getattr(get_next(appointment, timeline), "visit", None),
                 visit_code_sequence=appointment.visit_code_sequence,
             )
         except ScheduledVisitWindowError as e:
@@ -540,31 +562,34 @@ def raise_on_appt_datetime_not_in_window(
             raise AppointmentWindowError(msg) from e
 
 
-def get_window_gap_days(appointment) -> int:
+def get_window_gap_days(appointment, timeline: SubjectTimeline | None = None) -> int:
     """Return the number of days betwen this visit's upper and the
     next visit's lower.
 
     See get_default_max_visit_window_gap and settings attr.
     """
-    if not appointment.next:
+    if not (next_appt := get_next(appointment, timeline)):
         gap_days = 0
     else:
         gap_days = abs(
             (appointment.timepoint_datetime + appointment.visit.rupper)
-            - (appointment.next.timepoint_datetime - appointment.next.visit.rlower)
+            - (next_appt.timepoint_datetime - next_appt.visit.rlower)
         ).days
     return gap_days
 
 
-def appt_datetime_in_gap(appointment: Appointment, suggested_appt_datetime: datetime) -> bool:
+def appt_datetime_in_gap(
+    appointment: Appointment,
+    suggested_appt_datetime: datetime,
+    timeline: SubjectTimeline | None = None,
+) -> bool:
     """Return True if datetime falls in a gap between this and the
     next appointment window.
     """
     in_gap = False
-    if get_window_gap_days(appointment) > 0:
-        next_lower_datetime = (
-            appointment.next.timepoint_datetime - appointment.next.visit.rlower
-        )
+    if get_window_gap_days(appointment, timeline=timeline) > 0:
+        next_appt = get_next(appointment, timeline)
+        next_lower_datetime = next_appt.timepoint_datetime - next_appt.visit.rlower
         upper_datetime = appointment.timepoint_datetime + appointment.visit.rupper
         if upper_datetime < suggested_appt_datetime < next_lower_datetime:
             in_gap = True
@@ -583,25 +608,26 @@ def get_max_window_gap_to_lower(appointment) -> int:
 
 
 def appt_datetime_in_next_window_adjusted_for_gap(
-    appointment: Appointment, suggested_appt_datetime: datetime
+    appointment: Appointment,
+    suggested_appt_datetime: datetime,
+    timeline: SubjectTimeline | None = None,
 ) -> bool:
     """Returns True if `suggest_datetime` falls between the
     NEXT appointment's lower and upper window period datetime after
     adding gap_days to the lower datetime.
     """
     in_window = False
-    gap_days = get_window_gap_days(appointment)
+    gap_days = get_window_gap_days(appointment, timeline=timeline)
     max_gap = get_max_window_gap_to_lower(appointment)
     gap_days = min(gap_days, max_gap)
     if gap_days > 0:
+        next_appt = get_next(appointment, timeline)
         next_lower_datetime = (
-            appointment.next.timepoint_datetime
-            - appointment.next.visit.rlower
+            next_appt.timepoint_datetime
+            - next_appt.visit.rlower
             - relativedelta(days=gap_days)
         )
-        next_upper_datetime = (
-            appointment.next.timepoint_datetime + appointment.next.visit.rupper
-        )
+        next_upper_datetime = next_appt.timepoint_datetime + next_appt.visit.rupper
         if next_lower_datetime <= suggested_appt_datetime <= next_upper_datetime:
             in_window = True
     return in_window
@@ -613,6 +639,8 @@ def get_appointment_by_datetime(
     visit_schedule_name: str,
     schedule_name: str,
     raise_if_in_gap: bool | None = None,
+    *,
+    timeline: SubjectTimeline | None = None,
 ) -> Appointment | None:
     """Returns an appointment where the suggested datetime falls
     within the window period.
@@ -620,30 +648,31 @@ def get_appointment_by_datetime(
     * Returns None if no appointment is found.
     * Raises an exception if there is a gap between upper and lower
       boundaries and the date falls within the gap.
+
+    The subject's appointments are loaded once into a
+    `SubjectTimeline`, if not provided.
     """
+    from .subject_timeline import SubjectTimeline  # noqa: PLC0415
+
     appointment = None
     raise_if_in_gap = True if raise_if_in_gap is None else raise_if_in_gap
-    appointments = (
-        django_apps.get_model("edc_appointment.appointment")
-        .objects.filter(
-            subject_identifier=subject_identifier,
-            visit_schedule_name=visit_schedule_name,
-            schedule_name=schedule_name,
-            visit_code_sequence=0,
-        )
-        .order_by("timepoint_datetime")
+    timeline = timeline or SubjectTimeline(
+        subject_identifier, visit_schedule_name, schedule_name
     )
-    for appointment in appointments:
+    for appointment in sorted(timeline.scheduled, key=lambda obj: obj.timepoint_datetime):
         if appointment.appt_status == CANCELLED_APPT or is_baseline(appointment):
             continue
+        next_appt = timeline.next(appointment)
         try:
             raise_on_appt_datetime_not_in_window(
-                appointment, appt_datetime=suggested_appt_datetime
+                appointment, appt_datetime=suggested_appt_datetime, timeline=timeline
             )
         except AppointmentWindowError as e:
-            in_gap = appt_datetime_in_gap(appointment, suggested_appt_datetime)
+            in_gap = appt_datetime_in_gap(
+                appointment, suggested_appt_datetime, timeline=timeline
+            )
             in_next_window_adjusted = appt_datetime_in_next_window_adjusted_for_gap(
-                appointment, suggested_appt_datetime
+                appointment, suggested_appt_datetime, timeline=timeline
             )
             if in_gap and raise_if_in_gap:
                 dt = suggested_appt_datetime.strftime(
@@ -651,23 +680,19 @@ def get_appointment_by_datetime(
                 )
                 raise AppointmentDateWindowPeriodGapError(
                     f"Date falls in a `window period gap` between {appointment.visit_code} "
-                    f"and {appointment.next.visit_code}. Got {dt}."
+                    f"and {next_appt.visit_code}. Got {dt}."
                 ) from e
-            if (
-                in_gap
-                and in_next_window_adjusted
-                and appointment.next.visit.add_window_gap_to_lower
-            ):
-                appointment = appointment.next  # noqa: PLW2901
+            if in_gap and in_next_window_adjusted and next_appt.visit.add_window_gap_to_lower:
+                appointment = next_appt  # noqa: PLW2901
                 break
             if (
                 in_gap
                 and not in_next_window_adjusted
-                and appointment.next.visit.add_window_gap_to_lower
+                and next_appt.visit.add_window_gap_to_lower
             ):
                 appointment = None  # noqa: PLW2901
                 break
-            appointment = appointment.next  # noqa: PLW2901
+            appointment = next_appt  # noqa: PLW2901
         else:
             break
     return appointment
@@ -1,5 +1,11 @@
 from .data_request_admin import DataRequestAdmin
 from .data_request_history_admin import DataRequestHistoryAdmin
+from .export_watermark_admin import ExportWatermarkAdmin
 from .modeladmin_mixins import ExportMixinModelAdminMixin
 
-__all__ = ["DataRequestAdmin", "DataRequestHistoryAdmin", "ExportMixinModelAdminMixin"]
+__all__ = [
+    "DataRequestAdmin",
+    "DataRequestHistoryAdmin",
+    "ExportMixinModelAdminMixin",
+    "ExportWatermarkAdmin",
+]
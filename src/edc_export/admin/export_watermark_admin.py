@@ -0,0 +1,66 @@
+from django.contrib import admin
+from django_audit_fields import ModelAdminAuditFieldsMixin
+from django_revision.modeladmin_mixin import ModelAdminRevisionMixin
+
+from edc_model_admin.mixins import (
+    ModelAdminInstitutionMixin,
+    ModelAdminNextUrlRedirectMixin,
+    ModelAdminRedirectAllToChangelistMixin,
+    ModelAdminRedirectOnDeleteMixin,
+    TemplatesModelAdminMixin,
+)
+
+from ..admin_site import edc_export_admin
+from ..models import ExportWatermark
+
+
+@admin.register(ExportWatermark, site=edc_export_admin)
+class ExportWatermarkAdmin(
+    TemplatesModelAdminMixin,
+    ModelAdminRedirectOnDeleteMixin,
+    ModelAdminRevisionMixin,
+    ModelAdminInstitutionMixin,
+    ModelAdminNextUrlRedirectMixin,
+    ModelAdminAuditFieldsMixin,
+    ModelAdminRedirectAllToChangelistMixin,
+    admin.ModelAdmin,
+):
+    """Delete a watermark to have the next incremental export of
+    the model export all rows.
+    """
+
+    date_hierarchy = "exported_datetime"
+
+    show_cancel = True
+    view_on_site = False
+    show_history_label = False
+
+    change_search_field_name = "id"
+
+    fields = (
+        "username",
+        "export_name",
+        "model",
+        "last_modified",
+        "last_deleted",
+        "rows",
+        "deleted",
+        "exported_datetime",
+    )
+
+    list_display = (
+        "model",
+        "username",
+        "export_name",
+        "last_modified",
+        "last_deleted",
+        "rows",
+        "deleted",
+        "exported_datetime",
+    )
+
+    list_filter = ("username", "export_name", "exported_datetime")
+
+    readonly_fields = fields
+
+    search_fields = ("model", "username", "export_name")
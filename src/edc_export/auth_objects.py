@@ -6,8 +6,10 @@ export_codenames = [
     "edc_export.change_datarequesthistory",
     "edc_export.delete_datarequest",
     "edc_export.delete_datarequesthistory",
+    "edc_export.delete_exportwatermark",
     "edc_export.view_datarequest",
     "edc_export.view_datarequesthistory",
+    "edc_export.view_exportwatermark",
     "edc_export.view_historicaldatarequest",
     "edc_export.export_subjectschedulehistory",
     "edc_export.export_visitschedule",
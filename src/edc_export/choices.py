@@ -1,4 +1,4 @@
-from .constants import CSV, STATA_10, STATA_13, STATA_14, STATA_15
+from .constants import CSV, PARQUET, STATA_10, STATA_13, STATA_14, STATA_15
 
 EXPORT_FORMATS = (
     (CSV, "CSV (delimited by pipe `|`)"),
@@ -6,4 +6,5 @@ EXPORT_FORMATS = (
     (STATA_13, "Stata v13 or later"),
     (STATA_14, "Stata v14 or later"),
     (STATA_15, "Stata v15 or later"),
+    (PARQUET, "Parquet (partitioned by site)"),
 )
@@ -1,5 +1,6 @@
 CANCELLED = "cancelled"
 CSV = "CSV"
+PARQUET = "PARQUET"
 DELETE = "D"
 EXPORTED = "exported"
 INSERT = "I"
@@ -9,8 +9,8 @@ from pathlib import Path
 from django.core.management import CommandError, color_style
 from django.core.management.base import BaseCommand
 
-from edc_export.constants import CSV, STATA_14
-from edc_export.models_to_file import ModelsToFile
+from edc_export.constants import CSV, PARQUET, STATA_14
+from edc_export.models_to_file import ModelsToFile, ModelsToFileNothingExportedError
 from edc_export.utils import (
     get_default_models_for_export,
     get_export_user,
@@ -140,8 +140,8 @@ class Command(BaseCommand):
             "--format",
             dest="format",
             default="csv",
-            choices=["csv", "stata"],
-            help="export format (csv, stata)",
+            choices=["csv", "stata", "parquet"],
+            help="export format (csv, stata, parquet). Parquet is partitioned by site.",
         )
 
         parser.add_argument(
@@ -190,17 +190,46 @@ class Command(BaseCommand):
             help="only export data for site id. Separate by comma if more than one.",
         )
 
-    def handle(self, *args, **options):  # noqa: ARG002, C901, PLR0912
+        parser.add_argument(
+            "-w",
+            "--max-workers",
+            dest="max_workers",
+            type=int,
+            default=None,
+            help=(
+                "number of worker processes used to export models concurrently. "
+                "Defaults to settings.EDC_EXPORT_MAX_WORKERS or 1."
+            ),
+        )
+
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            dest="incremental",
+            default=False,
+            help=(
+                "only export rows added or changed since the last incremental export "
+                "and a file of deleted ids per model"
+            ),
+        )
+
+        parser.add_argument(
+            "--export-name",
+            dest="export_name",
+            default="",
+            help=(
+                "name of the incremental export. High-water marks are kept per user "
+                "and export name"
+            ),
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002, C901, PLR0912, PLR0915
         user = get_export_user()
         validate_user_perms_or_raise(user, options["decrypt"])
 
         self.options = options
         self.decrypt = self.options["decrypt"]
-        export_format = (
-            CSV
-            if self.options["format"] == "csv"
-            else int(self.options["stata_dta_version"] or STATA_14)
-        )
+        export_format = self.export_format
 
         if not self.options["path"]:
             raise CommandError("Path is required. Use --path to specify the export directory.")
@@ -278,16 +307,29 @@ class Command(BaseCommand):
             raise CommandError("Nothing to do. No models to export.")
 
         # export
-        models_to_file = ModelsToFile(
-            user=user,
-            models=model_names,
-            site_ids=site_ids,
-            decrypt=self.decrypt,
-            archive_to_single_file=True,
-            export_format=export_format,
-            use_simple_filename=use_simple_filename,
-            export_folder=export_path,
-        )
+        try:
+            models_to_file = ModelsToFile(
+                user=user,
+                models=model_names,
+                site_ids=site_ids,
+                decrypt=self.decrypt,
+                archive_to_single_file=True,
+                export_format=export_format,
+                use_simple_filename=use_simple_filename,
+                export_folder=export_path,
+                max_workers=self.options["max_workers"],
+                incremental=self.options["incremental"],
+                export_name=self.options["export_name"],
+            )
+        except ModelsToFileNothingExportedError:
+            if not self.options["incremental"]:
+                raise
+            sys.stdout.write(
+                style.SUCCESS(
+                    "\nDone.\nNothing added, changed or deleted since last export.\n"
+                )
+            )
+            return
 
         # audit log
         try:
@@ -312,6 +354,14 @@ class Command(BaseCommand):
             style.SUCCESS(f"\nDone.\nExported to {models_to_file.archive_filename}\n")
         )
 
+    @property
+    def export_format(self) -> str | int:
+        if self.options["format"] == "csv":
+            return CSV
+        if self.options["format"] == "parquet":
+            return PARQUET
+        return int(self.options["stata_dta_version"] or STATA_14)
+
     @property
     def countries(self):
         if not self._countries:
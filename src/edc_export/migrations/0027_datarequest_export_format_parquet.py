@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edc_export", "0026_alter_datarequest_managers_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="datarequest",
+            name="export_format",
+            field=models.CharField(
+                choices=[
+                    ("CSV", "CSV (delimited by pipe `|`)"),
+                    (114, "Stata v10 or later"),
+                    (117, "Stata v13 or later"),
+                    (118, "Stata v14 or later"),
+                    (119, "Stata v15 or later"),
+                    ("PARQUET", "Parquet (partitioned by site)"),
+                ],
+                default="CSV",
+                max_length=25,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicaldatarequest",
+            name="export_format",
+            field=models.CharField(
+                choices=[
+                    ("CSV", "CSV (delimited by pipe `|`)"),
+                    (114, "Stata v10 or later"),
+                    (117, "Stata v13 or later"),
+                    (118, "Stata v14 or later"),
+                    (119, "Stata v15 or later"),
+                    ("PARQUET", "Parquet (partitioned by site)"),
+                ],
+                default="CSV",
+                max_length=25,
+            ),
+        ),
+    ]
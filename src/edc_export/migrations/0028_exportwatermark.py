@@ -0,0 +1,184 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:19
+
+import _socket
+import django.utils.timezone
+import django_audit_fields.fields.hostname_modification_field
+import django_audit_fields.fields.userfield
+import django_audit_fields.fields.uuid_auto_field
+import django_revision.revision_field
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edc_export", "0027_datarequest_export_format_parquet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportWatermark",
+            fields=[
+                (
+                    "revision",
+                    django_revision.revision_field.RevisionField(
+                        blank=True,
+                        default="",
+                        editable=False,
+                        help_text="System field. From git repository (tag:branch:commit), project metadata, project toml, project VERSION, or settings.",
+                        max_length=75,
+                        verbose_name="Revision",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(blank=True, default=django.utils.timezone.now),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(blank=True, default=django.utils.timezone.now),
+                ),
+                (
+                    "user_created",
+                    django_audit_fields.fields.userfield.UserField(
+                        blank=True,
+                        default="",
+                        help_text="Updated by admin.save_model",
+                        max_length=50,
+                        verbose_name="user created",
+                    ),
+                ),
+                (
+                    "user_modified",
+                    django_audit_fields.fields.userfield.UserField(
+                        blank=True,
+                        default="",
+                        help_text="Updated by admin.save_model",
+                        max_length=50,
+                        verbose_name="user modified",
+                    ),
+                ),
+                (
+                    "hostname_created",
+                    models.CharField(
+                        blank=True,
+                        default=_socket.gethostname,
+                        help_text="System field. (modified on create only)",
+                        max_length=60,
+                        verbose_name="Hostname created",
+                    ),
+                ),
+                (
+                    "hostname_modified",
+                    django_audit_fields.fields.hostname_modification_field.HostnameModificationField(
+                        blank=True,
+                        default="",
+                        help_text="System field. (modified on every save)",
+                        max_length=50,
+                        verbose_name="Hostname modified",
+                    ),
+                ),
+                (
+                    "device_created",
+                    models.CharField(
+                        blank=True, default="", max_length=10, verbose_name="Device created"
+                    ),
+                ),
+                (
+                    "device_modified",
+                    models.CharField(
+                        blank=True, default="", max_length=10, verbose_name="Device modified"
+                    ),
+                ),
+                (
+                    "locale_created",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Auto-updated by Modeladmin",
+                        max_length=10,
+                        verbose_name="Locale created",
+                    ),
+                ),
+                (
+                    "locale_modified",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Auto-updated by Modeladmin",
+                        max_length=10,
+                        verbose_name="Locale modified",
+                    ),
+                ),
+                (
+                    "id",
+                    django_audit_fields.fields.uuid_auto_field.UUIDAutoField(
+                        blank=True,
+                        editable=False,
+                        help_text="System auto field. UUID primary key.",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("username", models.CharField(max_length=150)),
+                ("export_name", models.CharField(default="", max_length=50)),
+                (
+                    "site_ids",
+                    models.CharField(
+                        default="",
+                        help_text="Sorted site ids, comma separated.",
+                        max_length=250,
+                    ),
+                ),
+                ("decrypt", models.BooleanField(default=False)),
+                ("model", models.CharField(max_length=250)),
+                (
+                    "last_modified",
+                    models.DateTimeField(
+                        help_text="Max `modified` of the rows exported.", null=True
+                    ),
+                ),
+                (
+                    "last_modified_ids",
+                    models.TextField(
+                        default="",
+                        help_text="Ids of the rows exported at `last_modified`, one per line.",
+                    ),
+                ),
+                (
+                    "last_deleted",
+                    models.DateTimeField(
+                        help_text="Max `history_date` of the deletions exported.", null=True
+                    ),
+                ),
+                ("rows", models.IntegerField(default=0)),
+                ("deleted", models.IntegerField(default=0)),
+                ("exported_datetime", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Export Watermark",
+                "verbose_name_plural": "Export Watermarks",
+                "abstract": False,
+                "default_permissions": ("add", "change", "delete", "view", "export", "import"),
+                "default_manager_name": "objects",
+                "indexes": [
+                    models.Index(
+                        fields=["modified", "created"], name="edc_export__modifie_84ef29_idx"
+                    ),
+                    models.Index(
+                        fields=["user_modified", "user_created"],
+                        name="edc_export__user_mo_945ad4_idx",
+                    ),
+                    models.Index(
+                        fields=["username", "export_name", "site_ids", "decrypt"],
+                        name="edc_export__usernam_d6e408_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("username", "export_name", "site_ids", "decrypt", "model"),
+                        name="edc_export_exportwatermark_model_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 from .data_request import DataRequest
 from .data_request_history import DataRequestHistory
 from .edc_permissions import EdcPermissions
+from .export_watermark import ExportWatermark
 from .permission_dummies import ExportData, ImportData
 from .signals import (
     export_transaction_history_on_post_save,
@@ -12,6 +13,7 @@ __all__ = [
     "DataRequestHistory",
     "EdcPermissions",
     "ExportData",
+    "ExportWatermark",
     "ImportData",
     "export_transaction_history_on_post_save",
     "export_transaction_history_on_pre_delete",
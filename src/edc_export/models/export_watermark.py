@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models import Index, UniqueConstraint
+from django.utils import timezone
+
+from edc_model.models import BaseUuidModel
+
+
+class ExportWatermark(BaseUuidModel):
+    """The high-water mark of the last incremental export of a model
+    per user, export name, sites and decrypt option.
+
+    See `ModelsToFile` with `incremental=True`.
+    """
+
+    username = models.CharField(max_length=150)
+
+    export_name = models.CharField(max_length=50, default="")
+
+    site_ids = models.CharField(
+        max_length=250, default="", help_text="Sorted site ids, comma separated."
+    )
+
+    decrypt = models.BooleanField(default=False)
+
+    model = models.CharField(max_length=250)
+
+    last_modified = models.DateTimeField(
+        null=True, help_text="Max `modified` of the rows exported."
+    )
+
+    last_modified_ids = models.TextField(
+        default="", help_text="Ids of the rows exported at `last_modified`, one per line."
+    )
+
+    last_deleted = models.DateTimeField(
+        null=True, help_text="Max `history_date` of the deletions exported."
+    )
+
+    rows = models.IntegerField(default=0)
+
+    deleted = models.IntegerField(default=0)
+
+    exported_datetime = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.model} ({self.username}:{self.export_name})"
+
+    class Meta(BaseUuidModel.Meta):
+        verbose_name = "Export Watermark"
+        verbose_name_plural = "Export Watermarks"
+        constraints = (
+            UniqueConstraint(
+                fields=["username", "export_name", "site_ids", "decrypt", "model"],
+                name="%(app_label)s_%(class)s_model_uniq",
+            ),
+        )
+        indexes = (
+            *BaseUuidModel.Meta.indexes,
+            Index(fields=["username", "export_name", "site_ids", "decrypt"]),
+        )
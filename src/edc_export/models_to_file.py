@@ -1,24 +1,35 @@
 from __future__ import annotations
 
-import shutil
 import sys
+import time
 import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from django.apps import apps as django_apps
-from django.db import OperationalError
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import OperationalError, connection, connections
+from django.db.models import Max
 from django.utils import timezone
+from simple_history.exceptions import NotHistoricalModelError
+from simple_history.utils import get_history_model_for_model
 from tabulate import tabulate
 from tqdm import tqdm
 
 from edc_model_to_dataframe.model_to_dataframe import ModelToDataframe
 from edc_sites.site import sites
+from edc_utils.process_pool import get_mp_context, init_worker
 
-from .constants import CSV, STATA_14, STATA_15
+from .constants import CSV, PARQUET, STATA_14, STATA_15
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -29,6 +40,8 @@ if TYPE_CHECKING:
 
     from edc_data_manager.models import DataDictionary
 
+    from .models import ExportWatermark
+
 
 class ModelsToFileError(Exception):
     pass
@@ -38,16 +51,78 @@ class ModelsToFileNothingExportedError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class ModelExportResult:
+    """The file, row count and elapsed time of one exported model.
+
+    For an incremental export, also the tombstone file, the number
+    of deletions and the new high-water marks.
+    """
+
+    model: str
+    filename: str | None
+    rows: int
+    seconds: float
+    tombstone_filename: str | None = None
+    deleted: int = 0
+    modified: datetime | None = None
+    modified_ids: tuple[str, ...] = ()
+    deleted_datetime: datetime | None = None
+
+
+# the exporter of this worker process, see `init_export_worker`
+worker_exporter: dict[str, ModelsToFile] = {}
+
+
+def init_export_worker(exporter: ModelsToFile) -> None:
+    """Initializes a worker process of the `ModelsToFile` pool
+    with the exporter.
+
+    See `edc_utils.process_pool.init_worker`.
+    """
+    worker_exporter.update(exporter=exporter)
+    init_worker()
+
+
+def export_model(model: str) -> ModelExportResult | None:
+    """Exports one model in a worker process of the `ModelsToFile`
+    pool.
+
+    See `ModelsToFile.export_model`.
+    """
+    return worker_exporter["exporter"].export_model(model)
+
+
 class ModelsToFile:
-    """Exports a list of models to individual CSV files and
-    adds each to a single zip archive.
+    """Exports a list of models to individual CSV, STATA or Parquet
+    files and adds each to a single zip archive.
 
     models: a list of model names in label_lower format.
+
+    max_workers: if greater than 1, models are exported concurrently
+    in a process pool. Each worker process opens its own DB
+    connections. Defaults to settings.EDC_EXPORT_MAX_WORKERS or 1.
+
+    Files and the export summary (README.txt) are listed in the
+    order of `models` and the archive is written in sorted order
+    regardless of the order in which models complete.
+
+    incremental: if True, exports only the rows added or changed
+    since the last incremental export by this user with this
+    `export_name` and, for models with a history table, a
+    tombstone file of the ids deleted since then. The high-water
+    marks are kept in `ExportWatermark`. The first incremental
+    export of a model is a full export. See `get_incremental_query_filter`
+    and `get_tombstones`.
+
+    For Parquet, see `to_parquet`.
     """
 
     date_format: str = "%Y-%m-%d %H:%M:%S"
     delimiter: str = "|"
+    export_formats: tuple[str | int, ...] = (CSV, STATA_14, STATA_15, PARQUET)
     encoding: str = "utf-8"
+    parquet_partition_column: str = "site_id"
 
     def __init__(
         self,
@@ -61,17 +136,26 @@ class ModelsToFile:
         export_format: str | int | None = None,
         use_simple_filename: bool | None = None,
         date_format: str | None = None,
+        max_workers: int | None = None,
+        incremental: bool | None = None,
+        export_name: str | None = None,
     ):
         self.archive_filename: str | None = None
         self.emailed_datetime: datetime | None = None
         self.emailed_to: str | None = None
         self.exported_filenames: list = []
-        self.export_history = dict(model=[], rows=[])
+        self.incremental: bool = incremental or False
+        self.export_name: str = export_name or ""
+        self.export_history = dict(model=[], filename=[], rows=[])
+        if self.incremental:
+            self.export_history.update(deleted=[])
+        self.export_history.update(seconds=[])
+        self.export_results: list[ModelExportResult] = []
         self.export_format = export_format or CSV
-        if export_format not in [CSV, STATA_14, STATA_15]:
+        if self.export_format not in self.export_formats:
             raise ModelsToFileError(
-                f"Invalid export format. Expected one of {[CSV, STATA_14, STATA_15]}. "
-                f"Got {export_format}"
+                "Invalid export format. Expected one of "
+                f"{list(self.export_formats)}. Got {export_format}"
             )
         self.use_simple_filename = use_simple_filename
         self.date_format = date_format or self.date_format
@@ -82,54 +166,136 @@ class ModelsToFile:
         self.decrypt: bool = decrypt or False
         self.models: list[str] = models or []
         self.user = user
+        self.max_workers: int = max(
+            1, max_workers or getattr(settings, "EDC_EXPORT_MAX_WORKERS", 1)
+        )
 
         self.site_ids = site_ids or [sites.get_current_site().site_id]
         for site_id in self.site_ids:
             if not sites.get_site_ids_for_user(user=self.user, site_id=site_id):
                 self.site_ids = [s for s in self.site_ids if s != site_id]
 
+        self.watermarks: dict[str, ExportWatermark] = (
+            self.get_watermarks() if self.incremental else {}
+        )
+
         if export_folder and not export_folder.exists():
             raise ModelsToFileError(f"Export folder does not exist. Got {export_folder}.")
         self.export_folder: Path = export_folder or Path(mkdtemp())
         formatted_date: str = timezone.now().strftime("%Y%m%d%H%M%S")
-        self.sub_folder = (
-            f"{self.user.username}_{'csv' if export_format == CSV else 'stata'}_"
-            f"{formatted_date}"
-        )
+        self.sub_folder = f"{self.user.username}_{self.export_format_name}_{formatted_date}"
         (self.export_folder / self.sub_folder).mkdir(parents=False, exist_ok=False)
 
-        for model in tqdm(self.models, total=len(self.models)):
-            if filename := self.model_to_file(model):
-                self.exported_filenames.append(filename)
+        for result in self.export_models():
+            self.export_results.append(result)
+            self.exported_filenames.extend(
+                f for f in [result.filename, result.tombstone_filename] if f
+            )
+            self.export_history["model"].append(result.model)
+            self.export_history["filename"].append(result.filename or "")
+            self.export_history["rows"].append(result.rows)
+            if self.incremental:
+                self.export_history["deleted"].append(result.deleted)
+            self.export_history["seconds"].append(round(result.seconds, 2))
         if not self.exported_filenames:
             raise ModelsToFileNothingExportedError(f"Nothing exported. Got models={models}.")
         if self.export_history:
-            with (self.export_folder / self.sub_folder / "README.txt").open("w") as f:
-                f.write("\nExport Summary\n")
-                f.write(
-                    tabulate(
-                        pd.DataFrame(data=self.export_history)
-                        .sort_values("model")
-                        .reset_index(drop=True),
-                        tablefmt="fancy_grid",
-                        headers="keys",
-                        showindex=False,
-                    )
-                )
-                f.write("\n")
-                f.write(f"{timezone.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            self.write_summary()
         if self.archive_to_single_file:
             self.archive_filename = self.create_archive_file()
             sys.stdout.write(f"{self.archive_filename}\n")
+        if self.incremental:
+            self.update_watermarks()
+
+    def write_summary(self) -> None:
+        """Writes the export summary, a table of the file, row count
+        and elapsed time of each model, to README.txt.
+        """
+        with (self.export_folder / self.sub_folder / "README.txt").open("w") as f:
+            f.write("\nExport Summary\n")
+            f.write(
+                tabulate(
+                    pd.DataFrame(data=self.export_history),
+                    tablefmt="fancy_grid",
+                    headers="keys",
+                    showindex=False,
+                )
+            )
+            f.write("\n")
+            f.write(
+                f"Exported {sum(self.export_history['rows'])} rows from "
+                f"{len(self.export_results)} models in "
+                f"{sum(self.export_history['seconds']):.2f}s "
+                f"using {self.max_workers} worker(s).\n"
+            )
+            if self.incremental:
+                f.write(
+                    "Incremental export. Includes rows added or changed since the "
+                    "last export. Deleted ids are listed in *_deleted.csv.\n"
+                )
+            f.write(f"{timezone.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    def export_models(self) -> list[ModelExportResult]:
+        """Exports each model, concurrently if `max_workers` > 1,
+        and returns the results in the order of `models`.
+
+        Models are exported in this process if called within a
+        transaction since worker processes cannot read its
+        uncommitted rows.
+
+        Models with nothing to export are not included.
+        """
+        if (
+            self.max_workers == 1
+            or len(self.models) < 2  # noqa: PLR2004
+            or connection.in_atomic_block
+        ):
+            results = {
+                model: self.export_model(model)
+                for model in tqdm(self.models, total=len(self.models))
+            }
+        else:
+            results = {}
+            # worker processes must not share the open DB connections
+            # of this process. Each opens its own on first query.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(self.models)),
+                mp_context=get_mp_context(),
+                initializer=init_export_worker,
+                initargs=(self,),
+            ) as executor:
+                futures = {
+                    executor.submit(export_model, model): model for model in self.models
+                }
+                for future in tqdm(as_completed(futures), total=len(futures)):
+                    results[futures[future]] = future.result()
+        return [results[model] for model in self.models if results.get(model)]
 
     def model_to_file(self, model: str) -> str | None:
-        """Convert model to a dataframe and export as CSV or STATA
-        using pandas.Dataframe to_csv() or to_stata().
+        """Convert model to a dataframe and export as CSV, STATA or
+        Parquet. Returns the filename or None.
+
+        See `export_model`.
+        """
+        result = self.export_model(model)
+        return result.filename if result else None
+
+    def export_model(self, model: str) -> ModelExportResult | None:
+        """Convert model to a dataframe and export as CSV, STATA or
+        Parquet using pandas.Dataframe to_csv(), to_stata() or
+        `to_parquet`.
+
+        Returns the filename, row count and elapsed time, or None if
+        there is nothing to export. Runs in a worker process if
+        `max_workers` > 1.
         """
-        filename = None
+        start = time.perf_counter()
+        query_filter = self.get_incremental_query_filter(model)
         try:
             dataframe = ModelToDataframe(
                 model=model,
+                query_filter=query_filter,
                 decrypt=self.decrypt,
                 sites=self.site_ids,
                 drop_sys_columns=False,
@@ -141,52 +307,288 @@ class ModelsToFile:
             if "1142" not in str(e):
                 raise
             sys.stdout.write(f"Skipping. Got {e}\n")
+            return None
+        dataframe, modified, modified_ids = self.get_incremental_rows(dataframe, model)
+        fname = (
+            model.split(".")[-1:][0].upper() if self.use_simple_filename else model
+        ).replace(".", "_")
+        path = None if dataframe.empty else self.dataframe_to_file(dataframe, model, fname)
+        tombstones, deleted_datetime = self.get_tombstones(model)
+        tombstone_path = None
+        if not tombstones.empty:
+            tombstone_path = self.export_folder / self.sub_folder / f"{fname}_deleted.csv"
+            tombstones.to_csv(
+                path_or_buf=tombstone_path,
+                index=False,
+                encoding=self.encoding,
+                sep=self.delimiter,
+                date_format=self.date_format,
+            )
+        if not path and not tombstone_path:
+            return None
+        return ModelExportResult(
+            model=model,
+            filename=path.name if path else None,
+            rows=len(dataframe),
+            seconds=time.perf_counter() - start,
+            tombstone_filename=tombstone_path.name if tombstone_path else None,
+            deleted=len(tombstones),
+            modified=modified,
+            modified_ids=modified_ids,
+            deleted_datetime=deleted_datetime,
+        )
+
+    def dataframe_to_file(self, dataframe: pd.DataFrame, model: str, fname: str) -> Path:
+        """Writes the dataframe in the export format and returns the
+        path.
+        """
+        if self.export_format == CSV:
+            path = self.export_folder / self.sub_folder / f"{fname}.csv"
+            dataframe.to_csv(
+                path_or_buf=path,
+                index=False,
+                encoding=self.encoding,
+                sep=self.delimiter,
+                date_format=self.date_format,
+            )
+        elif self.export_format in [STATA_14, STATA_15]:
+            path = self.export_folder / self.sub_folder / f"{fname}.dta"
+            dataframe = self.make_stata_safe(dataframe)
+            dataframe.to_stata(
+                path,
+                data_label=str(path),
+                version=118,
+                variable_labels=self.stata_variable_labels(dataframe, model=model),
+                write_index=False,
+            )
+        elif self.export_format == PARQUET:
+            path = self.to_parquet(dataframe, model=model, fname=fname)
         else:
-            if not dataframe.empty:
-                self.export_history["model"].append(model)
-                self.export_history["rows"].append(len(dataframe))
-                fname = (
-                    model.split(".")[-1:][0].upper() if self.use_simple_filename else model
-                ).replace(".", "_")
-                if self.export_format == CSV:
-                    path = self.export_folder / self.sub_folder / f"{fname}.csv"
-                    dataframe.to_csv(
-                        path_or_buf=path,
-                        index=False,
-                        encoding=self.encoding,
-                        sep=self.delimiter,
-                        date_format=self.date_format,
-                    )
-                elif self.export_format in [STATA_14, STATA_15]:
-                    path = self.export_folder / self.sub_folder / f"{fname}.dta"
-                    dataframe = self.make_stata_safe(dataframe)
-                    dataframe.to_stata(
-                        path,
-                        data_label=str(path),
-                        version=118,
-                        variable_labels=self.stata_variable_labels(dataframe, model=model),
-                        write_index=False,
-                    )
-                else:
-                    raise ModelsToFileNothingExportedError(
-                        "Invalid file format. Expected CSV or STATA"
-                    )
-                filename = path.name
-            return filename
-        return None
+            raise ModelsToFileNothingExportedError(
+                "Invalid file format. Expected CSV, STATA or PARQUET"
+            )
+        return path
+
+    def get_incremental_query_filter(self, model: str) -> dict:
+        """Returns a query filter for the rows added or changed since
+        the last incremental export.
+
+        Rows are selected with `modified` at or after the last mark.
+        The rows at the mark that were already exported are dropped
+        in `get_incremental_rows`. Models without a `modified` field
+        are always exported in full.
+        """
+        if not self.incremental:
+            return {}
+        try:
+            django_apps.get_model(model)._meta.get_field("modified")
+        except FieldDoesNotExist:
+            return {}
+        if (watermark := self.watermarks.get(model)) and watermark.last_modified:
+            return dict(modified__gte=watermark.last_modified)
+        return {}
+
+    def get_incremental_rows(
+        self, dataframe: pd.DataFrame, model: str
+    ) -> tuple[pd.DataFrame, datetime | None, tuple[str, ...]]:
+        """Returns the dataframe without the rows already exported at
+        the last mark, the new high-water mark, the max `modified` of
+        the rows, and the ids of the rows at the new mark.
+
+        A row at the last mark is dropped only if its id was exported
+        at that mark.
+        """
+        if not self.incremental or dataframe.empty or "modified" not in dataframe.columns:
+            return dataframe, None, ()
+        # `modified` is naive UTC, see `remove_timezone`
+        modified = pd.to_datetime(dataframe["modified"])
+        ids = dataframe["id"].astype(str)
+        mark = modified.max()
+        mark_ids = tuple(sorted(ids[modified == mark]))
+        if (watermark := self.watermarks.get(model)) and watermark.last_modified:
+            last_modified = pd.Timestamp(watermark.last_modified).tz_convert(None)
+            exported = (modified == last_modified) & ids.isin(
+                watermark.last_modified_ids.splitlines()
+            )
+            dataframe = dataframe[~exported]
+        if dataframe.empty:
+            return dataframe, None, ()
+        return dataframe, mark.tz_localize("UTC").to_pydatetime(), mark_ids
+
+    def get_tombstones(self, model: str) -> tuple[pd.DataFrame, datetime | None]:
+        """Returns a dataframe of the ids deleted since the last
+        incremental export and the new high-water mark, the max
+        `history_date` of the deletions.
+
+        Deletions are read from the history table of the model
+        (history_type "-"). Returns an empty dataframe if not
+        incremental, if the model has no history table or if this is
+        the first incremental export of the model.
+        """
+        tombstones = pd.DataFrame(columns=["id", "deleted_datetime"])
+        if not self.incremental:
+            return tombstones, None
+        try:
+            history_model_cls = get_history_model_for_model(django_apps.get_model(model))
+        except NotHistoricalModelError:
+            return tombstones, None
+        queryset = history_model_cls.objects.filter(history_type="-")
+        try:
+            history_model_cls._meta.get_field("site")
+        except FieldDoesNotExist:
+            pass
+        else:
+            queryset = queryset.filter(site_id__in=self.site_ids)
+        deleted_datetime = queryset.aggregate(deleted_datetime=Max("history_date"))[
+            "deleted_datetime"
+        ]
+        watermark = self.watermarks.get(model)
+        if watermark is None or deleted_datetime is None:
+            return tombstones, deleted_datetime
+        queryset = queryset.filter(history_date__lte=deleted_datetime)
+        if watermark.last_deleted:
+            queryset = queryset.filter(history_date__gt=watermark.last_deleted)
+        tombstones = pd.DataFrame.from_records(
+            queryset.order_by("history_date", "id").values_list("id", "history_date"),
+            columns=["id", "deleted_datetime"],
+        )
+        tombstones["id"] = tombstones["id"].astype(str)
+        tombstones["deleted_datetime"] = pd.to_datetime(
+            tombstones["deleted_datetime"], utc=True
+        ).dt.tz_localize(None)
+        return tombstones, deleted_datetime
+
+    @property
+    def watermark_site_ids(self) -> str:
+        """Returns the sorted site ids, comma separated, for the
+        `ExportWatermark` key.
+        """
+        return ",".join(str(site_id) for site_id in sorted(self.site_ids))
+
+    def get_watermarks(self) -> dict[str, ExportWatermark]:
+        """Returns the high-water marks of the last incremental export
+        of each model by this user with this `export_name`, for these
+        sites and this `decrypt` option.
+        """
+        return {
+            obj.model: obj
+            for obj in self.watermark_model_cls.objects.filter(
+                username=self.user.username,
+                export_name=self.export_name,
+                site_ids=self.watermark_site_ids,
+                decrypt=self.decrypt,
+                model__in=self.models,
+            )
+        }
+
+    def update_watermarks(self) -> None:
+        """Saves the high-water marks of the models exported."""
+        for result in self.export_results:
+            watermark = self.watermarks.get(result.model) or self.watermark_model_cls(
+                username=self.user.username,
+                export_name=self.export_name,
+                site_ids=self.watermark_site_ids,
+                decrypt=self.decrypt,
+                model=result.model,
+            )
+            if result.modified:
+                watermark.last_modified = result.modified
+                watermark.last_modified_ids = "\n".join(result.modified_ids)
+            watermark.last_deleted = result.deleted_datetime or watermark.last_deleted
+            watermark.rows = result.rows
+            watermark.deleted = result.deleted
+            watermark.exported_datetime = timezone.now()
+            watermark.save()
+            self.watermarks[result.model] = watermark
+
+    @property
+    def export_format_name(self) -> str:
+        if self.export_format == CSV:
+            return "csv"
+        if self.export_format == PARQUET:
+            return "parquet"
+        return "stata"
+
+    def to_parquet(self, dataframe: pd.DataFrame, model: str, fname: str) -> Path:
+        """Writes the dataframe to Parquet and returns the path.
+
+        The nullable dtypes of the dataframe are kept in the pandas
+        schema metadata and the STATA variable labels are added to
+        each column as field metadata ("label").
+
+        If the dataframe has a `parquet_partition_column` (site_id),
+        writes a hive partitioned folder, one file per site. For
+        example, `fname/site_id=10/fname.parquet`. Otherwise writes
+        `fname.parquet`.
+        """
+        dataframe = self.make_parquet_safe(dataframe)
+        labels = self.stata_variable_labels(dataframe, model=model)
+        folder = self.export_folder / self.sub_folder
+        column = self.parquet_partition_column
+        if column not in dataframe.columns:
+            path = folder / f"{fname}.parquet"
+            pq.write_table(self.to_arrow_table(dataframe, labels), path)
+        else:
+            path = folder / fname
+            for value, df in dataframe.groupby(column, dropna=False, sort=True):
+                partition = "__HIVE_DEFAULT_PARTITION__" if pd.isna(value) else value
+                partition_folder = path / f"{column}={partition}"
+                partition_folder.mkdir(parents=True)
+                pq.write_table(
+                    self.to_arrow_table(df.drop(columns=[column]), labels),
+                    partition_folder / f"{fname}.parquet",
+                )
+        return path
+
+    @staticmethod
+    def to_arrow_table(dataframe: pd.DataFrame, labels: dict[str, str]) -> pa.Table:
+        """Returns an Arrow table with `labels` added as field
+        metadata.
+        """
+        table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        schema = pa.schema(
+            [
+                field.with_metadata({"label": labels[field.name]})
+                if labels.get(field.name)
+                else field
+                for field in table.schema
+            ],
+            metadata=table.schema.metadata,
+        )
+        return table.cast(schema)
+
+    @staticmethod
+    def make_parquet_safe(dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Convert uuid.UUID values (the pk `id` and FK `*_id`
+        columns) to str, as in `make_stata_safe`.
+
+        Arrow would otherwise write these as the `arrow.uuid`
+        extension type which most readers do not support.
+        """
+        for column in dataframe.select_dtypes(include="object").columns:
+            dataframe[column] = dataframe[column].map(
+                lambda v: str(v) if isinstance(v, uuid.UUID) else v
+            )
+        return dataframe
 
     def get_filename_without_ext(self, model_name: str) -> str:
         return (
             model_name.split("_")[-1:][0].upper() if self.use_simple_filename else model_name
         )
 
-    def create_archive_file(self):
-        return shutil.make_archive(
-            str(self.export_folder / self.sub_folder),
-            "zip",
-            root_dir=self.export_folder,
-            base_dir=self.sub_folder,
-        )
+    def create_archive_file(self) -> str:
+        """Returns the path of a zip archive of the sub_folder.
+
+        Members are added in sorted order so that the archive does not
+        depend on the order in which files were written.
+        """
+        folder = self.export_folder / self.sub_folder
+        archive_filename = f"{folder}.zip"
+        with zipfile.ZipFile(archive_filename, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.write(folder, arcname=self.sub_folder)
+            for path in sorted(folder.rglob("*")):
+                zf.write(path, arcname=path.relative_to(self.export_folder))
+        return archive_filename
 
     @staticmethod
     def make_stata_safe(dataframe: pd.DataFrame) -> pd.DataFrame:
@@ -249,3 +651,7 @@ class ModelsToFile:
     @property
     def data_dictionary_model_cls(self) -> type[DataDictionary]:
         return django_apps.get_model("edc_data_manager.datadictionary")
+
+    @property
+    def watermark_model_cls(self) -> type[ExportWatermark]:
+        return django_apps.get_model("edc_export.exportwatermark")
@@ -1,8 +1,11 @@
 from django.core.management import CommandError
-from django.test import SimpleTestCase, tag
+from django.test import RequestFactory, SimpleTestCase, tag
 
+from edc_export.constants import CSV, PARQUET, STATA_14, STATA_15
 from edc_export.utils import (
     get_default_models_for_export,
+    get_export_format_choices,
+    get_export_format_from_post,
     get_model_names_for_export,
 )
 
@@ -101,3 +104,25 @@ class TestGetModelNamesForExport(SimpleTestCase):
             model_names=["edc_export.datarequest", "edc_export.datarequest"],
         )
         self.assertEqual(result.count("edc_export.datarequest"), 1)
+
+
+@tag("export")
+class TestGetExportFormat(SimpleTestCase):
+    def test_choices_exportable(self):
+        self.assertEqual(
+            [fmt for fmt, _ in get_export_format_choices()],
+            [CSV, STATA_14, STATA_15, PARQUET],
+        )
+
+    def test_export_format_from_post(self):
+        for value, export_format in [
+            ("PARQUET", PARQUET),
+            ("118", STATA_14),
+            ("CSV", CSV),
+            ("117", CSV),
+            ("blah", CSV),
+        ]:
+            with self.subTest(value=value):
+                request = RequestFactory().post("/", data={"export_format": value})
+                self.assertEqual(get_export_format_from_post(request), export_format)
+        self.assertEqual(get_export_format_from_post(RequestFactory().post("/")), CSV)
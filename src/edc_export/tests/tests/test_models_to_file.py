@@ -1,16 +1,21 @@
 import shutil
+import zipfile
 from datetime import date
 from pathlib import Path
 from tempfile import mkdtemp
+from unittest.mock import patch
 
 import pandas as pd
+import pyarrow.parquet as pq
 from clinicedc_tests.sites import all_sites
 from clinicedc_tests.utils import get_user_for_tests
 from django.contrib.sites.models import Site
-from django.test import TestCase
+from django.db.models import Max
+from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings, tag
 
-from edc_export.constants import CSV, STATA_14
+from edc_export.constants import CSV, PARQUET, STATA_14
+from edc_export.models import ExportWatermark
 from edc_export.models_to_file import ModelsToFile, ModelsToFileNothingExportedError
 from edc_facility.import_holidays import import_holidays
 from edc_registration.models import RegisteredSubject
@@ -89,6 +94,155 @@ class TestArchiveExporter(TestCase):
         self.assertIn("dob", df.columns)
         self.assertEqual(pd.Timestamp(df["dob"].iloc[0]).date(), date(1990, 6, 15))
 
+    def test_request_archive_parquet(self):
+        exporter = ModelsToFile(
+            models=self.models,
+            user=self.user,
+            archive_to_single_file=True,
+            export_format=PARQUET,
+        )
+        folder = Path(mkdtemp())
+        shutil.unpack_archive(exporter.archive_filename, folder, "zip")
+        sub_folder = folder / exporter.sub_folder
+        # no site column, single file
+        self.assertTrue((sub_folder / "auth_user.parquet").exists())
+        # partitioned by site
+        path = sub_folder / "edc_registration_registeredsubject"
+        self.assertEqual(
+            [p.name for p in path.iterdir()], [f"site_id={Site.objects.get_current().id}"]
+        )
+        df = pd.read_parquet(path)
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df["subject_identifier"].dtype, pd.StringDtype())
+        self.assertIsInstance(df["id"].iloc[0], str)
+        self.assertEqual(pd.Timestamp(df["dob"].iloc[0]).date(), date(1990, 6, 15))
+        self.assertEqual(int(df["site_id"].iloc[0]), Site.objects.get_current().id)
+        # stata variable labels as column metadata
+        schema = pq.read_schema(next(path.rglob("*.parquet")))
+        self.assertEqual(schema.field("id").metadata, {b"label": b"primary key"})
+
+    def test_parallel_export_in_transaction_exports_serially(self):
+        with patch("edc_export.models_to_file.ProcessPoolExecutor") as executor:
+            exporter = ModelsToFile(
+                models=self.models,
+                user=self.user,
+                archive_to_single_file=True,
+                export_format=CSV,
+                max_workers=2,
+            )
+        executor.assert_not_called()
+        self.assertEqual([r.model for r in exporter.export_results], self.models)
+
+    def test_incremental_export(self):
+        model = "edc_registration.registeredsubject"
+        opts = dict(
+            models=[model],
+            user=self.user,
+            export_format=CSV,
+            incremental=True,
+            export_name="nightly",
+        )
+        # first export is a full export
+        exporter = ModelsToFile(**opts)
+        self.assertEqual(
+            exporter.exported_filenames, ["edc_registration_registeredsubject.csv"]
+        )
+        watermark = ExportWatermark.objects.get(
+            username=self.user.username, export_name="nightly", model=model
+        )
+        registered_subject = RegisteredSubject.objects.get(subject_identifier="12345")
+        self.assertEqual(
+            watermark.last_modified,
+            RegisteredSubject.objects.aggregate(modified=Max("modified"))["modified"],
+        )
+        self.assertEqual(watermark.rows, 1)
+
+        # nothing changed
+        self.assertRaises(ModelsToFileNothingExportedError, ModelsToFile, **opts)
+
+        # only the new row
+        RegisteredSubject.objects.create(subject_identifier="67890")
+        exporter = ModelsToFile(**opts)
+        self.assertEqual(exporter.export_results[0].rows, 1)
+        df = pd.read_csv(
+            exporter.export_folder / exporter.sub_folder / exporter.exported_filenames[0],
+            sep="|",
+        )
+        self.assertEqual(list(df["subject_identifier"]), [67890])
+
+        # changed row and tombstone for the deleted row
+        registered_subject.save()
+        deleted_id = RegisteredSubject.objects.get(subject_identifier="67890").id
+        RegisteredSubject.objects.get(subject_identifier="67890").delete()
+        exporter = ModelsToFile(**opts)
+        self.assertEqual(
+            exporter.exported_filenames,
+            [
+                "edc_registration_registeredsubject.csv",
+                "edc_registration_registeredsubject_deleted.csv",
+            ],
+        )
+        result = exporter.export_results[0]
+        self.assertEqual((result.rows, result.deleted), (1, 1))
+        df = pd.read_csv(
+            exporter.export_folder / exporter.sub_folder / result.tombstone_filename, sep="|"
+        )
+        self.assertEqual(list(df["id"]), [str(deleted_id)])
+        watermark.refresh_from_db()
+        self.assertEqual(watermark.deleted, 1)
+        self.assertIsNotNone(watermark.last_deleted)
+
+        # watermarks are per export name
+        exporter = ModelsToFile(**(opts | dict(export_name="weekly")))
+        self.assertEqual(exporter.export_results[0].rows, 1)
+        self.assertEqual(exporter.export_results[0].deleted, 0)
+
+    def test_incremental_export_includes_rows_at_mark(self):
+        """Assert a row committed with the `modified` of the last mark
+        after the last export is exported and the rows exported at the
+        mark are not exported again.
+        """
+        model = "edc_registration.registeredsubject"
+        opts = dict(models=[model], user=self.user, export_format=CSV, incremental=True)
+        ModelsToFile(**opts)
+        watermark = ExportWatermark.objects.get(model=model)
+        self.assertEqual(
+            watermark.last_modified_ids.splitlines(),
+            [str(RegisteredSubject.objects.get(subject_identifier="12345").id)],
+        )
+        RegisteredSubject.objects.create(subject_identifier="67890")
+        RegisteredSubject.objects.filter(subject_identifier="67890").update(
+            modified=watermark.last_modified
+        )
+        exporter = ModelsToFile(**opts)
+        df = pd.read_csv(
+            exporter.export_folder / exporter.sub_folder / exporter.exported_filenames[0],
+            sep="|",
+        )
+        self.assertEqual(list(df["subject_identifier"]), [67890])
+        watermark.refresh_from_db()
+        self.assertEqual(len(watermark.last_modified_ids.splitlines()), 2)
+        self.assertRaises(ModelsToFileNothingExportedError, ModelsToFile, **opts)
+
+    def test_incremental_export_watermark_per_sites_and_decrypt(self):
+        model = "edc_registration.registeredsubject"
+        opts = dict(models=[model], user=self.user, export_format=CSV, incremental=True)
+        ModelsToFile(**opts, site_ids=[10])
+        self.assertRaises(ModelsToFileNothingExportedError, ModelsToFile, **opts)
+        exporter = ModelsToFile(**opts, decrypt=True)
+        self.assertEqual(exporter.export_results[0].rows, 1)
+        self.assertEqual(
+            sorted(ExportWatermark.objects.values_list("site_ids", "decrypt")),
+            [("10", False), ("10", True)],
+        )
+
+    def test_incremental_export_without_modified_field(self):
+        opts = dict(models=["auth.user"], user=self.user, export_format=CSV, incremental=True)
+        ModelsToFile(**opts)
+        exporter = ModelsToFile(**opts)
+        self.assertEqual(exporter.exported_filenames, ["auth_user.csv"])
+        self.assertIsNone(exporter.export_results[0].modified)
+
     def test_requested_with_invalid_table(self):
         models = ["auth.blah", "edc_registration.registeredsubject"]
         self.assertRaises(
@@ -109,3 +263,65 @@ class TestArchiveExporter(TestCase):
             archive_to_single_file=True,
             export_format=CSV,
         )
+
+
+@tag("export")
+@override_settings(
+    EDC_EXPORT_EXPORT_FOLDER=mkdtemp(), EDC_EXPORT_UPLOAD_FOLDER=mkdtemp(), SITE_ID=10
+)
+class TestArchiveExporterParallel(TransactionTestCase):
+    """Exports in a process pool, outside of a transaction, so that
+    worker processes read committed rows.
+    """
+
+    def setUp(self):
+        import_holidays()
+        site_sites._registry = {}
+        site_sites.loaded = False
+        site_sites.register(*all_sites)
+        add_or_update_django_sites()
+        self.user = get_user_for_tests(username="erikvw")
+        RegisteredSubject.objects.create(subject_identifier="12345", dob=date(1990, 6, 15))
+        self.models = ["auth.user", "edc_registration.registeredsubject"]
+
+    def test_request_archive_parallel(self):
+        exporter = ModelsToFile(
+            models=self.models,
+            user=self.user,
+            archive_to_single_file=True,
+            export_format=CSV,
+            max_workers=2,
+        )
+        self.assertEqual(exporter.max_workers, 2)
+        # in the order of models, not the order completed
+        self.assertEqual([r.model for r in exporter.export_results], self.models)
+        self.assertEqual(
+            exporter.exported_filenames,
+            ["auth_user.csv", "edc_registration_registeredsubject.csv"],
+        )
+        self.assertEqual(exporter.export_results[1].rows, 1)
+        with zipfile.ZipFile(exporter.archive_filename) as zf:
+            names = zf.namelist()
+            self.assertEqual(names, sorted(names))
+            self.assertIn(f"{exporter.sub_folder}/auth_user.csv", names)
+            readme = zf.read(f"{exporter.sub_folder}/README.txt").decode()
+        self.assertIn("seconds", readme)
+        self.assertIn("edc_registration_registeredsubject.csv", readme)
+        df = pd.read_csv(
+            exporter.export_folder
+            / exporter.sub_folder
+            / "edc_registration_registeredsubject.csv",
+            sep="|",
+        )
+        self.assertEqual(df["subject_identifier"].iloc[0], 12345)
+
+    def test_parallel_export_raises_for_invalid_table(self):
+        self.assertRaises(
+            LookupError,
+            ModelsToFile,
+            models=["auth.blah", "edc_registration.registeredsubject"],
+            user=self.user,
+            archive_to_single_file=True,
+            export_format=CSV,
+            max_workers=2,
+        )
@@ -19,7 +19,8 @@ from django.utils.html import format_html
 from edc_protocol.research_protocol_config import ResearchProtocolConfig
 from edc_sites.site import sites as site_sites
 
-from .constants import EXPORT, EXPORT_PII
+from .choices import EXPORT_FORMATS
+from .constants import CSV, EXPORT, EXPORT_PII
 from .exceptions import ExporterExportFolder
 from .files_emailer import FilesEmailer, FilesEmailerError
 from .models_to_file import ModelsToFile
@@ -82,6 +83,24 @@ def raise_if_prohibited_from_export_pii_group(username: str, groups: Iterable) -
         )
 
 
+def get_export_format_choices() -> list[tuple[str | int, str]]:
+    """Returns the `EXPORT_FORMATS` choices that `ModelsToFile` can
+    export.
+    """
+    return [
+        (fmt, label) for fmt, label in EXPORT_FORMATS if fmt in ModelsToFile.export_formats
+    ]
+
+
+def get_export_format_from_post(request) -> str | int:
+    """Returns the export format selected in the POST or CSV."""
+    value = request.POST.get("export_format")
+    for fmt, _ in get_export_format_choices():
+        if str(fmt) == value:
+            return fmt
+    return CSV
+
+
 def email_files_to_user(request, models_to_file: ModelsToFile) -> None:
     try:
         FilesEmailer(
@@ -109,6 +128,7 @@ def update_data_request_history(request, models_to_file: ModelsToFile):
     data_request_history_model_cls = django_apps.get_model("edc_export.datarequesthistory")
     data_request = data_request_model_cls.objects.create(
         name=f"Data request {timezone.now().strftime('%Y%m%d%H%M')}",
+        export_format=str(models_to_file.export_format),
         models="\n".join(models_to_file.models),
         user_created=request.user.username,
         site=request.site,
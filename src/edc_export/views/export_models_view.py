@@ -8,6 +8,7 @@ from edc_dashboard.view_mixins import EdcViewMixin
 from edc_navbar import NavbarViewMixin
 
 from ..exportable_models_for_user import ExportableModelsForUser
+from ..utils import get_export_format_choices
 
 
 class ExportModelsView(EdcViewMixin, NavbarViewMixin, TemplateView):
@@ -24,5 +25,8 @@ class ExportModelsView(EdcViewMixin, NavbarViewMixin, TemplateView):
             else:
                 messages.info(self.request, "Nothing has been exported.")
         user = User.objects.get(username=self.request.user)
-        kwargs.update(exportables=ExportableModelsForUser(request=self.request, user=user))
+        kwargs.update(
+            exportables=ExportableModelsForUser(request=self.request, user=user),
+            export_formats=get_export_format_choices(),
+        )
         return super().get_context_data(**kwargs)
@@ -14,12 +14,16 @@ from django.views.generic.base import TemplateView
 
 from edc_dashboard.view_mixins import EdcViewMixin
 
-from ..constants import CSV
 from ..exportable_models_for_user import ExportableModelsForUser
 from ..files_emailer import FilesEmailerError
 from ..model_options import ModelOptions
 from ..models_to_file import ModelsToFile, ModelsToFileNothingExportedError
-from ..utils import email_files_to_user, update_data_request_history
+from ..utils import (
+    email_files_to_user,
+    get_export_format_choices,
+    get_export_format_from_post,
+    update_data_request_history,
+)
 
 if TYPE_CHECKING:
     from django.core.handlers.wsgi import WSGIRequest
@@ -40,6 +44,7 @@ class ExportSelectedModelsView(EdcViewMixin, TemplateView):
                     ModelOptions(**dct) for dct in self.request.session["selected_models"]
                 ]
             )
+        kwargs.update(export_formats=get_export_format_choices())
         return super().get_context_data(**kwargs)
 
     def post(self, request: WSGIRequest, *args, **kwargs) -> HttpResponseRedirect:  # noqa: ARG002
@@ -73,7 +78,7 @@ class ExportSelectedModelsView(EdcViewMixin, TemplateView):
                         models=selected_models,
                         user=request.user,
                         archive_to_single_file=True,
-                        export_format=CSV,
+                        export_format=get_export_format_from_post(request),
                     )
                 except ModelsToFileNothingExportedError as e:
                     messages.warning(request, f"Nothing to do. {e}.")
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from edc_appointment.constants import CANCELLED_APPT, SKIPPED_APPT
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class BookedSlots:
+    """An index of the number of appointments booked per local date
+    for a facility and, if given, a site.
+
+    Counts are selected for a range of dates with one aggregate
+    query (see `load`) and cached. Dates not yet loaded are selected
+    on first access. Use `reserve` and `release` to keep the index
+    current while allocating several appointments, for example
+    all appointments of a schedule.
+
+    Appointments with an `appt_status` in `excluded_appt_statuses`
+    (cancelled, skipped) do not take a slot.
+
+    For example:
+
+        booked_slots = BookedSlots(facility_name="5-day-clinic", site_id=10)
+        booked_slots.load(date(2025, 1, 1), date(2025, 12, 31))
+        booked_slots.count(date(2025, 3, 3))
+        12
+    """
+
+    appointment_model: str = "edc_appointment.appointment"
+    excluded_appt_statuses: tuple[str, ...] = (CANCELLED_APPT, SKIPPED_APPT)
+
+    def __init__(self, facility_name: str, site_id: int | None = None) -> None:
+        self.facility_name = facility_name
+        self.site_id = site_id
+        self.counts: dict[date, int] = {}
+        self.loaded_dates: set[date] = set()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(facility_name={self.facility_name}, "
+            f"site_id={self.site_id})"
+        )
+
+    def count(self, local_date: date) -> int:
+        """Returns the number of appointments booked on the local
+        date.
+        """
+        if local_date not in self.loaded_dates:
+            self.load(local_date, local_date)
+        return self.counts.get(local_date, 0)
+
+    def load(self, min_date: date, max_date: date) -> None:
+        """Selects the counts per local date from `min_date` to
+        `max_date`, inclusive, not already loaded.
+        """
+        dates = {min_date + timedelta(days=n) for n in range((max_date - min_date).days + 1)}
+        missing = dates - self.loaded_dates
+        if not missing:
+            return
+        for row in self.get_queryset(min(missing), max(missing)):
+            if row["local_date"] in missing:
+                self.counts[row["local_date"]] = row["booked"]
+        self.loaded_dates.update(missing)
+
+    def get_queryset(self, min_date: date, max_date: date) -> QuerySet:
+        tzinfo = ZoneInfo(settings.TIME_ZONE)
+        queryset = (
+            django_apps.get_model(self.appointment_model)
+            .objects.filter(
+                facility_name=self.facility_name,
+                appt_datetime__gte=datetime.combine(min_date, time.min, tzinfo=tzinfo),
+                appt_datetime__lt=datetime.combine(
+                    max_date + timedelta(days=1), time.min, tzinfo=tzinfo
+                ),
+            )
+            .exclude(appt_status__in=self.excluded_appt_statuses)
+        )
+        if self.site_id:
+            queryset = queryset.filter(site_id=self.site_id)
+        return (
+            queryset.annotate(local_date=TruncDate("appt_datetime", tzinfo=tzinfo))
+            .values("local_date")
+            .annotate(booked=Count("id"))
+            .order_by("local_date")
+        )
+
+    def reserve(self, local_date: date) -> None:
+        """Adds an appointment to the local date."""
+        self.counts[local_date] = self.count(local_date) + 1
+
+    def release(self, local_date: date) -> None:
+        """Removes an appointment from the local date."""
+        self.counts[local_date] = max(0, self.count(local_date) - 1)
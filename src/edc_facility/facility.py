@@ -13,11 +13,12 @@ from django.utils import timezone
 
 from edc_utils.text import convert_php_dateformat
 
+from .booked_slots import BookedSlots
 from .exceptions import FacilityError
 from .holidays import Holidays
 
 if TYPE_CHECKING:
-    pass
+    from django.contrib.sites.models import Site
 
 
 class Facility:
@@ -28,9 +29,21 @@ class Facility:
         lead to a protocol violation but may be helpful for facilities
         open 1 or 2 days per week, where the visit has a very
         narrow window period (forward_delta, reverse_delta).
+
+    Note: `slots` is the maximum number of appointments per day, in
+        the order of `days`. A day is not available if its slots are
+        taken, see `open_slot_on` and `BookedSlots`. If not set, the
+        number of appointments per day is not limited and booked
+        appointments are not counted.
+
+    Note: `load_balance` (Default: False) if True, selects the day
+        with the lowest proportion of slots taken within the window
+        period instead of the open day closest to the suggested
+        datetime. Ties go to the day closest to the suggested datetime.
     """
 
     holiday_cls = Holidays
+    booked_slots_cls = BookedSlots
 
     def __init__(
         self,
@@ -38,6 +51,7 @@ class Facility:
         days: list[weekday] | None = None,
         slots: list[int] | None = None,
         best_effort_available_datetime: datetime | None = None,
+        load_balance: bool | None = None,
     ):
         self.days = days
         self.name = name
@@ -46,7 +60,9 @@ class Facility:
         self.best_effort_available_datetime = (
             True if best_effort_available_datetime is None else best_effort_available_datetime
         )
+        self.load_balance = load_balance or False
         self.weekdays = [d.weekday for d in self.days]
+        self.slots_limited = bool(slots)
         self.slots = slots or [99999 for _ in self.days]
         self.config = dict(zip([str(d) for d in self.days], self.slots, strict=False))
         self.holidays = self.holiday_cls()
@@ -60,21 +76,41 @@ class Facility:
         )
         return f"{self.name.title()} {description}"
 
-    def slots_per_day(self, day) -> int:
-        try:
-            slots_per_day = self.config.get(str(day))
-        except KeyError:
-            slots_per_day = 0
-        return slots_per_day
+    def slots_per_day(self, day: weekday | int) -> int:
+        """Returns the number of slots for a weekday (e.g. MO or 0)
+        or 0 if the facility is closed.
+        """
+        return self.config.get(str(weekday(day) if isinstance(day, int) else day), 0)
 
-    @staticmethod
-    def open_slot_on(arr) -> Arrow:
-        """Hook for handling load balance by day.
+    def open_slot_on(
+        self, arr: Arrow, booked_slots: BookedSlots | None = None
+    ) -> Arrow | None:
+        """Returns arr if a slot is available on the day, otherwise
+        None.
 
         For example, if 15 appointment `slots` are filled out of 30
-        allowed for Monday, return arw, if 30/30 return None.
+        allowed for Monday, return arr, if 30/30 return None.
+        """
+        if booked_slots is None or booked_slots.count(arr.date()) < self.slots_per_day(
+            arr.date().weekday()
+        ):
+            return arr
+        return None
+
+    @property
+    def counts_booked_slots(self) -> bool:
+        """Returns True if booked appointments are counted to select
+        an available day.
+        """
+        return self.slots_limited or self.load_balance
+
+    def get_booked_slots(self, site: Site | None = None) -> BookedSlots:
+        """Returns an index of appointments booked per day for this
+        facility and site.
         """
-        return arr
+        return self.booked_slots_cls(
+            facility_name=self.name, site_id=site.id if site else None
+        )
 
     def is_holiday(self, dte: datetime) -> bool:
         return self.holidays.is_holiday(dte=dte)
@@ -126,6 +162,9 @@ class Facility:
         reverse_delta=None,
         taken_datetimes=None,
         schedule_on_holidays=None,
+        *,
+        booked_slots: BookedSlots | None = None,
+        site: Site | None = None,
         **kwargs,  # noqa: ARG002
     ):
         """Returns an arrow object for a datetime equal to or
@@ -133,14 +172,21 @@ class Facility:
 
         To exclude datetimes other than holidays, pass a list of
         datetimes to `taken_datetimes`.
+
+        Days with no open slot are excluded. Pass `booked_slots` to
+        share one index of booked appointments across calls, for
+        example when allocating all appointments of a subject, and
+        reserve each day allocated. Otherwise, the index is selected
+        for the facility and `site`. Booked appointments are not
+        counted if `slots` is not set and not `load_balance`.
         """
         available_arr = None
         forward_delta = forward_delta or relativedelta(months=1)
         reverse_delta = reverse_delta or relativedelta(months=0)
-        taken_arr = [
-            arrow.Arrow.fromdatetime(dt, tzinfo=ZoneInfo(settings.TIME_ZONE))
+        taken_dates = {
+            arrow.Arrow.fromdatetime(dt, tzinfo=ZoneInfo(settings.TIME_ZONE)).date()
             for dt in taken_datetimes or []
-        ]
+        }
         if suggested_datetime:
             suggested_arr = arrow.Arrow.fromdatetime(suggested_datetime)
         else:
@@ -150,19 +196,30 @@ class Facility:
             forward_delta,
             reverse_delta,
         )
-        for arr in arr_span_range:
-            # add back time to arrow object, r
-            if arr.date().weekday() in self.weekdays and (
-                min_arr.date() <= arr.date() < max_arr.date()
-            ):
-                is_holiday = False if schedule_on_holidays else self.is_holiday(arr.datetime)
-                if (
-                    not is_holiday
-                    and arr.date() not in [a.date() for a in taken_arr]
-                    and self.open_slot_on(arr)
-                ):
-                    available_arr = arr
-                    break
+        if not self.counts_booked_slots:
+            booked_slots = None
+        else:
+            if booked_slots is None:
+                booked_slots = self.get_booked_slots(site)
+            booked_slots.load(min_arr.date(), max_arr.date())
+        open_arrs = [
+            arr
+            for arr in arr_span_range
+            if arr.date().weekday() in self.weekdays
+            and (min_arr.date() <= arr.date() < max_arr.date())
+            and (schedule_on_holidays or not self.is_holiday(arr.datetime))
+            and arr.date() not in taken_dates
+            and self.open_slot_on(arr, booked_slots)
+        ]
+        if open_arrs and self.load_balance:
+            available_arr = min(
+                open_arrs,
+                key=lambda arr: (
+                    booked_slots.count(arr.date()) / self.slots_per_day(arr.date().weekday())
+                ),
+            )
+        elif open_arrs:
+            available_arr = open_arrs[0]
         if not available_arr:
             if self.best_effort_available_datetime:
                 available_arr = suggested_arr
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from django.apps import apps as django_apps
+
+
+class HolidayCalendar:
+    """A process-wide, in-memory calendar of holidays by country.
+
+    The `local_date` of each Holiday model instance for a country
+    is loaded once, on first access, into one bitmap (int) per year
+    where bit `n` is set if day-of-year `n + 1` is a holiday.
+    Lookups do not touch the database.
+
+    The calendar is invalidated when a Holiday model instance is
+    saved or deleted, once the transaction is committed (see
+    signals), and by `import_holidays`. Other
+    processes are not notified; their calendar is refreshed on
+    their next save, delete or import or when restarted.
+
+    For example:
+
+        holiday_calendar.is_holiday("botswana", date(2017, 9, 30))
+        True
+        holiday_calendar.next_open_day(
+            "botswana", date(2017, 9, 30), weekdays=[MO.weekday, TU.weekday]
+        )
+        date(2017, 10, 3)
+    """
+
+    model: str = "edc_facility.holiday"
+
+    def __init__(self) -> None:
+        self._bitmaps: dict[str, dict[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(countries={sorted(self._bitmaps)})"
+
+    def __contains__(self, country: str) -> bool:
+        return country in self._bitmaps
+
+    def get_bitmaps(self, country: str) -> dict[int, int]:
+        """Returns the bitmaps for a country by year, loading the
+        country on first access.
+        """
+        try:
+            return self._bitmaps[country]
+        except KeyError:
+            with self._lock:
+                if country not in self._bitmaps:
+                    self._bitmaps[country] = self.to_bitmaps(
+                        django_apps.get_model(self.model)
+                        .objects.filter(country=country)
+                        .values_list("local_date", flat=True)
+                    )
+            return self._bitmaps[country]
+
+    @staticmethod
+    def to_bitmaps(local_dates: Iterable[date]) -> dict[int, int]:
+        bitmaps: dict[int, int] = {}
+        for local_date in local_dates:
+            bitmaps[local_date.year] = bitmaps.get(local_date.year, 0) | (
+                1 << (local_date.timetuple().tm_yday - 1)
+            )
+        return bitmaps
+
+    def is_holiday(self, country: str, local_date: date) -> bool:
+        """Returns True if the local date is a holiday in the
+        country.
+        """
+        bitmap = self.get_bitmaps(country).get(local_date.year, 0)
+        return bool(bitmap >> (local_date.timetuple().tm_yday - 1) & 1)
+
+    def next_open_day(
+        self,
+        country: str,
+        local_date: date,
+        weekdays: Iterable[int] | None = None,
+        max_date: date | None = None,
+    ) -> date | None:
+        """Returns the first date on or after `local_date` that is not
+        a holiday and, if given, falls on one of `weekdays` (0=Monday),
+        or None if there is none up to and including `max_date`.
+
+        If `max_date` is None, searches up to one year ahead.
+        """
+        weekdays = set(range(7) if weekdays is None else weekdays)
+        if not weekdays:
+            return None
+        max_date = max_date or local_date + timedelta(days=366)
+        while local_date <= max_date:
+            if local_date.weekday() in weekdays and not self.is_holiday(country, local_date):
+                return local_date
+            local_date += timedelta(days=1)
+        return None
+
+    def invalidate(self, country: str | None = None) -> None:
+        """Removes a country, or all countries, from the calendar.
+
+        Reloaded from the database on next access.
+        """
+        with self._lock:
+            if country is None:
+                self._bitmaps = {}
+            else:
+                self._bitmaps.pop(country, None)
+
+
+holiday_calendar = HolidayCalendar()
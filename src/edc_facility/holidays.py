@@ -14,20 +14,30 @@ from edc_sites.utils import get_site_model_cls
 from edc_utils.date import to_local
 
 from .exceptions import FacilityCountryError, FacilitySiteError, HolidayError
+from .holiday_calendar import holiday_calendar
 from .holidays_disabled import holidays_disabled
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from django.contrib.sites.models import Site
 
+    from .holiday_calendar import HolidayCalendar
+
 
 class Holidays:
     """A class used by Facility to get holidays for the
     country of facility.
+
+    `is_holiday` and `next_open_day` are answered from the
+    process-wide `holiday_calendar` without querying the database.
     """
 
     model: str = "edc_facility.holiday"
+    calendar: HolidayCalendar = holiday_calendar
 
     def __init__(self, site: Site = None) -> None:
+        self._country: str | None = None
         self._holidays = None
         self.model_cls = django_apps.get_model(self.model)
         self._site: Site | None = site
@@ -69,10 +79,12 @@ class Holidays:
 
         Requires SiteProfile from edc_sites to be updated.
         """
-        country = site_sites.get(self.site.id).country
-        if not country:
-            raise FacilityCountryError("Unable to determine country.")
-        return country
+        if not self._country:
+            country = site_sites.get(self.site.id).country
+            if not country:
+                raise FacilityCountryError("Unable to determine country.")
+            self._country = country
+        return self._country
 
     @property
     def holidays(self) -> QuerySet:
@@ -87,9 +99,19 @@ class Holidays:
 
     def is_holiday(self, dte=None) -> bool:
         """Returns True if the datetime is a holiday."""
-        local_date = to_local(dte).date()
-        try:
-            self.model_cls.objects.get(country=self.country, local_date=local_date)
-        except ObjectDoesNotExist:
-            return False
-        return True
+        return self.calendar.is_holiday(self.country, to_local(dte).date())
+
+    def next_open_day(
+        self,
+        dte=None,
+        weekdays: Iterable[int] | None = None,
+        max_date: date | None = None,
+    ) -> date | None:
+        """Returns the first local date on or after the datetime that
+        is not a holiday and falls on one of `weekdays`.
+
+        See `HolidayCalendar.next_open_day`.
+        """
+        return self.calendar.next_open_day(
+            self.country, to_local(dte).date(), weekdays=weekdays, max_date=max_date
+        )
@@ -15,6 +15,7 @@ from tqdm import tqdm
 from edc_sites.site import sites
 
 from .exceptions import HolidayFileNotFoundError, HolidayImportError
+from .holiday_calendar import holiday_calendar
 from .utils import get_holiday_model_cls
 
 if TYPE_CHECKING:
@@ -50,6 +51,7 @@ def import_holidays(verbose: bool | None = None, test: bool | None = None) -> No
 
         if verbose:
             sys.stdout.write("Done.\n")
+    holiday_calendar.invalidate()
 
 
 def check_for_duplicates_in_file(path: Path) -> list:
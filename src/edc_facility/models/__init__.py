@@ -1,3 +1,8 @@
 from .health_facility import HealthFacility
 from .holiday import Holiday
 from .list_models import HealthFacilityTypes
+from .signals import (
+    get_holiday_country_on_pre_save,
+    invalidate_holiday_calendar_on_post_delete,
+    invalidate_holiday_calendar_on_post_save,
+)
@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ..holiday_calendar import holiday_calendar
+from .holiday import Holiday
+
+
+@receiver(pre_save, sender=Holiday, dispatch_uid="get_holiday_country_on_pre_save")
+def get_holiday_country_on_pre_save(sender, instance, raw, **kwargs):
+    """Stores the country of the holiday before it is saved so
+    the previous country can be invalidated if changed.
+    """
+    instance._previous_country = None
+    if not raw and instance.pk:
+        instance._previous_country = (
+            sender.objects.filter(pk=instance.pk).values_list("country", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Holiday, dispatch_uid="invalidate_holiday_calendar_on_post_save")
+def invalidate_holiday_calendar_on_post_save(sender, instance, using, **kwargs):
+    """Removes the country of the holiday, and the previous
+    country if changed, from the in-memory holiday calendar once
+    the transaction is committed.
+    """
+    transaction.on_commit(partial(holiday_calendar.invalidate, instance.country), using=using)
+    previous_country = getattr(instance, "_previous_country", None)
+    if previous_country and previous_country != instance.country:
+        transaction.on_commit(
+            partial(holiday_calendar.invalidate, previous_country), using=using
+        )
+
+
+@receiver(
+    post_delete, sender=Holiday, dispatch_uid="invalidate_holiday_calendar_on_post_delete"
+)
+def invalidate_holiday_calendar_on_post_delete(sender, instance, using, **kwargs):
+    """Removes the country of the holiday from the in-memory
+    holiday calendar once the transaction is committed.
+    """
+    transaction.on_commit(partial(holiday_calendar.invalidate, instance.country), using=using)
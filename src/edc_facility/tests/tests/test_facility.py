@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 from clinicedc_tests.mixins import SiteTestCaseMixin
@@ -8,6 +8,7 @@ from django.test import TestCase
 from django.test.utils import override_settings, tag
 from django.utils import timezone
 
+from edc_facility.booked_slots import BookedSlots
 from edc_facility.facility import Facility
 from edc_facility.import_holidays import import_holidays
 from edc_facility.models import Holiday
@@ -111,3 +112,70 @@ class TestFacility(SiteTestCaseMixin, TestCase):
         )
         available_arr = facility.available_arr(suggested_date)
         self.assertEqual(expected_date, available_arr.datetime)
+
+    def test_slots_per_day(self):
+        facility = Facility(name="clinic", days=[MO, WE], slots=[10, 20])
+        self.assertEqual(facility.slots_per_day(MO), 10)
+        self.assertEqual(facility.slots_per_day(WE.weekday), 20)
+        self.assertEqual(facility.slots_per_day(TU), 0)
+
+    def test_available_arr_skips_full_day(self):
+        facility = Facility(name="clinic", days=[MO, TU, WE, TH, FR], slots=[2, 2, 2, 2, 2])
+        suggested_datetime = datetime(2017, 3, 6, 8, tzinfo=ZoneInfo("UTC"))  # MO
+        booked_slots = BookedSlots(facility_name="clinic")
+        with self.assertNumQueries(1):
+            booked_slots.load(date(2017, 3, 1), date(2017, 4, 30))
+            booked_slots.reserve(suggested_datetime.date())
+            available_arr = facility.available_arr(
+                suggested_datetime, schedule_on_holidays=True, booked_slots=booked_slots
+            )
+        self.assertEqual(available_arr.date(), suggested_datetime.date())
+        booked_slots.reserve(suggested_datetime.date())
+        available_arr = facility.available_arr(
+            suggested_datetime, schedule_on_holidays=True, booked_slots=booked_slots
+        )
+        self.assertEqual(available_arr.date(), date(2017, 3, 7))
+
+    def test_available_arr_load_balance(self):
+        suggested_datetime = datetime(2017, 3, 6, 8, tzinfo=ZoneInfo("UTC"))  # MO
+        booked_slots = BookedSlots(facility_name="clinic")
+        for local_date, booked in [
+            (date(2017, 3, 6), 5),
+            (date(2017, 3, 7), 4),
+            (date(2017, 3, 8), 1),
+            (date(2017, 3, 9), 1),
+        ]:
+            for _ in range(booked):
+                booked_slots.reserve(local_date)
+        opts = dict(
+            suggested_datetime=suggested_datetime,
+            forward_delta=relativedelta(days=4),
+            schedule_on_holidays=True,
+            booked_slots=booked_slots,
+        )
+        # closest day with an open slot
+        facility = Facility(name="clinic", days=[MO, TU, WE, TH, FR], slots=[10] * 5)
+        self.assertEqual(facility.available_arr(**opts).date(), date(2017, 3, 6))
+        # least booked day, closest if tied
+        facility = Facility(
+            name="clinic", days=[MO, TU, WE, TH, FR], slots=[10] * 5, load_balance=True
+        )
+        self.assertEqual(facility.available_arr(**opts).date(), date(2017, 3, 8))
+
+    def test_booked_slots_release(self):
+        booked_slots = BookedSlots(facility_name="clinic")
+        booked_slots.reserve(date(2017, 3, 6))
+        self.assertEqual(booked_slots.count(date(2017, 3, 6)), 1)
+        booked_slots.release(date(2017, 3, 6))
+        booked_slots.release(date(2017, 3, 6))
+        self.assertEqual(booked_slots.count(date(2017, 3, 6)), 0)
+
+    def test_available_arr_without_slots_does_not_count(self):
+        facility = Facility(name="clinic", days=[MO, TU, WE, TH, FR])
+        self.assertFalse(facility.counts_booked_slots)
+        suggested_datetime = datetime(2017, 3, 6, 8, tzinfo=ZoneInfo("UTC"))  # MO
+        with self.assertNumQueries(0):
+            available_arr = facility.available_arr(
+                suggested_datetime, schedule_on_holidays=True
+            )
+        self.assertEqual(available_arr.date(), suggested_datetime.date())
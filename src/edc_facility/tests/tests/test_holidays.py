@@ -1,15 +1,20 @@
-from datetime import datetime
+import contextlib
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 from clinicedc_tests.mixins import SiteTestCaseMixin
 from clinicedc_tests.sites import all_sites
+from dateutil.relativedelta import MO, TU
 from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
 from django.test import TestCase
 from django.test.utils import override_settings, tag
 
 from edc_facility.exceptions import FacilitySiteError
+from edc_facility.holiday_calendar import holiday_calendar
 from edc_facility.holidays import Holidays
 from edc_facility.import_holidays import import_holidays
+from edc_facility.models import Holiday
 from edc_sites.site import sites as site_sites
 from edc_sites.utils import add_or_update_django_sites
 
@@ -70,3 +75,88 @@ class TestHolidays(SiteTestCaseMixin, TestCase):
         utc_datetime = datetime(2017, 9, 30, tzinfo=ZoneInfo("UTC"))
         holidays = Holidays()
         self.assertTrue(holidays.is_holiday(utc_datetime))
+
+    @override_settings(SITE_ID=10)
+    def test_is_holiday_without_queries(self):
+        holidays = Holidays()
+        holidays.is_holiday(datetime(2017, 9, 30, tzinfo=ZoneInfo("UTC")))
+        with self.assertNumQueries(0):
+            for day in range(1, 31):
+                holidays.is_holiday(datetime(2017, 9, day, tzinfo=ZoneInfo("UTC")))
+            Holidays().is_holiday(datetime(2017, 9, 30, tzinfo=ZoneInfo("UTC")))
+
+    @override_settings(SITE_ID=10)
+    def test_calendar_invalidated_on_save_and_delete(self):
+        holidays = Holidays()
+        dte = datetime(2017, 9, 29, tzinfo=ZoneInfo("UTC"))
+        self.assertFalse(holidays.is_holiday(dte))
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = Holiday.objects.create(
+                country=holidays.country, local_date=dte.date(), name="Holiday"
+            )
+            # not invalidated before the transaction is committed
+            self.assertIn(holidays.country, holiday_calendar)
+        self.assertNotIn(holidays.country, holiday_calendar)
+        self.assertTrue(holidays.is_holiday(dte))
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.delete()
+        self.assertFalse(holidays.is_holiday(dte))
+
+    @override_settings(SITE_ID=10)
+    def test_calendar_not_invalidated_on_rollback(self):
+        holidays = Holidays()
+        dte = datetime(2017, 9, 29, tzinfo=ZoneInfo("UTC"))
+        self.assertFalse(holidays.is_holiday(dte))
+        with (
+            self.captureOnCommitCallbacks(execute=True) as callbacks,
+            contextlib.suppress(DatabaseError),
+            transaction.atomic(),
+        ):
+            Holiday.objects.create(
+                country=holidays.country, local_date=dte.date(), name="Holiday"
+            )
+            self.assertFalse(holidays.is_holiday(dte))
+            raise DatabaseError
+        self.assertEqual(callbacks, [])
+        self.assertFalse(holidays.is_holiday(dte))
+
+    @override_settings(SITE_ID=10)
+    def test_calendar_invalidated_on_country_changed(self):
+        holidays = Holidays()
+        dte = datetime(2017, 9, 29, tzinfo=ZoneInfo("UTC"))
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = Holiday.objects.create(
+                country=holidays.country, local_date=dte.date(), name="Holiday"
+            )
+        self.assertTrue(holidays.is_holiday(dte))
+        self.assertFalse(holiday_calendar.is_holiday("blah", dte.date()))
+        self.assertIn("blah", holiday_calendar)
+        obj.country = "blah"
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        self.assertNotIn(holidays.country, holiday_calendar)
+        self.assertNotIn("blah", holiday_calendar)
+        self.assertFalse(holidays.is_holiday(dte))
+        self.assertTrue(holiday_calendar.is_holiday("blah", dte.date()))
+
+    @override_settings(SITE_ID=10)
+    def test_calendar_invalidated_on_import(self):
+        holidays = Holidays()
+        holidays.is_holiday(datetime(2017, 9, 30, tzinfo=ZoneInfo("UTC")))
+        self.assertIn(holidays.country, holiday_calendar)
+        import_holidays()
+        self.assertNotIn(holidays.country, holiday_calendar)
+
+    @override_settings(SITE_ID=10)
+    def test_next_open_day(self):
+        holidays = Holidays()
+        # Sat 2017-09-30 and Mon 2017-10-02 are holidays
+        dte = datetime(2017, 9, 30, tzinfo=ZoneInfo("UTC"))
+        self.assertEqual(holidays.next_open_day(dte), date(2017, 10, 1))
+        self.assertEqual(
+            holidays.next_open_day(dte, weekdays=[MO.weekday, TU.weekday]),
+            date(2017, 10, 3),
+        )
+        self.assertIsNone(
+            holidays.next_open_day(dte, weekdays=[MO.weekday], max_date=date(2017, 10, 8))
+        )
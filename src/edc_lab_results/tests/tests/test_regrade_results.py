@@ -0,0 +1,94 @@
+from io import StringIO
+
+from clinicedc_constants import FEMALE, GRAMS_PER_DECILITER, INCOMPLETE
+from clinicedc_tests.consents import consent_v1
+from clinicedc_tests.helper import Helper
+from clinicedc_tests.models import BloodResultsFbc
+from clinicedc_tests.visit_schedules.visit_schedule import get_visit_schedule
+from django.apps import apps as django_apps
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings, tag
+
+from edc_consent import site_consents
+from edc_lab.models import Panel
+from edc_reportable.exceptions import RegradeError
+from edc_reportable.results_regrader import ResultsRegrader
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+
+@tag("lab_results")
+@override_settings(SITE_ID=10)
+class TestRegradeResults(TestCase):
+    def setUp(self):
+        site_consents.registry = {}
+        site_consents.register(consent_v1)
+
+        visit_schedule = get_visit_schedule(consent_v1)
+        site_visit_schedules._registry = {}
+        site_visit_schedules.register(visit_schedule)
+
+        helper = Helper()
+        subject_visit = helper.enroll_to_baseline(
+            visit_schedule_name="visit_schedule", schedule_name="schedule", gender=FEMALE
+        )
+        panel = Panel.objects.get(name="fbc")
+        requisition = django_apps.get_model(
+            "clinicedc_tests.subjectrequisition"
+        ).objects.create(
+            subject_visit=subject_visit,
+            panel=panel,
+            requisition_datetime=subject_visit.report_datetime,
+        )
+        self.obj = BloodResultsFbc.objects.create(
+            subject_visit=subject_visit,
+            requisition=requisition,
+            crf_status=INCOMPLETE,
+            haemoglobin_value=7.5,
+            haemoglobin_units=GRAMS_PER_DECILITER,
+        )
+
+    def test_regrader_reports_changed_grade(self):
+        BloodResultsFbc.objects.filter(pk=self.obj.pk).update(haemoglobin_grade=None)
+        summary = ResultsRegrader("clinicedc_tests.bloodresultsfbc").run()
+        self.assertEqual(summary.rows, 1)
+        self.assertEqual(summary.values, 1)
+        self.assertEqual(len(summary.changed), 1)
+        changed_grade = summary.changed[0]
+        self.assertEqual(changed_grade.pk, self.obj.pk)
+        self.assertEqual(changed_grade.label, "haemoglobin")
+        self.assertIsNone(changed_grade.stored_grade)
+        self.assertEqual(changed_grade.grade, 3)
+        self.assertIn("6.5<=7.5<8.5", changed_grade.condition_str)
+
+    def test_regrader_unchanged_grade(self):
+        BloodResultsFbc.objects.filter(pk=self.obj.pk).update(haemoglobin_grade=3)
+        summary = ResultsRegrader("clinicedc_tests.bloodresultsfbc", chunk_size=1).run()
+        self.assertEqual(summary.values, 1)
+        self.assertEqual(summary.changed, [])
+
+    def test_regrader_not_graded_not_changed(self):
+        BloodResultsFbc.objects.filter(pk=self.obj.pk).update(
+            haemoglobin_units="blah", haemoglobin_grade=3
+        )
+        summary = ResultsRegrader("clinicedc_tests.bloodresultsfbc").run()
+        self.assertEqual(summary.values, 1)
+        self.assertEqual(summary.not_graded, 1)
+        self.assertEqual(summary.changed, [])
+
+    def test_regrader_bad_collection(self):
+        self.assertRaises(
+            RegradeError,
+            ResultsRegrader,
+            "clinicedc_tests.bloodresultsfbc",
+            reference_range_collection_name="blah",
+        )
+
+    def test_command(self):
+        BloodResultsFbc.objects.filter(pk=self.obj.pk).update(haemoglobin_grade=4)
+        out = StringIO()
+        call_command("regrade_results", model="clinicedc_tests.bloodresultsfbc", stdout=out)
+        self.assertIn("haemoglobin: 7.5 g/dL GRADE4 -> GRADE3", out.getvalue())
+        self.assertIn("changed: 1", out.getvalue())
+
+    def test_command_requires_model(self):
+        self.assertRaises(CommandError, call_command, "regrade_results")
@@ -8,6 +8,13 @@ Usage::
     manage.py import_results /path/to/pdf_folder --laboratory "MNH"
     manage.py import_results /path/to/pdf_folder \
         --laboratory "MNH" --dry-run
+    manage.py import_results /path/to/pdf_folder \
+        --laboratory "MNH" --workers 4
+
+If --parse-cache-path or the EDC_LAB_RESULTS_PARSE_CACHE_DIR setting
+is set, parse results of each PDF are cached there by file content
+hash; unchanged PDFs are not parsed again. Use --no-parse-cache to
+parse all PDFs.
 
 """
 
@@ -60,6 +67,32 @@ class Command(BaseCommand):
             help="Path and filename for existing duplicates JSON mapping.",
         )
 
+        parser.add_argument(
+            "--workers",
+            type=int,
+            dest="workers",
+            default=1,
+            help="Number of processes used to parse PDF files. Default: 1.",
+        )
+
+        parser.add_argument(
+            "--parse-cache-path",
+            dest="parse_cache_path",
+            default=None,
+            help=(
+                "Folder for cached parse results. Should not be the PDF folder. "
+                "Default: settings.EDC_LAB_RESULTS_PARSE_CACHE_DIR, if set."
+            ),
+        )
+
+        parser.add_argument(
+            "--no-parse-cache",
+            action="store_false",
+            dest="use_parse_cache",
+            default=True,
+            help="Parse all PDF files instead of reading cached parse results.",
+        )
+
     def handle(self, *args, **options) -> None:  # noqa: ARG002
         if not options.get("laboratory"):
             raise CommandError("--laboratory is required.")
@@ -86,5 +119,8 @@ class Command(BaseCommand):
             dry_run=dry_run,
             duplicates_json_path=duplicates_json_path,
             is_valid_identifier_func=is_valid_subject_identifier,
+            workers=options.get("workers"),
+            parse_cache_path=options.get("parse_cache_path"),
+            use_parse_cache=options.get("use_parse_cache"),
         )
         importer.run(to_model=True, df_to_path=path)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.db import connections
+from parse_trial_labs.parse_folder.files_to_dataframe import FilesToDataFrame
+from tqdm import tqdm
+
+from edc_utils.process_pool import get_mp_context, init_worker
+
+if TYPE_CHECKING:
+    from zoneinfo import ZoneInfo
+
+__all__ = ["ParallelFilesToDataFrame", "ParsedFile", "parse_pdf"]
+
+# change to invalidate all cached parse results
+CACHE_VERSION = "1"
+LOG_RECORDS_KEY = b"edc_lab_results_import.log_records"
+LOG_RECORD_ATTRS = ["name", "levelno", "levelname", "msg", "source_file", "source_utestid"]
+
+
+@dataclass(frozen=True)
+class ParsedFile:
+    """The result of parsing one PDF.
+
+    `log_records` are the records logged by the parser, as
+    dictionaries, to be handled in the parent process.
+    """
+
+    path: Path
+    rows: list[dict] = field(default_factory=list)
+    log_records: list[dict] = field(default_factory=list)
+    error: str | None = None
+
+
+class LogRecordCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(level=logging.NOTSET)
+        self.records: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        data = {attr: getattr(record, attr, None) for attr in LOG_RECORD_ATTRS}
+        data["msg"] = record.getMessage()
+        self.records.append(data)
+
+
+def parse_pdf(
+    parser_func: Callable,
+    path: Path,
+    tz: ZoneInfo | None = None,
+    is_valid_identifier_func: Callable | None = None,
+    logger_name: str | None = None,
+) -> ParsedFile:
+    """Parses one PDF with `parser_func`.
+
+    Records logged by the parser to `logger_name` are collected
+    and returned instead of handled here. An exception is returned
+    as the error.
+    """
+    logger = logging.getLogger(logger_name or "parse_trial_labs")
+    handlers, propagate = logger.handlers, logger.propagate
+    collector = LogRecordCollector()
+    logger.handlers, logger.propagate = [collector], False
+    try:
+        rows = parser_func(path, tz=tz, is_valid_identifier_func=is_valid_identifier_func)
+    except Exception as exc:
+        return ParsedFile(path=path, log_records=collector.records, error=str(exc))
+    finally:
+        logger.handlers, logger.propagate = handlers, propagate
+    return ParsedFile(path=path, rows=list(rows), log_records=collector.records)
+
+
+class ParallelFilesToDataFrame(FilesToDataFrame):
+    """A `FilesToDataFrame` that parses PDFs across a process pool
+    and caches the parse result of each file.
+
+    Each file is parsed in a worker with `parse_pdf`. The rows of a
+    parsed file are written to `cache_path` as Parquet, keyed on the
+    sha256 of the file bytes, the parser, the timezone and the
+    identifier validation function. A file with a cached parse
+    result is not parsed again.
+
+    The per-file results are merged in the sorted order of the file
+    names, so the dataframe does not depend on the order in which
+    workers finish. Records logged by the parser are handled in this
+    process, in the same order, so duplicate tracking and the
+    session log are the same as when parsing in one process.
+
+    `parser_func` and `is_valid_identifier_func` must be module-level
+    functions so they can be pickled to the workers.
+    """
+
+    def __init__(
+        self,
+        *args,
+        workers: int | None = None,
+        cache_path: Path | None = None,
+        **kwargs,
+    ):
+        self.workers = workers or 1
+        self.cache_path = Path(cache_path).expanduser() if cache_path else None
+        self.cache_hits = 0
+        super().__init__(*args, **kwargs)
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        if self._dataframe.empty:
+            dfs: list[pd.DataFrame] = []
+            try:
+                for pdf_file_path, df_file, log_records, error in self.parse_files():
+                    for data in log_records:
+                        self.pkg_logger.handle(logging.makeLogRecord(data))
+                    if error is not None:
+                        sys.stdout.write(
+                            f"WARNING: failed to parse {pdf_file_path.name}: {error}\n"
+                        )
+                    elif not df_file.empty:
+                        df_file["source_file_sha256"] = self.byte_digests.get(
+                            pdf_file_path, ""
+                        )
+                        dfs.append(df_file)
+            finally:
+                self.remove_log_handlers()
+            self._dataframe = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+            if not self._dataframe.empty:
+                self._dataframe["result"] = pd.to_numeric(
+                    self._dataframe["result"], errors="coerce"
+                )
+            self.write_duplicates()
+            self.log_duplicates()
+        return self._dataframe
+
+    def parse_files(self) -> list[tuple[Path, pd.DataFrame, list[dict], str | None]]:
+        """Returns a list of (path, dataframe, log records, error)
+        per file, in the order of `files_to_parse`.
+        """
+        results: dict[Path, tuple[pd.DataFrame, list[dict], str | None]] = {}
+        to_parse: list[Path] = []
+        for pdf_file_path in self.files_to_parse:
+            if (cached := self.read_cache(pdf_file_path)) is not None:
+                results[pdf_file_path] = (*cached, None)
+                self.cache_hits += 1
+            else:
+                to_parse.append(pdf_file_path)
+        for parsed_file in self.parse_pdfs(to_parse):
+            df_file = self.write_cache(parsed_file)
+            results[parsed_file.path] = (df_file, parsed_file.log_records, parsed_file.error)
+        return [(path, *results[path]) for path in self.files_to_parse]
+
+    def parse_pdfs(self, paths: list[Path]) -> list[ParsedFile]:
+        """Parses PDFs in this process or across a process pool."""
+        args = (self.tz, self.is_valid_identifier_func, self.app_name)
+        if self.workers > 1 and len(paths) > 1:
+            # workers must not share the parent's DB connection
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_mp_context(),
+                initializer=init_worker,
+            ) as executor:
+                futures = [
+                    executor.submit(parse_pdf, self.parser_func, path, *args) for path in paths
+                ]
+                return [
+                    future.result()
+                    for future in tqdm(
+                        as_completed(futures),
+                        total=len(futures),
+                        desc="Parsing PDFs",
+                        unit="file",
+                        disable=not self.verbose,
+                    )
+                ]
+        return [
+            parse_pdf(self.parser_func, path, *args)
+            for path in tqdm(paths, desc="Parsing PDFs", unit="file", disable=not self.verbose)
+        ]
+
+    def get_cache_key(self, pdf_file_path: Path) -> str | None:
+        if not (byte_digest := self.byte_digests.get(pdf_file_path)):
+            return None
+        key = "\n".join(
+            [
+                CACHE_VERSION,
+                byte_digest,
+                get_qualname(self.parser_func),
+                str(self.tz),
+                get_qualname(self.is_valid_identifier_func),
+            ]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get_cache_file(self, pdf_file_path: Path) -> Path | None:
+        if self.cache_path and (key := self.get_cache_key(pdf_file_path)):
+            return self.cache_path / f"{key}.parquet"
+        return None
+
+    def read_cache(self, pdf_file_path: Path) -> tuple[pd.DataFrame, list[dict]] | None:
+        """Returns the cached dataframe and log records of a file
+        or None.
+        """
+        cache_file = self.get_cache_file(pdf_file_path)
+        if not cache_file or not cache_file.exists():
+            return None
+        try:
+            table = pq.read_table(cache_file)
+        except (OSError, pa.ArrowException):
+            return None
+        log_records = json.loads((table.schema.metadata or {}).get(LOG_RECORDS_KEY, b"[]"))
+        return table.to_pandas(), log_records
+
+    def write_cache(self, parsed_file: ParsedFile) -> pd.DataFrame:
+        """Returns the rows of a parsed file as a dataframe, writing
+        it to the cache if parsed without error.
+
+        The dataframe returned is read from the Arrow table written,
+        so that it is the same as when read from the cache.
+        """
+        df_file = pd.DataFrame(parsed_file.rows)
+        cache_file = self.get_cache_file(parsed_file.path)
+        if parsed_file.error is not None or not cache_file:
+            return df_file
+        try:
+            table = pa.Table.from_pandas(df_file, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError):
+            return df_file
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                LOG_RECORDS_KEY: json.dumps(parsed_file.log_records, default=str),
+            }
+        )
+        tmp_file = cache_file.with_suffix(".tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, tmp_file)
+            tmp_file.replace(cache_file)
+        except (OSError, pa.ArrowException):
+            tmp_file.unlink(missing_ok=True)
+        return table.to_pandas()
+
+
+def get_qualname(func: Callable | None) -> str:
+    if func is None:
+        return ""
+    return f"{func.__module__}.{func.__qualname__}"
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import sys
 from collections.abc import Callable
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
@@ -11,10 +12,9 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 from django.apps import apps as django_apps
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
 from django.core.management import color_style
+from django.db.models import Q, QuerySet
 from django_pandas.io import read_frame
-from parse_trial_labs import parse_folder
 from tqdm import tqdm
 
 from edc_appointment.constants import ONTIME_APPT
@@ -34,8 +34,8 @@ from edc_reportable.models import NormalData
 from ..exceptions import ResultImporterError
 from .get_mappings import get_mappings
 from .get_parser import get_parser
+from .parallel_files_to_dataframe import ParallelFilesToDataFrame
 from .save_summary import SaveSummary
-from .utils import to_datetime, to_decimal, to_int, to_pk, to_str
 
 if TYPE_CHECKING:
     from edc_lab import RequisitionPanel
@@ -57,6 +57,53 @@ class UniqueValues:
     name_id: str
 
 
+# {Result field: dataframe column} by type, see `to_model_values`
+MODEL_STR_COLUMNS = {
+    "order_no": "order_no",
+    "result_no": "result_no",
+    "sample_no": "sample_no",
+    "result_status": "result_status",
+    "source_utestid": "source_utestid",
+    "utestid": "utestid",
+    "name_id": "name_id",
+    "clinic_ward": "clinic_ward",
+    "flag": "flag",
+    "ordered_by": "ordered_by",
+    "priority": "priority",
+    "report_type": "report_type",
+    "reported_by": "reported_by",
+    "requisition_identifier": "requisition_identifier",
+    "sample_condition": "sample_condition",
+    "sample_type": "sample_type",
+    "screening_identifier": "screening_identifier",
+    "sex": "sex",
+    "source_file": "source_file",
+    "specimen_collected_by": "specimen_collected_by",
+    "specimen_received_by": "specimen_received_by",
+    "subject_identifier": "subject_identifier",
+    "units": "units",
+    "verified_by": "verified_by",
+    "visit_code": "visit_code",
+}
+MODEL_DATETIME_COLUMNS = {
+    "result_datetime": "result_datetime",
+    "order_datetime": "order_datetime",
+    "report_datetime": "report_datetime",
+    "requisition_datetime": "requisition_datetime",
+    "specimen_collected_datetime": "specimen_collected_datetime",
+    "specimen_received_datetime": "specimen_received_datetime",
+    "verified_datetime": "verified_datetime",
+    "visit_datetime": "visit_datetime",
+}
+MODEL_DECIMAL_COLUMNS = {
+    "reference_range_lower": "reference_range_lower",
+    "reference_range_upper": "reference_range_upper",
+    "result_value": "result",
+}
+MODEL_INT_COLUMNS = {"age": "age", "visit_code_sequence": "visit_code_sequence"}
+MODEL_PK_COLUMNS = {"requisition_id": "requisition", "subject_visit_id": "subject_visit"}
+
+
 class ResultImporter:
     """
     Parse results from a folder of PDFs and import data into
@@ -69,6 +116,7 @@ class ResultImporter:
             Path("~/upload/gmail").expanduser(),
             is_valid_identifier_func=is_valid_subject_identifier,
             extra_panels=[wbc_differential],
+            workers=4,
         )
         # create the dataframe (importer.df)
         importer.run()
@@ -76,8 +124,14 @@ class ResultImporter:
         # table before this step.
         importer.dataframe_to_model(importer.df)
 
+    The requisition, visit, screening and registered subject tables
+    read by `resolve` are filtered on the subject and screening
+    identifiers and the date span of the parsed dataframe (see
+    `read_frame_in_chunks`).
     """
 
+    lookup_chunk_size: int = 500
+
     def __init__(
         self,
         laboratory: str,
@@ -90,6 +144,9 @@ class ResultImporter:
         extra_panels: list[RequisitionPanel] | None = None,
         duplicates_json_path: Path | None = None,
         limit_file_count: int | None = None,
+        workers: int | None = None,
+        parse_cache_path: Path | None = None,
+        use_parse_cache: bool | None = None,
     ) -> None:
         self._df_utestid = pd.DataFrame()
         self._df_requisitions = pd.DataFrame()
@@ -106,6 +163,7 @@ class ResultImporter:
         self.style = color_style()
         self.tz = tz or ZoneInfo(settings.TIME_ZONE)
         self.limit_file_count = limit_file_count
+        self.workers = workers
         self.known_utestids = set(
             NormalData.objects.values_list("label", flat=True).distinct()
         )
@@ -116,15 +174,18 @@ class ResultImporter:
         if not path.is_dir():
             raise ResultImporterError(f"Not a directory: {path}")
         self.parser_func = get_parser(self.laboratory)
+        self.parse_cache_path = None
+        if use_parse_cache is not False and (
+            parse_cache_path := parse_cache_path
+            or getattr(settings, "EDC_LAB_RESULTS_PARSE_CACHE_DIR", None)
+        ):
+            self.parse_cache_path = Path(parse_cache_path).expanduser()
 
     def run(self, to_model: bool | None = None, df_to_path: Path | None = None):
         pdf_count = len(list(self.path.glob("*.pdf")))
         if pdf_count == 0:
             raise ResultImporterError(f"No PDF files found in {self.path}")
         self.parse_all_to_dataframe()
-        self.df[
-            self.df["result_datetime"] >= self.df_screening["screening_datetime"].min()
-        ].copy().reset_index(drop=True)
         self.apply_mappings_after_parse()
         self.update_dtypes_after_parse()
 
@@ -145,13 +206,26 @@ class ResultImporter:
             self.dataframe_to_model(dry_run=self.dry_run)
 
     def parse_all_to_dataframe(self) -> None:
-        """Parse PDF files into a dataframe."""
-        self.df: pd.DataFrame = parse_folder(
+        """Parse PDF files into a dataframe.
+
+        PDFs are parsed across `workers` processes. If
+        `parse_cache_path` is set, the parse result of each file is
+        cached there by content hash so that unchanged PDFs are not
+        parsed again (see ParallelFilesToDataFrame).
+        """
+        files_to_dataframe = ParallelFilesToDataFrame(
             self.path,
             self.parser_func,
             tz=self.tz,
             is_valid_identifier_func=self.is_valid_identifier_func,
             duplicates_json_path=self.duplicates_json_path,
+            workers=self.workers,
+            cache_path=self.parse_cache_path,
+        )
+        self.df: pd.DataFrame = files_to_dataframe.dataframe
+        self.stdout.write(
+            f"parse_pdfs: {len(files_to_dataframe.files_to_parse)} files, "
+            f"{files_to_dataframe.cache_hits} from cache\n"
         )
 
     def apply_mappings_after_parse(self) -> None:
@@ -351,7 +425,7 @@ class ResultImporter:
     def df_requisitions(self) -> pd.DataFrame:
         if self._df_requisitions.empty:
             requisition_model_cls = django_apps.get_model(settings.SUBJECT_REQUISITION_MODEL)
-            df = read_frame(
+            qs = (
                 requisition_model_cls.objects.values(
                     "id",
                     "subject_identifier",
@@ -365,8 +439,15 @@ class ResultImporter:
                     "panel__name",
                 )
                 .filter(drawn_datetime__isnull=False)
-                .exclude(item_type=FINGER_PRICK),
-                verbose=False,
+                .exclude(item_type=FINGER_PRICK)
+            )
+            if date_span := self.get_date_span():
+                qs = qs.filter(
+                    Q(drawn_datetime__gte=date_span[0], drawn_datetime__lt=date_span[1])
+                    | Q(report_datetime__gte=date_span[0], report_datetime__lt=date_span[1])
+                )
+            df = self.read_frame_in_chunks(
+                qs, subject_identifier=self.get_unique_values("subject_identifier")
             ).rename(
                 columns={
                     "id": "requisition",
@@ -412,16 +493,21 @@ class ResultImporter:
         if self._df_related_visit.empty:
             schedule_name = "schedule"
             related_visit_model_cls = django_apps.get_model(settings.SUBJECT_VISIT_MODEL)
-            df = read_frame(
-                related_visit_model_cls.objects.values(
-                    "id",
-                    "appointment__subject_identifier",
-                    "report_datetime",
-                    "visit_code",
-                    "visit_code_sequence",
-                    "schedule_name",
-                ).filter(appointment__appt_timing=ONTIME_APPT),
-                verbose=False,
+            qs = related_visit_model_cls.objects.values(
+                "id",
+                "appointment__subject_identifier",
+                "report_datetime",
+                "visit_code",
+                "visit_code_sequence",
+                "schedule_name",
+            ).filter(appointment__appt_timing=ONTIME_APPT)
+            if date_span := self.get_date_span():
+                qs = qs.filter(
+                    report_datetime__gte=date_span[0], report_datetime__lt=date_span[1]
+                )
+            df = self.read_frame_in_chunks(
+                qs,
+                appointment__subject_identifier=self.get_unique_values("subject_identifier"),
             ).rename(
                 columns={
                     "id": "subject_visit",
@@ -452,11 +538,11 @@ class ResultImporter:
     def df_screening(self) -> pd.DataFrame:
         if self._df_screening.empty:
             screening_model_cls = django_apps.get_model(settings.SUBJECT_SCREENING_MODEL)
-            df = read_frame(
+            df = self.read_frame_in_chunks(
                 screening_model_cls.objects.values(
                     "screening_identifier", "report_datetime", "site"
-                ).all(),
-                verbose=False,
+                ),
+                screening_identifier=self.get_unique_values("screening_identifier"),
             ).rename(columns={"report_datetime": "screening_datetime"})
             df["screening_identifier"] = (
                 df["screening_identifier"].astype("string").fillna(pd.NA)
@@ -468,17 +554,65 @@ class ResultImporter:
     @property
     def df_registered_subject(self) -> pd.DataFrame:
         if self._df_registered_subject.empty:
-            df = read_frame(
+            df = self.read_frame_in_chunks(
                 RegisteredSubject.objects.values(
                     "subject_identifier", "screening_identifier", "site"
-                ).all(),
-                verbose=False,
+                ),
+                subject_identifier=self.get_unique_values("subject_identifier"),
+                screening_identifier=self.get_unique_values("screening_identifier"),
             )
             df["subject_identifier"] = df["subject_identifier"].astype("string").fillna(pd.NA)
             df["site"] = df["site"].astype("string").fillna(pd.NA)
             self._df_registered_subject = df
         return self._df_registered_subject
 
+    def get_unique_values(self, column: str) -> list[str]:
+        """Returns the sorted unique values of a column of the parsed
+        dataframe, used to scope the reference table queries.
+        """
+        if column not in self.df.columns:
+            return []
+        return sorted({str(v) for v in self.df[column].dropna()} - {""})
+
+    def get_date_span(self) -> tuple[datetime, datetime] | None:
+        """Returns the span of UTC days of the specimen collected and
+        order dates of the parsed dataframe, as (start, end) where
+        end is exclusive, or None.
+        """
+        dates = pd.concat(
+            [
+                pd.to_datetime(self.df[col], utc=True).dt.normalize()
+                for col in ["specimen_collected_datetime", "order_datetime"]
+                if col in self.df.columns
+            ]
+            or [pd.Series(dtype="datetime64[ns, UTC]")]
+        ).dropna()
+        if dates.empty:
+            return None
+        return (
+            dates.min().to_pydatetime(),
+            (dates.max() + pd.Timedelta(days=1)).to_pydatetime(),
+        )
+
+    def read_frame_in_chunks(self, qs: QuerySet, **lookups: list[str]) -> pd.DataFrame:
+        """Returns a dataframe of the rows of a values queryset
+        where any field in `lookups` is in its list of values.
+
+        Each field is queried with `<field>__in` in chunks of
+        `lookup_chunk_size` values.
+        """
+        dfs = [
+            read_frame(
+                qs.filter(**{f"{field_name}__in": values[i : i + self.lookup_chunk_size]}),
+                verbose=False,
+            )
+            for field_name, values in lookups.items()
+            for i in range(0, len(values), self.lookup_chunk_size)
+        ]
+        if not dfs:
+            return read_frame(qs.none(), verbose=False)
+        return pd.concat(dfs, ignore_index=True).drop_duplicates(ignore_index=True)
+
     def resolve_requisitions(self):
         remaining = self.df.copy()
         results = []
@@ -575,112 +709,127 @@ class ResultImporter:
         )
 
     def save_to_model(self, batch_size: int | None = None) -> SaveSummary:
-        """Bulk-create ``Result`` rows from *df*."""
+        """Bulk-create ``Result`` rows from *df*.
+
+        Rows are saved in batches of `batch_size`. Columns of each
+        batch are converted to model field values once per column
+        (see `to_model_values`). Rows with a unique key
+        (`UniqueValues`) already seen in the dataframe or in the
+        Result table are skipped. Existing keys are looked up per batch,
+        filtered on the batch order numbers, the leading column of the
+        `unique_lab_result` index, and on the range of the batch
+        result datetimes.
+
+        Rows are inserted with `bulk_create(ignore_conflicts=True)`,
+        so a row inserted by another import after the lookup is also
+        skipped.
+        """
         batch_size = batch_size or 500
-        skipped = 0
-        imported_results_batch: list[Result] = []
-
-        existing_keys = {
-            UniqueValues(*row_tuple)
-            for row_tuple in self.result_model_cls().objects.values_list(
-                "order_no",
-                "result_no",
-                "sample_no",
-                "result_status",
-                "source_utestid",
-                "utestid",
-                "result_datetime",
-                "name_id",
-            )
-        }
-        for _, row in tqdm(self.df.iterrows(), total=len(self.df)):
-            name_id = to_str(row.get("name_id", ""))
-            unique_values = UniqueValues(
-                to_str(row.get("order_no", "")),
-                to_str(row.get("result_no", "")),
-                to_str(row.get("sample_no", "")),
-                to_str(row.get("result_status", "")),
-                to_str(row.get("source_utestid", "")),
-                to_str(row.get("utestid", "")),
-                to_datetime(row.get("result_datetime")),
-                name_id,
-            )
-            if unique_values in existing_keys:
-                skipped += 1
-                continue
-
-            existing_keys.add(unique_values)
-            if batch_size == 1:
-                try:
-                    self.result_model_cls().objects.get(**asdict(unique_values))
-                except ObjectDoesNotExist:
-                    pass
-                else:
+        model_cls = self.result_model_cls()
+        unique_fields = [f.name for f in fields(UniqueValues)]
+        seen_keys: set[UniqueValues] = set()
+        skipped = created = 0
+        for start in tqdm(range(0, len(self.df), batch_size), unit="batch"):
+            df_batch = self.to_model_values(self.df.iloc[start : start + batch_size])
+            seen_keys.update(self.get_existing_keys(df_batch))
+            imported_results_batch: list[Result] = []
+            for values in df_batch.to_dict("records"):
+                unique_values = UniqueValues(*[values[f] for f in unique_fields])
+                if unique_values in seen_keys:
                     skipped += 1
-                    existing_keys.add(unique_values)
                     continue
-            imported_results_batch.append(self.prepare_imported_result(unique_values, row))
-            if len(imported_results_batch) >= batch_size:
-                if not self.dry_run:
-                    self.result_model_cls().objects.bulk_create(imported_results_batch)
-                imported_results_batch.clear()
-
-        if not self.dry_run and imported_results_batch:
-            self.result_model_cls().objects.bulk_create(imported_results_batch)
+                seen_keys.add(unique_values)
+                obj = model_cls(laboratory=self.laboratory, **values)
+                # UUIDAutoField sets the pk on pre_save
+                obj._meta.pk.pre_save(obj, add=True)
+                imported_results_batch.append(obj)
+            if self.dry_run:
+                created += len(imported_results_batch)
+            elif imported_results_batch:
+                model_cls.objects.bulk_create(imported_results_batch, ignore_conflicts=True)
+                inserted = model_cls.objects.filter(
+                    pk__in=[obj.pk for obj in imported_results_batch]
+                ).count()
+                created += inserted
+                skipped += len(imported_results_batch) - inserted
 
         return SaveSummary(
-            created=len(self.df) - skipped,
+            created=created,
             skipped=skipped,
             stdout=self.stdout,
             style=self.style,
         )
 
-    def prepare_imported_result(
-        self,
-        unique_values: UniqueValues,
-        row: pd.Series,
-    ) -> Result:
-        model_cls = self.result_model_cls()
-        return model_cls(
-            laboratory=self.laboratory,
-            order_no=unique_values.order_no,
-            result_no=unique_values.result_no,
-            sample_no=unique_values.sample_no,
-            result_status=unique_values.result_status,
-            source_utestid=unique_values.source_utestid,
-            utestid=unique_values.utestid,
-            result_datetime=unique_values.result_datetime,
-            name_id=unique_values.name_id,
-            age=to_int(row.get("age")),
-            clinic_ward=to_str(row.get("clinic_ward", "")),
-            flag=to_str(row.get("flag", "")),
-            order_datetime=to_datetime(row.get("order_datetime")),
-            ordered_by=to_str(row.get("ordered_by", "")),
-            priority=to_str(row.get("priority", "")),
-            reference_range_lower=to_decimal(row.get("reference_range_lower")),
-            reference_range_upper=to_decimal(row.get("reference_range_upper")),
-            report_datetime=to_datetime(row.get("report_datetime")),
-            report_type=to_str(row.get("report_type", "")),
-            reported_by=to_str(row.get("reported_by", "")),
-            requisition_datetime=to_datetime(row.get("requisition_datetime")),
-            requisition_id=to_pk(row.get("requisition")),
-            requisition_identifier=to_str(row.get("requisition_identifier", "")),
-            result_value=to_decimal(row.get("result")),
-            sample_condition=to_str(row.get("sample_condition", "")),
-            sample_type=to_str(row.get("sample_type", "")),
-            screening_identifier=to_str(row.get("screening_identifier", "")),
-            sex=to_str(row.get("sex", "")),
-            source_file=to_str(row.get("source_file", "")),
-            specimen_collected_by=to_str(row.get("specimen_collected_by", "")),
-            specimen_collected_datetime=to_datetime(row.get("specimen_collected_datetime")),
-            specimen_received_by=to_str(row.get("specimen_received_by", "")),
-            specimen_received_datetime=to_datetime(row.get("specimen_received_datetime")),
-            subject_identifier=to_str(row.get("subject_identifier", "")),
-            subject_visit_id=to_pk(row.get("subject_visit")),
-            units=to_str(row.get("units", "")),
-            verified_by=to_str(row.get("verified_by", "")),
-            verified_datetime=to_datetime(row.get("verified_datetime")),
-            visit_code=to_str(row.get("visit_code", "")),
-            visit_code_sequence=to_int(row.get("visit_code_sequence", "")),
-            visit_datetime=to_datetime(row.get("visit_datetime")),
-        )
+    def get_existing_keys(self, df: pd.DataFrame) -> set[UniqueValues]:
+        """Returns the unique keys in the Result table of the rows
+        in `df`, filtered on order number and result datetime.
+        """
+        result_datetimes = df["result_datetime"].dropna()
+        opts = {}
+        if not result_datetimes.empty:
+            opts.update(
+                result_datetime__gte=result_datetimes.min(),
+                result_datetime__lte=result_datetimes.max(),
+            )
+        qs = self.result_model_cls().objects.filter(order_no__in=set(df["order_no"]))
+        if df["result_datetime"].isna().any():
+            qs = qs.filter(Q(**opts) | Q(result_datetime__isnull=True))
+        else:
+            qs = qs.filter(**opts)
+        return {
+            UniqueValues(*row_tuple)
+            for row_tuple in qs.values_list(*[f.name for f in fields(UniqueValues)])
+        }
+
+    def to_model_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns a dataframe of the Result field values of each row,
+        converting each column once.
+
+        Missing columns are empty.
+        """
+        values = {}
+        for field_name, column in MODEL_STR_COLUMNS.items():
+            values[field_name] = (
+                df[column].astype("string").fillna("").astype(object)
+                if column in df.columns
+                else ""
+            )
+        for field_name, column in MODEL_DATETIME_COLUMNS.items():
+            values[field_name] = (
+                df[column].astype(object).where(df[column].notna(), None)
+                if column in df.columns
+                else None
+            )
+        for field_name, column in MODEL_DECIMAL_COLUMNS.items():
+            values[field_name] = (
+                pd.Series(
+                    [
+                        None if pd.isna(v) else Decimal(str(v))
+                        for v in pd.to_numeric(df[column], errors="coerce")
+                    ],
+                    index=df.index,
+                    dtype=object,
+                )
+                if column in df.columns
+                else None
+            )
+        for field_name, column in MODEL_INT_COLUMNS.items():
+            values[field_name] = (
+                pd.Series(
+                    [
+                        None if pd.isna(v) else int(v)
+                        for v in pd.to_numeric(df[column], errors="coerce")
+                    ],
+                    index=df.index,
+                    dtype=object,
+                )
+                if column in df.columns
+                else None
+            )
+        for field_name, column in MODEL_PK_COLUMNS.items():
+            values[field_name] = (
+                df[column].astype(object).where(df[column].notna(), None)
+                if column in df.columns
+                else None
+            )
+        return pd.DataFrame(values, index=df.index).astype(object)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import tempfile
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from django.test import SimpleTestCase, tag
+
+from edc_lab_results_import.result_importer.parallel_files_to_dataframe import (
+    ParallelFilesToDataFrame,
+)
+
+UTC = ZoneInfo("UTC")
+
+logger = logging.getLogger("parse_trial_labs.tests")
+
+parsed_files: list[str] = []
+
+
+def parse_text_pdf(path: Path, *, tz=None, is_valid_identifier_func=None) -> list[dict]:
+    """A parser for the fake "PDFs" written by the tests, one
+    result per line as `<utestid>,<result>`.
+    """
+    parsed_files.append(path.name)
+    text = path.read_text()
+    if text.startswith("corrupt"):
+        raise ValueError("not a PDF")
+    rows = []
+    for line_no, line in enumerate(text.splitlines()):
+        source_utestid, result = line.split(",")
+        if source_utestid == "DUP":
+            logger.warning(
+                "Duplicate result collapsed",
+                extra={"source_file": path.name, "source_utestid": source_utestid},
+            )
+        rows.append(
+            {
+                "source_file": path.name,
+                "source_utestid": source_utestid,
+                "result": result,
+                "order_datetime": datetime(2026, 1, 5, 9, line_no, tzinfo=tz),
+            }
+        )
+    return rows
+
+
+@tag("lab_results_import")
+class TestParallelFilesToDataFrame(SimpleTestCase):
+    def setUp(self):
+        parsed_files.clear()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.folder = Path(tmpdir.name) / "pdfs"
+        self.folder.mkdir()
+        self.cache_path = Path(tmpdir.name) / "cache"
+        # skip the text duplicate check, which needs real PDFs
+        self.duplicates_json_path = Path(tmpdir.name) / "duplicates.json"
+        self.duplicates_json_path.write_text("{}")
+        for index in range(6):
+            (self.folder / f"report_{index:03d}.pdf").write_text(
+                f"HGB,{index}.5\nWBC,{index}\nDUP,x{index}\n"
+            )
+        (self.folder / "report_999.pdf").write_text("corrupt")
+
+    def get_dataframe(self, **kwargs) -> tuple[pd.DataFrame, ParallelFilesToDataFrame]:
+        files_to_dataframe = ParallelFilesToDataFrame(
+            self.folder,
+            parse_text_pdf,
+            tz=UTC,
+            duplicates_json_path=self.duplicates_json_path,
+            verbose=False,
+            **kwargs,
+        )
+        with patch("sys.stdout", new_callable=StringIO):
+            df = files_to_dataframe.dataframe
+        return df, files_to_dataframe
+
+    def test_serial(self):
+        df, files_to_dataframe = self.get_dataframe()
+        self.assertEqual(len(df), 18)
+        self.assertEqual(
+            list(df["source_file"].unique()), [f"report_{i:03d}.pdf" for i in range(6)]
+        )
+        self.assertEqual(df.loc[0, "result"], 0.5)
+        self.assertTrue(pd.isna(df.loc[2, "result"]))
+        self.assertEqual(
+            df.loc[0, "source_file_sha256"],
+            files_to_dataframe.byte_digests[self.folder / "report_000.pdf"],
+        )
+        self.assertEqual(len(files_to_dataframe.dup_handler.duplicates), 6)
+
+    def test_parallel_same_as_serial(self):
+        df_serial, _ = self.get_dataframe()
+        df_parallel, files_to_dataframe = self.get_dataframe(workers=3)
+        pd.testing.assert_frame_equal(df_serial, df_parallel)
+        self.assertEqual(len(files_to_dataframe.dup_handler.duplicates), 6)
+
+    def test_cache(self):
+        df, files_to_dataframe = self.get_dataframe(cache_path=self.cache_path)
+        self.assertEqual(files_to_dataframe.cache_hits, 0)
+        # the file that failed to parse is not cached
+        self.assertEqual(len(list(self.cache_path.glob("*.parquet"))), 6)
+        self.assertEqual(len(parsed_files), 7)
+
+        parsed_files.clear()
+        df_cached, files_to_dataframe = self.get_dataframe(cache_path=self.cache_path)
+        self.assertEqual(files_to_dataframe.cache_hits, 6)
+        self.assertEqual(parsed_files, ["report_999.pdf"])
+        pd.testing.assert_frame_equal(df, df_cached)
+        # log records are replayed from the cache
+        self.assertEqual(len(files_to_dataframe.dup_handler.duplicates), 6)
+
+    def test_cache_changed_file_parsed_again(self):
+        self.get_dataframe(cache_path=self.cache_path)
+        (self.folder / "report_002.pdf").write_text("HGB,9.9\n")
+        parsed_files.clear()
+        df, _ = self.get_dataframe(cache_path=self.cache_path)
+        self.assertEqual(parsed_files, ["report_002.pdf", "report_999.pdf"])
+        self.assertEqual(list(df[df["source_file"] == "report_002.pdf"]["result"]), [9.9])
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings, tag
+
+from edc_lab_results_import.result_importer import ResultImporter
+
+
+@tag("lab_results_import")
+@patch(
+    "edc_lab_results_import.result_importer.result_importer.get_parser",
+    return_value=None,
+)
+@patch(
+    "edc_lab_results_import.result_importer.result_importer.get_mappings",
+    return_value={"UTESTIDS": {}, "UNITS": {}},
+)
+class TestParseCachePath(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.folder = Path(tmpdir.name) / "pdfs"
+        self.folder.mkdir()
+        self.cache_dir = Path(tmpdir.name) / "cache"
+
+    def test_no_cache_by_default(self, *args):  # noqa: ARG002
+        importer = ResultImporter("MNH", self.folder)
+        self.assertIsNone(importer.parse_cache_path)
+
+    def test_cache_path(self, *args):  # noqa: ARG002
+        importer = ResultImporter("MNH", self.folder, parse_cache_path=self.cache_dir)
+        self.assertEqual(importer.parse_cache_path, self.cache_dir)
+        importer = ResultImporter(
+            "MNH", self.folder, parse_cache_path=self.cache_dir, use_parse_cache=False
+        )
+        self.assertIsNone(importer.parse_cache_path)
+
+    def test_cache_path_from_settings(self, *args):  # noqa: ARG002
+        with override_settings(EDC_LAB_RESULTS_PARSE_CACHE_DIR=str(self.cache_dir)):
+            importer = ResultImporter("MNH", self.folder)
+        self.assertEqual(importer.parse_cache_path, self.cache_dir)
+        self.assertFalse(importer.parse_cache_path.is_relative_to(self.folder))
@@ -9,8 +9,7 @@ from django.core.management import color_style
 from django.test import TestCase, tag
 
 from edc_lab_results_import.models import Result
-from edc_lab_results_import.result_importer.result_importer import ResultImporter, UniqueValues
-from edc_lab_results_import.result_importer.utils import to_datetime, to_str
+from edc_lab_results_import.result_importer.result_importer import ResultImporter
 
 UTC = ZoneInfo("UTC")
 
@@ -116,29 +115,14 @@ class TestResultImporterDataframeRoundTrip(TestCase):
         return pd.DataFrame([full_row, empty_row])
 
     def write_rows(self, df: pd.DataFrame) -> None:
-        """Persists each row using the same per-row mapping that
-        `ResultImporter.save_to_model` uses (`prepare_imported_result`),
-        saving individually instead of via `save_to_model`/`bulk_create`.
-
-        `Result`'s UUID primary key is generated in `UUIDAutoField.pre_save()`
-        (see `django_audit_fields.fields.UUIDAutoField`), which Django's
-        `bulk_create()` never calls (it writes `get_db_prep_save()` values
-        directly, bypassing `pre_save()`). That makes `save_to_model`'s use
-        of `bulk_create()` fail for this model on any backend; that bug is
-        independent of the dataframe dtype round trip under test here.
+        """Persists each row with the field values of
+        `to_model_values`, saving individually instead of via
+        `save_to_model`/`bulk_create`.
+
+        `save_to_model` is tested in `test_save_to_model`.
         """
-        for _, row in df.iterrows():
-            unique_values = UniqueValues(
-                to_str(row.get("order_no", "")),
-                to_str(row.get("result_no", "")),
-                to_str(row.get("sample_no", "")),
-                to_str(row.get("result_status", "")),
-                to_str(row.get("source_utestid", "")),
-                to_str(row.get("utestid", "")),
-                to_datetime(row.get("result_datetime")),
-                to_str(row.get("name_id", "")),
-            )
-            self.importer.prepare_imported_result(unique_values, row).save()
+        for values in self.importer.to_model_values(df).to_dict("records"):
+            Result(laboratory=self.importer.laboratory, **values).save()
 
     def test_round_trip_dtypes_and_values(self):
         df_in = self.build_source_df()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from django.test import TestCase, tag
+
+from edc_lab_results_import.models import Result
+from edc_lab_results_import.result_importer.result_importer import (
+    MODEL_DATETIME_COLUMNS,
+    MODEL_DECIMAL_COLUMNS,
+    MODEL_INT_COLUMNS,
+    MODEL_PK_COLUMNS,
+    MODEL_STR_COLUMNS,
+)
+from edc_lab_results_import.result_importer.utils import (
+    to_datetime,
+    to_decimal,
+    to_int,
+    to_pk,
+    to_str,
+)
+
+from .test_result_importer_roundtrip import make_importer
+
+UTC = ZoneInfo("UTC")
+
+
+def make_row(index: int, **kwargs) -> dict:
+    row = {
+        "order_no": f"ORD{index:03d}",
+        "result_no": f"RES{index:03d}",
+        "sample_no": f"SAM{index:03d}",
+        "result_status": "final",
+        "source_utestid": "HGB",
+        "utestid": "haemoglobin",
+        "result_datetime": datetime(2026, 1, 5, 9, index % 60, tzinfo=UTC),
+        "name_id": f"NAME{index:03d}",
+        "subject_identifier": "101-40990001-6",
+        "age": 34.0,
+        "result": 13.4,
+        "reference_range_lower": "12.0",
+        "units": "g/dL",
+        "source_file": "report_001.pdf",
+    }
+    row.update(**kwargs)
+    return row
+
+
+def get_expected_values(row: dict) -> dict:
+    """Returns the Result field values of a row converted one value
+    at a time.
+    """
+    values = {}
+    for convert, columns in [
+        (to_str, MODEL_STR_COLUMNS),
+        (to_datetime, MODEL_DATETIME_COLUMNS),
+        (to_decimal, MODEL_DECIMAL_COLUMNS),
+        (to_int, MODEL_INT_COLUMNS),
+        (to_pk, MODEL_PK_COLUMNS),
+    ]:
+        for field_name, column in columns.items():
+            values[field_name] = convert(row.get(column))
+    return values
+
+
+@tag("lab_results_import")
+class TestSaveToModel(TestCase):
+    def setUp(self):
+        self.importer = make_importer()
+
+    def test_save_to_model(self):
+        self.importer.df = pd.DataFrame([make_row(i) for i in range(25)])
+        summary = self.importer.save_to_model(batch_size=10)
+        self.assertEqual(summary.created, 25)
+        self.assertEqual(summary.skipped, 0)
+        self.assertEqual(Result.objects.count(), 25)
+        obj = Result.objects.get(result_no="RES003")
+        self.assertEqual(obj.laboratory, "MNH")
+        self.assertEqual(obj.age, 34)
+        self.assertEqual(obj.result_value, Decimal("13.4"))
+        self.assertEqual(obj.reference_range_lower, Decimal("12.0"))
+        self.assertIsNone(obj.reference_range_upper)
+        self.assertEqual(obj.flag, "")
+        self.assertEqual(obj.result_datetime, datetime(2026, 1, 5, 9, 3, tzinfo=UTC))
+
+    def test_same_values_as_per_row_conversion(self):
+        """Assert the columns converted by `to_model_values` are
+        saved with the values converted per row by the functions in
+        `result_importer.utils`.
+        """
+        self.importer.df = pd.DataFrame(
+            [make_row(1), make_row(2, age=None, result=None, name_id=None)]
+        )
+        self.importer.save_to_model()
+        for row, values in zip(
+            self.importer.df.to_dict("records"),
+            self.importer.to_model_values(self.importer.df).to_dict("records"),
+            strict=True,
+        ):
+            expected = get_expected_values(row)
+            self.assertEqual(values, expected)
+            obj = Result.objects.get(result_no=row["result_no"])
+            for field_name, value in expected.items():
+                self.assertEqual(getattr(obj, field_name), value, field_name)
+        self.assertEqual(Result.objects.get(result_no="RES002").name_id, "")
+
+    def test_skips_existing_and_duplicates(self):
+        self.importer.df = pd.DataFrame([make_row(i) for i in range(5)])
+        self.importer.save_to_model()
+        self.importer.df = pd.DataFrame(
+            [make_row(i) for i in range(3, 8)]
+            + [make_row(7), make_row(8, result_datetime=None)]
+            + [make_row(8, result_datetime=None)]
+        )
+        summary = self.importer.save_to_model(batch_size=2)
+        self.assertEqual(summary.created, 4)
+        self.assertEqual(summary.skipped, 4)
+        self.assertEqual(Result.objects.count(), 9)
+
+        # result_datetime is null, matched on lookup
+        self.importer.df = pd.DataFrame([make_row(8, result_datetime=None)])
+        summary = self.importer.save_to_model()
+        self.assertEqual(summary.created, 0)
+        self.assertEqual(summary.skipped, 1)
+
+    def test_dry_run(self):
+        self.importer.df = pd.DataFrame([make_row(i) for i in range(5)])
+        self.importer.save_to_model()
+        self.importer.dry_run = True
+        self.importer.df = pd.DataFrame([make_row(i) for i in range(3, 8)])
+        summary = self.importer.save_to_model()
+        self.assertEqual(summary.created, 3)
+        self.assertEqual(summary.skipped, 2)
+        self.assertEqual(Result.objects.count(), 5)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from clinicedc_constants import YES
+from clinicedc_tests.consents import consent_v1
+from clinicedc_tests.helper import Helper
+from clinicedc_tests.models import SubjectRequisition
+from clinicedc_tests.sites import all_sites
+from clinicedc_tests.visit_schedules.visit_schedule import get_visit_schedule
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, override_settings, tag
+
+from edc_consent import site_consents
+from edc_lab.models import Panel
+from edc_registration.models import RegisteredSubject
+from edc_sites.site import sites as site_sites
+from edc_sites.utils import add_or_update_django_sites
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+from edc_visit_tracking.models import SubjectVisit
+
+from .test_result_importer_roundtrip import make_importer
+
+UTC = ZoneInfo("UTC")
+
+
+@tag("lab_results_import")
+@override_settings(SITE_ID=10)
+class TestScopedReferenceTables(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        site_sites._registry = {}
+        site_sites.loaded = False
+        site_sites.register(*all_sites)
+        add_or_update_django_sites()
+
+    def setUp(self):
+        for index in range(6):
+            RegisteredSubject.objects.create(
+                subject_identifier=f"101-4099000{index}-6",
+                screening_identifier=f"SCR000{index}",
+            )
+        self.importer = make_importer()
+        for attr in [
+            "_df_registered_subject",
+            "_df_screening",
+            "_df_related_visit",
+            "_df_requisitions",
+            "_df_utestid",
+        ]:
+            setattr(self.importer, attr, pd.DataFrame())
+        self.importer.df = pd.DataFrame(
+            {
+                "subject_identifier": ["101-40990001-6", "101-40990002-6", None, ""],
+                "screening_identifier": [None, "SCR0002", "SCR0004", None],
+                "utestid": ["haemoglobin", "wbc", "wbc", None],
+                "specimen_collected_datetime": [
+                    datetime(2026, 1, 5, 9, 0, tzinfo=UTC),
+                    None,
+                    datetime(2026, 1, 3, 23, 59, tzinfo=UTC),
+                    None,
+                ],
+                "order_datetime": [
+                    datetime(2026, 1, 7, 13, 0, tzinfo=UTC),
+                    None,
+                    None,
+                    None,
+                ],
+            }
+        )
+
+    def test_registered_subjects_scoped_to_dataframe(self):
+        df = self.importer.df_registered_subject
+        self.assertEqual(
+            sorted(df["subject_identifier"]),
+            ["101-40990001-6", "101-40990002-6", "101-40990004-6"],
+        )
+
+    def test_lookups_chunked(self):
+        self.importer.lookup_chunk_size = 1
+        # 2 subject identifiers, 2 screening identifiers
+        with self.assertNumQueries(4):
+            df = self.importer.df_registered_subject
+        self.assertEqual(len(df), 3)
+
+    def test_no_identifiers(self):
+        self.importer.df = pd.DataFrame({"subject_identifier": [None]})
+        with self.assertNumQueries(0):
+            df = self.importer.df_registered_subject
+        self.assertTrue(df.empty)
+        self.assertIn("subject_identifier", df.columns)
+
+    def test_date_span(self):
+        self.assertEqual(
+            self.importer.get_date_span(),
+            (datetime(2026, 1, 3, tzinfo=UTC), datetime(2026, 1, 8, tzinfo=UTC)),
+        )
+        self.importer.df = pd.DataFrame({"order_datetime": [None]})
+        self.assertIsNone(self.importer.get_date_span())
+
+    def test_scoped_queries(self):
+        """Assert reads only the visits and requisitions of the
+        subjects in the dataframe within the date span, and only the
+        screenings of the screening identifiers in the dataframe.
+        """
+        site_consents.registry = {}
+        site_consents.register(consent_v1)
+        site_visit_schedules._registry = {}
+        site_visit_schedules.register(get_visit_schedule(consent_v1))
+        panel = Panel.objects.get(name="fbc")
+        subject_visits = []
+        for _ in range(3):
+            subject_visit = Helper().enroll_to_baseline(
+                visit_schedule_name="visit_schedule", schedule_name="schedule"
+            )
+            SubjectRequisition.objects.create(
+                subject_visit=subject_visit,
+                panel=panel,
+                requisition_datetime=subject_visit.report_datetime,
+                drawn_datetime=subject_visit.report_datetime,
+                is_drawn=YES,
+            )
+            subject_visits.append(subject_visit)
+        # in the dataframe, in the date span
+        in_scope = subject_visits[0]
+        # in the dataframe, outside the date span
+        out_of_span = subject_visits[1]
+        report_datetime = out_of_span.report_datetime - relativedelta(days=30)
+        SubjectVisit.objects.filter(pk=out_of_span.pk).update(report_datetime=report_datetime)
+        SubjectRequisition.objects.filter(subject_visit=out_of_span).update(
+            report_datetime=report_datetime,
+            requisition_datetime=report_datetime,
+            drawn_datetime=report_datetime,
+        )
+        # subject_visits[2] is in the date span, not in the dataframe
+
+        self.importer.df = pd.DataFrame(
+            {
+                "subject_identifier": [
+                    in_scope.subject_identifier,
+                    out_of_span.subject_identifier,
+                ],
+                "screening_identifier": [
+                    RegisteredSubject.objects.get(
+                        subject_identifier=in_scope.subject_identifier
+                    ).screening_identifier,
+                    None,
+                ],
+                "specimen_collected_datetime": [in_scope.report_datetime] * 2,
+                "order_datetime": [None, None],
+            }
+        )
+        self.importer._df_utestid = pd.DataFrame(
+            {"panel_name": ["fbc"], "utestid": ["haemoglobin"]}
+        )
+
+        df = self.importer.df_related_visits
+        self.assertEqual(list(df["subject_identifier"]), [in_scope.subject_identifier])
+        self.assertEqual(list(df["subject_visit"]), [str(in_scope.pk)])
+
+        df = self.importer.df_requisitions
+        self.assertEqual(list(df["subject_identifier"]), [in_scope.subject_identifier])
+        self.assertEqual(list(df["subject_visit"]), [str(in_scope.pk)])
+
+        df = self.importer.df_screening
+        self.assertEqual(
+            list(df["screening_identifier"]),
+            list(self.importer.df["screening_identifier"].dropna()),
+        )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps as django_apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField, F, QuerySet, Value
+
+if TYPE_CHECKING:
+    from edc_visit_tracking.model_mixins import VisitModelMixin as Base
+
+    from .model_mixins.creates import CreatesMetadataModelMixin
+
+    class RelatedVisitModel(CreatesMetadataModelMixin, Base):
+        pass
+
+
+class KeyedMap:
+    """A map of the source model instances that exist (are KEYED)
+    for a related_visit.
+
+    Selects from all source model tables of the visit in one
+    UNION ALL query on first access. Values are keyed by
+    (model, panel_name) where `panel_name` is "" for CRFs.
+
+    By default, includes the models of all CRFs and requisitions
+    of the visit (`visit.all_crfs`, `visit.all_requisitions`).
+    A model not included is selected, and added to the map, on
+    first access.
+
+    Create one instance per save or request and pass it along.
+    The map is not refreshed if a source model instance is added
+    or deleted afterwards.
+
+    For example:
+
+        keyed_map = KeyedMap(related_visit)
+        keyed_map.is_keyed("clinicedc_tests.crfone")
+        keyed_map.is_keyed("clinicedc_tests.subjectrequisition", "cd4")
+        keyed_map.get_values("clinicedc_tests.crfone")
+        {"created": datetime(...), "user_created": "erikvw", ...}
+    """
+
+    values_fields = ("keyed_model", "keyed_panel_name", "created", "user_created")
+    max_union_size = 100
+
+    def __init__(
+        self, related_visit: RelatedVisitModel, models: Iterable[str] | None = None
+    ) -> None:
+        self.related_visit = related_visit
+        self.models: set[str] = (
+            self.get_visit_models(related_visit) if models is None else set(models)
+        )
+        self._selected_models: set[str] = set()
+        self._values: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(related_visit={self.related_visit!r})"
+
+    @staticmethod
+    def get_visit_models(related_visit: RelatedVisitModel) -> set[str]:
+        visit = related_visit.visit
+        return {f.model for f in visit.all_crfs} | {f.model for f in visit.all_requisitions}
+
+    def is_keyed(self, model: str, panel_name: str | None = None) -> bool:
+        """Returns True if a source model instance exists."""
+        return self.count(model, panel_name) > 0
+
+    def count(self, model: str, panel_name: str | None = None) -> int:
+        """Returns the number of source model instances."""
+        return len(self.get_all_values(model, panel_name))
+
+    def get_values(self, model: str, panel_name: str | None = None) -> dict[str, Any] | None:
+        """Returns the values of the first source model instance
+        or None.
+        """
+        values = self.get_all_values(model, panel_name)
+        return values[0] if values else None
+
+    def get_all_values(
+        self, model: str, panel_name: str | None = None
+    ) -> list[dict[str, Any]]:
+        if model not in self._selected_models:
+            self.models.add(model)
+            self.select(self.models - self._selected_models)
+        return self._values.get((model, panel_name or ""), [])
+
+    def select(self, models: set[str]) -> None:
+        """Selects the source model values for `models` using one
+        UNION ALL query per `max_union_size` models.
+
+        Models not found in the app registry are ignored.
+        """
+        querysets = []
+        for model in sorted(models):
+            with suppress(LookupError):
+                querysets.append(self.get_queryset(model))
+        for i in range(0, len(querysets), self.max_union_size):
+            qs, *others = querysets[i : i + self.max_union_size]
+            if others:
+                qs = qs.union(*others, all=True)
+            for values in qs:
+                key = (values["keyed_model"], values["keyed_panel_name"] or "")
+                self._values.setdefault(key, []).append(values)
+        self._selected_models.update(models)
+
+    def get_queryset(self, model: str) -> QuerySet:
+        """Returns a values queryset of the source model instances
+        for this related_visit.
+        """
+        model_cls = django_apps.get_model(model)
+        try:
+            related_visit_model_attr = model_cls.related_visit_model_attr()
+        except AttributeError:
+            related_visit_model_attr = "subject_visit"
+        try:
+            model_cls._meta.get_field("panel")
+        except FieldDoesNotExist:
+            panel_name = Value("", output_field=CharField())
+        else:
+            panel_name = F("panel__name")
+        return (
+            model_cls.objects.filter(
+                **{f"{related_visit_model_attr}_id": self.related_visit.id}
+            )
+            .annotate(
+                keyed_model=Value(model, output_field=CharField()),
+                keyed_panel_name=panel_name,
+            )
+            .order_by()
+            .values(*self.values_fields)
+        )
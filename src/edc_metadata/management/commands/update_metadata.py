@@ -12,12 +12,47 @@ style = color_style()
 class Command(BaseCommand):
     help = "Update metadata and re-run metadatarules"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=1,
+            help="Number of worker processes (default: 1)",
+        )
+
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=100,
+            help="Number of subjects per chunk / transaction (default: 100)",
+        )
+
+        parser.add_argument(
+            "--resume",
+            dest="resume",
+            action="store_true",
+            default=False,
+            help=(
+                "Resume an interrupted run from the last completed chunk. "
+                "Existing metadata is not deleted."
+            ),
+        )
+
     def handle(self, *args, **options) -> None:  # noqa: ARG002
-        metadata_refresher = MetadataRefresher(verbose=True, fresh_create=True)
-        sys.stdout.write("Deleting all CrfMetadata...     \r")
-        CrfMetadata.objects.all().delete()
-        sys.stdout.write("Deleting all CrfMetadata...done.                    \n")
-        sys.stdout.write("Deleting all RequisitionMetadata...     \r")
-        RequisitionMetadata.objects.all().delete()
-        sys.stdout.write("Deleting all RequisitionMetadata...done.            \n")
+        metadata_refresher = MetadataRefresher(
+            verbose=True,
+            fresh_create=True,
+            workers=options.get("workers"),
+            chunk_size=options.get("chunk_size"),
+            resume=options.get("resume"),
+        )
+        if not options.get("resume"):
+            sys.stdout.write("Deleting all CrfMetadata...     \r")
+            CrfMetadata.objects.all().delete()
+            sys.stdout.write("Deleting all CrfMetadata...done.                    \n")
+            sys.stdout.write("Deleting all RequisitionMetadata...     \r")
+            RequisitionMetadata.objects.all().delete()
+            sys.stdout.write("Deleting all RequisitionMetadata...done.            \n")
         metadata_refresher.run()
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 from django.apps import apps as django_apps
 from django.contrib.admin.sites import all_sites
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 from edc_visit_schedule.exceptions import MissedVisitError, UnScheduledVisitError
 from edc_visit_schedule.visit import CrfCollection, RequisitionCollection
 from edc_visit_tracking.constants import MISSED_VISIT
 
 from ..constants import KEYED, NOT_REQUIRED, REQUIRED
+from ..keyed_map import KeyedMap
 from ..metadata_mixins import SourceModelMetadataMixin
-from ..utils import verify_model_cls_registered_with_admin
+from ..utils import bulk_create_metadata, verify_model_cls_registered_with_admin
 
 if TYPE_CHECKING:
     from edc_model.models import BaseUuidModel
@@ -68,8 +71,11 @@ class CrfCreator(SourceModelMetadataMixin):
         update_keyed: bool,
         crf: Crf | Requisition,
         fresh_create: bool = False,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
-        super().__init__(source_model=crf.model, related_visit=related_visit)
+        super().__init__(
+            source_model=crf.model, related_visit=related_visit, keyed_map=keyed_map
+        )
         self._metadata_obj = None
         self.update_keyed = update_keyed
         self.crf = crf
@@ -153,18 +159,29 @@ class CrfCreator(SourceModelMetadataMixin):
         Note: that the default `entry_status` may be changed by rules
         later on.
         """
-        if metadata_obj.entry_status != KEYED and self.source_model_obj_exists:
-            metadata_obj.entry_status = KEYED
+        entry_status = self.get_default_or_keyed_entry_status(
+            metadata_obj.entry_status, self.source_model_obj_exists
+        )
+        if entry_status != metadata_obj.entry_status:
+            metadata_obj.entry_status = entry_status
             metadata_obj.save(update_fields=["entry_status"])
-        elif metadata_obj.entry_status in [REQUIRED, NOT_REQUIRED]:
-            if self.crf.required and metadata_obj.entry_status == NOT_REQUIRED:
-                metadata_obj.entry_status = REQUIRED
-                metadata_obj.save(update_fields=["entry_status"])
-            elif (not self.crf.required) and (metadata_obj.entry_status == REQUIRED):
-                metadata_obj.entry_status = NOT_REQUIRED
-                metadata_obj.save(update_fields=["entry_status"])
         return metadata_obj
 
+    def get_default_or_keyed_entry_status(
+        self, entry_status: str, source_model_obj_exists: bool
+    ) -> str:
+        """Returns the `entry_status` a metadata record should have
+        given its current `entry_status` and whether the source model
+        instance exists.
+
+        See also `update_entry_status_to_default_or_keyed`.
+        """
+        if entry_status != KEYED and source_model_obj_exists:
+            entry_status = KEYED
+        elif entry_status in [REQUIRED, NOT_REQUIRED]:
+            entry_status = REQUIRED if self.crf.required else NOT_REQUIRED
+        return entry_status
+
 
 class RequisitionCreator(CrfCreator):
     metadata_model: str = "edc_metadata.requisitionmetadata"
@@ -175,12 +192,14 @@ class RequisitionCreator(CrfCreator):
         update_keyed: bool,
         related_visit: RelatedVisitModel,
         fresh_create: bool = False,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
         super().__init__(
             crf=requisition,
             update_keyed=update_keyed,
             related_visit=related_visit,
             fresh_create=fresh_create,
+            keyed_map=keyed_map,
         )
         self.panel_name: str = f"{self.requisition.model}.{self.requisition.panel.name}"
 
@@ -199,18 +218,41 @@ class RequisitionCreator(CrfCreator):
         """Source model query options"""
         return dict(subject_visit=self.related_visit, panel__name=self.requisition.panel.name)
 
+    @property
+    def metadata_key(self) -> tuple[str, str]:
+        return self.source_model, self.requisition.panel.name
+
 
 class Creator:
+    """A class to create metadata for all CRFs and requisitions of
+    a related_visit.
+
+    Whether a source model instance exists is read from a `KeyedMap`,
+    one UNION ALL query for all source model tables of the visit.
+    Pass `keyed_map` to share one map across a save.
+    """
+
     crf_creator_cls = CrfCreator
     requisition_creator_cls = RequisitionCreator
+    keyed_map_cls = KeyedMap
 
     def __init__(
         self,
         update_keyed: bool,
         related_visit: RelatedVisitModel,
+        bulk: bool | None = None,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
         self.related_visit = related_visit
         self.update_keyed = update_keyed
+        self.bulk = bulk_create_metadata() if bulk is None else bulk
+        self._keyed_map = keyed_map
+
+    @property
+    def keyed_map(self) -> KeyedMap:
+        if self._keyed_map is None:
+            self._keyed_map = self.keyed_map_cls(related_visit=self.related_visit)
+        return self._keyed_map
 
     @property
     def crfs(self) -> CrfCollection:
@@ -268,26 +310,157 @@ class Creator:
     def create(self, fresh_create: bool = False) -> None:
         """Creates metadata for all CRFs and requisitions for
         the scheduled or unscheduled visit instance.
+
+        If `bulk`, see `create_in_bulk`.
         """
+        if self.bulk:
+            self.create_in_bulk(fresh_create=fresh_create)
+            return
         for crf in self.crfs:
             self.create_crf(crf, fresh_create=fresh_create)
         for requisition in self.requisitions:
             self.create_requisition(requisition, fresh_create=fresh_create)
 
+    def create_in_bulk(self, fresh_create: bool = False) -> None:
+        """Creates or updates metadata for all CRFs and requisitions
+        for the visit using a constant number of queries per metadata
+        model and one for the source model tables (see `KeyedMap`),
+        regardless of the number of forms in the visit.
+
+        Gives the same result as calling `CrfCreator.create` /
+        `RequisitionCreator.create` for each form, in order, but:
+          * prefetches all existing metadata for the visit in one query;
+          * selects the source model instances, if any, in one
+            UNION ALL query over the source model tables;
+          * applies the changes with `bulk_create(ignore_conflicts=True)`,
+            `bulk_update` and one delete.
+
+        Note: as with `bulk_create`, no model `save` is called.
+        """
+        with transaction.atomic():
+            self._create_in_bulk(
+                [
+                    self.crf_creator_cls(
+                        crf=crf,
+                        update_keyed=self.update_keyed,
+                        related_visit=self.related_visit,
+                        fresh_create=fresh_create,
+                        keyed_map=self.keyed_map,
+                    )
+                    for crf in self.crfs
+                ],
+                fresh_create=fresh_create,
+            )
+            self._create_in_bulk(
+                [
+                    self.requisition_creator_cls(
+                        requisition=requisition,
+                        update_keyed=self.update_keyed,
+                        related_visit=self.related_visit,
+                        fresh_create=fresh_create,
+                        keyed_map=self.keyed_map,
+                    )
+                    for requisition in self.requisitions
+                ],
+                fresh_create=fresh_create,
+            )
+
+    def _create_in_bulk(self, creators: list[CrfCreator], fresh_create: bool) -> None:
+        if not creators:
+            return
+        metadata_model_cls = creators[0].metadata_model_cls
+        existing = {}
+        if not fresh_create:
+            existing = {
+                (obj.model, getattr(obj, "panel_name", "")): obj
+                for obj in metadata_model_cls.objects.filter(
+                    subject_identifier=self.related_visit.subject_identifier,
+                    **self.related_visit.metadata_query_options,
+                )
+            }
+        source_values = self.get_source_model_values(creators)
+        now = timezone.now()
+        to_create = {}
+        to_update = {}
+        to_delete = set()
+        for creator in creators:
+            key = creator.metadata_key
+            if not model_cls_registered_with_admin_site(creator.source_model_cls):
+                if key in existing:
+                    to_delete.add(existing.pop(key).id)
+                    to_update.pop(key, None)
+                to_create.pop(key, None)
+                continue
+            values = source_values.get(key)
+            metadata_obj = existing.get(key) or to_create.get(key)
+            if metadata_obj is None:
+                metadata_obj = metadata_model_cls(
+                    id=uuid4(),
+                    entry_status=(REQUIRED if creator.crf.required else NOT_REQUIRED),
+                    show_order=creator.crf.show_order,
+                    site=self.related_visit.site,
+                    due_datetime=creator.due_datetime,
+                    fill_datetime=values.get("created") if values else None,
+                    document_user=(
+                        values.get("user_created")
+                        if values
+                        else self.related_visit.user_created
+                    ),
+                    document_name=creator.document_name,
+                    created=now,
+                    modified=now,
+                    **creator.query_options,
+                )
+                to_create[key] = metadata_obj
+            entry_status = creator.get_default_or_keyed_entry_status(
+                metadata_obj.entry_status, values is not None
+            )
+            if entry_status != metadata_obj.entry_status:
+                metadata_obj.entry_status = entry_status
+                if key not in to_create:
+                    metadata_obj.modified = now
+                    to_update[key] = metadata_obj
+        if to_delete:
+            metadata_model_cls.objects.filter(id__in=to_delete).delete()
+        if to_create:
+            metadata_model_cls.objects.bulk_create(
+                list(to_create.values()), ignore_conflicts=True
+            )
+        if to_update:
+            metadata_model_cls.objects.bulk_update(
+                list(to_update.values()), fields=["entry_status", "modified"]
+            )
+
+    def get_source_model_values(self, creators: list[CrfCreator]) -> dict[tuple, dict]:
+        """Returns a dict of {metadata_key: values} for each source
+        model instance that exists for this visit.
+
+        See `KeyedMap`.
+        """
+        source_values = {}
+        for creator in creators:
+            if values := self.keyed_map.get_values(*creator.metadata_key):
+                source_values[creator.metadata_key] = values
+        return source_values
+
     def create_crf(self, crf, fresh_create: bool = False) -> CrfMetadata:
         return self.crf_creator_cls(
             crf=crf,
             update_keyed=self.update_keyed,
             related_visit=self.related_visit,
             fresh_create=fresh_create,
+            keyed_map=self.keyed_map,
         ).create()
 
-    def create_requisition(self, requisition, fresh_create: bool = False) -> RequisitionMetadata:
+    def create_requisition(
+        self, requisition, fresh_create: bool = False
+    ) -> RequisitionMetadata:
         return self.requisition_creator_cls(
             requisition=requisition,
             update_keyed=self.update_keyed,
             related_visit=self.related_visit,
             fresh_create=fresh_create,
+            keyed_map=self.keyed_map,
         ).create()
 
 
@@ -333,11 +506,14 @@ class Metadata:
         self,
         related_visit: RelatedVisitModel | CreatesMetadataModelMixin,
         update_keyed: bool,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
         self._reason = None
         self._reason_field = "reason"
         self.related_visit = related_visit
-        self.creator = self.creator_cls(related_visit=related_visit, update_keyed=update_keyed)
+        self.creator = self.creator_cls(
+            related_visit=related_visit, update_keyed=update_keyed, keyed_map=keyed_map
+        )
         self.destroyer = self.destroyer_cls(related_visit=related_visit)
 
     def prepare(self, fresh_create: bool = False) -> bool:
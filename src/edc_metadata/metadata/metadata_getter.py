@@ -8,6 +8,7 @@ from django.contrib.admin.sites import all_sites
 from django.core.exceptions import MultipleObjectsReturned
 from django.db.models import QuerySet
 
+from ..keyed_map import KeyedMap
 from .metadata import model_cls_registered_with_admin_site
 
 if TYPE_CHECKING:
@@ -26,15 +27,31 @@ class MetadataValidator:
         self,
         metadata_obj: CrfMetadata | RequisitionMetadata,
         related_visit: RelatedVisitProtocol,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
         self.metadata_obj = metadata_obj
         self.related_visit = related_visit
+        self.keyed_map = keyed_map
         self.validate_metadata_object()
 
     @property
     def extra_query_attrs(self) -> dict:
         return {}
 
+    @property
+    def metadata_key(self) -> tuple[str, str]:
+        return self.metadata_obj.model, ""
+
+    def source_model_obj_count(self, source_model_cls: Any) -> int:
+        """Returns the number of source model instances for this
+        metadata model instance, from the keyed map, if given.
+        """
+        if self.keyed_map is not None:
+            return self.keyed_map.count(*self.metadata_key)
+        query_attrs = {f"{source_model_cls.related_visit_model_attr()}": self.related_visit}
+        query_attrs.update(**self.extra_query_attrs)
+        return source_model_cls.objects.filter(**query_attrs).values("id").count()
+
     def validate_metadata_object(self) -> None:
         if self.metadata_obj:
             # confirm model class exists
@@ -52,26 +69,21 @@ class MetadataValidator:
                     )
                     self.metadata_obj.delete()
                     self.metadata_obj = None
-                else:
-                    # confirm metadata.entry_status is correct
-                    query_attrs = {
-                        f"{source_model_cls.related_visit_model_attr()}": self.related_visit
-                    }
-                    query_attrs.update(**self.extra_query_attrs)
-                    if source_model_cls.objects.filter(**query_attrs).values("id").count() > 1:
-                        raise MultipleObjectsReturned(
-                            f"{source_model_cls._meta.label_lower} {self.related_visit}"
-                        )
-                    # try:
-                    #     model_cls.objects.get(**query_attrs)
-                    # except AttributeError as e:
-                    #     if "related_visit_model_attr" not in str(e):
-                    #         raise ImproperlyConfigured(f"{e} See {repr(model_cls)}")
-                    #     raise
-                    # except ObjectDoesNotExist:
-                    #     pass
-                    # except MultipleObjectsReturned:
-                    #     raise
+                # confirm metadata.entry_status is correct
+                elif self.source_model_obj_count(source_model_cls) > 1:
+                    raise MultipleObjectsReturned(
+                        f"{source_model_cls._meta.label_lower} {self.related_visit}"
+                    )
+                # try:
+                #     model_cls.objects.get(**query_attrs)
+                # except AttributeError as e:
+                #     if "related_visit_model_attr" not in str(e):
+                #         raise ImproperlyConfigured(f"{e} See {repr(model_cls)}")
+                #     raise
+                # except ObjectDoesNotExist:
+                #     pass
+                # except MultipleObjectsReturned:
+                #     raise
 
     @staticmethod
     def model_cls_registered_with_admin_site(model_cls: Any) -> bool:
@@ -86,13 +98,15 @@ class MetadataGetter:
     * gets a queryset of CrfMetadata/RequisitionMetadata instances for
       the given appointment;
     * validates the entry status of each using the
-      `metadata_validator_cls` and;
+      `metadata_validator_cls` and a `KeyedMap` of the source models
+      (one query) and;
     * returns a requeried queryset.
     """
 
     metadata_model: str = None
 
     metadata_validator_cls = MetadataValidator
+    keyed_map_cls = KeyedMap
 
     def __init__(self, appointment: Appointment) -> None:
         self.options = {}
@@ -136,7 +150,12 @@ class MetadataGetter:
     def validate_metadata_objects(
         self, queryset: QuerySet[CrfMetadata | RequisitionMetadata]
     ) -> QuerySet[CrfMetadata | RequisitionMetadata]:
-        metadata_obj: CrfMetadata | RequisitionMetadata
-        for metadata_obj in queryset:
-            self.metadata_validator_cls(metadata_obj, self.related_visit)
+        metadata_objs: list[CrfMetadata | RequisitionMetadata] = list(queryset)
+        keyed_map = None
+        if self.related_visit:
+            keyed_map = self.keyed_map_cls(
+                related_visit=self.related_visit, models={obj.model for obj in metadata_objs}
+            )
+        for metadata_obj in metadata_objs:
+            self.metadata_validator_cls(metadata_obj, self.related_visit, keyed_map=keyed_map)
         return queryset.all()
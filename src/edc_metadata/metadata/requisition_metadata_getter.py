@@ -8,6 +8,10 @@ class RequisitionMetadataValidator(MetadataValidator):
     def extra_query_attrs(self) -> dict:
         return dict(panel__name=self.metadata_obj.panel_name)
 
+    @property
+    def metadata_key(self) -> tuple[str, str]:
+        return self.metadata_obj.model, self.metadata_obj.panel_name
+
 
 class RequisitionMetadataGetter(MetadataGetter):
     metadata_model: str = "edc_metadata.requisitionmetadata"
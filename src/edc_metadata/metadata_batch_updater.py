@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps as django_apps
+from django.db import transaction
+
+from .constants import KEYED
+from .keyed_map import KeyedMap
+from .metadata_updater import MetadataUpdater
+from .requisition import RequisitionMetadataUpdater
+from .utils import get_crf_metadata_model_cls, get_requisition_metadata_model_cls
+
+if TYPE_CHECKING:
+    from edc_lab.models import Panel
+    from edc_visit_tracking.model_mixins import VisitModelMixin as Base
+
+    from .model_mixins.creates import CreatesMetadataModelMixin
+    from .models import CrfMetadata, RequisitionMetadata
+
+    class RelatedVisitModel(CreatesMetadataModelMixin, Base):
+        pass
+
+
+@dataclass(frozen=True)
+class MetadataResolution:
+    """The resolved `entry_status` for one metadata target.
+
+    `rule` is the last rule to set the target ("last rule wins").
+    `overridden` lists the earlier (rule, entry_status) pairs, in
+    evaluation order. `applied_entry_status` is the value saved,
+    KEYED if the source model instance exists.
+    """
+
+    target_model: str
+    panel_name: str
+    entry_status: str
+    rule: str
+    overridden: tuple[tuple[str, str], ...]
+    applied_entry_status: str | None = None
+    changed: bool = False
+
+
+class MetadataBatchUpdater:
+    """A class to collect the entry_status set by metadata rules for
+    a related_visit and apply the net changes in one pass.
+
+    Call `add` once per rule result in evaluation order, then call
+    `apply`. The last rule to set a target wins.
+
+    Existing CrfMetadata and RequisitionMetadata rows are fetched in
+    one query each and changes are saved with `bulk_update`. Missing
+    rows (e.g. a PRN) are created with `MetadataUpdater`. Source model
+    instances are read from `keyed_map`, if given, or from a
+    `KeyedMap` of the target models.
+    """
+
+    crf_metadata_updater_cls = MetadataUpdater
+    requisition_metadata_updater_cls = RequisitionMetadataUpdater
+    keyed_map_cls = KeyedMap
+    update_fields = (
+        "entry_status",
+        "due_datetime",
+        "fill_datetime",
+        "document_name",
+        "document_user",
+    )
+
+    def __init__(
+        self,
+        related_visit: RelatedVisitModel = None,
+        allow_create: bool | None = None,
+        keyed_map: KeyedMap | None = None,
+    ) -> None:
+        self.related_visit = related_visit
+        self.allow_create = allow_create
+        self.keyed_map = keyed_map
+        self.panels: dict[str, Panel] = {}
+        self.results: dict[tuple[str, str], list[tuple[str, str]]] = {}
+
+    def add(
+        self,
+        rule: Any,
+        target_model: str,
+        entry_status: str,
+        target_panel: Panel | None = None,
+    ) -> None:
+        """Records the entry_status set by `rule` for a target."""
+        panel_name = target_panel.name if target_panel else ""
+        if target_panel:
+            self.panels[panel_name] = target_panel
+        self.results.setdefault((target_model, panel_name), []).append(
+            (str(rule), entry_status)
+        )
+
+    def apply(self) -> dict[tuple[str, str], MetadataResolution]:
+        """Saves the net changes and returns a resolution report
+        keyed by (target_model, panel_name).
+        """
+        resolutions = {}
+        with transaction.atomic():
+            crf_objs = self.get_metadata_objs(requisitions=False)
+            requisition_objs = self.get_metadata_objs(requisitions=True)
+            source_values = self.get_source_values()
+            changed_crf_objs = []
+            changed_requisition_objs = []
+            for (target_model, panel_name), results in self.results.items():
+                rule, entry_status = results[-1]
+                key = (target_model, panel_name)
+                metadata_obj = (requisition_objs if panel_name else crf_objs).get(key)
+                if metadata_obj is None:
+                    metadata_obj = self.get_and_update(target_model, panel_name, entry_status)
+                    changed = True
+                else:
+                    changed = self.update_metadata_obj(
+                        metadata_obj, target_model, entry_status, source_values.get(key)
+                    )
+                    if changed:
+                        (changed_requisition_objs if panel_name else changed_crf_objs).append(
+                            metadata_obj
+                        )
+                resolutions[key] = MetadataResolution(
+                    target_model=target_model,
+                    panel_name=panel_name,
+                    entry_status=entry_status,
+                    rule=rule,
+                    overridden=tuple(results[:-1]),
+                    applied_entry_status=getattr(metadata_obj, "entry_status", None),
+                    changed=changed,
+                )
+            if changed_crf_objs:
+                get_crf_metadata_model_cls().objects.bulk_update(
+                    changed_crf_objs, fields=self.update_fields
+                )
+            if changed_requisition_objs:
+                get_requisition_metadata_model_cls().objects.bulk_update(
+                    changed_requisition_objs, fields=self.update_fields
+                )
+        return resolutions
+
+    def get_metadata_objs(
+        self, requisitions: bool
+    ) -> dict[tuple[str, str], CrfMetadata | RequisitionMetadata]:
+        """Returns existing metadata model instances for the targets,
+        keyed by (model, panel_name).
+        """
+        keys = [key for key in self.results if bool(key[1]) == requisitions]
+        if not keys:
+            return {}
+        opts = self.related_visit.metadata_query_options
+        opts.update(
+            subject_identifier=self.related_visit.subject_identifier,
+            model__in={key[0] for key in keys},
+        )
+        if requisitions:
+            opts.update(panel_name__in={key[1] for key in keys})
+            model_cls = get_requisition_metadata_model_cls()
+        else:
+            model_cls = get_crf_metadata_model_cls()
+        return {
+            (obj.model, getattr(obj, "panel_name", "") if requisitions else ""): obj
+            for obj in model_cls.objects.filter(**opts)
+        }
+
+    def get_source_values(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """Returns "created" and "user_created" of the existing source
+        model instances for the targets.
+        """
+        if self.keyed_map is None:
+            self.keyed_map = self.keyed_map_cls(
+                related_visit=self.related_visit, models={key[0] for key in self.results}
+            )
+        return {
+            key: values for key in self.results if (values := self.keyed_map.get_values(*key))
+        }
+
+    def update_metadata_obj(
+        self,
+        metadata_obj: CrfMetadata | RequisitionMetadata,
+        target_model: str,
+        entry_status: str,
+        source_values: dict[str, Any] | None,
+    ) -> bool:
+        """Updates the metadata model instance in memory. Returns
+        True if changed.
+
+        Same rules as `MetadataUpdater.get_and_update`.
+        """
+        if entry_status != KEYED and source_values:
+            entry_status = KEYED
+        if metadata_obj.entry_status == entry_status:
+            return False
+        source_values = source_values or {}
+        metadata_obj.entry_status = entry_status
+        metadata_obj.due_datetime = self.related_visit.report_datetime
+        metadata_obj.fill_datetime = source_values.get("created")
+        metadata_obj.document_user = source_values.get(
+            "user_created", self.related_visit.user_created
+        )
+        metadata_obj.document_name = django_apps.get_model(target_model)._meta.verbose_name
+        return True
+
+    def get_and_update(
+        self, target_model: str, panel_name: str, entry_status: str
+    ) -> CrfMetadata | RequisitionMetadata | None:
+        """Creates and updates a missing metadata model instance."""
+        if panel_name:
+            metadata_updater = self.requisition_metadata_updater_cls(
+                related_visit=self.related_visit,
+                source_model=target_model,
+                source_panel=self.panels[panel_name],
+                allow_create=self.allow_create,
+                keyed_map=self.keyed_map,
+            )
+        else:
+            metadata_updater = self.crf_metadata_updater_cls(
+                related_visit=self.related_visit,
+                source_model=target_model,
+                allow_create=self.allow_create,
+                keyed_map=self.keyed_map,
+            )
+        return metadata_updater.get_and_update(entry_status=entry_status)
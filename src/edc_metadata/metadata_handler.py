@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from edc_sites.model_mixins import SiteModelMixin
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
+    from .keyed_map import KeyedMap
     from .model_mixins.creates import CreatesMetadataModelMixin
     from .models import CrfMetadata, RequisitionMetadata
 
@@ -40,12 +41,15 @@ class MetadataHandler:
         related_visit: RelatedVisitModel = None,
         model: str = None,
         allow_create: bool | None = None,
+        keyed_map: KeyedMap | None = None,
     ):
         self.allow_create = True if allow_create is None else allow_create
         self.metadata_model: str = metadata_model
         self.model: str = model
         self.related_visit = related_visit
-        self.creator = self.creator_cls(related_visit=self.related_visit, update_keyed=True)
+        self.creator = self.creator_cls(
+            related_visit=self.related_visit, update_keyed=True, keyed_map=keyed_map
+        )
 
     @property
     def metadata_model_cls(self) -> type[CrfMetadata] | type[RequisitionMetadata]:
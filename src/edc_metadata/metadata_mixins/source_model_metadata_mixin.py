@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from edc_sites.model_mixins import SiteModelMixin
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
+    from ..keyed_map import KeyedMap
     from ..model_mixins.creates import CreatesMetadataModelMixin
 
     class RelatedVisitModel(SiteModelMixin, CreatesMetadataModelMixin, Base, BaseUuidModel):
@@ -20,12 +21,23 @@ if TYPE_CHECKING:
 
 
 class SourceModelMetadataMixin:
-    """Mixin class for Metadata and MetadataUpdater class."""
-
-    def __init__(self, source_model: str, related_visit: RelatedVisitModel):
+    """Mixin class for Metadata and MetadataUpdater class.
+
+    If a `keyed_map` is given, `source_model_obj_exists`,
+    `fill_datetime` and `document_user` are read from the map instead
+    of querying the source model.
+    """
+
+    def __init__(
+        self,
+        source_model: str,
+        related_visit: RelatedVisitModel,
+        keyed_map: KeyedMap | None = None,
+    ):
         self._source_model_obj = None
         self._source_model = source_model
         self.related_visit = related_visit
+        self.keyed_map = keyed_map
 
     @property
     def source_model(self) -> str:
@@ -54,9 +66,23 @@ class SourceModelMetadataMixin:
         """
         return dict(subject_visit_id=self.related_visit.id)
 
+    @property
+    def metadata_key(self) -> tuple[str, str]:
+        """Returns a key unique to this form's metadata record
+        within the visit, (model, panel_name).
+        """
+        return self.source_model, ""
+
+    @property
+    def source_model_values(self) -> dict[str, Any] | None:
+        """Returns the source model values from the keyed map or None."""
+        return self.keyed_map.get_values(*self.metadata_key)
+
     @property
     def source_model_obj_exists(self) -> bool:
         """Returns True if the source model instance exists."""
+        if self.keyed_map is not None:
+            return self.source_model_values is not None
         return self.source_model_obj is not None
 
     @property
@@ -65,10 +91,16 @@ class SourceModelMetadataMixin:
 
     @property
     def fill_datetime(self) -> datetime | None:
+        if self.keyed_map is not None:
+            return (self.source_model_values or {}).get("created")
         return getattr(self.source_model_obj, "created", None)
 
     @property
     def document_user(self) -> str | None:
+        if self.keyed_map is not None:
+            return (self.source_model_values or {}).get(
+                "user_created", self.related_visit.user_created
+            )
         return getattr(self.source_model_obj, "user_created", self.related_visit.user_created)
 
     @property
@@ -1,46 +1,171 @@
 from __future__ import annotations
 
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Any
 
 from django.apps import apps as django_apps
 from django.contrib.admin.sites import all_sites
+from django.db import connections, transaction
 from django.db.models import Count
 from tqdm import tqdm
 
 from edc_appointment.models import Appointment
-from edc_metadata.models import CrfMetadata, RequisitionMetadata
+from edc_metadata.models import (
+    CrfMetadata,
+    MetadataRefresherCheckpoint,
+    RequisitionMetadata,
+)
+from edc_utils.process_pool import get_mp_context, init_worker
 from edc_visit_schedule.site_visit_schedules import site_visit_schedules
 from edc_visit_tracking.utils import get_related_visit_model_cls
 
 from .metadata import CrfMetadataGetter, RequisitionMetadataGetter
 from .metadata_rules import site_metadata_rules
 
+METADATA_STAGE = "metadata"
+RULES_STAGE = "rules"
+
+
+def refresh_metadata_for_subjects(
+    stage: str, subject_identifiers: list[str], fresh_create: bool | None = None
+) -> int:
+    """Creates metadata or runs metadata rules for all related visits
+    of the given subjects in a single transaction and records a
+    checkpoint for the chunk.
+
+    Returns the number of related visits processed.
+    """
+    related_visits = (
+        get_related_visit_model_cls()
+        .objects.filter(subject_identifier__in=subject_identifiers)
+        .select_related("appointment", "site")
+        .order_by("subject_identifier", "appointment__timepoint", "visit_code_sequence")
+    )
+    visit_count = 0
+    with transaction.atomic():
+        for related_visit in related_visits:
+            if stage == METADATA_STAGE:
+                related_visit.metadata_create(fresh_create=fresh_create)
+            elif django_apps.get_app_config("edc_metadata").metadata_rules_enabled:
+                related_visit.run_metadata_rules()
+            visit_count += 1
+        MetadataRefresherCheckpoint.objects.create(
+            stage=stage,
+            first_subject_identifier=subject_identifiers[0],
+            last_subject_identifier=subject_identifiers[-1],
+            subject_count=len(subject_identifiers),
+            visit_count=visit_count,
+            subject_identifiers="\n".join(subject_identifiers),
+        )
+    return visit_count
+
 
 class MetadataRefresher:
     """A class to be `run` when metadata gets out-of-date
 
     This may happen when there are changes to the visit schedule,
     metadata rules or manual changes to data.
+
+    If `chunk_size` is set, related visits are partitioned by subject
+    into chunks of `chunk_size` subjects. Each chunk is processed in
+    its own transaction, across a pool of `workers` processes, and a
+    `MetadataRefresherCheckpoint` is recorded when the chunk
+    completes. With `resume=True`, subjects already checkpointed by
+    a previous, interrupted run are skipped.
     """
 
-    def __init__(self, verbose: bool | None = None, fresh_create: bool = False):
+    def __init__(
+        self,
+        verbose: bool | None = None,
+        fresh_create: bool = False,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        resume: bool | None = None,
+    ):
         self._source_models = []
         self._admin_models = []
         self.verbose = verbose
         self.fresh_create = fresh_create
+        self.workers = workers or 1
+        self.chunk_size = chunk_size
+        if self.workers > 1 and not self.chunk_size:
+            self.chunk_size = 100
+        self.resume = resume
 
     def run(self) -> None:
+        if self.chunk_size and not self.resume:
+            MetadataRefresherCheckpoint.objects.all().delete()
         self._message("Updating metadata ...     \n")
         self.create_or_update_metadata_for_all()
 
         # note: only need to run metadata rules on the related
         # visit model
         self._message("Running metadata rules ...\n")
-        total = get_related_visit_model_cls().objects.all().count()
-        self.run_metadata_rules(get_related_visit_model_cls(), total)
+        if self.chunk_size:
+            self.run_in_chunks(RULES_STAGE)
+        else:
+            total = get_related_visit_model_cls().objects.all().count()
+            self.run_metadata_rules(get_related_visit_model_cls(), total)
         self._message("Done.\n")
 
+    def get_chunks(self, stage: str) -> list[list[str]]:
+        """Returns a list of chunks of subject identifiers not yet
+        checkpointed for this stage.
+        """
+        subject_identifiers = list(
+            get_related_visit_model_cls()
+            .objects.values_list("subject_identifier", flat=True)
+            .order_by("subject_identifier")
+            .distinct()
+        )
+        if self.resume:
+            completed = {
+                subject_identifier
+                for value in MetadataRefresherCheckpoint.objects.filter(
+                    stage=stage
+                ).values_list("subject_identifiers", flat=True)
+                for subject_identifier in value.splitlines()
+            }
+            subject_identifiers = [
+                subject_identifier
+                for subject_identifier in subject_identifiers
+                if subject_identifier not in completed
+            ]
+        return [
+            subject_identifiers[i : i + self.chunk_size]
+            for i in range(0, len(subject_identifiers), self.chunk_size)
+        ]
+
+    def run_in_chunks(self, stage: str) -> None:
+        """Creates metadata or runs metadata rules, per chunk of
+        subjects, in this process or across a process pool.
+        """
+        chunks = self.get_chunks(stage)
+        self._message(
+            f"   - {len(chunks)} chunks of up to {self.chunk_size} subjects "
+            f"({self.workers} workers) ... \n"
+        )
+        if self.workers > 1 and len(chunks) > 1:
+            # workers must not share the parent's DB connection
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_mp_context(),
+                initializer=init_worker,
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        refresh_metadata_for_subjects, stage, chunk, self.fresh_create
+                    )
+                    for chunk in chunks
+                ]
+                for future in tqdm(as_completed(futures), total=len(futures)):
+                    future.result()
+        else:
+            for chunk in tqdm(chunks, total=len(chunks)):
+                refresh_metadata_for_subjects(stage, chunk, self.fresh_create)
+
     @property
     def source_models(self) -> list[str]:
         if not self._source_models:
@@ -150,8 +275,11 @@ class MetadataRefresher:
         self._message(
             f"   - {model_count} post-consent models found for {total} visits ... \n"
         )
-        for related_visit in tqdm(related_visits, total=total):
-            related_visit.metadata_create(fresh_create=self.fresh_create)
+        if self.chunk_size:
+            self.run_in_chunks(METADATA_STAGE)
+        else:
+            for related_visit in tqdm(related_visits, total=total):
+                related_visit.metadata_create(fresh_create=self.fresh_create)
         self._message("    Done.\n")
 
     def validate_metadata_for_all(self):
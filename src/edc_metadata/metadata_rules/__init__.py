@@ -10,6 +10,7 @@ from .requisition import (
     RequisitionRuleGroupMetaOptionsError,
 )
 from .rule import Rule, RuleError
+from .rule_evaluation_context import RuleEvaluationContext
 from .rule_evaluator import RuleEvaluatorError, RuleEvaluatorRegisterSubjectError
 from .rule_group import TargetModelConflict
 from .rule_group_meta_options import RuleGroupMetaError
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
     from ...model_mixins.creates import CreatesMetadataModelMixin
+    from ..rule_evaluation_context import RuleEvaluationContext
 
     class RelatedVisitModel(CreatesMetadataModelMixin, Base):
         pass
@@ -38,7 +39,11 @@ class CrfRule(Rule):
         self.run_only_for_visit_schedules = run_only_for_visit_schedules or []
         self.run_only_for_visit_codes = run_only_for_visit_codes or []
 
-    def run(self, related_visit: RelatedVisitModel) -> dict[str, str] | None:
+    def run(
+        self,
+        related_visit: RelatedVisitModel,
+        context: RuleEvaluationContext | None = None,
+    ) -> dict[str, str] | None:
         visit_schedule_schedule = f"{related_visit.visit_schedule}.{related_visit.schedule}"
         if self.source_model in self.target_models:
             raise CrfRuleModelConflict(
@@ -60,4 +65,4 @@ class CrfRule(Rule):
             )
         ):
             return None
-        return super().run(related_visit=related_visit)
+        return super().run(related_visit=related_visit, context=context)
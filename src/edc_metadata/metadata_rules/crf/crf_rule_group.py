@@ -12,8 +12,11 @@ from ..rule_group_metaclass import RuleGroupMetaclass
 if TYPE_CHECKING:
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
+    from ...metadata_batch_updater import MetadataBatchUpdater
     from ...model_mixins.creates import CreatesMetadataModelMixin
     from ...models import CrfMetadata
+    from ..rule_evaluation_context import RuleEvaluationContext
+    from .crf_rule import CrfRule
 
     class RelatedVisitModel(CreatesMetadataModelMixin, Base):
         pass
@@ -32,31 +35,33 @@ class CrfRuleGroup(RuleGroup, metaclass=RuleGroupMetaclass):
 
     @classmethod
     def crfs_for_visit(cls, visit: RelatedVisitModel = None) -> CrfCollection:
-        """Returns a list of scheduled or unscheduled
+        """Returns a frozen collection of scheduled or unscheduled
         CRFs + PRNs depending on visit_code_sequence.
         """
-        if visit.visit_code_sequence != 0:
-            crfs = CrfCollection(
-                *visit.visit.crfs_unscheduled,
-                *visit.visit.crfs_prn,
-                name="crfs_for_visit",
-            )
-        else:
-            crfs = CrfCollection(
-                *visit.visit.crfs, *visit.visit.crfs_prn, name="crfs_for_visit"
-            )
-        return crfs
+        return visit.visit.get_crfs(visit.visit_code_sequence)
 
     @classmethod
     def evaluate_rules(
         cls: Any,
         related_visit: RelatedVisitModel = None,
         allow_create: bool | None = None,
+        rules: list[CrfRule] | None = None,
+        context: RuleEvaluationContext | None = None,
+        batch_updater: MetadataBatchUpdater | None = None,
     ) -> tuple[dict[str, dict[str, dict]], dict[str, CrfMetadata]]:
+        """Returns a tuple of (rule_results, metadata_objects).
+
+        If `rules` is None, evaluates all rules in this group.
+
+        If `batch_updater` is provided, results are added to it instead
+        of being saved and `metadata_objects` is empty.
+        """
         rule_results = {}
         metadata_objects = {}
-        crfs_for_visit_models = [c.model for c in cls.crfs_for_visit(related_visit)]
-        for rule in cls._meta.options.get("rules"):
+        crfs_for_visit_models = related_visit.visit.get_crf_models(
+            related_visit.visit_code_sequence
+        )
+        for rule in cls._meta.options.get("rules") if rules is None else rules:
             # skip if source model is not in visit.crfs (including PRNs)
             if (
                 rule.source_model
@@ -75,13 +80,15 @@ class CrfRuleGroup(RuleGroup, metaclass=RuleGroupMetaclass):
                         f"Target model and visit model might be the same. "
                         f"Got {target_model}~={related_visit._meta.label_lower}"
                     )
-            if result := rule.run(related_visit=related_visit):
+            if result := rule.run(related_visit=related_visit, context=context):
                 rule_results.update({str(rule): result})
                 for target_model, entry_status in rule_results[str(rule)].items():
                     if not entry_status:
                         raise RuleGroupError("Cannot be None. Got `entry_status`.")
                     # only do something if target model is in visit.crfs (including PRNs)
-                    if target_model in crfs_for_visit_models:
+                    if target_model in crfs_for_visit_models and batch_updater:
+                        batch_updater.add(rule, target_model, entry_status)
+                    elif target_model in crfs_for_visit_models:
                         metadata_updater = cls.metadata_updater_cls(
                             related_visit=related_visit,
                             source_model=target_model,
@@ -4,9 +4,15 @@ from typing import TYPE_CHECKING
 
 from edc_visit_tracking.utils import get_related_visit_model_cls
 
+from ..metadata_batch_updater import MetadataBatchUpdater
+from .rule_evaluation_context import RuleEvaluationContext
 from .site import site_metadata_rules
 
 if TYPE_CHECKING:
+    from ..keyed_map import KeyedMap
+    from ..metadata_batch_updater import MetadataResolution
+    from .rule import Rule
+
     related_visit_model_cls = get_related_visit_model_cls()
 
 
@@ -14,18 +20,34 @@ class MetadataRuleEvaluator:
     """Main class to evaluate rules.
 
     Used by model mixin.
+
+    Each call to `evaluate_rules` shares a new `RuleEvaluationContext`
+    across all rules and predicates. The context is kept on
+    `self.context` for profiling (see `context.hits`, `context.misses`).
+
+    Rule results from all rule groups are collected by a
+    `MetadataBatchUpdater` and the net changes are saved in one pass
+    after all rules have run.
     """
 
+    context_cls = RuleEvaluationContext
+    batch_updater_cls = MetadataBatchUpdater
+
     def __init__(
         self,
         related_visit: related_visit_model_cls = None,
         app_label: str | None = None,
         allow_create: bool | None = None,
+        source_model: str | None = None,
+        keyed_map: KeyedMap | None = None,
     ) -> None:
         self.related_visit = related_visit
+        self.source_model = source_model
+        self.keyed_map = keyed_map
         self.app_labels = [app_label] if app_label else []
         self.related_visit_model = related_visit._meta.label_lower
         self.allow_create = allow_create
+        self.context: RuleEvaluationContext | None = None
         if not self.app_labels:
             for rule_groups in site_metadata_rules.registry.values():
                 for rule_group in rule_groups:
@@ -35,9 +57,44 @@ class MetadataRuleEvaluator:
                     ):
                         self.app_labels.append(rule_group._meta.app_label)
 
-    def evaluate_rules(self) -> None:
+    @property
+    def rules(self) -> set[Rule]:
+        """Returns the set of rules to evaluate for this visit.
+
+        If `source_model` is set, only rules affected by a change to
+        `source_model` are included.
+        """
+        rules = site_metadata_rules.get_rules_for_visit(self.related_visit)
+        if self.source_model:
+            rules = rules.intersection(
+                site_metadata_rules.get_rules_for_model(
+                    self.source_model, self.related_visit_model
+                )
+            )
+        return rules
+
+    def evaluate_rules(self) -> dict[tuple[str, str], MetadataResolution]:
+        """Evaluates the rules and saves the resulting metadata.
+
+        Returns a report of the resolved entry_status per target,
+        keyed by (target_model, panel_name). Where more than one rule
+        sets a target, the last rule evaluated wins.
+        """
+        rules = self.rules
+        self.context = self.context_cls(related_visit=self.related_visit)
+        batch_updater = self.batch_updater_cls(
+            related_visit=self.related_visit,
+            allow_create=self.allow_create,
+            keyed_map=self.keyed_map,
+        )
         for app_label in self.app_labels:
             for rule_group in site_metadata_rules.registry.get(app_label, []):
-                rule_group.evaluate_rules(
-                    related_visit=self.related_visit, allow_create=self.allow_create
-                )
+                if group_rules := [r for r in rule_group.get_rules() if r in rules]:
+                    rule_group.evaluate_rules(
+                        related_visit=self.related_visit,
+                        allow_create=self.allow_create,
+                        rules=group_rules,
+                        context=self.context,
+                        batch_updater=batch_updater,
+                    )
+        return batch_updater.apply()
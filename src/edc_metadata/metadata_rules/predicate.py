@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from django.apps import apps as django_apps
 from django.core.exceptions import ObjectDoesNotExist
 
+if TYPE_CHECKING:
+    from .rule_evaluation_context import RuleEvaluationContext
+
 
 class PredicateError(Exception):
     pass
@@ -17,12 +20,18 @@ class NoValueError(Exception):
 
 class BasePredicate:
     @staticmethod
-    def get_value(attr: str | None = None, source_model: str | None = None, **kwargs) -> Any:
+    def get_value(
+        attr: str | None = None,
+        source_model: str | None = None,
+        context: RuleEvaluationContext | None = None,
+        **kwargs,
+    ) -> Any:
         """Returns a value by checking for the attr on each arg.
 
         Each arg in args may be a model instance, queryset, or None.
 
-        If not found, does a lookup on the source_model.
+        If not found, does a lookup on the source_model. The source
+        model instance is memoized on `context`, if provided.
         """
         found: bool = False
         value: Any = None
@@ -36,21 +45,31 @@ class BasePredicate:
                 break
         if not found:
             visit = kwargs.get("visit")
-            try:
-                obj = django_apps.get_model(source_model).objects.get(
-                    subject_visit__subject_identifier=visit.subject_identifier,
-                    subject_visit__visit_schedule_name=visit.visit_schedule_name,
-                    subject_visit__schedule_name=visit.schedule_name,
-                    subject_visit__visit_code=visit.visit_code,
-                    subject_visit__visit_code_sequence=visit.visit_code_sequence,
-                    subject_visit__site=visit.site,
+            if context:
+                obj = context.get(
+                    source_model, lambda: BasePredicate.get_source_obj(source_model, visit)
                 )
-            except ObjectDoesNotExist:
-                value = None
             else:
-                value = getattr(obj, attr)
+                obj = BasePredicate.get_source_obj(source_model, visit)
+            value = None if obj is None else getattr(obj, attr)
         return value
 
+    @staticmethod
+    def get_source_obj(source_model: str, visit: Any) -> Any:
+        """Returns the source model instance for this visit or None."""
+        try:
+            obj = django_apps.get_model(source_model).objects.get(
+                subject_visit__subject_identifier=visit.subject_identifier,
+                subject_visit__visit_schedule_name=visit.visit_schedule_name,
+                subject_visit__schedule_name=visit.schedule_name,
+                subject_visit__visit_code=visit.visit_code,
+                subject_visit__visit_code_sequence=visit.visit_code_sequence,
+                subject_visit__site=visit.site,
+            )
+        except ObjectDoesNotExist:
+            obj = None
+        return obj
+
 
 class P(BasePredicate):
     """
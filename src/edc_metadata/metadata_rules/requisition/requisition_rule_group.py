@@ -17,8 +17,11 @@ RuleResult = namedtuple("RuleResult", "target_panel entry_status")
 if TYPE_CHECKING:
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
+    from ...metadata_batch_updater import MetadataBatchUpdater
     from ...model_mixins.creates import CreatesMetadataModelMixin
     from ...models import RequisitionMetadata
+    from ..rule_evaluation_context import RuleEvaluationContext
+    from .requisition_rule import RequisitionRule
 
     class RelatedVisitModel(CreatesMetadataModelMixin, Base):
         pass
@@ -97,25 +100,40 @@ class RequisitionRuleGroup(RuleGroup, metaclass=RequisitionMetaclass):
         cls: Any,
         related_visit: RelatedVisitModel = None,
         allow_create: bool | None = None,
+        rules: list[RequisitionRule] | None = None,
+        context: RuleEvaluationContext | None = None,
+        batch_updater: MetadataBatchUpdater | None = None,
     ) -> tuple[dict[str, dict[str, list[RuleResult]]], dict[str, RequisitionMetadata]]:
         """Returns a tuple of (rule_results, metadata_objects) where
         rule_results ...
 
+        If `rules` is None, evaluates all rules in this group.
+
+        If `batch_updater` is provided, results are added to it instead
+        of being saved and `metadata_objects` is empty.
+
         Metadata must exist.
         """
         rule_results = {}
         metadata_objects = {}
-        for rule in cls._meta.options.get("rules"):
+        panel_names = related_visit.visit.get_requisition_panel_names(
+            related_visit.visit_code_sequence
+        )
+        for rule in cls._meta.options.get("rules") if rules is None else rules:
             rule_results[str(rule)] = {}
-            if result := rule.run(related_visit=related_visit):
+            if result := rule.run(related_visit=related_visit, context=context):
                 for target_model, entry_status in result.items():
                     rule_results[str(rule)].update({target_model: []})
                     for target_panel in rule.target_panels:
                         # only do something if target_panel is in
                         # visit.requisitions
-                        if target_panel.name in [
-                            r.panel.name for r in cls.requisitions_for_visit(related_visit)
-                        ]:
+                        if target_panel.name not in panel_names:
+                            continue
+                        if batch_updater:
+                            batch_updater.add(
+                                rule, target_model, entry_status, target_panel=target_panel
+                            )
+                        else:
                             metadata_updater = cls.metadata_updater_cls(
                                 related_visit=related_visit,
                                 source_model=target_model,
@@ -126,7 +144,7 @@ class RequisitionRuleGroup(RuleGroup, metaclass=RequisitionMetaclass):
                                 entry_status=entry_status
                             )
                             metadata_objects.update({target_panel: metadata_obj})
-                            rule_results[str(rule)][target_model].append(
-                                RuleResult(target_panel, entry_status)
-                            )
+                        rule_results[str(rule)][target_model].append(
+                            RuleResult(target_panel, entry_status)
+                        )
         return rule_results, metadata_objects
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
     from ..model_mixins.creates import CreatesMetadataModelMixin
     from .predicate import PF, P
+    from .rule_evaluation_context import RuleEvaluationContext
 
     class RelatedVisitModel(CreatesMetadataModelMixin, Base):
         pass
@@ -49,11 +50,18 @@ class Rule:
     def __str__(self) -> str:
         return f"{self.group}.{self.name}"
 
-    def run(self, related_visit: RelatedVisitModel) -> dict[str, str] | None:
+    def run(
+        self,
+        related_visit: RelatedVisitModel,
+        context: RuleEvaluationContext | None = None,
+    ) -> dict[str, str] | None:
         """Returns a dictionary of {target_model: entry_status, ...} updated
         by running the rule for each target model given a visit.
 
         Skips run if `appointment.appt_timing` == MISSED_APPT
+
+        `context`, if provided, is shared with the other rules evaluated
+        for this visit (see `MetadataRuleEvaluator`).
         """
         result = None
         if (
@@ -72,7 +80,7 @@ class Rule:
             result = {}
             opts = {k: v for k, v in self.__dict__.items() if k.startswith != "_"}
             rule_evaluator = self.rule_evaluator_cls(
-                related_visit=related_visit, logic=self.logic, **opts
+                related_visit=related_visit, logic=self.logic, context=context, **opts
             )
             entry_status = rule_evaluator.result
             for target_model in self.target_models:
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from edc_registration import get_registered_subject_model_cls
+
+if TYPE_CHECKING:
+    from edc_registration.models import RegisteredSubject
+    from edc_visit_tracking.model_mixins import VisitModelMixin as Base
+
+    from ..model_mixins.creates import CreatesMetadataModelMixin
+
+    class RelatedVisitModel(CreatesMetadataModelMixin, Base):
+        pass
+
+
+class RuleEvaluationContext:
+    """A per-visit cache shared by all rules and predicates evaluated
+    in one pass of `MetadataRuleEvaluator.evaluate_rules`.
+
+    Memoizes the registered subject and the source model instances
+    looked up by predicates. `hits` and `misses` count lookups
+    served from and added to the cache.
+    """
+
+    def __init__(self, related_visit: RelatedVisitModel = None) -> None:
+        self.related_visit = related_visit
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cache: dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(related_visit={self.related_visit!r}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def get(self, key: str, getter: Callable[[], Any]) -> Any:
+        """Returns the cached value for `key` or calls `getter` and
+        caches the value returned.
+
+        Exceptions raised by `getter` are not cached.
+        """
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            value = getter()
+            self._cache[key] = value
+        else:
+            self.hits += 1
+        return value
+
+    @property
+    def registered_subject(self) -> RegisteredSubject:
+        """Returns the registered subject model instance or raises
+        ObjectDoesNotExist.
+        """
+        return self.get(
+            "registered_subject",
+            lambda: get_registered_subject_model_cls().objects.get(
+                subject_identifier=self.related_visit.subject_identifier
+            ),
+        )
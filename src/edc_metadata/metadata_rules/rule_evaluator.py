@@ -8,6 +8,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from edc_registration import get_registered_subject_model_cls
 
 from ..constants import DO_NOTHING
+from .rule_evaluation_context import RuleEvaluationContext
 
 if TYPE_CHECKING:
     from edc_registration.models import RegisteredSubject
@@ -39,18 +40,26 @@ class RuleEvaluator:
     Set as a class attribute on Rule.
 
     See also RuleGroup and its metaclass.
+
+    If `context` is not provided, a new `RuleEvaluationContext` is
+    used for this rule only.
     """
 
     def __init__(
-        self, logic: Logic = None, related_visit: RelatedVisitModel = None, **kwargs
+        self,
+        logic: Logic = None,
+        related_visit: RelatedVisitModel = None,
+        context: RuleEvaluationContext | None = None,
+        **kwargs,
     ) -> None:
-        self._registered_subject: RegisteredSubject | None = None
         self.logic: Logic = logic
         self.result: str | None = None
         self.related_visit = related_visit
+        self.context = context or RuleEvaluationContext(related_visit=related_visit)
         options = dict(
             visit=self.related_visit,
             registered_subject=self.registered_subject,
+            context=self.context,
             **kwargs,
         )
         predicate = self.logic.predicate(**options)
@@ -67,15 +76,12 @@ class RuleEvaluator:
     @property
     def registered_subject(self) -> Any:
         """Returns a registered subject model instance or raises."""
-        if not self._registered_subject:
-            try:
-                self._registered_subject = self.registered_subject_model.objects.get(
-                    subject_identifier=self.related_visit.subject_identifier
-                )
-            except ObjectDoesNotExist as e:
-                raise RuleEvaluatorRegisterSubjectError(
-                    f"Registered subject required for rule {self!r}. "
-                    f"subject_identifier='{self.related_visit.subject_identifier}'. "
-                    f"Got {e}."
-                ) from e
-        return self._registered_subject
+        try:
+            registered_subject = self.context.registered_subject
+        except ObjectDoesNotExist as e:
+            raise RuleEvaluatorRegisterSubjectError(
+                f"Registered subject required for rule {self!r}. "
+                f"subject_identifier='{self.related_visit.subject_identifier}'. "
+                f"Got {e}."
+            ) from e
+        return registered_subject
@@ -1,11 +1,26 @@
+from __future__ import annotations
+
 import copy
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from django.apps import apps as django_apps
+from django.conf import settings
 from django.core.management.color import color_style
 from django.utils.module_loading import import_module, module_has_submodule
 
+from ..constants import REQUISITION
+
+if TYPE_CHECKING:
+    from edc_visit_tracking.model_mixins import VisitModelMixin as Base
+
+    from ..model_mixins.creates import CreatesMetadataModelMixin
+    from .rule import Rule
+
+    class RelatedVisitModel(CreatesMetadataModelMixin, Base):
+        pass
+
+
 style = color_style()
 
 
@@ -21,7 +36,19 @@ class SiteMetadataRules:
     """Main controller of :class:`MetadataRules` objects."""
 
     def __init__(self) -> None:
-        self.registry = {}
+        self._registry: dict[str, list] = {}
+        self._rules_by_source_model: dict[str, list[Rule]] | None = None
+        self._rules_by_target_model: dict[str, list[Rule]] | None = None
+        self._rules_by_visit: dict[tuple, set[Rule]] = {}
+
+    @property
+    def registry(self) -> dict[str, list]:
+        return self._registry
+
+    @registry.setter
+    def registry(self, value: dict[str, list]) -> None:
+        self._registry = value
+        self.reset_index()
 
     def register(self, rule_group_cls: Any | None = None) -> None:
         """Register MetadataRules to a list per app_label
@@ -42,11 +69,106 @@ class SiteMetadataRules:
                         f"The metadata rule group {rule_group_cls.name} is already registered"
                     )
             self.registry.get(rule_group_cls._meta.app_label).append(rule_group_cls)
+            self.reset_index()
 
     @property
     def rule_groups(self) -> Any:
         return self.registry
 
+    def reset_index(self) -> None:
+        """Clears the rule index. The index is rebuilt on next access."""
+        self._rules_by_source_model = None
+        self._rules_by_target_model = None
+        self._rules_by_visit = {}
+
+    def build_index(self) -> None:
+        """Builds the source model -> rules and target model -> rules
+        index over all registered rule groups.
+
+        Rules without a source model are indexed under "".
+        """
+        self.reset_index()
+        self._rules_by_source_model = {}
+        self._rules_by_target_model = {}
+        for rule_groups in self.registry.values():
+            for rule_group in rule_groups:
+                for rule in rule_group.get_rules():
+                    self._rules_by_source_model.setdefault(rule.source_model or "", []).append(
+                        rule
+                    )
+                    for target_model in rule.target_models:
+                        self._rules_by_target_model.setdefault(target_model, []).append(rule)
+
+    @property
+    def rules_by_source_model(self) -> dict[str, list[Rule]]:
+        if self._rules_by_source_model is None:
+            self.build_index()
+        return self._rules_by_source_model
+
+    @property
+    def rules_by_target_model(self) -> dict[str, list[Rule]]:
+        if self._rules_by_target_model is None:
+            self.build_index()
+        return self._rules_by_target_model
+
+    def get_rules_for_model(self, model: str, related_visit_model: str) -> set[Rule]:
+        """Returns the set of rules affected by a change to `model`.
+
+        These are rules whose predicate reads from `model`, rules
+        that target `model` and rules that read from the related
+        visit or have no source model.
+
+        Rules that share a target model with an affected rule are
+        also included so that, as in a full evaluation, the rule
+        registered last decides the target's metadata.
+        """
+        rules = {
+            *self.rules_by_source_model.get(model, []),
+            *self.rules_by_target_model.get(model, []),
+            *self.rules_by_source_model.get(related_visit_model, []),
+            *self.rules_by_source_model.get("", []),
+        }
+        target_models = set()
+        while new_target_models := {
+            target_model for rule in rules for target_model in rule.target_models
+        }.difference(target_models):
+            target_models.update(new_target_models)
+            for target_model in new_target_models:
+                rules.update(self.rules_by_target_model.get(target_model, []))
+        return rules
+
+    def get_rules_for_visit(self, related_visit: RelatedVisitModel) -> set[Rule]:
+        """Returns the set of rules to run for this visit.
+
+        Excludes CRF rules whose source model is neither the related
+        visit nor scheduled for the visit (including PRNs). Rules are
+        not excluded by target model since a predicate may update
+        metadata at other timepoints (see `PersistantSingletonMixin`).
+
+        Cached per (related visit model, visit_schedule, schedule,
+        visit_code, scheduled or unscheduled, site).
+        """
+        key = (
+            related_visit._meta.label_lower,
+            related_visit.visit_schedule_name,
+            related_visit.schedule_name,
+            related_visit.visit_code,
+            bool(related_visit.visit_code_sequence),
+            settings.SITE_ID,
+        )
+        if key not in self._rules_by_visit:
+            crf_models = related_visit.visit.get_crf_models(related_visit.visit_code_sequence)
+            self._rules_by_visit[key] = {
+                rule
+                for source_model, rules in self.rules_by_source_model.items()
+                for rule in rules
+                if getattr(rule, "metadata_category", None) == REQUISITION
+                or not source_model
+                or source_model == related_visit._meta.label_lower
+                or source_model in crf_models
+            }
+        return self._rules_by_visit[key]
+
     def validate(self) -> None:
         for rule_groups in self.registry.values():
             for rule_group in rule_groups:
@@ -79,6 +201,7 @@ class SiteMetadataRules:
                     )
             except ImportError:
                 pass
+        site_metadata_rules.build_index()
 
 
 site_metadata_rules = SiteMetadataRules()
@@ -9,6 +9,7 @@ from .metadata_mixins import SourceModelMetadataMixin
 if TYPE_CHECKING:
     from edc_visit_tracking.model_mixins import VisitModelMixin as Base
 
+    from .keyed_map import KeyedMap
     from .model_mixins.creates import CreatesMetadataModelMixin
     from .models import CrfMetadata, RequisitionMetadata
 
@@ -35,8 +36,9 @@ class MetadataUpdater(SourceModelMetadataMixin):
         related_visit: RelatedVisitModel,
         source_model: str,
         allow_create: bool | None = None,
+        keyed_map: KeyedMap | None = None,
     ):
-        super().__init__(source_model, related_visit)
+        super().__init__(source_model, related_visit, keyed_map=keyed_map)
         self._metadata_obj: CrfMetadata | RequisitionMetadata | None = None
         self.allow_create = True if allow_create is None else allow_create
 
@@ -83,4 +85,5 @@ class MetadataUpdater(SourceModelMetadataMixin):
             model=self.source_model,
             related_visit=self.related_visit,
             allow_create=self.allow_create,
+            keyed_map=self.keyed_map,
         )
@@ -0,0 +1,146 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:55
+
+import _socket
+import django.utils.timezone
+import django_audit_fields.fields.hostname_modification_field
+import django_audit_fields.fields.userfield
+import django_audit_fields.fields.uuid_auto_field
+import django_revision.revision_field
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edc_metadata", "0043_alter_crfmetadatamissing_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetadataRefresherCheckpoint",
+            fields=[
+                (
+                    "revision",
+                    django_revision.revision_field.RevisionField(
+                        blank=True,
+                        default="",
+                        editable=False,
+                        help_text="System field. From git repository (tag:branch:commit), project metadata, project toml, project VERSION, or settings.",
+                        max_length=75,
+                        verbose_name="Revision",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(blank=True, default=django.utils.timezone.now),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(blank=True, default=django.utils.timezone.now),
+                ),
+                (
+                    "user_created",
+                    django_audit_fields.fields.userfield.UserField(
+                        blank=True,
+                        default="",
+                        help_text="Updated by admin.save_model",
+                        max_length=50,
+                        verbose_name="user created",
+                    ),
+                ),
+                (
+                    "user_modified",
+                    django_audit_fields.fields.userfield.UserField(
+                        blank=True,
+                        default="",
+                        help_text="Updated by admin.save_model",
+                        max_length=50,
+                        verbose_name="user modified",
+                    ),
+                ),
+                (
+                    "hostname_created",
+                    models.CharField(
+                        blank=True,
+                        default=_socket.gethostname,
+                        help_text="System field. (modified on create only)",
+                        max_length=60,
+                        verbose_name="Hostname created",
+                    ),
+                ),
+                (
+                    "hostname_modified",
+                    django_audit_fields.fields.hostname_modification_field.HostnameModificationField(
+                        blank=True,
+                        default="",
+                        help_text="System field. (modified on every save)",
+                        max_length=50,
+                        verbose_name="Hostname modified",
+                    ),
+                ),
+                (
+                    "device_created",
+                    models.CharField(
+                        blank=True, default="", max_length=10, verbose_name="Device created"
+                    ),
+                ),
+                (
+                    "device_modified",
+                    models.CharField(
+                        blank=True, default="", max_length=10, verbose_name="Device modified"
+                    ),
+                ),
+                (
+                    "locale_created",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Auto-updated by Modeladmin",
+                        max_length=10,
+                        verbose_name="Locale created",
+                    ),
+                ),
+                (
+                    "locale_modified",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Auto-updated by Modeladmin",
+                        max_length=10,
+                        verbose_name="Locale modified",
+                    ),
+                ),
+                (
+                    "id",
+                    django_audit_fields.fields.uuid_auto_field.UUIDAutoField(
+                        blank=True,
+                        editable=False,
+                        help_text="System auto field. UUID primary key.",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("stage", models.CharField(max_length=25)),
+                ("first_subject_identifier", models.CharField(max_length=50)),
+                ("last_subject_identifier", models.CharField(max_length=50)),
+                ("subject_count", models.IntegerField(default=0)),
+                ("visit_count", models.IntegerField(default=0)),
+                ("subject_identifiers", models.TextField(default="")),
+            ],
+            options={
+                "verbose_name": "Metadata refresher checkpoint",
+                "verbose_name_plural": "Metadata refresher checkpoints",
+                "abstract": False,
+                "default_permissions": ("add", "change", "delete", "view", "export", "import"),
+                "default_manager_name": "objects",
+                "indexes": [
+                    models.Index(
+                        fields=["modified", "created"], name="edc_metadat_modifie_56d08d_idx"
+                    ),
+                    models.Index(
+                        fields=["user_modified", "user_created"],
+                        name="edc_metadat_user_mo_4ff0f7_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -17,6 +17,9 @@ from ...metadata_rules import MetadataRuleEvaluator
 if TYPE_CHECKING:
     from edc_visit_schedule.visit import Visit
     from edc_visit_tracking.typing_stubs import RelatedVisitProtocol
+
+    from ...keyed_map import KeyedMap
+    from ...metadata_batch_updater import MetadataResolution
 else:
 
     class RelatedVisitProtocol: ...
@@ -31,26 +34,44 @@ class CreatesMetadataModelMixin(RelatedVisitProtocol, models.Model):
     metadata_destroyer_cls: type[Destroyer] = Destroyer
     metadata_rule_evaluator_cls: type[MetadataRuleEvaluator] = MetadataRuleEvaluator
 
-    def metadata_create(self, fresh_create: bool = False) -> None:
+    def metadata_create(
+        self, fresh_create: bool = False, keyed_map: KeyedMap | None = None
+    ) -> None:
         """Creates metadata, called by post_save signal.
 
         Set fresh_create=True when all metadata has already been deleted
         (e.g. during a full regeneration via update_metadata). This skips
         the per-CRF SELECT and per-visit DELETE queries that would otherwise
         always find nothing.
+
+        Pass `keyed_map` to reuse a `KeyedMap` already selected for
+        this save.
         """
-        metadata = self.metadata_cls(related_visit=self, update_keyed=True)
+        metadata = self.metadata_cls(
+            related_visit=self, update_keyed=True, keyed_map=keyed_map
+        )
         metadata.prepare(fresh_create=fresh_create)
 
-    def run_metadata_rules(self, allow_create: bool | None = None) -> None:
-        """Runs all the metadata rules.
+    def run_metadata_rules(
+        self,
+        allow_create: bool | None = None,
+        source_model: str | None = None,
+        keyed_map: KeyedMap | None = None,
+    ) -> dict[tuple[str, str], MetadataResolution]:
+        """Runs all the metadata rules or, if `source_model` is set,
+        only those affected by a change to `source_model`.
+
+        Returns the resolution report from `MetadataRuleEvaluator`.
 
         Initially called by post_save signal.
 
         Also called by post_save signal after metadata is updated.
         """
         return self.metadata_rule_evaluator_cls(
-            related_visit=self, allow_create=allow_create
+            related_visit=self,
+            allow_create=allow_create,
+            source_model=source_model,
+            keyed_map=keyed_map,
         ).evaluate_rules()
 
     @property
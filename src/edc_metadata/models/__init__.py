@@ -5,6 +5,7 @@ from .manage_missing import (
     RequisitionMetadataMissing,
     ReviewFilter,
 )
+from .metadata_refresher_checkpoint import MetadataRefresherCheckpoint
 from .requisition_metadata import RequisitionMetadata
 from .signals import (
     delete_flagged_as_missing_post_save,
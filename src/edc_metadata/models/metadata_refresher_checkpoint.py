@@ -0,0 +1,31 @@
+from django.db import models
+
+from edc_model.models import BaseUuidModel
+
+
+class MetadataRefresherCheckpoint(BaseUuidModel):
+    """A completed chunk of subjects processed by the `MetadataRefresher`.
+
+    Used to resume an interrupted `update_metadata` run from the last
+    completed chunk. See `MetadataRefresher`.
+    """
+
+    stage = models.CharField(max_length=25)
+
+    first_subject_identifier = models.CharField(max_length=50)
+
+    last_subject_identifier = models.CharField(max_length=50)
+
+    subject_count = models.IntegerField(default=0)
+
+    visit_count = models.IntegerField(default=0)
+
+    # the subject identifiers of the chunk, one per line
+    subject_identifiers = models.TextField(default="")
+
+    def __str__(self) -> str:
+        return f"{self.stage} {self.first_subject_identifier}-{self.last_subject_identifier}"
+
+    class Meta(BaseUuidModel.Meta):
+        verbose_name = "Metadata refresher checkpoint"
+        verbose_name_plural = "Metadata refresher checkpoints"
@@ -48,8 +48,8 @@ def metadata_update_on_post_save(
     A CRF/Requisition model instance will:
       * update it`s own references (`update_reference_on_save`)
       * update it`s own metadata (`metadata_update`)
-      * run ALL metadata rules for the timepoint
-        (`run_metadata_rules_for_related_visit`).
+      * run the metadata rules for the timepoint affected by a change
+        to this model (`refresh_metadata_for_timepoint`).
     """
     if (
         not raw
@@ -63,7 +63,9 @@ def metadata_update_on_post_save(
             if "metadata_update" not in str(e):
                 raise
         else:
-            refresh_metadata_for_timepoint(instance, allow_create=True)
+            refresh_metadata_for_timepoint(
+                instance, allow_create=True, source_model=instance._meta.label_lower
+            )
 
 
 @receiver(post_delete, weak=False, dispatch_uid="metadata_reset_on_post_delete")
@@ -104,7 +106,11 @@ def metadata_update_previous_timepoints_for_singleton_on_post_save(
         appointment = instance.related_visit.appointment.relative_previous_with_related_visit
         while appointment:
             if appointment.related_visit:
-                refresh_metadata_for_timepoint(appointment.related_visit, allow_create=False)
+                refresh_metadata_for_timepoint(
+                    appointment.related_visit,
+                    allow_create=False,
+                    source_model=instance._meta.label_lower,
+                )
             appointment = appointment.relative_previous_with_related_visit
 
 
@@ -35,6 +35,7 @@ class RequisitionMetadataUpdater(MetadataUpdater):
             related_visit=self.related_visit,
             panel=self.source_panel,
             allow_create=self.allow_create,
+            keyed_map=self.keyed_map,
         )
 
     @property
@@ -43,3 +44,7 @@ class RequisitionMetadataUpdater(MetadataUpdater):
         get, the SubjectRequisition model instance.
         """
         return dict(subject_visit_id=self.related_visit.id, panel__name=self.source_panel.name)
+
+    @property
+    def metadata_key(self) -> tuple[str, str]:
+        return self.source_model, self.source_panel.name
@@ -20,6 +20,7 @@ from edc_metadata.metadata_rules import (
     CrfRule,
     CrfRuleGroup,
     CrfRuleModelConflict,
+    MetadataRuleEvaluator,
     P,
     PredicateError,
     RuleEvaluatorRegisterSubjectError,
@@ -287,6 +288,17 @@ class TestMetadataRulesWithGender(TestCase):
             NOT_REQUIRED,
         )
 
+    def test_evaluator_shares_context_across_rules(self):
+        subject_visit = self.enroll_female()
+        evaluator = MetadataRuleEvaluator(related_visit=subject_visit)
+        evaluator.evaluate_rules()
+        # registered subject fetched once for all rules in the pass
+        self.assertEqual(evaluator.context.misses, 1)
+        self.assertEqual(
+            evaluator.context.hits,
+            len(CrfRuleGroupGender._meta.options.get("rules")) - 1,
+        )
+
     def test_rule_group_rule_results(self):
         subject_visit = self.enroll_male()
         rule_results, _ = CrfRuleGroupGender().evaluate_rules(related_visit=subject_visit)
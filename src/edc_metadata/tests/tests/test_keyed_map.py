@@ -0,0 +1,77 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import time_machine
+from clinicedc_tests.models import CrfFive, CrfFour, SubjectRequisition
+from django.db import connection
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+
+from edc_lab.models import Panel
+from edc_lab_panel.panels import fbc_panel, lft_panel
+from edc_metadata.keyed_map import KeyedMap
+from edc_metadata.metadata import CrfMetadataGetter, RequisitionMetadataGetter
+
+from .metadata_test_mixin import TestMetadataMixin
+
+utc_tz = ZoneInfo("UTC")
+
+
+@tag("metadata")
+@override_settings(SITE_ID=10)
+@time_machine.travel(datetime(2019, 8, 11, 8, 00, tzinfo=utc_tz))
+class TestKeyedMap(TestMetadataMixin, TestCase):
+    def test_is_keyed(self):
+        crf_four = CrfFour.objects.create(subject_visit=self.subject_visit)
+        SubjectRequisition.objects.create(
+            subject_visit=self.subject_visit, panel=Panel.objects.get(name=fbc_panel.name)
+        )
+        keyed_map = KeyedMap(self.subject_visit)
+        self.assertTrue(keyed_map.is_keyed("clinicedc_tests.crffour"))
+        self.assertFalse(keyed_map.is_keyed("clinicedc_tests.crffive"))
+        self.assertTrue(
+            keyed_map.is_keyed("clinicedc_tests.subjectrequisition", fbc_panel.name)
+        )
+        self.assertFalse(
+            keyed_map.is_keyed("clinicedc_tests.subjectrequisition", lft_panel.name)
+        )
+        self.assertFalse(keyed_map.is_keyed("clinicedc_tests.subjectrequisition"))
+        self.assertEqual(
+            keyed_map.get_values("clinicedc_tests.crffour")["created"], crf_four.created
+        )
+        self.assertIsNone(keyed_map.get_values("clinicedc_tests.crffive"))
+
+    def test_one_query_for_visit(self):
+        CrfFour.objects.create(subject_visit=self.subject_visit)
+        keyed_map = KeyedMap(self.subject_visit)
+        self.assertGreater(len(keyed_map.models), 2)
+        with CaptureQueriesContext(connection) as ctx:
+            for model in keyed_map.models:
+                keyed_map.is_keyed(model)
+            keyed_map.is_keyed("clinicedc_tests.subjectrequisition", fbc_panel.name)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn("UNION ALL", ctx.captured_queries[0]["sql"])
+
+    def test_model_not_in_map_selected_on_access(self):
+        CrfFive.objects.create(subject_visit=self.subject_visit)
+        keyed_map = KeyedMap(self.subject_visit, models=["clinicedc_tests.crffour"])
+        self.assertFalse(keyed_map.is_keyed("clinicedc_tests.crffour"))
+        with self.assertNumQueries(1):
+            self.assertTrue(keyed_map.is_keyed("clinicedc_tests.crffive"))
+        with self.assertNumQueries(0):
+            self.assertTrue(keyed_map.is_keyed("clinicedc_tests.crffive"))
+
+    def test_unknown_model_not_keyed(self):
+        keyed_map = KeyedMap(self.subject_visit, models=["clinicedc_tests.blah"])
+        self.assertFalse(keyed_map.is_keyed("clinicedc_tests.blah"))
+
+    def test_metadata_getter_validates_with_one_source_query(self):
+        CrfFour.objects.create(subject_visit=self.subject_visit)
+        SubjectRequisition.objects.create(
+            subject_visit=self.subject_visit, panel=Panel.objects.get(name=fbc_panel.name)
+        )
+        self.assertIsNotNone(self.appointment.related_visit)
+        # metadata select, one UNION ALL source model query
+        for getter_cls in [CrfMetadataGetter, RequisitionMetadataGetter]:
+            with self.subTest(getter_cls=getter_cls), self.assertNumQueries(2):
+                getter_cls(self.appointment)
@@ -3,14 +3,20 @@ from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import time_machine
+from clinicedc_tests.models import CrfFour, SubjectRequisition
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
 
 from edc_appointment.constants import IN_PROGRESS_APPT, MISSED_APPT
 from edc_appointment.creators import create_unscheduled_appointment
 from edc_appointment.tests.utils import create_related_visit
-from edc_metadata.metadata import CreatesMetadataError, CrfCreator
+from edc_lab.models import Panel
+from edc_lab_panel.panels import fbc_panel
+from edc_metadata.constants import KEYED, NOT_REQUIRED, REQUIRED
+from edc_metadata.metadata import CreatesMetadataError, Creator, CrfCreator
 from edc_metadata.metadata_updater import MetadataUpdater
 from edc_metadata.models import CrfMetadata, RequisitionMetadata
 from edc_visit_tracking.constants import MISSED_VISIT, SCHEDULED, UNSCHEDULED
@@ -135,3 +141,108 @@ class TestCreatesMetadata(TestMetadataMixin, TestCase):
 
         self.assertIsNotNone(metadata_obj)
         self.assertEqual(metadata_obj.model, crf_model)
+
+
+@tag("metadata")
+@override_settings(SITE_ID=10)
+@time_machine.travel(datetime(2025, 8, 11, 8, 00, tzinfo=utc_tz))
+class TestCreatesMetadataInBulk(TestMetadataMixin, TestCase):
+    @staticmethod
+    def get_metadata(model_cls, subject_visit) -> list[tuple]:
+        return list(
+            model_cls.objects.filter(
+                subject_identifier=subject_visit.subject_identifier,
+                visit_code=subject_visit.visit_code,
+                visit_code_sequence=subject_visit.visit_code_sequence,
+            )
+            .order_by("show_order", "model")
+            .values_list("model", "entry_status", "show_order", "site_id", "timepoint")
+        )
+
+    def test_bulk_same_as_default(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        CrfFour.objects.create(subject_visit=subject_visit)
+        SubjectRequisition.objects.create(
+            subject_visit=subject_visit, panel=Panel.objects.get(name=fbc_panel.name)
+        )
+        crf_metadata = self.get_metadata(CrfMetadata, subject_visit)
+        requisition_metadata = self.get_metadata(RequisitionMetadata, subject_visit)
+        CrfMetadata.objects.all().delete()
+        RequisitionMetadata.objects.all().delete()
+
+        Creator(related_visit=subject_visit, update_keyed=True, bulk=True).create()
+
+        self.assertEqual(self.get_metadata(CrfMetadata, subject_visit), crf_metadata)
+        self.assertEqual(
+            self.get_metadata(RequisitionMetadata, subject_visit), requisition_metadata
+        )
+        self.assertEqual(
+            CrfMetadata.objects.get(
+                model="clinicedc_tests.crffour", visit_code=subject_visit.visit_code
+            ).entry_status,
+            KEYED,
+        )
+        self.assertEqual(
+            RequisitionMetadata.objects.get(
+                model="clinicedc_tests.subjectrequisition",
+                panel_name=fbc_panel.name,
+                visit_code=subject_visit.visit_code,
+            ).entry_status,
+            KEYED,
+        )
+
+    def test_bulk_updates_existing(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        CrfMetadata.objects.filter(model="clinicedc_tests.crffive").update(
+            entry_status=NOT_REQUIRED
+        )
+        CrfMetadata.objects.filter(model="clinicedc_tests.crfsix").delete()
+        CrfFour.objects.create(subject_visit=subject_visit)
+        CrfMetadata.objects.filter(model="clinicedc_tests.crffour").update(
+            entry_status=REQUIRED
+        )
+
+        Creator(related_visit=subject_visit, update_keyed=True, bulk=True).create()
+
+        self.assertEqual(
+            CrfMetadata.objects.get(
+                model="clinicedc_tests.crffour", visit_code=subject_visit.visit_code
+            ).entry_status,
+            KEYED,
+        )
+        self.assertEqual(
+            CrfMetadata.objects.get(
+                model="clinicedc_tests.crffive", visit_code=subject_visit.visit_code
+            ).entry_status,
+            REQUIRED,
+        )
+        self.assertEqual(
+            CrfMetadata.objects.get(
+                model="clinicedc_tests.crfsix", visit_code=subject_visit.visit_code
+            ).entry_status,
+            REQUIRED,
+        )
+
+    def test_bulk_query_count_independent_of_forms(self):
+        subject_visit = SubjectVisit.objects.select_related("appointment").get(
+            appointment=self.appointment
+        )
+        creator = Creator(related_visit=subject_visit, update_keyed=True, bulk=True)
+        source_models = {f.model for f in creator.crfs} | {
+            f.model for f in creator.requisitions
+        }
+        forms = len(creator.crfs) + len(creator.requisitions)
+        with CaptureQueriesContext(connection) as ctx:
+            creator.create()
+        # savepoint/release + 2 prefetch + 1 per source table
+        self.assertLessEqual(len(ctx.captured_queries), 4 + len(source_models))
+        self.assertLess(len(source_models), forms)
+
+    @override_settings(EDC_METADATA_BULK_CREATE=True)
+    def test_bulk_on_visit_save(self):
+        self.assertTrue(Creator(related_visit=self.subject_visit, update_keyed=True).bulk)
+        CrfMetadata.objects.all().delete()
+        RequisitionMetadata.objects.all().delete()
+        self.subject_visit.save()
+        self.assertEqual(CrfMetadata.objects.all().count(), 9)
+        self.assertEqual(RequisitionMetadata.objects.all().count(), 4)
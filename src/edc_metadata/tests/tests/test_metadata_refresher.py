@@ -1,17 +1,37 @@
 from datetime import datetime
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import time_machine
+from clinicedc_constants import MALE
+from clinicedc_tests.action_items import register_actions
 from clinicedc_tests.consents import consent_v1
+from clinicedc_tests.helper import Helper
 from clinicedc_tests.models import CrfFive, CrfFour, SubjectVisit
+from clinicedc_tests.sites import all_sites
+from clinicedc_tests.visit_schedules.visit_schedule import get_visit_schedule
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ObjectDoesNotExist
-from django.test import TestCase, override_settings, tag
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings, tag
 
 from edc_consent import site_consents
+from edc_facility.import_holidays import import_holidays
 from edc_metadata.constants import KEYED, REQUIRED
-from edc_metadata.metadata_refresher import MetadataRefresher
-from edc_metadata.models import CrfMetadata
+from edc_metadata.metadata_refresher import (
+    METADATA_STAGE,
+    RULES_STAGE,
+    MetadataRefresher,
+)
+from edc_metadata.models import (
+    CrfMetadata,
+    MetadataRefresherCheckpoint,
+    RequisitionMetadata,
+)
+from edc_sites.site import sites as site_sites
+from edc_sites.utils import add_or_update_django_sites
+from edc_utils.tests.utils import SerialThreadPoolExecutor
 from edc_visit_schedule.schedule import Schedule
 from edc_visit_schedule.site_visit_schedules import site_visit_schedules
 from edc_visit_schedule.visit import Crf, CrfCollection, Visit
@@ -266,3 +286,132 @@ class TestMetadataRefresher(TestMetadataMixin, TestCase):
         metadata_refresher = MetadataRefresher()
         metadata_refresher.run()
         self.assertEqual(CrfMetadata.objects.filter(entry_status=REQUIRED).count(), 4)
+
+    def test_chunked_creates_metadata_and_checkpoints(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        CrfFour.objects.create(subject_visit=subject_visit)
+        crf_count = CrfMetadata.objects.all().count()
+        CrfMetadata.objects.all().delete()
+        RequisitionMetadata.objects.all().delete()
+        MetadataRefresher(chunk_size=1, fresh_create=True).run()
+        self.assertEqual(CrfMetadata.objects.all().count(), crf_count)
+        self.assertEqual(
+            CrfMetadata.objects.get(
+                model="clinicedc_tests.crffour", visit_code=subject_visit.visit_code
+            ).entry_status,
+            KEYED,
+        )
+        for stage in [METADATA_STAGE, RULES_STAGE]:
+            with self.subTest(stage=stage):
+                checkpoint = MetadataRefresherCheckpoint.objects.get(stage=stage)
+                self.assertEqual(checkpoint.subject_identifiers, self.subject_identifier)
+                self.assertEqual(checkpoint.first_subject_identifier, self.subject_identifier)
+                self.assertEqual(checkpoint.last_subject_identifier, self.subject_identifier)
+                self.assertEqual(checkpoint.subject_count, 1)
+                self.assertEqual(
+                    checkpoint.visit_count,
+                    SubjectVisit.objects.filter(
+                        subject_identifier=self.subject_identifier
+                    ).count(),
+                )
+
+    def test_chunked_resume_skips_completed_chunks(self):
+        MetadataRefresherCheckpoint.objects.create(
+            stage=METADATA_STAGE,
+            first_subject_identifier=self.subject_identifier,
+            last_subject_identifier=self.subject_identifier,
+            subject_identifiers=self.subject_identifier,
+        )
+        CrfMetadata.objects.all().delete()
+        refresher = MetadataRefresher(chunk_size=1, fresh_create=True, resume=True)
+        self.assertEqual(refresher.get_chunks(METADATA_STAGE), [])
+        self.assertEqual(refresher.get_chunks(RULES_STAGE), [[self.subject_identifier]])
+        refresher.run()
+        self.assertEqual(CrfMetadata.objects.all().count(), 0)
+        self.assertEqual(
+            MetadataRefresherCheckpoint.objects.filter(stage=RULES_STAGE).count(), 1
+        )
+
+        # not resuming, starts over
+        MetadataRefresher(chunk_size=1, fresh_create=True).run()
+        self.assertGreater(CrfMetadata.objects.all().count(), 0)
+        self.assertEqual(
+            MetadataRefresherCheckpoint.objects.filter(stage=METADATA_STAGE).count(), 1
+        )
+
+    def test_chunked_resume_does_not_skip_subjects_between_completed(self):
+        """Assert a subject that sorts between the first and last
+        subject of a checkpoint is not skipped.
+        """
+        MetadataRefresherCheckpoint.objects.create(
+            stage=METADATA_STAGE,
+            first_subject_identifier="000",
+            last_subject_identifier="zzz",
+            subject_identifiers="000\nzzz",
+        )
+        refresher = MetadataRefresher(chunk_size=1, resume=True)
+        self.assertEqual(refresher.get_chunks(METADATA_STAGE), [[self.subject_identifier]])
+
+    def test_update_metadata_command(self):
+        crf_count = CrfMetadata.objects.all().count()
+        call_command("update_metadata", chunk_size=10)
+        self.assertEqual(CrfMetadata.objects.all().count(), crf_count)
+        self.assertEqual(MetadataRefresherCheckpoint.objects.all().count(), 2)
+        call_command("update_metadata", chunk_size=10, resume=True)
+        self.assertEqual(CrfMetadata.objects.all().count(), crf_count)
+        self.assertEqual(MetadataRefresherCheckpoint.objects.all().count(), 2)
+
+
+@tag("metadata")
+@override_settings(SITE_ID=10)
+@time_machine.travel(datetime(2019, 8, 11, 8, 00, tzinfo=utc_tz))
+class TestMetadataRefresherWorkers(TransactionTestCase):
+    def setUp(self):
+        import_holidays()
+        register_actions()
+        site_sites._registry = {}
+        site_sites.loaded = False
+        site_sites.register(*all_sites)
+        add_or_update_django_sites()
+        site_consents.registry = {}
+        site_consents.register(consent_v1)
+        site_visit_schedules._registry = {}
+        site_visit_schedules.loaded = False
+        site_visit_schedules.register(get_visit_schedule(consent_v1))
+        visit_schedule, schedule = site_visit_schedules.get_by_onschedule_model(
+            "edc_visit_schedule.onschedule"
+        )
+        helper = Helper()
+        self.subject_identifiers = sorted(
+            helper.enroll_to_baseline(
+                visit_schedule_name=visit_schedule.name,
+                schedule_name=schedule.name,
+                gender=MALE,
+            ).subject_identifier
+            for _ in range(3)
+        )
+
+    def assert_refreshed_by_workers(self):
+        crf_count = CrfMetadata.objects.all().count()
+        CrfMetadata.objects.all().delete()
+        MetadataRefresher(workers=2, chunk_size=1, fresh_create=True).run()
+        self.assertEqual(CrfMetadata.objects.all().count(), crf_count)
+        for stage in [METADATA_STAGE, RULES_STAGE]:
+            with self.subTest(stage=stage):
+                self.assertEqual(
+                    sorted(
+                        MetadataRefresherCheckpoint.objects.filter(stage=stage).values_list(
+                            "subject_identifiers", flat=True
+                        )
+                    ),
+                    self.subject_identifiers,
+                )
+
+    @patch("edc_metadata.metadata_refresher.ProcessPoolExecutor", SerialThreadPoolExecutor)
+    def test_workers(self):
+        self.assert_refreshed_by_workers()
+
+    def test_workers_process_pool(self):
+        if connection.vendor == "sqlite":
+            self.skipTest("Worker processes cannot open the SQLite test database.")
+        self.assert_refreshed_by_workers()
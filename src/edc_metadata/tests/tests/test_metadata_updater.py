@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import time_machine
@@ -14,6 +15,7 @@ from django.test import TestCase, override_settings, tag
 from edc_lab.models import Panel
 from edc_lab_panel.panels import fbc_panel, lft_panel
 from edc_metadata.constants import KEYED, NOT_REQUIRED, REQUIRED
+from edc_metadata.metadata_batch_updater import MetadataBatchUpdater
 from edc_metadata.metadata_handler import MetadataHandlerError
 from edc_metadata.metadata_inspector import MetaDataInspector
 from edc_metadata.metadata_updater import MetadataUpdater
@@ -56,6 +58,21 @@ class TestMetadataUpdater(TestMetadataMixin, TestCase):
             1,
         )
 
+    def test_crf_save_runs_rules_for_source_model(self):
+        """Assert saving a CRF does not reset metadata and runs only
+        the rules affected by the CRF.
+        """
+        with (
+            patch.object(SubjectVisit, "metadata_create") as metadata_create,
+            patch.object(SubjectVisit, "run_metadata_rules") as run_metadata_rules,
+        ):
+            CrfFour.objects.create(subject_visit=self.subject_visit)
+        metadata_create.assert_not_called()
+        run_metadata_rules.assert_called_once()
+        self.assertEqual(
+            run_metadata_rules.call_args.kwargs["source_model"], "clinicedc_tests.crffour"
+        )
+
     def test_updates_all_crf_metadata_as_keyed(self):
         subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
         CrfFour.objects.create(subject_visit=subject_visit)
@@ -287,3 +304,80 @@ class TestMetadataUpdater(TestMetadataMixin, TestCase):
             metadata_updater.get_and_update,
             entry_status=NOT_REQUIRED,
         )
+
+    def test_batch_updater_last_rule_wins(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        batch_updater = MetadataBatchUpdater(related_visit=subject_visit)
+        batch_updater.add("group.rule1", "clinicedc_tests.crffour", NOT_REQUIRED)
+        batch_updater.add("group.rule2", "clinicedc_tests.crffive", NOT_REQUIRED)
+        batch_updater.add("group.rule3", "clinicedc_tests.crffour", REQUIRED)
+        batch_updater.add("group.rule4", "clinicedc_tests.crffour", NOT_REQUIRED)
+        resolutions = batch_updater.apply()
+        resolution = resolutions[("clinicedc_tests.crffour", "")]
+        self.assertEqual(resolution.rule, "group.rule4")
+        self.assertEqual(
+            resolution.overridden,
+            (("group.rule1", NOT_REQUIRED), ("group.rule3", REQUIRED)),
+        )
+        self.assertEqual(resolution.applied_entry_status, NOT_REQUIRED)
+        self.assertTrue(resolution.changed)
+        for model in ["clinicedc_tests.crffour", "clinicedc_tests.crffive"]:
+            self.assertEqual(
+                CrfMetadata.objects.get(
+                    visit_code=subject_visit.visit_code, model=model
+                ).entry_status,
+                NOT_REQUIRED,
+            )
+
+    def test_batch_updater_keyed_if_source_model_exists(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        CrfFour.objects.create(subject_visit=subject_visit)
+        batch_updater = MetadataBatchUpdater(related_visit=subject_visit)
+        batch_updater.add("group.rule1", "clinicedc_tests.crffour", NOT_REQUIRED)
+        resolutions = batch_updater.apply()
+        resolution = resolutions[("clinicedc_tests.crffour", "")]
+        self.assertEqual(resolution.entry_status, NOT_REQUIRED)
+        self.assertEqual(resolution.applied_entry_status, KEYED)
+        self.assertFalse(resolution.changed)
+
+    def test_batch_updater_requisitions(self):
+        subject_visit = SubjectVisit.objects.get(appointment=self.appointment)
+        SubjectRequisition.objects.create(
+            subject_visit=subject_visit,
+            panel=Panel.objects.get(name=fbc_panel.name),
+        )
+        batch_updater = MetadataBatchUpdater(related_visit=subject_visit)
+        for panel in [fbc_panel, lft_panel]:
+            batch_updater.add(
+                "group.rule1",
+                "clinicedc_tests.subjectrequisition",
+                NOT_REQUIRED,
+                target_panel=panel,
+            )
+        resolutions = batch_updater.apply()
+        self.assertEqual(
+            resolutions[
+                ("clinicedc_tests.subjectrequisition", fbc_panel.name)
+            ].applied_entry_status,
+            KEYED,
+        )
+        self.assertEqual(
+            RequisitionMetadata.objects.get(
+                visit_code=subject_visit.visit_code, panel_name=lft_panel.name
+            ).entry_status,
+            NOT_REQUIRED,
+        )
+
+    def test_batch_updater_num_queries(self):
+        subject_visit = SubjectVisit.objects.select_related("appointment").get(
+            appointment=self.appointment
+        )
+        batch_updater = MetadataBatchUpdater(related_visit=subject_visit)
+        for model in ["crffour", "crffive", "crfsix"]:
+            batch_updater.add("group.rule1", f"clinicedc_tests.{model}", NOT_REQUIRED)
+            batch_updater.add("group.rule2", f"clinicedc_tests.{model}", REQUIRED)
+            batch_updater.add("group.rule3", f"clinicedc_tests.{model}", NOT_REQUIRED)
+        # metadata select, one UNION ALL source model query (KeyedMap),
+        # one bulk update, inside a savepoint.
+        with self.assertNumQueries(5):
+            batch_updater.apply()
@@ -14,7 +14,7 @@ from faker import Faker
 
 from edc_consent import site_consents
 from edc_facility.import_holidays import import_holidays
-from edc_metadata.metadata_rules import PF, P
+from edc_metadata.metadata_rules import PF, P, RuleEvaluationContext
 from edc_registration.models import RegisteredSubject
 from edc_visit_schedule.site_visit_schedules import site_visit_schedules
 from edc_visit_tracking.constants import SCHEDULED
@@ -158,3 +158,30 @@ class TestPredicates(TestCase):
             subject_visit=self.subject_visit_female, f1="car", f2="bicycle"
         )
         self.assertTrue(PF("f1", "f2", func=func)(**opts))
+
+    def test_pf_with_context_memoizes_source_obj(self):
+        context = RuleEvaluationContext(related_visit=self.subject_visit_female)
+        opts = dict(
+            source_model="clinicedc_tests.crfthree",
+            registered_subject=self.registered_subject_female,
+            visit=self.subject_visit_female,
+            context=context,
+        )
+        CrfThree.objects.create(
+            subject_visit=self.subject_visit_female, f1="car", f2="bicycle"
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                PF("f1", "f2", func=lambda x, y: x == "car" and y == "bicycle")(**opts)
+            )
+            self.assertTrue(P("f2", "eq", "bicycle")(**opts))
+        self.assertEqual(context.misses, 1)
+        self.assertEqual(context.hits, 2)
+
+    def test_context_memoizes_registered_subject(self):
+        context = RuleEvaluationContext(related_visit=self.subject_visit_male)
+        with self.assertNumQueries(1):
+            self.assertEqual(context.registered_subject, self.registered_subject_male)
+            self.assertEqual(context.registered_subject, self.registered_subject_male)
+        self.assertEqual(context.misses, 1)
+        self.assertEqual(context.hits, 1)
@@ -55,6 +55,45 @@ class RuleGroupWithRules2(CrfRuleGroup):
         source_model = "edc_visit_tracking.subjectvisit"
 
 
+class RuleGroupWithSourceModel(CrfRuleGroup):
+    rule1 = CrfRule(
+        predicate=P("f1", "eq", "car"),
+        consequence=REQUIRED,
+        alternative=NOT_REQUIRED,
+        target_models=["crftwo"],
+    )
+
+    class Meta:
+        app_label = "clinicedc_tests"
+        source_model = "clinicedc_tests.crfone"
+
+
+class RuleGroupWithSharedTarget(CrfRuleGroup):
+    rule1 = CrfRule(
+        predicate=P("f1", "eq", "car"),
+        consequence=REQUIRED,
+        alternative=NOT_REQUIRED,
+        target_models=["crftwo", "crffour"],
+    )
+
+    class Meta:
+        app_label = "clinicedc_tests"
+        source_model = "clinicedc_tests.crfthree"
+
+
+class RuleGroupWithSharedTarget2(CrfRuleGroup):
+    rule1 = CrfRule(
+        predicate=P("f1", "eq", "car"),
+        consequence=REQUIRED,
+        alternative=NOT_REQUIRED,
+        target_models=["crffour"],
+    )
+
+    class Meta:
+        app_label = "clinicedc_tests"
+        source_model = "clinicedc_tests.crffive"
+
+
 utc_tz = ZoneInfo("UTC")
 
 
@@ -107,6 +146,65 @@ class TestSiteMetadataRules(TestCase):
         repr(RuleGroupWithRules())
         str(RuleGroupWithRules())
 
+    def test_index_by_source_and_target_model(self):
+        site_metadata_rules.register(RuleGroupWithRules)
+        site_metadata_rules.register(RuleGroupWithSourceModel)
+        self.assertEqual(
+            site_metadata_rules.rules_by_source_model.get("clinicedc_tests.crfone"),
+            [RuleGroupWithSourceModel.rule1],
+        )
+        self.assertEqual(
+            site_metadata_rules.rules_by_target_model.get("clinicedc_tests.crftwo"),
+            [RuleGroupWithRules.rule1, RuleGroupWithSourceModel.rule1],
+        )
+
+    def test_get_rules_for_model(self):
+        site_metadata_rules.register(RuleGroupWithRules)
+        site_metadata_rules.register(RuleGroupWithSourceModel)
+        visit_model = "edc_visit_tracking.subjectvisit"
+        # source model
+        self.assertEqual(
+            site_metadata_rules.get_rules_for_model("clinicedc_tests.crfone", visit_model),
+            {RuleGroupWithRules.rule1, RuleGroupWithSourceModel.rule1},
+        )
+        # target model
+        self.assertEqual(
+            site_metadata_rules.get_rules_for_model("clinicedc_tests.crftwo", visit_model),
+            {RuleGroupWithRules.rule1, RuleGroupWithSourceModel.rule1},
+        )
+        # unrelated model, rules on the visit model and rules that
+        # share their target models
+        self.assertEqual(
+            site_metadata_rules.get_rules_for_model("clinicedc_tests.crfthree", visit_model),
+            {RuleGroupWithRules.rule1, RuleGroupWithSourceModel.rule1},
+        )
+
+    def test_get_rules_for_model_includes_rules_sharing_target(self):
+        site_metadata_rules.register(RuleGroupWithSourceModel)
+        site_metadata_rules.register(RuleGroupWithSharedTarget)
+        site_metadata_rules.register(RuleGroupWithSharedTarget2)
+        visit_model = "edc_visit_tracking.subjectvisit"
+        self.assertEqual(
+            site_metadata_rules.get_rules_for_model("clinicedc_tests.crfone", visit_model),
+            {
+                RuleGroupWithSourceModel.rule1,
+                RuleGroupWithSharedTarget.rule1,
+                RuleGroupWithSharedTarget2.rule1,
+            },
+        )
+        self.assertEqual(
+            site_metadata_rules.get_rules_for_model("clinicedc_tests.crfsix", visit_model),
+            set(),
+        )
+
+    def test_index_reset_on_register(self):
+        site_metadata_rules.register(RuleGroupWithRules)
+        self.assertNotIn("clinicedc_tests.crfone", site_metadata_rules.rules_by_source_model)
+        site_metadata_rules.register(RuleGroupWithSourceModel)
+        self.assertIn("clinicedc_tests.crfone", site_metadata_rules.rules_by_source_model)
+        site_metadata_rules.registry = {}
+        self.assertEqual(site_metadata_rules.rules_by_source_model, {})
+
     def test_register_decorator(self):
         @register()
         class RuleGroupWithRules(CrfRuleGroup):
@@ -10,6 +10,7 @@ from django.db import models
 from django.db.models import QuerySet
 
 from .constants import CRF, KEYED, REQUISITION
+from .keyed_map import KeyedMap
 
 if TYPE_CHECKING:
     from edc_appointment.models import Appointment
@@ -69,12 +70,29 @@ def verify_model_cls_registered_with_admin():
     return getattr(settings, "EDC_METADATA_VERIFY_MODELS_REGISTERED_WITH_ADMIN", False)
 
 
+def bulk_create_metadata() -> bool:
+    """Returns True if `Creator` should create metadata in bulk.
+
+    See also `Creator.create_in_bulk`.
+    """
+    return getattr(settings, "EDC_METADATA_BULK_CREATE", False)
+
+
 def refresh_metadata_for_timepoint(
     instance: CrfModel | RequisitionModel | Appointment | RelatedVisitModel,
     allow_create: bool | None = None,
+    source_model: str | None = None,
 ):
     """Refresh (or creates) metadata for the given timepoint.
 
+    If `source_model` is set, metadata is not reset and only the
+    metadata rules affected by a change to `source_model` are run.
+    Otherwise, if `allow_create` is True, metadata is reset to the
+    visit schedule defaults and all rules are run.
+
+    One `KeyedMap` is selected for the timepoint and shared by the
+    metadata creator and the rule evaluator.
+
     See also `metadata_create_on_post_save` and `CreatesMetadataModelMixin`.
     """
     if instance:
@@ -82,10 +100,13 @@ def refresh_metadata_for_timepoint(
             related_visit = instance.related_visit
         except AttributeError:
             related_visit = instance
-        if allow_create:
-            related_visit.metadata_create()
+        keyed_map = KeyedMap(related_visit)
+        if allow_create and not source_model:
+            related_visit.metadata_create(keyed_map=keyed_map)
         if django_apps.get_app_config("edc_metadata").metadata_rules_enabled:
-            related_visit.run_metadata_rules(allow_create=allow_create)
+            related_visit.run_metadata_rules(
+                allow_create=allow_create, source_model=source_model, keyed_map=keyed_map
+            )
 
 
 def get_crf_metadata(
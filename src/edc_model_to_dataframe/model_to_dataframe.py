@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import contextlib
+from collections.abc import Iterator
 from copy import copy
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import IO, TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 from clinicedc_utils import convert_visit_code_to_float as func_convert_visit_code_to_float
 from django.apps import apps as django_apps
-from django.core.exceptions import FieldError
+from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db.models import DecimalField, FloatField, IntegerField, QuerySet
 from django_crypto_fields.utils import get_encrypted_fields, has_encrypted_fields
 from django_pandas.io import read_frame
@@ -18,8 +21,40 @@ from .constants import ACTION_ITEM_COLUMNS, SYSTEM_COLUMNS
 
 __all__ = ["ModelToDataframe", "ModelToDataframeError"]
 
+# dtype of a model field's column after `clean_dataframe`, by
+# internal type. See `ModelToDataframe.get_field_dtype`.
+INTERNAL_TYPE_DTYPES: dict[str, Any] = {
+    **dict.fromkeys(
+        [
+            "CharField",
+            "EmailField",
+            "GenericIPAddressField",
+            "SlugField",
+            "TextField",
+            "URLField",
+        ],
+        pd.StringDtype(),
+    ),
+    **dict.fromkeys(
+        [
+            "AutoField",
+            "BigAutoField",
+            "BigIntegerField",
+            "BooleanField",
+            "IntegerField",
+            "PositiveBigIntegerField",
+            "PositiveIntegerField",
+            "PositiveSmallIntegerField",
+            "SmallAutoField",
+            "SmallIntegerField",
+        ],
+        pd.Int64Dtype(),
+    ),
+    **dict.fromkeys(["DecimalField", "DurationField", "FloatField"], pd.Float64Dtype()),
+}
+
 if TYPE_CHECKING:
-    pass
+    from pathlib import Path
 
 
 class ModelToDataframeError(Exception):
@@ -48,6 +83,15 @@ class ModelToDataframe:
     m = ModelToDataframe(model='edc_pdutils.crf')
     my_df = m.dataframe
 
+    For large tables, iterate over the dataframe in chunks of
+    `chunk_size` rows or write the chunks directly to CSV. Peak memory
+    is bounded by the chunk size:
+
+    for df in m.iter_dataframes(chunk_size=10000):
+        ...
+
+    m.to_csv("crf.csv", chunk_size=10000, index=False)
+
     See also: get_crf()
     """
 
@@ -67,6 +111,8 @@ class ModelToDataframe:
         "\u2013": "-",
         "\u2022": "*",
     }
+    default_chunk_size: int = 5000
+    dtypes_sample_size: int = 1000
 
     def __init__(
         self,
@@ -80,8 +126,10 @@ class ModelToDataframe:
         remove_timezone: bool | None = None,
         sites: list[int] | None = None,
         convert_visit_code_to_float: bool | None = None,
+        chunk_size: int | None = None,
     ):
         self._columns = None
+        self._dtypes: dict[str, Any] | None = None
         self._has_encrypted_fields = None
         self._list_model_related_columns = None
         self._encrypted_columns = None
@@ -101,8 +149,9 @@ class ModelToDataframe:
         self.convert_visit_code_to_float = (
             True if convert_visit_code_to_float is None else convert_visit_code_to_float
         )
+        self.chunk_size = chunk_size or self.default_chunk_size
         self.queryset = queryset
-        self.model = queryset.model._meta.label_lower if self.queryset else model
+        self.model = queryset.model._meta.label_lower if self.queryset is not None else model
 
         try:
             self.model_cls = django_apps.get_model(self.model)
@@ -137,98 +186,251 @@ class ModelToDataframe:
             of a Series like all other columns.
         """
         if self._dataframe.empty:
-            model_row_count = (
-                (self.queryset or self.model_cls.objects)
-                .filter(**self.query_filter)
-                .all()
-                .count()
+            queryset = self.get_queryset()
+            model_row_count = queryset.count()
+            df = self.clean_dataframe(self.read_frame(queryset), model_row_count)
+            if self._dtypes is None:
+                self._dtypes = self.get_dtypes(df)
+            self._dataframe = self.apply_dtypes(df)
+        return self._dataframe
+
+    def iter_dataframes(self, chunk_size: int | None = None) -> Iterator[pd.DataFrame]:
+        """Yields the dataframe in chunks of up to `chunk_size` rows.
+
+        The queryset is paged by primary key and each chunk is cleaned
+        as in `dataframe`. Each column is cast to its dtype in `dtypes`
+        and the index continues from the previous chunk, so
+        `pd.concat` of the chunks equals `dataframe`.
+
+        Rows are in queryset order. An unordered queryset is ordered
+        by primary key.
+
+        Always yields at least one, possibly empty, dataframe.
+        """
+        rows = 0
+        for pks in self.iter_pks(chunk_size or self.chunk_size):
+            queryset = self.get_queryset().filter(pk__in=pks)
+            if not queryset.ordered:
+                queryset = queryset.order_by("pk")
+            df = self.clean_dataframe(self.read_frame(queryset), len(pks), pks=pks)
+            df = self.apply_dtypes(df)
+            df.index = pd.RangeIndex(rows, rows + len(df))
+            rows += len(df)
+            yield df
+        if not rows:
+            yield self.apply_dtypes(
+                self.clean_dataframe(self.read_frame(self.get_queryset().none()), 0)
             )
 
-            df = read_frame(
-                (self.queryset or self.model_cls.objects)
-                .values(*self.columns)
-                .filter(**self.query_filter)
-                .all(),
-                verbose=self.read_frame_verbose,
-            )[[col for col in self.columns]]
-
-            # convert to nullable dtypes consistently
-            df = df.convert_dtypes()
-
-            self.validate_row_count(model_row_count, df, step_name="read_frame")
-
-            df = self.merge_m2ms(df)
-
-            self.validate_row_count(model_row_count, df, step_name="m2m")
-
-            df = df.rename(columns=self.columns)
-
-            # remove timezone if asked. Note: tz-aware columns
-            # (datetime64[us, UTC]) are selected with "datetimetz", not
-            # "datetime" (which only matches tz-naive datetime64). With
-            # USE_TZ=True Django datetimes are tz-aware.
-            if self.remove_timezone:
-                for column in df.select_dtypes(include="datetimetz").columns:
-                    try:
-                        df[column] = df[column].dt.tz_localize(None)
-                    except AttributeError as e:
-                        raise AttributeError(
-                            "Failed to localize date columns. "
-                            f"{self.model}.{column} dtype {df[column]}. Got {e}"
-                        ) from e
-
-            # convert bool to int64
-            for column in df.select_dtypes(include=["bool"]).columns:
-                df[column] = df[column].astype("Int64")
-
-            # remove illegal chars
-            for column in df.select_dtypes(include="string").columns:
-                for char, replacement in self.illegal_chars.items():
-                    df[column] = df[column].str.replace(char, replacement, regex=False)
-
-            # clean up empty strings
-            for column in df.select_dtypes(include="string").columns:
-                df[column] = df[column].str.strip().replace("", pd.NA)
-
-            # convert timedeltas to secs
-            for column in df.select_dtypes(include="timedelta").columns:
-                df[column] = df[column].dt.total_seconds().astype("Float64")
-
-            for column in self.float_cols:
-                df[column] = df[column].astype("Float64")
-
-            for column in self.int_cols:
-                df[column] = df[column].astype("Int64")
-
-            # fillna
-            # df = df.fillna(value=np.nan, axis=0)
-
-            # check merges worked correctly
-            self.validate_row_count(model_row_count, df, step_name="final")
-
-            if (
-                self.convert_visit_code_to_float
-                and "visit_code" in df.columns
-                and "visit_code_sequence" in df.columns
-            ):
-                df = func_convert_visit_code_to_float(df)
-            self._dataframe = df
-        return self._dataframe
+    def to_csv(
+        self, path_or_buf: str | Path | IO, chunk_size: int | None = None, **kwargs
+    ) -> int:
+        """Writes the dataframe to CSV one chunk at a time and
+        returns the number of rows written.
+
+        Accepts the keyword arguments of `pd.DataFrame.to_csv`. The
+        header, if any, is written with the first chunk only.
+        """
+        rows = 0
+        header = kwargs.pop("header", True)
+        kwargs.pop("mode", None)
+        for df in self.iter_dataframes(chunk_size):
+            df.to_csv(
+                path_or_buf,
+                header=header if not rows else False,
+                mode="a" if rows else "w",
+                **kwargs,
+            )
+            rows += len(df)
+        return rows
+
+    def iter_pks(self, chunk_size: int) -> Iterator[list[Any]]:
+        """Yields lists of up to `chunk_size` primary keys in queryset
+        order.
+
+        An unordered queryset is paged with `pk__gt` on the last
+        primary key of the previous chunk. For an ordered queryset,
+        the primary keys are selected once, in order.
+        """
+        queryset = self.get_queryset()
+        if queryset.ordered:
+            pks = list(queryset.values_list("pk", flat=True))
+            for index in range(0, len(pks), chunk_size):
+                yield pks[index : index + chunk_size]
+        else:
+            queryset = queryset.order_by("pk")
+            pks = list(queryset.values_list("pk", flat=True)[:chunk_size])
+            while pks:
+                yield pks
+                pks = list(
+                    queryset.filter(pk__gt=pks[-1]).values_list("pk", flat=True)[:chunk_size]
+                )
+
+    def get_queryset(self) -> QuerySet:
+        queryset = self.queryset if self.queryset is not None else self.model_cls.objects
+        return queryset.filter(**self.query_filter).all()
+
+    def read_frame(self, queryset: QuerySet) -> pd.DataFrame:
+        return read_frame(
+            queryset.values(*self.columns),
+            verbose=self.read_frame_verbose,
+        )[[col for col in self.columns]]
+
+    def clean_dataframe(
+        self, df: pd.DataFrame, model_row_count: int, pks: list[Any] | None = None
+    ) -> pd.DataFrame:
+        """Returns the dataframe from `read_frame` with M2Ms merged,
+        columns renamed and values cleaned.
+
+        If `pks` is set, only M2Ms for those rows are merged.
+        """
+        # convert to nullable dtypes consistently
+        df = df.convert_dtypes()
+
+        self.validate_row_count(model_row_count, df, step_name="read_frame")
+
+        df = self.merge_m2ms(df, pks=pks)
+
+        self.validate_row_count(model_row_count, df, step_name="m2m")
+
+        df = self.format_dataframe(df)
+
+        # check merges worked correctly
+        self.validate_row_count(model_row_count, df, step_name="final")
+        return df
+
+    def format_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.rename(columns=self.columns)
+
+        # remove timezone if asked. Note: tz-aware columns
+        # (datetime64[us, UTC]) are selected with "datetimetz", not
+        # "datetime" (which only matches tz-naive datetime64). With
+        # USE_TZ=True Django datetimes are tz-aware.
+        if self.remove_timezone:
+            for column in df.select_dtypes(include="datetimetz").columns:
+                try:
+                    df[column] = df[column].dt.tz_localize(None)
+                except AttributeError as e:
+                    raise AttributeError(
+                        "Failed to localize date columns. "
+                        f"{self.model}.{column} dtype {df[column]}. Got {e}"
+                    ) from e
+
+        # convert bool to int64
+        for column in df.select_dtypes(include=["bool"]).columns:
+            df[column] = df[column].astype("Int64")
+
+        # remove illegal chars and clean up empty strings
+        illegal_chars = str.maketrans(self.illegal_chars)
+        for column in df.select_dtypes(include="string").columns:
+            df[column] = df[column].str.translate(illegal_chars).str.strip().replace("", pd.NA)
+
+        # convert timedeltas to secs
+        for column in df.select_dtypes(include="timedelta").columns:
+            df[column] = df[column].dt.total_seconds().astype("Float64")
+
+        for column in self.float_cols:
+            df[column] = df[column].astype("Float64")
+
+        for column in self.int_cols:
+            df[column] = df[column].astype("Int64")
+
+        # fillna
+        # df = df.fillna(value=np.nan, axis=0)
+
+        if (
+            self.convert_visit_code_to_float
+            and "visit_code" in df.columns
+            and "visit_code_sequence" in df.columns
+        ):
+            df = func_convert_visit_code_to_float(df)
+        return df
+
+    @property
+    def dtypes(self) -> dict[str, Any]:
+        """Returns a dict of {column: dtype} of the full dataframe.
+
+        Computed once, see `get_dtypes`, from the full dataframe if
+        already read, otherwise from a sample of the first
+        `dtypes_sample_size` rows.
+        """
+        if self._dtypes is None:
+            queryset = self.get_queryset()
+            pks = list(queryset.values_list("pk", flat=True)[: self.dtypes_sample_size])
+            df = self.clean_dataframe(
+                self.read_frame(queryset.filter(pk__in=pks)), len(pks), pks=pks
+            )
+            self._dtypes = self.get_dtypes(df, sample=len(pks) == self.dtypes_sample_size)
+        return self._dtypes
+
+    def get_dtypes(self, df: pd.DataFrame, sample: bool | None = None) -> dict[str, Any]:
+        """Returns a dict of {column: dtype} for the columns of `df`.
+
+        The column of a model field takes the dtype of the field (see
+        `get_field_dtype`) and an M2M column is a string. Any other
+        column takes its dtype in `df` unless `df` is a `sample` in
+        which the column is null in all rows.
+        """
+        dtypes: dict[str, Any] = {}
+        lookups = {column: lookup for lookup, column in self.columns.items()}
+        m2m_columns = [m2m_field.name for m2m_field in self.model_cls._meta.many_to_many]
+        for column in df.columns:
+            if column in m2m_columns:
+                dtype = pd.StringDtype()
+            elif column == "visit_code" and self.convert_visit_code_to_float:
+                # not the dtype of the field, see `format_dataframe`
+                dtype = None
+            else:
+                dtype = self.get_field_dtype(lookups[column]) if column in lookups else None
+            if dtype is None and not (sample and df[column].isna().all()):
+                dtype = df[column].dtype
+            if dtype is not None:
+                dtypes[column] = dtype
+        return dtypes
+
+    def get_field_dtype(self, lookup: str) -> Any:
+        """Returns the dtype of the column of a field lookup, as
+        converted by `clean_dataframe`, or None if not known.
+        """
+        opts = self.model_cls._meta
+        for name in lookup.split("__"):
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.is_relation:
+                if not (field := getattr(field, "target_field", None)):
+                    return None
+                opts = field.model._meta
+        internal_type = field.get_internal_type()
+        if internal_type == "DateTimeField":
+            dtype = pd.Series([datetime(2000, 1, 1, tzinfo=ZoneInfo("UTC"))]).dtype
+            return dtype.base if self.remove_timezone else dtype
+        return INTERNAL_TYPE_DTYPES.get(internal_type)
+
+    def apply_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Casts each column to its dtype in `dtypes`."""
+        for column, dtype in self.dtypes.items():
+            if column in df.columns and df[column].dtype != dtype:
+                df[column] = df[column].astype(dtype)
+        return df
 
     def validate_row_count(
         self, model_row_count: int, df: pd.DataFrame, step_name: str
     ) -> bool:
         if model_row_count != len(df):
-            model = (self.queryset or self.model_cls)._meta.label_lower
+            model = self.model_cls._meta.label_lower
             raise ModelToDataframeRowCountError(
                 "Dataframe row count mismatch. "
                 f"See {model}. Expected {model_row_count}. Got {len(df)} at step {step_name}."
             )
         return True
 
-    def merge_m2ms(self, dataframe):
+    def merge_m2ms(self, dataframe, pks: list[Any] | None = None):
         """Merge m2m data into main dataframe.
 
+        If `pks` is set, only m2m data for those rows are selected.
+
         If m2m field name is not "name", add a class attr to
         the m2m model that returns a field_name.
 
@@ -255,11 +457,12 @@ class ModelToDataframe:
                     f"{m2m_field.related_model}"
                 )
             m2m_field_name = f"{m2m_field.name}__{related_field}"
-            df_m2m = read_frame(
-                self.model_cls.objects.prefetch_related(m2m_field_name)
-                .filter(**{f"{m2m_field_name}__isnull": False})
-                .values("id", m2m_field_name)
+            queryset = self.model_cls.objects.prefetch_related(m2m_field_name).filter(
+                **{f"{m2m_field_name}__isnull": False}
             )
+            if pks is not None:
+                queryset = queryset.filter(id__in=pks)
+            df_m2m = read_frame(queryset.values("id", m2m_field_name))
             df_m2m = (
                 df_m2m.groupby("id")[m2m_field_name]
                 .apply(",".join)
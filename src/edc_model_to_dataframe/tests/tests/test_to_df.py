@@ -1,8 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
+from io import StringIO
 from tempfile import mkdtemp
 from zoneinfo import ZoneInfo
 
+import pandas as pd
 import time_machine
 from clinicedc_tests.action_items import register_actions
 from clinicedc_tests.consents import consent_v1
@@ -15,6 +17,7 @@ from django.apps import apps as django_apps
 from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 
+from edc_appointment.models import Appointment
 from edc_consent.site_consents import site_consents
 from edc_facility.import_holidays import import_holidays
 from edc_model_to_dataframe.constants import SYSTEM_COLUMNS
@@ -159,3 +162,85 @@ class TestExport(TestCase):
         CrfEncrypted.objects.create(subject_visit=self.subject_visit, encrypted1="encrypted1")
         m = ModelToDataframe(queryset=CrfEncrypted.objects.all())
         self.assertEqual(len(m.dataframe.index), 1)
+
+    def test_iter_dataframes_equals_dataframe(self):
+        CrfFour.objects.filter(
+            pk=CrfFour.objects.order_by("pk").values_list("pk", flat=True)[0]
+        ).update(f1=" it\u2019s ")
+        queryset = CrfFour.objects.all().order_by("pk")
+        df = ModelToDataframe(queryset=queryset).dataframe
+        for chunk_size in [1, 3, 100]:
+            with self.subTest(chunk_size=chunk_size):
+                m = ModelToDataframe(queryset=queryset, chunk_size=chunk_size)
+                chunks = list(m.iter_dataframes())
+                self.assertEqual(len(chunks), -(-len(df) // chunk_size))
+                pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+    def test_iter_dataframes_casts_all_null_columns(self):
+        pk = SubjectVisit.objects.order_by("pk").values_list("pk", flat=True)[0]
+        SubjectVisit.objects.filter(pk=pk).update(reason_unscheduled_other="blah")
+        queryset = SubjectVisit.objects.all().order_by("pk")
+        df = ModelToDataframe(queryset=queryset).dataframe
+        self.assertEqual(df["reason_unscheduled_other"].dtype, pd.StringDtype())
+        chunks = list(ModelToDataframe(queryset=queryset).iter_dataframes(chunk_size=1))
+        for chunk in chunks:
+            self.assertEqual(chunk["reason_unscheduled_other"].dtype, pd.StringDtype())
+        pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+    def test_dtypes_of_column_null_in_sample(self):
+        pk = SubjectVisit.objects.order_by("pk").values_list("pk", flat=True).last()
+        SubjectVisit.objects.filter(pk=pk).update(reason_unscheduled_other="blah")
+        queryset = SubjectVisit.objects.all().order_by("pk")
+        m = ModelToDataframe(queryset=queryset)
+        m.dtypes_sample_size = 1
+        m.columns  # noqa: B018
+        # pks, sample, m2m merge
+        m2m_count = len(SubjectVisit._meta.many_to_many)
+        with self.assertNumQueries(2 + m2m_count):
+            dtypes = m.dtypes
+        self.assertEqual(dtypes["reason_unscheduled_other"], pd.StringDtype())
+        self.assertEqual(dtypes["report_datetime"], m.dataframe["report_datetime"].dtype)
+        chunks = list(m.iter_dataframes(chunk_size=1))
+        pd.testing.assert_frame_equal(pd.concat(chunks), m.dataframe)
+
+    def test_iter_dataframes_unordered_queryset_by_pk(self):
+        m = ModelToDataframe(model="clinicedc_tests.crffour", chunk_size=2)
+        df = pd.concat(m.iter_dataframes())
+        self.assertEqual(
+            list(df["id"]), list(CrfFour.objects.order_by("pk").values_list("pk", flat=True))
+        )
+
+    def test_iter_dataframes_none(self):
+        CrfFour.objects.all().delete()
+        chunks = list(ModelToDataframe(model="clinicedc_tests.crffour").iter_dataframes())
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].empty)
+
+    def test_to_csv_equals_dataframe_to_csv(self):
+        queryset = CrfFour.objects.all().order_by("pk")
+        opts = dict(index=False, sep="|", date_format="%Y-%m-%d %H:%M:%S")
+        buffer = StringIO()
+        rows = ModelToDataframe(queryset=queryset).to_csv(buffer, chunk_size=3, **opts)
+        df = ModelToDataframe(queryset=queryset).dataframe
+        self.assertEqual(rows, len(df))
+        self.assertEqual(buffer.getvalue(), df.to_csv(**opts))
+
+    def test_to_csv_equals_dataframe_to_csv_mixed_numeric(self):
+        """Assert a numeric column integral in some chunks and not
+        in others is written as in the full dataframe.
+        """
+        queryset = Appointment.objects.all().order_by("pk")
+        Appointment.objects.filter(pk=queryset.last().pk).update(timepoint=Decimal("0.5"))
+        opts = dict(index=False, sep="|", date_format="%Y-%m-%d %H:%M:%S")
+        df = ModelToDataframe(queryset=queryset).dataframe
+        self.assertEqual(df["timepoint"].dtype, pd.Float64Dtype())
+        m = ModelToDataframe(queryset=queryset)
+        m.dtypes_sample_size = 1
+        for chunk in m.iter_dataframes(chunk_size=1):
+            pd.testing.assert_series_equal(chunk.dtypes, df.dtypes)
+        buffer = StringIO()
+        m = ModelToDataframe(queryset=queryset)
+        m.dtypes_sample_size = 1
+        rows = m.to_csv(buffer, chunk_size=1, **opts)
+        self.assertEqual(rows, len(df))
+        self.assertEqual(buffer.getvalue(), df.to_csv(**opts))
@@ -10,6 +10,7 @@ from clinicedc_constants import NULL_STRING
 from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, router, transaction
 from django.db.models import Q
 
 from edc_registration.utils import get_registered_subject_model_cls
@@ -87,6 +88,9 @@ class Randomizer:
     randomizationlist_folder: Path | str = get_randomization_list_path()
     extra_csv_fieldnames: tuple[str] | None = None
     trial_is_blinded: bool = True
+    # claim the next SID atomically, see `claim_model_obj`. If None,
+    # settings.EDC_RANDOMIZATION_CONCURRENT_ALLOCATION is used.
+    concurrent_allocation: bool | None = None
     importer_cls: Any = RandomizationListImporter
     apps = None  # if not using django_apps
 
@@ -147,6 +151,11 @@ class Randomizer:
             raise RandomizationError(
                 f"Randomization failed. Insufficient data. Got {required_instance_attrs}."
             )
+        if self.allocate_concurrently:
+            with transaction.atomic(using=router.db_for_write(self.model_cls())):
+                self._model_obj = self.claim_model_obj()
+                self.update_registration_obj()
+            return
         setattr(
             self.model_obj,
             self.identifier_attr,
@@ -163,15 +172,31 @@ class Randomizer:
             allocated_datetime=self.allocated_datetime,
             **self.identifier_opts,
         )
+        self.update_registration_obj()
+        # requery
+        self._registration_obj = self.get_registration_model_cls().objects.get(
+            sid=self.model_obj.sid, **self.identifier_opts
+        )
+
+    @property
+    def allocate_concurrently(self) -> bool:
+        """Returns True if the next SID is claimed atomically.
+
+        The setting is read when called, not on import.
+        """
+        if self.concurrent_allocation is None:
+            return getattr(settings, "EDC_RANDOMIZATION_CONCURRENT_ALLOCATION", False)
+        return self.concurrent_allocation
+
+    def update_registration_obj(self) -> None:
+        """Updates the registration model instance with the SID
+        of the allocated "rando" model instance.
+        """
         self.registration_obj.sid = self.sid
         self.registration_obj.randomization_datetime = self.model_obj.allocated_datetime
         self.registration_obj.registration_status = RANDOMIZED
         self.registration_obj.randomization_list_model = self.model_obj._meta.label_lower
         self.registration_obj.save()
-        # requery
-        self._registration_obj = self.get_registration_model_cls().objects.get(
-            sid=self.model_obj.sid, **self.identifier_opts
-        )
 
     @property
     def identifier_opts(self) -> dict[str, str]:
@@ -242,6 +267,54 @@ class Randomizer:
                 )
         return self._model_obj
 
+    def claim_model_obj(self):
+        """Claims and returns the next available "rando" model
+        instance for this site, allocated to this identifier.
+
+        Used by `randomize` if `allocate_concurrently`. Call in a
+        transaction.
+
+        Where the backend supports it (PostgreSQL, MySQL 8+,
+        Oracle), the next row is selected with
+        `select_for_update(skip_locked=True)`, so concurrent
+        allocations at a site lock different rows instead of waiting
+        on, or failing on, the same row. Otherwise, the next row is
+        claimed with a conditional UPDATE (where the identifier is
+        still null) and, if another allocation claimed it first, the
+        following row is tried.
+
+        The instance is saved once and not re-queried.
+        """
+        model_cls = self.model_cls()
+        if model_cls.objects.filter(**self.identifier_opts).exists():
+            # raises AlreadyRandomized
+            return self.model_obj
+        opts = dict(site_name=self.site.name, **self.extra_model_obj_options)
+        qs = model_cls.objects.filter(
+            **{f"{self.identifier_attr}__isnull": True}, **opts
+        ).order_by("sid")
+        if connections[qs.db].features.has_select_for_update_skip_locked:
+            obj = qs.select_for_update(skip_locked=True).first()
+        else:
+            while (obj := qs.first()) and not (
+                model_cls.objects.filter(
+                    pk=obj.pk, **{f"{self.identifier_attr}__isnull": True}
+                ).update(**self.identifier_opts)
+            ):
+                pass
+        if not obj:
+            fld_str = ", ".join([f"{k}=`{v}`" for k, v in opts.items()])
+            raise AllocationError(
+                f"Randomization failed. No additional SIDs available for {fld_str}."
+            )
+        setattr(obj, self.identifier_attr, getattr(self, self.identifier_attr))
+        obj.allocated_datetime = self.allocated_datetime
+        obj.allocated_user = self.user
+        obj.allocated_site = self.site
+        obj.allocated = True
+        obj.save()
+        return obj
+
     def raise_if_already_randomized(self) -> Any:
         """Forces a query, will raise if already randomized."""
         return self.registration_obj
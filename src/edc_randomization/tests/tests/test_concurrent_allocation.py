@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import override_settings, tag
+from multisite import SiteID
+
+from edc_randomization.exceptions import AllocationError, AlreadyRandomized
+from edc_randomization.randomizer import Randomizer
+from edc_randomization.site_randomizers import site_randomizers
+from edc_registration.models import RegisteredSubject
+from edc_sites.site import sites as site_sites
+
+from ..models import MyRandomizationList, SubjectConsent
+from ..utils import populate_randomization_list_for_tests
+
+logger = logging.getLogger(__name__)
+
+tmpdir = mkdtemp()
+
+
+class MyConcurrentRandomizer(Randomizer):
+    name = "default"
+    model = "edc_randomization.myrandomizationlist"
+    randomizationlist_folder = tmpdir
+    concurrent_allocation = True
+
+
+def populate_list(per_site: int | None = None) -> None:
+    populate_randomization_list_for_tests(
+        randomizer_name="default",
+        site_names=[s.name for s in site_sites._registry.values()],
+        per_site=per_site,
+        overwrite_site=True,
+    )
+
+
+def randomize(subject_consent: SubjectConsent) -> MyConcurrentRandomizer:
+    randomizer = MyConcurrentRandomizer(
+        subject_identifier=subject_consent.subject_identifier,
+        report_datetime=subject_consent.consent_datetime,
+        site=subject_consent.site,
+        user=subject_consent.user_created,
+    )
+    randomizer.randomize()
+    return randomizer
+
+
+@tag("randomization")
+@override_settings(
+    EDC_AUTH_SKIP_SITE_AUTHS=True,
+    EDC_AUTH_SKIP_AUTH_UPDATER=True,
+    SITE_ID=SiteID(40),
+    EDC_SITES_REGISTER_DEFAULTS=False,
+    EDC_RANDOMIZATION_REGISTER_DEFAULT_RANDOMIZER=False,
+    ETC_DIR=tmpdir,
+    DEBUG=False,
+)
+class TestConcurrentAllocation(TestCase):
+    def setUp(self):
+        site_randomizers._registry = {}
+        site_randomizers.register(MyConcurrentRandomizer)
+        populate_list()
+
+    def test_allocates_first_sid(self):
+        first_obj = MyRandomizationList.objects.order_by("sid").first()
+        subject_consent = SubjectConsent.objects.create(
+            subject_identifier="12345", user_created="erikvw"
+        )
+        randomizer = randomize(subject_consent)
+        self.assertEqual(randomizer.sid, first_obj.sid)
+        first_obj.refresh_from_db()
+        self.assertEqual(first_obj.subject_identifier, "12345")
+        self.assertTrue(first_obj.allocated)
+        self.assertEqual(first_obj.allocated_user, "erikvw")
+        self.assertEqual(first_obj.allocated_datetime, subject_consent.consent_datetime)
+        self.assertEqual(first_obj.allocated_site, subject_consent.site)
+        rs = RegisteredSubject.objects.get(subject_identifier="12345")
+        self.assertEqual(rs.sid, str(first_obj.sid))
+        self.assertEqual(rs.randomization_datetime, first_obj.allocated_datetime)
+        self.assertEqual(rs.randomization_list_model, first_obj._meta.label_lower)
+
+    @patch.object(connection.features, "has_select_for_update_skip_locked", False)
+    def test_skips_claimed_sid(self):
+        """Assert allocates the next SID if the first is claimed
+        after it is selected.
+        """
+        first_obj, second_obj = MyRandomizationList.objects.order_by("sid")[:2]
+        subject_consent = SubjectConsent.objects.create(
+            subject_identifier="12345", user_created="erikvw"
+        )
+        selected_sids = []
+
+        def first(qs):
+            obj = original_first(qs)
+            if qs.model is MyRandomizationList:
+                selected_sids.append(obj.sid)
+                if len(selected_sids) == 1:
+                    # another allocation claims the row first
+                    MyRandomizationList.objects.filter(pk=obj.pk).update(
+                        subject_identifier="54321"
+                    )
+            return obj
+
+        original_first = QuerySet.first
+        with patch.object(QuerySet, "first", autospec=True, side_effect=first):
+            randomizer = randomize(subject_consent)
+        self.assertEqual(selected_sids, [first_obj.sid, second_obj.sid])
+        self.assertEqual(randomizer.sid, second_obj.sid)
+        first_obj.refresh_from_db()
+        self.assertEqual(first_obj.subject_identifier, "54321")
+        second_obj.refresh_from_db()
+        self.assertEqual(second_obj.subject_identifier, "12345")
+
+    def test_concurrent_allocation_setting(self):
+        class MyRandomizer(MyConcurrentRandomizer):
+            concurrent_allocation = None
+
+        subject_consent = SubjectConsent.objects.create(
+            subject_identifier="12345", user_created="erikvw"
+        )
+        randomizer = MyRandomizer(
+            subject_identifier=subject_consent.subject_identifier,
+            report_datetime=subject_consent.consent_datetime,
+            site=subject_consent.site,
+            user=subject_consent.user_created,
+        )
+        self.assertFalse(randomizer.allocate_concurrently)
+        with override_settings(EDC_RANDOMIZATION_CONCURRENT_ALLOCATION=True):
+            self.assertTrue(randomizer.allocate_concurrently)
+            with patch.object(
+                MyRandomizer, "claim_model_obj", wraps=randomizer.claim_model_obj
+            ) as claim_model_obj:
+                randomizer.randomize()
+        claim_model_obj.assert_called_once()
+
+    def test_cannot_rerandomize(self):
+        subject_consent = SubjectConsent.objects.create(
+            subject_identifier="12345", user_created="erikvw"
+        )
+        randomize(subject_consent)
+        self.assertRaises(AlreadyRandomized, randomize, subject_consent)
+
+    def test_allocation_error(self):
+        site = Site.objects.get_current()
+        MyRandomizationList.objects.filter(site_name=site.name).update(
+            subject_identifier=None, site_name="blah"
+        )
+        subject_consent = SubjectConsent.objects.create(
+            subject_identifier="12345", user_created="erikvw"
+        )
+        self.assertRaises(AllocationError, randomize, subject_consent)
+        self.assertFalse(RegisteredSubject.objects.get(subject_identifier="12345").sid)
+
+
+@tag("randomization")
+@override_settings(
+    EDC_AUTH_SKIP_SITE_AUTHS=True,
+    EDC_AUTH_SKIP_AUTH_UPDATER=True,
+    SITE_ID=SiteID(40),
+    EDC_SITES_REGISTER_DEFAULTS=False,
+    EDC_RANDOMIZATION_REGISTER_DEFAULT_RANDOMIZER=False,
+    ETC_DIR=tmpdir,
+    DEBUG=False,
+)
+@skipUnlessDBFeature("has_select_for_update_skip_locked")
+class TestConcurrentAllocationBenchmark(TransactionTestCase):
+    """Randomizes subjects of one site from many threads.
+
+    Asserts that each subject is allocated a different SID and
+    that the SIDs allocated are the first SIDs of the site's list,
+    none skipped.
+
+    Skipped on SQLite, which raises "database table is locked"
+    instead of waiting on a concurrent writer. See
+    `test_skips_claimed_sid` for the conditional UPDATE path.
+    """
+
+    subjects = 40
+    threads = 8
+
+    def setUp(self):
+        site_randomizers._registry = {}
+        site_randomizers.register(MyConcurrentRandomizer)
+        populate_list(per_site=self.subjects)
+        self.subject_consents = [
+            SubjectConsent.objects.create(
+                subject_identifier=f"12345{i:03d}", user_created="erikvw"
+            )
+            for i in range(self.subjects)
+        ]
+
+    @staticmethod
+    def randomize_in_thread(subject_consent: SubjectConsent) -> int:
+        try:
+            return randomize(subject_consent).sid
+        finally:
+            connection.close()
+
+    def test_concurrent_randomize(self):
+        site = Site.objects.get_current()
+        expected_sids = list(
+            MyRandomizationList.objects.filter(site_name=site.name)
+            .order_by("sid")
+            .values_list("sid", flat=True)[: self.subjects]
+        )
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            sids = list(executor.map(self.randomize_in_thread, self.subject_consents))
+        seconds = time.perf_counter() - start
+        self.assertEqual(len(set(sids)), self.subjects)
+        self.assertEqual(sorted(sids), expected_sids)
+        self.assertEqual(
+            sorted(
+                MyRandomizationList.objects.filter(
+                    subject_identifier__isnull=False
+                ).values_list("sid", flat=True)
+            ),
+            expected_sids,
+        )
+        self.assertEqual(
+            sorted(
+                int(sid) for sid in RegisteredSubject.objects.values_list("sid", flat=True)
+            ),
+            expected_sids,
+        )
+        logger.info(
+            "%s subjects randomized from %s threads on %s in %.2fs (%.1f/s)",
+            self.subjects,
+            self.threads,
+            connection.vendor,
+            seconds,
+            self.subjects / seconds,
+        )
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from datetime import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from edc_utils.age import AgeValueError
+
+from .compiled_reference_ranges import compiled_reference_ranges, get_age_value
+
+if TYPE_CHECKING:
+    from .compiled_reference_ranges import CompiledLabel, GradingRange
+    from .models import ReferenceRangeCollection
+
+__all__ = ["GRADE_COLUMNS", "INPUT_COLUMNS", "grade_dataframe", "in_bounds_array"]
+
+INPUT_COLUMNS = ["label", "units", "gender", "dob", "report_datetime", "value"]
+GRADE_COLUMNS = ["grade", "is_normal", "condition_str", "error"]
+
+
+def in_bounds_array(
+    values: np.ndarray,
+    lower: float | np.ndarray | None,
+    lower_inclusive: bool,
+    upper: float | np.ndarray | None,
+    upper_inclusive: bool,
+) -> np.ndarray:
+    """Returns a boolean array, True where `lower <(=) value <(=) upper`.
+
+    A bound of None is open. A NaN value or bound is never in bounds.
+    """
+    lower = -np.inf if lower is None else lower
+    upper = np.inf if upper is None else upper
+    above = values >= lower if lower_inclusive else values > lower
+    below = values <= upper if upper_inclusive else values < upper
+    return above & below
+
+
+def grade_dataframe(
+    df: pd.DataFrame,
+    reference_range_collection: ReferenceRangeCollection,
+    age_units: str | None = None,
+) -> pd.DataFrame:
+    """Returns a DataFrame, with the index of `df`, of the grade,
+    normal range flag, condition string and error for each value.
+
+    `df` has the columns in INPUT_COLUMNS: label, units, gender,
+    dob, report_datetime and value.
+
+    Values are graded against the compiled reference ranges of the
+    collection (see `compiled_reference_ranges`), with one array
+    comparison per age band and grade instead of one call to
+    `get_grade_for_value` per value. The age is calculated once
+    per unique (dob, report_datetime).
+
+    Columns returned:
+        * grade: as `get_grade_for_value`, NA if not graded;
+        * is_normal: as `ReferenceRangeCollection.is_normal`, NA if
+          the normal reference is not found;
+        * condition_str: as `get_grade_for_value`, for example
+          "alt: 1.25*40.0<=55.0<2.5*40.0 IU/L GRADE1", or "";
+        * error: why the value was not graded, or "".
+
+    Unlike `get_grade_for_value`, missing normal references are
+    not created for new units. Add them before batch grading.
+    """
+    age_units = age_units or "years"
+    batch = BatchGrading(len(df))
+    batch.values = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=float)
+    batch.set_ages(df["dob"], df["report_datetime"], age_units)
+    groups = df.groupby(["label", "units", "gender"], sort=False, dropna=False).indices
+    for (label, units, gender), positions in groups.items():
+        if pd.isna(label) or pd.isna(units) or pd.isna(gender):
+            batch.set_error(
+                positions, "Value not graded. Label, units and gender are required"
+            )
+            continue
+        compiled = compiled_reference_ranges.get(reference_range_collection, label)
+        batch.grade(compiled, units, gender, age_units, positions)
+    return pd.DataFrame(
+        {
+            "grade": pd.array(
+                [None if g < 0 else int(g) for g in batch.grades], dtype="Int64"
+            ),
+            "is_normal": pd.array(
+                [None if n < 0 else bool(n) for n in batch.is_normal], dtype="boolean"
+            ),
+            "condition_str": batch.condition_strs,
+            "error": batch.errors,
+        },
+        index=df.index,
+    )
+
+
+class BatchGrading:
+    """Result arrays of `grade_dataframe`.
+
+    Grade and is_normal use -1 for NA until converted.
+    """
+
+    def __init__(self, size: int):
+        self.values = np.full(size, np.nan)
+        self.ages = np.full(size, np.nan)
+        self.grades = np.full(size, -1, dtype=np.int64)
+        self.is_normal = np.full(size, -1, dtype=np.int8)
+        self.condition_strs = np.full(size, "", dtype=object)
+        self.errors = np.full(size, "", dtype=object)
+        self.age_errors = np.full(size, "", dtype=object)
+
+    def set_error(self, positions: np.ndarray, error: str) -> None:
+        """Sets the error where not already set."""
+        positions = positions[self.errors[positions] == ""]
+        self.errors[positions] = error
+
+    def set_ages(self, dobs: pd.Series, report_datetimes: pd.Series, age_units: str) -> None:
+        codes, uniques = pd.factorize(
+            pd.Series(list(zip(dobs, report_datetimes, strict=True)), dtype=object)
+        )
+        unique_ages = np.full(len(uniques), np.nan)
+        for index, (dob, report_datetime) in enumerate(uniques):
+            try:
+                unique_ages[index] = get_age_value(
+                    to_python(dob), to_python(report_datetime), age_units
+                )
+            except (AgeValueError, TypeError, ValueError) as e:
+                self.age_errors[codes == index] = str(e)
+        self.ages = unique_ages[codes]
+
+    def grade(
+        self,
+        compiled: CompiledLabel,
+        units: str,
+        gender: str,
+        age_units: str,
+        positions: np.ndarray,
+    ) -> None:
+        """Grades the values of one (label, units, gender)."""
+        label = compiled.label
+        ages = self.ages[positions]
+        values = self.values[positions]
+        grading_bands = compiled.grading.get((units, gender))
+        if grading_bands is None:
+            self.set_error(
+                positions,
+                "Value not graded. "
+                f"No matching grading data found for {label} {units} {gender}",
+            )
+        for age_error in set(self.age_errors[positions]) - {""}:
+            self.set_error(positions[self.age_errors[positions] == age_error], age_error)
+        if grading_bands is not None:
+            in_any_band = np.zeros(len(positions), dtype=bool)
+            for bounds, _ in grading_bands.bands:
+                in_any_band |= in_bounds_array(ages, *bounds)
+            self.set_error(
+                positions[~in_any_band],
+                "Value not graded. No matching grading data found for "
+                f"{label} {units} {gender} given age bounds",
+            )
+        normal_lower, normal_upper, has_normal = self.set_is_normal(
+            compiled, (units, gender, age_units), positions, ages, values
+        )
+        if grading_bands is None:
+            return
+        grading_ranges: list[GradingRange] = []
+        matched = np.full(len(positions), -1)
+        lowers = np.full(len(positions), np.nan)
+        uppers = np.full(len(positions), np.nan)
+        for bounds, band in grading_bands.bands:
+            in_band = in_bounds_array(ages, *bounds)
+            for grading_range in band:
+                lower, upper = grading_range.lower, grading_range.upper
+                if lower and grading_range.lln:
+                    lower = lower * (
+                        normal_lower if "LLN" in grading_range.lln else normal_upper
+                    )
+                if upper and grading_range.uln:
+                    upper = upper * (
+                        normal_lower if "LLN" in grading_range.uln else normal_upper
+                    )
+                in_grade = (
+                    in_band
+                    & has_normal
+                    & in_bounds_array(
+                        values,
+                        lower,
+                        grading_range.lower_inclusive,
+                        upper,
+                        grading_range.upper_inclusive,
+                    )
+                )
+                overlaps = in_grade & (matched >= 0)
+                if overlaps.any():
+                    self.set_error(
+                        positions[overlaps],
+                        "Overlapping grading definitions. "
+                        f"Check your grading definitions for `{label}`.",
+                    )
+                    matched[overlaps] = -2
+                in_grade &= matched == -1
+                matched[in_grade] = len(grading_ranges)
+                lowers[in_grade] = np.broadcast_to(
+                    np.nan if lower is None else lower, values.shape
+                )[in_grade]
+                uppers[in_grade] = np.broadcast_to(
+                    np.nan if upper is None else upper, values.shape
+                )[in_grade]
+                grading_ranges.append(grading_range)
+        for index in (matched >= 0).nonzero()[0]:
+            grading_range = grading_ranges[matched[index]]
+            condition_str = grading_range.get_condition_str(
+                float(values[index]),
+                None if np.isnan(lowers[index]) else float(lowers[index]),
+                None if np.isnan(uppers[index]) else float(uppers[index]),
+            )
+            self.grades[positions[index]] = grading_range.grade
+            self.condition_strs[positions[index]] = (
+                f"{label}: {condition_str} {units} GRADE{grading_range.grade}"
+            )
+
+    def set_is_normal(
+        self,
+        compiled: CompiledLabel,
+        key: tuple[str, str, str],
+        positions: np.ndarray,
+        ages: np.ndarray,
+        values: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sets is_normal and returns the arrays of the LLN, ULN
+        and a mask of the values with one normal reference.
+        """
+        units, gender, _ = key
+        normal_bands = compiled.normal.get(key)
+        normal_lower = np.full(len(positions), np.nan)
+        normal_upper = np.full(len(positions), np.nan)
+        is_normal = np.zeros(len(positions), dtype=bool)
+        found = np.zeros(len(positions), dtype=np.int64)
+        for bounds, band in normal_bands.bands if normal_bands else ():
+            in_band = in_bounds_array(ages, *bounds)
+            for normal_range in band:
+                found += in_band
+                normal_lower[in_band] = (
+                    np.nan if normal_range.obj.lower is None else normal_range.obj.lower
+                )
+                normal_upper[in_band] = (
+                    np.nan if normal_range.obj.upper is None else normal_range.obj.upper
+                )
+                is_normal[in_band] = (
+                    in_bounds_array(ages, *normal_range.phrase_age_bounds)
+                    & in_bounds_array(values, *normal_range.bounds)
+                )[in_band]
+        self.set_error(
+            positions[found == 0],
+            f"Value not evaluated. Normal reference not found for `{compiled.label}`. "
+            f"Using units={units}, gender={gender}.",
+        )
+        self.set_error(
+            positions[found > 1],
+            f"Value not evaluated. Multiple normal references found for `{compiled.label}`. "
+            f"Using units={units}, gender={gender}.",
+        )
+        has_normal = found == 1
+        self.is_normal[positions[has_normal]] = is_normal[has_normal]
+        return normal_lower, normal_upper, has_normal
+
+
+def to_python(value):
+    """Returns a pandas Timestamp as a datetime or date."""
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+        if value.tzinfo is None and value.time() == time(0):
+            value = value.date()
+    return value
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from math import inf
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps as django_apps
+
+from edc_utils import age
+
+from .constants import MAX_AGE
+
+if TYPE_CHECKING:
+    from .models import GradingData, NormalData, ReferenceRangeCollection
+
+__all__ = [
+    "AgeBands",
+    "CompiledLabel",
+    "CompiledReferenceRanges",
+    "GradingRange",
+    "NormalRange",
+    "compiled_reference_ranges",
+    "get_age_bounds",
+    "get_age_value",
+    "get_bounds",
+    "in_bounds",
+]
+
+AGE_UNITS = ["days", "months", "years"]
+
+
+def in_bounds(
+    value: int | float,
+    lower: int | float | None,
+    lower_inclusive: bool,
+    upper: int | float | None,
+    upper_inclusive: bool,
+) -> bool:
+    """Returns True if `lower <(=) value <(=) upper`.
+
+    A bound of None is open.
+    """
+    if lower is not None and (value < lower if lower_inclusive else value <= lower):
+        return False
+    return upper is None or (value <= upper if upper_inclusive else value < upper)
+
+
+def get_age_value(
+    dob: date, report_datetime: datetime, age_units: str | None = None
+) -> int | float:
+    """Returns the age in `age_units` or raises ValueError.
+
+    Same checks as `ReferenceModelMixin.age_in_bounds_or_raise`.
+    """
+    age_units = age_units or "years"
+    if age_units not in AGE_UNITS:
+        raise ValueError(f"Invalid age units. Expected one of {AGE_UNITS}. Got {age_units}")
+    age_value = getattr(age(dob, report_datetime), age_units)
+    if not isinstance(age_value, (int, float)) or not (0.0 <= age_value <= MAX_AGE):
+        raise ValueError(f"Invalid age value. Got {age_value}.")
+    return age_value
+
+
+def get_bounds(obj: GradingData | NormalData) -> tuple[float | None, bool, float | None, bool]:
+    """Returns (lower, lower_inclusive, upper, upper_inclusive) of
+    the value phrase of a GradingData or NormalData instance.
+
+    A bound is None if the phrase has no lower or upper limit.
+    """
+    return (
+        float(obj.lower) if obj.lower and obj.lower_operator else None,
+        obj.lower_operator == "<=",
+        float(obj.upper) if obj.upper and obj.upper_operator else None,
+        obj.upper_operator == "<=",
+    )
+
+
+def get_age_bounds(obj: GradingData | NormalData) -> tuple[int | None, bool, int | None, bool]:
+    """Returns (lower, lower_inclusive, upper, upper_inclusive) of
+    the age phrase of a GradingData or NormalData instance.
+    """
+    return (
+        obj.age_lower if obj.age_lower and obj.age_lower_operator else None,
+        obj.age_lower_operator == "<=",
+        obj.age_upper if obj.age_upper and obj.age_upper_operator else None,
+        obj.age_upper_operator == "<=",
+    )
+
+
+@dataclass(frozen=True)
+class NormalRange:
+    """A NormalData instance compiled for lookup by age.
+
+    Age bounds for lookup are inclusive (see
+    `get_normal_data_or_raise`). `bounds` and `phrase_age_bounds` are
+    the bounds checked by `NormalData.value_in_normal_range_or_raise`.
+    """
+
+    obj: NormalData
+    age_bounds: tuple[int | None, bool, int | None, bool]
+    bounds: tuple[float | None, bool, float | None, bool]
+    phrase_age_bounds: tuple[int | None, bool, int | None, bool]
+
+    @classmethod
+    def from_obj(cls, obj: NormalData) -> NormalRange:
+        return cls(
+            obj=obj,
+            age_bounds=(obj.age_lower, True, obj.age_upper, True),
+            bounds=get_bounds(obj),
+            phrase_age_bounds=get_age_bounds(obj),
+        )
+
+
+@dataclass(frozen=True)
+class GradingRange:
+    """A GradingData instance compiled to numeric bounds.
+
+    A bound is None if the phrase has no lower or upper limit. If the
+    bound is relative to the normal range (`lln`, `uln`), it is
+    multiplied by the LLN or ULN of the NormalData instance in
+    `evaluate`.
+    """
+
+    obj: GradingData
+    lower: float | None
+    lower_inclusive: bool
+    lln: str
+    upper: float | None
+    upper_inclusive: bool
+    uln: str
+    age_bounds: tuple[int | None, bool, int | None, bool]
+
+    @classmethod
+    def from_obj(cls, obj: GradingData) -> GradingRange:
+        lower, lower_inclusive, upper, upper_inclusive = get_bounds(obj)
+        return cls(
+            obj=obj,
+            lower=lower,
+            lower_inclusive=lower_inclusive,
+            lln=obj.lln or "",
+            upper=upper,
+            upper_inclusive=upper_inclusive,
+            uln=obj.uln or "",
+            age_bounds=get_age_bounds(obj),
+        )
+
+    @property
+    def grade(self) -> int:
+        return self.obj.grade
+
+    def get_limits(self, normal_data: NormalData) -> tuple[float | None, float | None]:
+        """Returns the lower and upper limits with LLN/ULN resolved."""
+        lower, upper = self.lower, self.upper
+        if lower and self.lln:
+            lower *= normal_data.lower if "LLN" in self.lln else normal_data.upper
+        if upper and self.uln:
+            upper *= normal_data.lower if "LLN" in self.uln else normal_data.upper
+        return lower, upper
+
+    def evaluate(self, value: float, normal_data: NormalData) -> str | None:
+        """Returns the condition string if the value is within
+        the limits of this grade, otherwise None.
+
+        For example, "10.0<=11.0<20.0".
+        """
+        lower, upper = self.get_limits(normal_data)
+        if not in_bounds(value, lower, self.lower_inclusive, upper, self.upper_inclusive):
+            return None
+        return self.get_condition_str(value, lower, upper)
+
+    def get_condition_str(self, value: float, lower: float | None, upper: float | None) -> str:
+        return (
+            f"{'' if lower is None else lower}{self.obj.lower_operator or ''}{value}"
+            f"{self.obj.upper_operator or ''}{'' if upper is None else upper}"
+        )
+
+
+class AgeBands:
+    """Ranges grouped by age bounds and sorted by the lower
+    age bound.
+
+    The bands that may include an age are found by bisect.
+    """
+
+    def __init__(self, ranges: list[GradingRange | NormalRange]):
+        bands: dict[tuple, list] = {}
+        for rng in ranges:
+            bands.setdefault(rng.age_bounds, []).append(rng)
+        self.bands: tuple[tuple[tuple, tuple], ...] = tuple(
+            sorted(
+                ((bounds, tuple(band)) for bounds, band in bands.items()),
+                key=lambda item: -inf if item[0][0] is None else item[0][0],
+            )
+        )
+        self.lowers: tuple[float, ...] = tuple(
+            -inf if bounds[0] is None else bounds[0] for bounds, _ in self.bands
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({[bounds for bounds, _ in self.bands]})"
+
+    def get(self, age_value: int | float) -> list[GradingRange | NormalRange]:
+        ranges = []
+        for bounds, band in self.bands[: bisect_right(self.lowers, age_value)]:
+            if in_bounds(age_value, *bounds):
+                ranges.extend(band)
+        return ranges
+
+
+@dataclass(frozen=True)
+class CompiledLabel:
+    """The compiled grading and normal ranges of a label in a
+    reference range collection.
+
+    `grading` is keyed by (units, gender) and `normal` by
+    (units, gender, age_units).
+    """
+
+    label: str
+    grading: dict[tuple[str, str], AgeBands] = field(default_factory=dict)
+    normal: dict[tuple[str, str, str], AgeBands] = field(default_factory=dict)
+
+    @classmethod
+    def from_objs(
+        cls, label: str, grading_objs: list[GradingData], normal_objs: list[NormalData]
+    ) -> CompiledLabel:
+        grading: dict[tuple[str, str], list[GradingRange]] = {}
+        for obj in sorted(grading_objs, key=lambda o: o.grade):
+            grading.setdefault((obj.units, obj.gender), []).append(GradingRange.from_obj(obj))
+        normal: dict[tuple[str, str, str], list[NormalRange]] = {}
+        for obj in normal_objs:
+            normal.setdefault((obj.units, obj.gender, obj.age_units), []).append(
+                NormalRange.from_obj(obj)
+            )
+        return cls(
+            label=label,
+            grading={k: AgeBands(v) for k, v in grading.items()},
+            normal={k: AgeBands(v) for k, v in normal.items()},
+        )
+
+    def get_grading_ranges(
+        self, units: str, gender: str, age_value: int | float
+    ) -> list[GradingRange] | None:
+        """Returns the grading ranges for the age sorted by grade
+        or None if there are none for the units and gender.
+        """
+        try:
+            age_bands = self.grading[(units, gender)]
+        except KeyError:
+            return None
+        return sorted(age_bands.get(age_value), key=lambda rng: rng.grade)
+
+    def get_normal_data(
+        self, units: str, gender: str, age_units: str, age_value: int | float
+    ) -> list[NormalData]:
+        try:
+            age_bands = self.normal[(units, gender, age_units)]
+        except KeyError:
+            return []
+        return [rng.obj for rng in age_bands.get(age_value)]
+
+
+class CompiledReferenceRanges:
+    """A process-wide cache of the GradingData and NormalData of
+    each reference range collection compiled by label.
+
+    A collection is loaded on first access with one query per model.
+    Grading a value does not touch the database.
+
+    A label is invalidated when a GradingData or NormalData instance
+    is saved or deleted (see signals) and reloaded on next access;
+    a collection is invalidated by `load_reference_ranges`. Other
+    processes are not notified; their cache is refreshed on their
+    next save, delete or load or when restarted.
+
+    For example:
+
+        compiled = compiled_reference_ranges.get(reference_range_collection, "alt")
+        compiled.get_grading_ranges(IU_LITER, MALE, age_value=25)
+        [GradingRange(obj=<GradingData: alt: 1.25*ULN<=x<2.5*ULN ...>, ...]
+    """
+
+    grading_data_model: str = "edc_reportable.gradingdata"
+    normal_data_model: str = "edc_reportable.normaldata"
+
+    def __init__(self) -> None:
+        # {collection pk: {label: CompiledLabel or None if invalidated}}
+        self._collections: dict[Any, dict[str, CompiledLabel | None]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(collections={len(self._collections)})"
+
+    def __contains__(self, reference_range_collection: ReferenceRangeCollection) -> bool:
+        return reference_range_collection.pk in self._collections
+
+    def get(
+        self, reference_range_collection: ReferenceRangeCollection, label: str
+    ) -> CompiledLabel:
+        """Returns the CompiledLabel for a label, loading the
+        collection or the invalidated label if needed.
+        """
+        pk = reference_range_collection.pk
+        try:
+            labels = self._collections[pk]
+        except KeyError:
+            with self._lock:
+                if pk not in self._collections:
+                    self._collections[pk] = self.compile(pk)
+                labels = self._collections[pk]
+        try:
+            compiled = labels[label]
+        except KeyError:
+            return CompiledLabel(label=label)
+        if compiled is None:
+            with self._lock:
+                if labels.get(label) is None:
+                    labels[label] = self.compile(pk, label=label).get(
+                        label, CompiledLabel(label=label)
+                    )
+                compiled = labels[label]
+        return compiled
+
+    def compile(self, pk: Any, label: str | None = None) -> dict[str, CompiledLabel]:
+        """Returns a dictionary of {label: CompiledLabel} for a
+        collection or for one label of a collection.
+        """
+        opts = dict(reference_range_collection_id=pk)
+        if label is not None:
+            opts.update(label=label)
+        grading_objs: dict[str, list[GradingData]] = {}
+        for obj in django_apps.get_model(self.grading_data_model).objects.filter(**opts):
+            grading_objs.setdefault(obj.label, []).append(obj)
+        normal_objs: dict[str, list[NormalData]] = {}
+        for obj in django_apps.get_model(self.normal_data_model).objects.filter(**opts):
+            normal_objs.setdefault(obj.label, []).append(obj)
+        return {
+            lbl: CompiledLabel.from_objs(
+                lbl, grading_objs.get(lbl, []), normal_objs.get(lbl, [])
+            )
+            for lbl in {*grading_objs, *normal_objs}
+        }
+
+    def invalidate(self, pk: Any = None, label: str | None = None) -> None:
+        """Removes a label of a collection, a collection or all
+        collections from the cache.
+
+        Reloaded from the database on next access.
+        """
+        with self._lock:
+            if pk is None:
+                self._collections = {}
+            elif label is None:
+                self._collections.pop(pk, None)
+            elif pk in self._collections:
+                self._collections[pk][label] = None
+
+
+compiled_reference_ranges = CompiledReferenceRanges()
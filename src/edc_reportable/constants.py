@@ -1,3 +1,4 @@
 LLN = "LLN"
 ULN = "ULN"
 HIGH_VALUE = "9999999999.9"
+MAX_AGE = 130.0
@@ -36,3 +36,7 @@ class NotEvaluated(Exception):  # noqa: N818
 
 class BoundariesOverlap(Exception):  # noqa: N818
     pass
+
+
+class RegradeError(Exception):
+    pass
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from edc_reportable.exceptions import RegradeError
+from edc_reportable.results_regrader import ResultsRegrader
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-grade the result values of a blood results model against the current "
+        "reference ranges and report the values where the stored grade would change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            dest="model",
+            default=None,
+            help="Blood results model in the format app_label.model_name",
+        )
+
+        parser.add_argument(
+            "--reference-range-collection",
+            dest="reference_range_collection_name",
+            default=None,
+            help=(
+                "Reference range collection name "
+                "(Default: the collection of the requisition panel)"
+            ),
+        )
+
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=5000,
+            help="Number of rows per chunk (Default: 5000)",
+        )
+
+        parser.add_argument(
+            "--age-units",
+            dest="age_units",
+            default="years",
+            help="Age units (Default: years)",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        model = options.get("model")
+        if not model:
+            raise CommandError("--model is required")
+        try:
+            regrader = ResultsRegrader(
+                model,
+                reference_range_collection_name=options.get("reference_range_collection_name"),
+                chunk_size=options.get("chunk_size"),
+                age_units=options.get("age_units"),
+            )
+        except (LookupError, RegradeError) as e:
+            raise CommandError(e) from e
+        summary = regrader.run()
+        for changed_grade in summary.changed:
+            self.stdout.write(f"{changed_grade}\n")
+        self.stdout.write(
+            f"Re-graded {summary.values} values in {summary.rows} rows in "
+            f"{summary.seconds:.1f}s ({summary.values_per_second:.1f} values/s).\n"
+        )
+        self.stdout.write(f"not graded: {summary.not_graded}\n")
+        self.stdout.write(f"changed: {len(summary.changed)}\n")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edc_reportable", "0008_alter_gradingdata_revision_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="referencerangecollection",
+            name="content_hash",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="Hash of the reference ranges last loaded. See load_reference_ranges",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -4,3 +4,7 @@ from .mw import MolecularWeight
 from .normal_data import NormalData
 from .reference_model_mixins import ReferenceModelMixin
 from .reference_range_collection import ReferenceRangeCollection
+from .signals import (
+    invalidate_compiled_reference_ranges_on_post_delete,
+    invalidate_compiled_reference_ranges_on_post_save,
+)
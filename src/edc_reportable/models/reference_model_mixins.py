@@ -6,12 +6,11 @@ from django.db import models
 
 from edc_utils import age
 
+from ..constants import MAX_AGE
 from ..exceptions import ValueBoundryError
 from ..formula import clean_and_validate_phrase
 from .reference_range_collection import ReferenceRangeCollection
 
-MAX_AGE = 130.0
-
 
 class ReferenceModelMixin(models.Model):
     reference_range_collection = models.ForeignKey(
@@ -63,13 +62,20 @@ class ReferenceModelMixin(models.Model):
     )
 
     def save(self, *args, **kwargs):
+        self.update_calculated_fields()
+        super().save(*args, **kwargs)
+
+    def update_calculated_fields(self) -> None:
+        """Sets the fields calculated in save().
+
+        Called directly before `bulk_create` or `bulk_update`.
+        """
         self.age_phrase = (
             f"{self.age_lower or ''}{self.age_lower_operator or ''}"
             f"%(age_value)s{self.age_upper_operator or ''}{self.age_upper or ''}"
         )
         self.phrase = self.get_phrase()
         self.description = self.get_description()
-        super().save(*args, **kwargs)
 
     def get_phrase(self) -> str:
         lower = self.lower or ""
@@ -27,6 +27,13 @@ class ReferenceRangeCollection(BaseUuidModel):
     grade3 = models.BooleanField(default=True)
     grade4 = models.BooleanField(default=True)
 
+    content_hash = models.CharField(
+        max_length=64,
+        default="",
+        editable=False,
+        help_text="Hash of the reference ranges last loaded. See load_reference_ranges",
+    )
+
     def __str__(self):
         return self.name
 
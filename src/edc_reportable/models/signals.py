@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..compiled_reference_ranges import compiled_reference_ranges
+from .grading_data import GradingData
+from .normal_data import NormalData
+
+
+@receiver(
+    post_save,
+    sender=GradingData,
+    dispatch_uid="invalidate_compiled_reference_ranges_on_grading_data_post_save",
+)
+@receiver(
+    post_save,
+    sender=NormalData,
+    dispatch_uid="invalidate_compiled_reference_ranges_on_normal_data_post_save",
+)
+def invalidate_compiled_reference_ranges_on_post_save(sender, instance, **kwargs):
+    """Removes the label of the instance from the in-memory
+    compiled reference ranges.
+    """
+    compiled_reference_ranges.invalidate(
+        instance.reference_range_collection_id, instance.label
+    )
+
+
+@receiver(
+    post_delete,
+    sender=GradingData,
+    dispatch_uid="invalidate_compiled_reference_ranges_on_grading_data_post_delete",
+)
+@receiver(
+    post_delete,
+    sender=NormalData,
+    dispatch_uid="invalidate_compiled_reference_ranges_on_normal_data_post_delete",
+)
+def invalidate_compiled_reference_ranges_on_post_delete(sender, instance, **kwargs):
+    """Removes the label of the instance from the in-memory
+    compiled reference ranges.
+    """
+    compiled_reference_ranges.invalidate(
+        instance.reference_range_collection_id, instance.label
+    )
@@ -16,6 +16,7 @@ from django.apps import apps as django_apps
 
 from edc_metadata.constants import REQUIRED
 
+from .compiled_reference_ranges import compiled_reference_ranges
 from .exceptions import NotEvaluated, ValueBoundryError
 from .utils import get_grade_for_value, get_normal_data_or_raise
 
@@ -101,10 +102,9 @@ class ReferenceRangeEvaluator:
                 utest_id = field
             if (
                 value is not None
-                and self.normal_data_model_cls.objects.filter(
-                    reference_range_collection=self.reference_range_collection,
-                    label=utest_id,
-                ).exists()
+                and compiled_reference_ranges.get(
+                    self.reference_range_collection, utest_id
+                ).normal
             ):
                 # raise ValidationError if
                 self._grade_or_check_normal_range(utest_id, value, field)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+from django.apps import apps as django_apps
+from django.core.exceptions import ObjectDoesNotExist
+
+from .batch_grading import grade_dataframe
+from .exceptions import RegradeError
+from .utils import get_reference_range_collection, reference_range_colllection_model_cls
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db import models
+
+    from .models import ReferenceRangeCollection
+
+__all__ = ["ChangedGrade", "RegradeSummary", "ResultsRegrader"]
+
+
+@dataclass(frozen=True)
+class ChangedGrade:
+    """A result value where the stored grade differs from the
+    grade given the current reference ranges.
+    """
+
+    pk: Any
+    subject_identifier: str
+    label: str
+    value: Decimal | float
+    units: str
+    stored_grade: int | None
+    grade: int | None
+    condition_str: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.pk} {self.subject_identifier} {self.label}: "
+            f"{self.value} {self.units} GRADE{self.stored_grade} -> GRADE{self.grade}"
+            f"{f' ({self.condition_str})' if self.condition_str else ''}"
+        )
+
+
+@dataclass
+class RegradeSummary:
+    rows: int = 0
+    values: int = 0
+    not_graded: int = 0
+    changed: list[ChangedGrade] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def values_per_second(self) -> float:
+        return self.values / self.seconds if self.seconds else 0.0
+
+
+class ResultsRegrader:
+    """Re-grades the result values of a blood results model against
+    the current reference ranges and returns the values where the
+    stored grade (`<utest_id>_grade`) would change.
+
+    Rows are read in chunks ordered by pk. Each chunk is graded with
+    `grade_dataframe`. The dob and gender of each subject are read
+    from RegisteredSubject, once per chunk.
+
+    As in `get_summary`, the expected stored grade is the grade if
+    it is a reportable grade for the label, otherwise None. Values
+    that cannot be graded are counted in `not_graded` and are not
+    reported as changed.
+
+    Stored grades are not updated.
+
+    For example:
+
+        summary = ResultsRegrader("meta_subject.bloodresultslft").run()
+        for changed_grade in summary.changed:
+            print(changed_grade)
+    """
+
+    registered_subject_model = "edc_registration.registeredsubject"
+
+    def __init__(
+        self,
+        model: str,
+        reference_range_collection_name: str | None = None,
+        chunk_size: int | None = None,
+        age_units: str | None = None,
+    ):
+        self.model_cls: type[models.Model] = django_apps.get_model(model)
+        self.chunk_size = chunk_size or 5000
+        self.age_units = age_units or "years"
+        self.utest_ids = self.get_utest_ids()
+        if not self.utest_ids:
+            raise RegradeError(f"Model has no graded result fields. Got {model}.")
+        self.subject_identifier_attr = (
+            f"{self.model_cls.related_visit_model_attr()}__subject_identifier"
+        )
+        self.reference_range_collection = self.get_reference_range_collection(
+            reference_range_collection_name
+        )
+        self._reportable_grades: dict[str, list[int]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.model_cls._meta.label_lower})"
+
+    def get_utest_ids(self) -> list[str]:
+        """Returns the utest_ids of fields `<utest_id>_value` with
+        fields `<utest_id>_units` and `<utest_id>_grade`.
+        """
+        field_names = [f.name for f in self.model_cls._meta.get_fields()]
+        return [
+            field_name.removesuffix("_value")
+            for field_name in field_names
+            if field_name.endswith("_value")
+            and f"{field_name.removesuffix('_value')}_units" in field_names
+            and f"{field_name.removesuffix('_value')}_grade" in field_names
+        ]
+
+    def get_reference_range_collection(
+        self, name: str | None = None
+    ) -> ReferenceRangeCollection | None:
+        """Returns the collection by name or, if not given, the
+        collection of the requisition panel of the first row.
+        """
+        if name:
+            try:
+                return reference_range_colllection_model_cls().objects.get(name=name)
+            except ObjectDoesNotExist as e:
+                raise RegradeError(f"Invalid reference range collection. Got {name}.") from e
+        obj = self.model_cls.objects.order_by("pk").first()
+        return get_reference_range_collection(obj)
+
+    def reportable_grades(self, label: str) -> list[int]:
+        if label not in self._reportable_grades:
+            self._reportable_grades[label] = self.reference_range_collection.reportable_grades(
+                label
+            )
+        return self._reportable_grades[label]
+
+    def chunks(self) -> Iterator[list[dict]]:
+        """Yields lists of rows as dictionaries, paginated on pk."""
+        qs = self.model_cls.objects.order_by("pk").values(
+            "pk",
+            "report_datetime",
+            self.subject_identifier_attr,
+            *[
+                f"{utest_id}_{attr}"
+                for utest_id in self.utest_ids
+                for attr in ["value", "units", "grade"]
+            ],
+        )
+        last_pk = None
+        while True:
+            rows = list(
+                (qs if last_pk is None else qs.filter(pk__gt=last_pk))[: self.chunk_size]
+            )
+            if not rows:
+                break
+            yield rows
+            last_pk = rows[-1]["pk"]
+
+    def run(self) -> RegradeSummary:
+        summary = RegradeSummary()
+        start = time.perf_counter()
+        if self.reference_range_collection:
+            for rows in self.chunks():
+                summary.rows += len(rows)
+                self.regrade(rows, summary)
+        summary.seconds = time.perf_counter() - start
+        return summary
+
+    def regrade(self, rows: list[dict], summary: RegradeSummary) -> None:
+        df = pd.DataFrame(rows).rename(
+            columns={self.subject_identifier_attr: "subject_identifier"}
+        )
+        registered_subjects = (
+            pd.DataFrame(
+                django_apps.get_model(self.registered_subject_model)
+                .objects.filter(subject_identifier__in=df["subject_identifier"].unique())
+                .values("subject_identifier", "dob", "gender")
+            )
+            .drop_duplicates("subject_identifier")
+            .set_index("subject_identifier")
+        )
+        df_values = self.to_long(df)
+        if df_values.empty:
+            return
+        df_values["dob"] = df_values["subject_identifier"].map(registered_subjects["dob"])
+        df_values["gender"] = df_values["subject_identifier"].map(
+            registered_subjects["gender"]
+        )
+        df_values = df_values.join(
+            grade_dataframe(df_values, self.reference_range_collection, self.age_units)
+        )
+        summary.values += len(df_values)
+        summary.not_graded += (df_values["error"] != "").sum()
+        expected = df_values["grade"].where(
+            [
+                not pd.isna(grade) and grade in self.reportable_grades(label)
+                for grade, label in zip(df_values["grade"], df_values["label"], strict=True)
+            ]
+        )
+        stored = df_values["stored_grade"].astype("Int64")
+        # values not graded are counted in `not_graded`, not as changed
+        changed = (expected.fillna(-1) != stored.fillna(-1)) & (df_values["error"] == "")
+        for row in df_values[changed].itertuples():
+            summary.changed.append(
+                ChangedGrade(
+                    pk=row.pk,
+                    subject_identifier=row.subject_identifier,
+                    label=row.label,
+                    value=row.value,
+                    units=row.units,
+                    stored_grade=None if pd.isna(row.stored_grade) else int(row.stored_grade),
+                    grade=None if pd.isna(expected[row.Index]) else int(expected[row.Index]),
+                    condition_str=row.condition_str,
+                )
+            )
+
+    def to_long(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns one row per result value and units, as
+        `get_summary`, skipping missing and zero values.
+        """
+        dfs = []
+        for utest_id in self.utest_ids:
+            df_utest = df[
+                ["pk", "subject_identifier", "report_datetime"]
+                + [f"{utest_id}_{attr}" for attr in ["value", "units", "grade"]]
+            ].rename(
+                columns={
+                    f"{utest_id}_value": "value",
+                    f"{utest_id}_units": "units",
+                    f"{utest_id}_grade": "stored_grade",
+                }
+            )
+            df_utest = df_utest[df_utest["value"].notna() & (df_utest["value"] != 0)]
+            df_utest = df_utest[df_utest["units"].notna() & (df_utest["units"] != "")]
+            dfs.append(df_utest.assign(label=utest_id))
+        return pd.concat(dfs, ignore_index=True)
@@ -0,0 +1,134 @@
+import pandas as pd
+from clinicedc_constants import FEMALE, MALE, MILLIGRAMS_PER_DECILITER
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, override_settings, tag
+from django.utils import timezone
+
+from edc_reportable.batch_grading import grade_dataframe
+from edc_reportable.formula import Formula
+from edc_reportable.models import ReferenceRangeCollection
+from edc_reportable.utils import (
+    get_grade_for_value,
+    update_grading_data,
+    update_normal_data,
+)
+
+
+@tag("reportable")
+@override_settings(SITE_ID=10)
+class TestBatchGrading(TestCase):
+    def setUp(self):
+        self.reference_range_collection = ReferenceRangeCollection.objects.create(
+            name="my_references"
+        )
+        age_opts = dict(
+            age_lower=18, age_upper=None, age_units="years", age_lower_inclusive=True
+        )
+        update_normal_data(
+            self.reference_range_collection,
+            normal_data={
+                "labtest": [
+                    Formula(
+                        "3.0<=x<7.0",
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE, FEMALE],
+                        **age_opts,
+                    ),
+                ],
+            },
+        )
+        update_grading_data(
+            self.reference_range_collection,
+            grading_data={
+                "labtest": [
+                    Formula(
+                        "1.5*ULN<=x<3.0*ULN",
+                        grade=3,
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE],
+                        **age_opts,
+                    ),
+                    Formula(
+                        "3.0*ULN<=x",
+                        grade=4,
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE],
+                        **age_opts,
+                    ),
+                ]
+            },
+        )
+        self.report_datetime = timezone.now()
+        self.dob = (self.report_datetime - relativedelta(years=25)).date()
+
+    def get_df(self, values: list, **kwargs) -> pd.DataFrame:
+        data = dict(
+            label="labtest",
+            units=MILLIGRAMS_PER_DECILITER,
+            gender=MALE,
+            dob=self.dob,
+            report_datetime=self.report_datetime,
+        )
+        data.update(**kwargs)
+        return pd.DataFrame([dict(value=value, **data) for value in values])
+
+    def test_grade_dataframe_matches_get_grade_for_value(self):
+        values = [2.0, 3.0, 6.9, 7.0, 10.4, 10.5, 15.0, 20.9, 21.0, 100.0]
+        df = grade_dataframe(self.get_df(values), self.reference_range_collection)
+        self.assertEqual(list(df.columns), ["grade", "is_normal", "condition_str", "error"])
+        for value, row in zip(values, df.itertuples(), strict=True):
+            with self.subTest(value=value):
+                grading_data, condition_str = get_grade_for_value(
+                    reference_range_collection=self.reference_range_collection,
+                    label="labtest",
+                    value=value,
+                    gender=MALE,
+                    dob=self.dob,
+                    report_datetime=self.report_datetime,
+                    units=MILLIGRAMS_PER_DECILITER,
+                    age_units="years",
+                )
+                self.assertEqual(
+                    None if pd.isna(row.grade) else row.grade,
+                    getattr(grading_data, "grade", None),
+                )
+                self.assertEqual(row.condition_str, condition_str or "")
+                self.assertEqual(row.is_normal, value in [3.0, 6.9])
+                self.assertEqual(row.error, "")
+
+    def test_grade_dataframe_condition_str(self):
+        df = grade_dataframe(self.get_df([10.5, 21.0]), self.reference_range_collection)
+        self.assertEqual(
+            list(df["condition_str"]),
+            [
+                "labtest: 10.5<=10.5<21.0 mg/dL GRADE3",
+                "labtest: 21.0<=21.0 mg/dL GRADE4",
+            ],
+        )
+
+    def test_grade_dataframe_errors(self):
+        df = pd.concat(
+            [
+                self.get_df([10.5], gender=FEMALE),
+                self.get_df([10.5], dob=(self.report_datetime - relativedelta(years=10))),
+                self.get_df([10.5], units="mmol/L"),
+                self.get_df([10.5], label="badlabtest"),
+                self.get_df([10.5]),
+            ],
+            ignore_index=True,
+        )
+        df = grade_dataframe(df, self.reference_range_collection)
+        self.assertTrue(df["grade"][:4].isna().all())
+        self.assertIn("No matching grading data found for labtest mg/dL F", df["error"][0])
+        self.assertIn("given age bounds", df["error"][1])
+        self.assertIn("No matching grading data found for labtest mmol/L M", df["error"][2])
+        self.assertIn("badlabtest", df["error"][3])
+        self.assertEqual(df["grade"][4], 3)
+        self.assertEqual(df["error"][4], "")
+
+    def test_grade_dataframe_keeps_index(self):
+        df = self.get_df([1.0, 10.5, 21.0])
+        df.index = [10, 20, 30]
+        self.assertEqual(
+            list(grade_dataframe(df, self.reference_range_collection).index), [10, 20, 30]
+        )
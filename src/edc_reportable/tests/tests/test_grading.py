@@ -13,12 +13,14 @@ from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 
 from edc_reportable.adult_age_options import adult_age_options
+from edc_reportable.compiled_reference_ranges import compiled_reference_ranges
 from edc_reportable.constants import HIGH_VALUE
 from edc_reportable.exceptions import BoundariesOverlap, NotEvaluated
 from edc_reportable.formula import Formula
 from edc_reportable.models import ReferenceRangeCollection
 from edc_reportable.utils import (
     get_grade_for_value,
+    load_reference_ranges,
     update_grading_data,
     update_normal_data,
 )
@@ -397,6 +399,111 @@ class TestGrading(TestCase):
         )
         self.assertEqual(grading_data.grade, 4)
 
+    def load_labtest(self):
+        update_normal_data(
+            self.reference_range_collection,
+            normal_data={
+                "labtest": [
+                    Formula(
+                        "3.0<=x<7.0",
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE, FEMALE],
+                        **self.age_opts,
+                    ),
+                ],
+            },
+        )
+        update_grading_data(
+            self.reference_range_collection,
+            grading_data={
+                "labtest": [
+                    Formula(
+                        "1.5*ULN<=x<3.0*ULN",
+                        grade=3,
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE],
+                        **self.age_opts,
+                    ),
+                    Formula(
+                        "3.0*ULN<=x",
+                        grade=4,
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE],
+                        **self.age_opts,
+                    ),
+                ]
+            },
+        )
+
+    def get_grade(self, value: float, **kwargs):
+        opts = dict(
+            reference_range_collection=self.reference_range_collection,
+            label="labtest",
+            value=value,
+            gender=MALE,
+            dob=timezone.now() - relativedelta(years=25),
+            report_datetime=timezone.now(),
+            units=MILLIGRAMS_PER_DECILITER,
+            age_units="years",
+        )
+        opts.update(**kwargs)
+        return get_grade_for_value(**opts)
+
+    def test_grading_does_not_query_once_compiled(self):
+        self.load_labtest()
+        self.get_grade(10.0)
+        self.assertIn(self.reference_range_collection, compiled_reference_ranges)
+        with self.assertNumQueries(0):
+            grading_data, condition_str = self.get_grade(10.5)
+            self.assertEqual(grading_data.grade, 3)
+            self.assertEqual(condition_str, "labtest: 10.5<=10.5<21.0 mg/dL GRADE3")
+            grading_data, _ = self.get_grade(21.0)
+            self.assertEqual(grading_data.grade, 4)
+            grading_data, _ = self.get_grade(10.4)
+            self.assertIsNone(grading_data)
+            self.assertRaises(NotEvaluated, self.get_grade, 10.5, gender=FEMALE)
+            self.assertRaises(
+                NotEvaluated,
+                self.get_grade,
+                10.5,
+                dob=timezone.now() - relativedelta(years=17),
+            )
+
+    def test_grading_invalidated_on_update(self):
+        self.load_labtest()
+        grading_data, _ = self.get_grade(10.5)
+        self.assertEqual(grading_data.grade, 3)
+        update_grading_data(
+            self.reference_range_collection,
+            grading_data={
+                "labtest": [
+                    Formula(
+                        "1.5*ULN<=x<3.0*ULN",
+                        grade=2,
+                        units=MILLIGRAMS_PER_DECILITER,
+                        gender=[MALE],
+                        **self.age_opts,
+                    ),
+                ]
+            },
+        )
+        grading_data, _ = self.get_grade(10.5)
+        self.assertEqual(grading_data.grade, 2)
+        grading_data, _ = self.get_grade(21.0)
+        self.assertIsNone(grading_data)
+
+    def test_grading_invalidated_on_load_reference_ranges(self):
+        self.load_labtest()
+        self.get_grade(10.5)
+        self.assertIn(self.reference_range_collection, compiled_reference_ranges)
+        load_reference_ranges(
+            self.reference_range_collection.name,
+            normal_data={},
+            grading_data={},
+        )
+        self.assertNotIn(self.reference_range_collection, compiled_reference_ranges)
+        self.assertRaises(NotEvaluated, self.get_grade, 10.5)
+
     # TODO:
     def test_grading_with_limits_normal_gender(self):
         pass
@@ -12,12 +12,16 @@ from django.db.models import Count
 from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 
+from edc_reportable.adult_age_options import adult_age_options
 from edc_reportable.evaluator import ValueBoundryError
+from edc_reportable.formula import Formula
 from edc_reportable.models import GradingData, MolecularWeight, NormalData
 from edc_reportable.utils import (
     get_normal_data_or_raise,
     in_normal_bounds_or_raise,
     load_reference_ranges,
+    load_reference_ranges_with_summary,
+    update_normal_data,
 )
 from edc_reportable.utils.get_normal_data_or_raise import (
     create_obj_for_new_units_or_raise,
@@ -401,3 +405,94 @@ class TestLoadData(TestCase):
                 age_units="years",
             )
         )
+
+    def test_load_skipped_if_unchanged(self):
+        summary = load_reference_ranges_with_summary(
+            "my_other_reportables", grading_data=grading_data, normal_data=normal_data
+        )
+        self.assertFalse(summary.skipped)
+        self.assertEqual(summary.normal.created, 100)
+        self.assertEqual(summary.grading.created, 194)
+        self.assertEqual(
+            GradingData.history.filter(
+                reference_range_collection=summary.reference_range_collection
+            ).count(),
+            194,
+        )
+        self.assertTrue(summary.reference_range_collection.content_hash)
+
+        # savepoint, select the collection, release savepoint
+        with self.assertNumQueries(3):
+            summary = load_reference_ranges_with_summary(
+                "my_other_reportables", grading_data=grading_data, normal_data=normal_data
+            )
+        self.assertTrue(summary.skipped)
+
+        summary = load_reference_ranges_with_summary(
+            "my_other_reportables",
+            grading_data=grading_data,
+            normal_data=normal_data,
+            force=True,
+        )
+        self.assertFalse(summary.skipped)
+        self.assertEqual(summary.normal.unchanged, 100)
+        self.assertEqual(summary.grading.unchanged, 194)
+        self.assertEqual(summary.grading.created + summary.grading.deleted, 0)
+        self.assertEqual(
+            GradingData.history.filter(
+                reference_range_collection=summary.reference_range_collection
+            ).count(),
+            194,
+        )
+
+    def test_load_writes_differences(self):
+        load_reference_ranges(
+            "my_other_reportables", grading_data=grading_data, normal_data=normal_data
+        )
+        tbil = GradingData.objects.filter(
+            reference_range_collection__name="my_other_reportables", label="tbil"
+        )
+        tbil_pks = set(tbil.values_list("pk", flat=True))
+        alt_count = GradingData.objects.filter(
+            reference_range_collection__name="my_other_reportables", label="alt"
+        ).count()
+        changed_grading_data = {k: v for k, v in grading_data.items() if k != "alt"}
+        changed_grading_data["tbil"] = [
+            *grading_data["tbil"][:-1],
+            Formula(
+                "6.0*ULN<=x",
+                grade=4,
+                units=MICROMOLES_PER_LITER,
+                gender=[MALE, FEMALE],
+                **adult_age_options,
+            ),
+        ]
+        summary = load_reference_ranges_with_summary(
+            "my_other_reportables", grading_data=changed_grading_data, normal_data=normal_data
+        )
+        self.assertFalse(summary.skipped)
+        self.assertEqual(summary.grading.deleted, alt_count + 2)
+        self.assertEqual(summary.grading.created, 2)
+        self.assertEqual(summary.grading.updated, 0)
+        self.assertEqual(
+            GradingData.objects.filter(
+                reference_range_collection__name="my_other_reportables", label="alt"
+            ).count(),
+            0,
+        )
+        self.assertEqual(
+            len(tbil_pks & set(tbil.values_list("pk", flat=True))), tbil.count() - 2
+        )
+
+    def test_update_normal_data_clears_content_hash(self):
+        reference_range_collection = load_reference_ranges(
+            "my_other_reportables", grading_data=grading_data, normal_data=normal_data
+        )
+        update_normal_data(reference_range_collection, normal_data=normal_data)
+        reference_range_collection.refresh_from_db()
+        self.assertEqual(reference_range_collection.content_hash, "")
+        self.assertFalse(
+            load_reference_ranges_with_summary(
+                "my_other_reportables", grading_data=grading_data, normal_data=normal_data
+            ).skipped
+        )
@@ -6,7 +6,11 @@ from .get_reference_range_collection import get_reference_range_collection
 from .grading_data_model_cls import grading_data_model_cls
 from .grading_exception_model_cls import grading_exception_model_cls
 from .in_normal_bounds_or_raise import in_normal_bounds_or_raise
-from .load_data import load_all_reference_ranges, load_reference_ranges
+from .load_data import (
+    load_all_reference_ranges,
+    load_reference_ranges,
+    load_reference_ranges_with_summary,
+)
 from .molecular_weight_model_cls import molecular_weight_model_cls
 from .normal_data_model_cls import normal_data_model_cls
 from .reference_range_colllection_model_cls import reference_range_colllection_model_cls
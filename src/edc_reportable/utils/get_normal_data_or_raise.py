@@ -4,13 +4,13 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from clinicedc_utils import convert_units
-from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db.models import Q
 from django.utils import timezone
 
 from edc_model_to_dataframe.constants import SYSTEM_COLUMNS
 from edc_utils import age as get_age
 
+from ..compiled_reference_ranges import compiled_reference_ranges
 from ..exceptions import NotEvaluated
 from .normal_data_model_cls import normal_data_model_cls
 
@@ -38,43 +38,36 @@ def get_normal_data_or_raise(
     obj = None
     age_rdelta = get_age(dob, report_datetime)
     age = getattr(age_rdelta, age_units)
-    try:
-        obj = normal_data_model_cls().objects.get(
-            (Q(age_lower__lte=age) | Q(age_lower__isnull=True)),
-            (Q(age_upper__gte=age) | Q(age_upper__isnull=True)),
+    objs = compiled_reference_ranges.get(reference_range_collection, label).get_normal_data(
+        units, gender, age_units, age
+    )
+    if len(objs) > 1:
+        raise NotEvaluated(
+            f"Value not evaluated. "
+            f"Multiple normal references found for `{label}`. "
+            f"Using units={units}, gender={gender}, age={getattr(age_rdelta, age_units)}. "
+        )
+    if objs:
+        obj = objs[0]
+    elif create_missing_normal:
+        obj = create_obj_for_new_units_or_raise(
             reference_range_collection=reference_range_collection,
             label=label,
             gender=gender,
             units=units,
+            dob=dob,
+            report_datetime=report_datetime,
             age_units=age_units,
         )
-    except ObjectDoesNotExist as e:
-        if create_missing_normal:
-            opts = dict(
-                reference_range_collection=reference_range_collection,
-                label=label,
-                gender=gender,
-                units=units,
-                dob=dob,
-                report_datetime=report_datetime,
-                age_units=age_units,
-            )
-            obj = create_obj_for_new_units_or_raise(**opts)
-        if not obj:
-            raise NotEvaluated(
-                f"Value not evaluated. "
-                f"Normal reference not found for `{label}`. "
-                f"Using units={units}, gender={gender}, "
-                f"age={getattr(age_rdelta, age_units)}{age_units}. "
-                "Perhaps add this to the default normal reference range data or "
-                "pass 'create_missing=True' to convert an existing normal reference."
-            ) from e
-    except MultipleObjectsReturned as e:
+    if not obj:
         raise NotEvaluated(
             f"Value not evaluated. "
-            f"Multiple normal references found for `{label}`. "
-            f"Using units={units}, gender={gender}, age={getattr(age_rdelta, age_units)}. "
-        ) from e
+            f"Normal reference not found for `{label}`. "
+            f"Using units={units}, gender={gender}, "
+            f"age={getattr(age_rdelta, age_units)}{age_units}. "
+            "Perhaps add this to the default normal reference range data or "
+            "pass 'create_missing=True' to convert an existing normal reference."
+        )
     return obj
 
 
@@ -87,7 +80,6 @@ def create_obj_for_new_units_or_raise(
     report_datetime: datetime | None = None,
     age_units: str | None = None,
 ) -> NormalData | None:
-    opts = {}
     age_rdelta = get_age(dob, report_datetime)
     age = getattr(age_rdelta, age_units)
     # try to find an existing record but with different units
@@ -104,40 +96,47 @@ def create_obj_for_new_units_or_raise(
         .exclude(units=units)
     ):
         # print(f"Creating normal data: {label} {gender} -- {obj.units}->{units}")
-        opts = {
-            k: v
-            for k, v in obj.__dict__.items()
-            if not k.startswith("_")
-            and k
-            not in [
-                "id",
-                "units",
-                "description",
-                "phrase",
-                "lower",
-                "upper",
-                *SYSTEM_COLUMNS,
-            ]
-        }
-        opts["lower"] = convert_units(
-            label=obj.label,
-            value=obj.lower,
-            units_from=obj.units,
-            units_to=units,
-            places=4,
-        )
-        opts["upper"] = convert_units(
-            label=obj.label,
-            value=obj.upper,
-            units_from=obj.units,
-            units_to=units,
-            places=4,
-        )
-        opts["units"] = units
-        opts["auto_created"] = True
-        opts["created"] = timezone.now()
-        opts["modified"] = opts["created"]
-        break
-    if opts:
-        return normal_data_model_cls().objects.create(**opts)
+        new_obj = get_obj_for_new_units(obj, units)
+        new_obj.save()
+        return new_obj
     return None
+
+
+def get_obj_for_new_units(obj: NormalData, units: str) -> NormalData:
+    """Returns a new, unsaved NormalData instance converted from
+    `obj` to `units`.
+    """
+    opts = {
+        k: v
+        for k, v in obj.__dict__.items()
+        if not k.startswith("_")
+        and k
+        not in [
+            "id",
+            "units",
+            "description",
+            "phrase",
+            "lower",
+            "upper",
+            *SYSTEM_COLUMNS,
+        ]
+    }
+    opts["lower"] = convert_units(
+        label=obj.label,
+        value=obj.lower,
+        units_from=obj.units,
+        units_to=units,
+        places=4,
+    )
+    opts["upper"] = convert_units(
+        label=obj.label,
+        value=obj.upper,
+        units_from=obj.units,
+        units_to=units,
+        places=4,
+    )
+    opts["units"] = units
+    opts["auto_created"] = True
+    opts["created"] = timezone.now()
+    opts["modified"] = opts["created"]
+    return normal_data_model_cls()(**opts)
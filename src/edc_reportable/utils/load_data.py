@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import sys
+import time
+from dataclasses import dataclass, field
 from importlib import import_module
 from typing import TYPE_CHECKING
 
 from django.apps import apps as django_apps
 from django.conf import settings
+from django.db import transaction
 
+from ..compiled_reference_ranges import compiled_reference_ranges
 from ..formula import Formula
 from .get_default_reportable_grades import get_default_reportable_grades
+from .grading_data_model_cls import grading_data_model_cls
+from .normal_data_model_cls import normal_data_model_cls
 from .reference_range_colllection_model_cls import reference_range_colllection_model_cls
-from .update_grading_data import update_grading_data
+from .sync_reference_data import SyncSummary, sync_reference_data
+from .update_grading_data import get_grading_data_objs, get_missing_normal_data_objs
 from .update_grading_exceptions import update_grading_exceptions
-from .update_normal_data import update_normal_data
+from .update_normal_data import get_normal_data_objs
 
 if TYPE_CHECKING:
     from ..models import ReferenceRangeCollection
@@ -22,7 +31,26 @@ class AlreadyLoaded(Exception):  # noqa: N818
     pass
 
 
-__all__ = ["load_all_reference_ranges", "load_reference_ranges"]
+__all__ = [
+    "LoadSummary",
+    "load_all_reference_ranges",
+    "load_reference_ranges",
+    "load_reference_ranges_with_summary",
+]
+
+
+@dataclass
+class LoadSummary:
+    reference_range_collection: ReferenceRangeCollection
+    skipped: bool = False
+    normal: SyncSummary = field(default_factory=SyncSummary)
+    grading: SyncSummary = field(default_factory=SyncSummary)
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        if self.skipped:
+            return f"unchanged, skipped in {self.seconds:.2f}s"
+        return f"normal: {self.normal}; grading: {self.grading} in {self.seconds:.2f}s"
 
 
 def get_module_name() -> str:
@@ -43,7 +71,7 @@ def load_all_reference_ranges() -> None:
         except ImportError:
             pass
         else:
-            load_reference_ranges(
+            summary = load_reference_ranges_with_summary(
                 reportables_module.collection_name,
                 normal_data=reportables_module.normal_data,
                 grading_data=reportables_module.grading_data,
@@ -52,7 +80,7 @@ def load_all_reference_ranges() -> None:
             )
             sys.stdout.write(
                 f"   - loaded {app}.{module_name} collection "
-                f"`{reportables_module.collection_name}`."
+                f"`{reportables_module.collection_name}` ({summary}).\n"
             )
 
 
@@ -64,33 +92,105 @@ def load_reference_ranges(
     reportable_grades_exceptions: dict[str, list[int]] | None = None,
     keep_existing: bool | None = None,
     create_missing_normal: bool | None = None,
+    force: bool | None = None,
 ) -> ReferenceRangeCollection:
     """Load the reference ranges for a single collection.
 
-    See also: load_all_reference_ranges
+    See also: load_all_reference_ranges, load_reference_ranges_with_summary
     """
-    (
-        reference_range_collection,
-        _,
-    ) = reference_range_colllection_model_cls().objects.get_or_create(name=collection_name)
-    reportable_grades = reportable_grades or get_default_reportable_grades()
-    for grade in reportable_grades:
-        setattr(reference_range_collection, f"grade{grade}", True)
-    reference_range_collection.save()
-
-    update_grading_exceptions(
-        reference_range_collection=reference_range_collection,
+    return load_reference_ranges_with_summary(
+        collection_name,
+        normal_data=normal_data,
+        grading_data=grading_data,
+        reportable_grades=reportable_grades,
         reportable_grades_exceptions=reportable_grades_exceptions,
         keep_existing=keep_existing,
-    )
+        force=force,
+    ).reference_range_collection
 
-    update_normal_data(reference_range_collection, normal_data=normal_data)
 
-    update_grading_data(
-        reference_range_collection,
-        grading_data=grading_data,
-        reportable_grades=reportable_grades,
-        reportable_grades_exceptions=reportable_grades_exceptions,
-        create_missing_normal=True,
+def load_reference_ranges_with_summary(
+    collection_name: str,
+    *,
+    normal_data: dict[str, list[Formula]],
+    grading_data: dict[str, list[Formula]],
+    reportable_grades: list[int] | None = None,
+    reportable_grades_exceptions: dict[str, list[int]] | None = None,
+    keep_existing: bool | None = None,
+    force: bool | None = None,
+) -> LoadSummary:
+    """Load the reference ranges for a single collection and return
+    a summary of the changes.
+
+    If the content hash of the declared reference ranges has not
+    changed since the last load, nothing is written unless `force`.
+
+    Otherwise, the NormalData and GradingData instances are built in
+    memory, including the normal references converted for units
+    without one (see `get_missing_normal_data_objs`), and only the
+    differences are written, in one transaction (see
+    `sync_reference_data`). The compiled reference ranges of the
+    collection are invalidated.
+    """
+    start = time.perf_counter()
+    reportable_grades = reportable_grades or get_default_reportable_grades()
+    content_hash = get_content_hash(
+        normal_data, grading_data, reportable_grades, reportable_grades_exceptions
+    )
+    with transaction.atomic():
+        (
+            reference_range_collection,
+            _,
+        ) = reference_range_colllection_model_cls().objects.get_or_create(name=collection_name)
+        summary = LoadSummary(reference_range_collection=reference_range_collection)
+        if not force and reference_range_collection.content_hash == content_hash:
+            summary.skipped = True
+            summary.seconds = time.perf_counter() - start
+            return summary
+        for grade in reportable_grades:
+            setattr(reference_range_collection, f"grade{grade}", True)
+        reference_range_collection.save()
+
+        update_grading_exceptions(
+            reference_range_collection=reference_range_collection,
+            reportable_grades_exceptions=reportable_grades_exceptions,
+            keep_existing=keep_existing,
+        )
+        normal_objs = get_normal_data_objs(reference_range_collection, normal_data)
+        grading_objs = get_grading_data_objs(
+            reference_range_collection, grading_data, reportable_grades
+        )
+        normal_objs.extend(
+            get_missing_normal_data_objs(grading_objs, normal_objs, create_missing_normal=True)
+        )
+        summary.normal = sync_reference_data(
+            reference_range_collection, normal_objs, normal_data_model_cls()
+        )
+        summary.grading = sync_reference_data(
+            reference_range_collection, grading_objs, grading_data_model_cls()
+        )
+        reference_range_collection.content_hash = content_hash
+        reference_range_collection.save(update_fields=["content_hash"])
+    compiled_reference_ranges.invalidate(reference_range_collection.pk)
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+def get_content_hash(
+    normal_data: dict[str, list[Formula]],
+    grading_data: dict[str, list[Formula]],
+    reportable_grades: list[int],
+    reportable_grades_exceptions: dict[str, list[int]] | None = None,
+) -> str:
+    """Returns a hash of the declared reference ranges of a
+    collection.
+    """
+    content = dict(
+        normal_data={k: [vars(f) for f in v] for k, v in (normal_data or {}).items()},
+        grading_data={k: [vars(f) for f in v] for k, v in (grading_data or {}).items()},
+        reportable_grades=sorted(int(g) for g in reportable_grades),
+        reportable_grades_exceptions=reportable_grades_exceptions or {},
     )
-    return reference_range_collection
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode()
+    ).hexdigest()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.utils import timezone
+from django_audit_fields.constants import AUDIT_MODEL_FIELDS
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+if TYPE_CHECKING:
+    from ..models import GradingData, NormalData, ReferenceRangeCollection
+
+__all__ = ["SyncSummary", "get_key", "prepare_reference_data", "sync_reference_data"]
+
+KEY_FIELDS = [
+    "label",
+    "units",
+    "gender",
+    "age_units",
+    "age_lower",
+    "age_upper",
+    "fasting",
+    "grade",
+    "phrase",
+]
+
+
+@dataclass
+class SyncSummary:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: SyncSummary) -> SyncSummary:
+        return SyncSummary(
+            created=self.created + other.created,
+            updated=self.updated + other.updated,
+            deleted=self.deleted + other.deleted,
+            unchanged=self.unchanged + other.unchanged,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"created {self.created}, updated {self.updated}, "
+            f"deleted {self.deleted}, unchanged {self.unchanged}"
+        )
+
+
+def sync_reference_data(
+    reference_range_collection: ReferenceRangeCollection,
+    objs: list[NormalData | GradingData],
+    model_cls: type[NormalData | GradingData],
+    keep_existing: bool | None = None,
+) -> SyncSummary:
+    """Updates the NormalData or GradingData instances of a
+    collection to match the unsaved instances in `objs`.
+
+    Existing and new instances are matched on KEY_FIELDS, repeated
+    keys are matched in order. Matched instances with other field
+    values changed are updated. Unmatched existing instances are
+    deleted unless `keep_existing`.
+
+    Writes with `bulk_create_with_history`, `bulk_update_with_history`
+    and one queryset delete. `post_save` is not sent. Call in a
+    transaction and invalidate the compiled reference ranges of the
+    collection afterwards.
+    """
+    compare_fields = get_compare_fields(model_cls)
+    existing: dict[tuple, list[NormalData | GradingData]] = {}
+    for obj in model_cls.objects.filter(
+        reference_range_collection=reference_range_collection
+    ).order_by("created"):
+        existing.setdefault(get_key(obj), []).append(obj)
+    summary = SyncSummary()
+    created, updated = [], []
+    now = timezone.now()
+    prepare_reference_data(objs)
+    for obj in objs:
+        try:
+            existing_obj = existing[get_key(obj)].pop(0)
+        except (KeyError, IndexError):
+            obj.reference_range_collection = reference_range_collection
+            obj.created = obj.modified = now
+            # UUIDAutoField sets the pk on pre_save
+            obj._meta.pk.pre_save(obj, add=True)
+            created.append(obj)
+            continue
+        if changed := [
+            f for f in compare_fields if getattr(existing_obj, f) != getattr(obj, f)
+        ]:
+            for field_name in changed:
+                setattr(existing_obj, field_name, getattr(obj, field_name))
+            existing_obj.modified = now
+            updated.append(existing_obj)
+        else:
+            summary.unchanged += 1
+    deleted = (
+        []
+        if keep_existing
+        else [o.pk for existing_objs in existing.values() for o in existing_objs]
+    )
+    if deleted:
+        model_cls.objects.filter(pk__in=deleted).delete()
+        summary.deleted = len(deleted)
+    if created:
+        bulk_create_with_history(created, model_cls)
+        summary.created = len(created)
+    if updated:
+        bulk_update_with_history(updated, model_cls, fields=[*compare_fields, "modified"])
+        summary.updated = len(updated)
+    return summary
+
+
+def get_compare_fields(model_cls: type[NormalData | GradingData]) -> list[str]:
+    """Returns the names of the editable fields, other than the key,
+    the collection and the audit fields, compared to find changed
+    instances.
+    """
+    exclude = [*KEY_FIELDS, *AUDIT_MODEL_FIELDS, "reference_range_collection"]
+    return [
+        f.name
+        for f in model_cls._meta.concrete_fields
+        if f.editable and not f.primary_key and f.name not in exclude
+    ]
+
+
+def get_key(obj: NormalData | GradingData) -> tuple:
+    return tuple(getattr(obj, f) for f in KEY_FIELDS)
+
+
+def prepare_reference_data(objs: list[NormalData | GradingData]) -> None:
+    """Sets the calculated fields of unsaved instances and converts
+    field values to their python type as loaded from the DB, e.g.
+    "18" -> 18, so that instances compare equal.
+    """
+    for obj in objs:
+        obj.update_calculated_fields()
+        for field_name in [*KEY_FIELDS, *get_compare_fields(obj.__class__)]:
+            field = obj._meta.get_field(field_name)
+            setattr(obj, field.attname, field.to_python(getattr(obj, field.attname)))
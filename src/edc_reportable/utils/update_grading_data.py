@@ -5,20 +5,36 @@ from typing import TYPE_CHECKING
 
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.utils import timezone
 
+from ..compiled_reference_ranges import (
+    CompiledLabel,
+    compiled_reference_ranges,
+    get_age_value,
+    in_bounds,
+)
 from ..exceptions import NotEvaluated
 from ..formula import Formula
 from .get_default_reportable_grades import get_default_reportable_grades
-from .get_grade_for_value import get_grade_for_value
+from .get_grade_for_value import evaluate_grading_ranges
+from .get_normal_data_or_raise import get_obj_for_new_units
 from .grading_data_model_cls import grading_data_model_cls
 from .grading_exception_model_cls import grading_exception_model_cls
+from .normal_data_model_cls import normal_data_model_cls
+from .sync_reference_data import (
+    SyncSummary,
+    get_key,
+    prepare_reference_data,
+    sync_reference_data,
+)
+from .update_normal_data import clear_content_hash
 
 if TYPE_CHECKING:
-    from ..models import ReferenceRangeCollection
+    from ..models import GradingData, NormalData, ReferenceRangeCollection
 
 
-__all__ = ["update_grading_data"]
+__all__ = ["get_grading_data_objs", "get_missing_normal_data_objs", "update_grading_data"]
 
 
 def update_grading_data(
@@ -28,47 +44,183 @@ def update_grading_data(
     reportable_grades_exceptions: dict[str, list[str]] | None = None,
     keep_existing: bool | None = None,
     create_missing_normal: bool | None = None,
-):
-    if not keep_existing:
-        grading_data_model_cls().objects.filter(
-            reference_range_collection=reference_range_collection
-        ).delete()
-    for label, formulas in grading_data.items():
+) -> SyncSummary:
+    """Replaces the GradingData instances of a collection with those
+    declared in `grading_data`, writing only the differences.
+
+    If `create_missing_normal`, NormalData instances are created for
+    units without a normal reference (see
+    `get_missing_normal_data_objs`).
+    """
+    with transaction.atomic():
+        grading_objs = get_grading_data_objs(
+            reference_range_collection, grading_data, reportable_grades
+        )
+        existing_grading_objs = []
+        if keep_existing:
+            keys = [get_key(obj) for obj in grading_objs]
+            existing_grading_objs = [
+                obj
+                for obj in grading_data_model_cls().objects.filter(
+                    reference_range_collection=reference_range_collection
+                )
+                if get_key(obj) not in keys
+            ]
+        missing_normal_objs = get_missing_normal_data_objs(
+            grading_objs,
+            list(
+                normal_data_model_cls().objects.filter(
+                    reference_range_collection=reference_range_collection
+                )
+            ),
+            create_missing_normal=create_missing_normal,
+            existing_grading_objs=existing_grading_objs,
+        )
+        summary = sync_reference_data(
+            reference_range_collection,
+            grading_objs,
+            grading_data_model_cls(),
+            keep_existing=keep_existing,
+        )
+        if missing_normal_objs:
+            summary += sync_reference_data(
+                reference_range_collection,
+                missing_normal_objs,
+                normal_data_model_cls(),
+                keep_existing=True,
+            )
+        clear_content_hash(reference_range_collection)
+    compiled_reference_ranges.invalidate(reference_range_collection.pk)
+    return summary
+
+
+def get_grading_data_objs(
+    reference_range_collection: ReferenceRangeCollection,
+    grading_data: dict[str, list[Formula]] | None = None,
+    reportable_grades: list[str] | None = None,
+) -> list[GradingData]:
+    """Returns a list of unsaved GradingData instances, one per
+    formula and gender.
+    """
+    objs = []
+    for label, formulas in (grading_data or {}).items():
+        if not get_reportable_grades(reference_range_collection, label, reportable_grades):
+            continue
         for formula in formulas:
-            if get_reportable_grades(reference_range_collection, label, reportable_grades):
-                formula_opts = {k: v for k, v in formula.__dict__.items() if k != "gender"}
-                age_opts = {k: v for k, v in formula_opts.items() if "age" in k}
-                for gender in formula.__dict__.get("gender"):
-                    grading_data_model_cls().objects.create(
-                        reference_range_collection=reference_range_collection,
-                        label=label,
-                        description=formula.description,
-                        gender=gender,
-                        **formula_opts,
+            formula_opts = {k: v for k, v in formula.__dict__.items() if k != "gender"}
+            objs.extend(
+                grading_data_model_cls()(
+                    reference_range_collection=reference_range_collection,
+                    label=label,
+                    description=formula.description,
+                    gender=gender,
+                    **formula_opts,
+                )
+                for gender in formula.__dict__.get("gender")
+            )
+    prepare_reference_data(objs)
+    return objs
+
+
+def get_missing_normal_data_objs(
+    grading_objs: list[GradingData],
+    normal_objs: list[NormalData],
+    create_missing_normal: bool | None = None,
+    existing_grading_objs: list[GradingData] | None = None,
+) -> list[NormalData]:
+    """Returns a list of unsaved NormalData instances converted from
+    an existing normal reference for units graded without one.
+
+    The lower and upper value of each grading reference are graded,
+    in memory, against the grading references before it and the
+    normal references, at the lower age bound. As with
+    `get_grade_for_value`, BoundariesOverlap is raised and a
+    NotEvaluated message is written to stdout.
+
+    `existing_grading_objs` are kept grading references graded
+    against but not evaluated.
+    """
+    missing_objs: list[NormalData] = []
+    normal_objs_by_label: dict[str, list[NormalData]] = {}
+    for obj in normal_objs:
+        normal_objs_by_label.setdefault(obj.label, []).append(obj)
+    grading_objs_by_label: dict[str, list[GradingData]] = {}
+    for obj in existing_grading_objs or []:
+        grading_objs_by_label.setdefault(obj.label, []).append(obj)
+    report_datetime = timezone.now()
+    for obj in grading_objs:
+        grading_objs_by_label.setdefault(obj.label, []).append(obj)
+        dob = report_datetime - relativedelta(**{obj.age_units: obj.age_lower})
+        for value in [obj.lower, obj.upper]:
+            if not value:
+                continue
+            try:
+                normal_obj = evaluate_in_memory(
+                    obj,
+                    value,
+                    grading_objs_by_label[obj.label],
+                    normal_objs_by_label.setdefault(obj.label, []),
+                    age_value=get_age_value(dob, report_datetime, obj.age_units),
+                    create_missing_normal=create_missing_normal,
+                )
+            except NotEvaluated as e:
+                sys.stdout.write(f"{e}\n")
+            else:
+                if normal_obj not in normal_objs_by_label[obj.label]:
+                    missing_objs.append(normal_obj)
+                    normal_objs_by_label[obj.label].append(normal_obj)
+    return missing_objs
+
+
+def evaluate_in_memory(
+    obj: GradingData,
+    value: float,
+    grading_objs: list[GradingData],
+    normal_objs: list[NormalData],
+    *,
+    age_value: int | float,
+    create_missing_normal: bool | None = None,
+) -> NormalData:
+    """Grades a value against unsaved instances and returns the
+    normal reference used.
+    """
+    label, units, gender, age_units = obj.label, obj.units, obj.gender, obj.age_units
+    compiled = CompiledLabel.from_objs(label, grading_objs, normal_objs)
+    grading_ranges = compiled.get_grading_ranges(units, gender, age_value)
+    if not grading_ranges:
+        raise NotEvaluated(
+            "Value not graded. No matching grading data found for "
+            f"{label} {units} {gender} given age bounds"
+        )
+    found = compiled.get_normal_data(units, gender, age_units, age_value)
+    if len(found) > 1:
+        raise NotEvaluated(
+            f"Value not evaluated. Multiple normal references found for `{label}`. "
+            f"Using units={units}, gender={gender}, age={age_value}. "
+        )
+    if found:
+        normal_obj = found[0]
+    else:
+        normal_obj = None
+        if create_missing_normal:
+            for source_obj in normal_objs:
+                if (
+                    source_obj.gender == gender
+                    and source_obj.age_units == age_units
+                    and source_obj.units != units
+                    and in_bounds(
+                        age_value, source_obj.age_lower, True, source_obj.age_upper, True
                     )
-                    for value in [formula.lower, formula.upper]:
-                        if value:
-                            try:
-                                get_grade_for_value(
-                                    reference_range_collection=reference_range_collection,
-                                    label=label,
-                                    value=value,
-                                    units=formula_opts.get("units"),
-                                    gender=gender,
-                                    dob=timezone.now()
-                                    - relativedelta(
-                                        **{
-                                            age_opts.get("age_units"): age_opts.get(
-                                                "age_lower"
-                                            )
-                                        }
-                                    ),
-                                    report_datetime=timezone.now(),
-                                    age_units=age_opts.get("age_units"),
-                                    create_missing_normal=create_missing_normal,
-                                )
-                            except NotEvaluated as e:
-                                sys.stdout.write(f"{e}\n")
+                ):
+                    normal_obj = get_obj_for_new_units(source_obj, units)
+                    break
+        if not normal_obj:
+            raise NotEvaluated(
+                f"Value not evaluated. Normal reference not found for `{label}`. "
+                f"Using units={units}, gender={gender}, age={age_value}{age_units}. "
+            )
+    evaluate_grading_ranges(grading_ranges, normal_obj, value, label, units)
+    return normal_obj
 
 
 def get_reportable_grades(
@@ -2,27 +2,67 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db import transaction
+
+from ..compiled_reference_ranges import compiled_reference_ranges
 from ..formula import Formula
 from .normal_data_model_cls import normal_data_model_cls
+from .reference_range_colllection_model_cls import reference_range_colllection_model_cls
+from .sync_reference_data import SyncSummary, prepare_reference_data, sync_reference_data
 
 if TYPE_CHECKING:
-    from ..models import ReferenceRangeCollection
+    from ..models import NormalData, ReferenceRangeCollection
+
+__all__ = ["get_normal_data_objs", "update_normal_data"]
 
 
 def update_normal_data(
     reference_range_collection: ReferenceRangeCollection,
     normal_data: dict[str, list[Formula]] | None = None,
-):
-    normal_data_model_cls().objects.filter(
-        reference_range_collection=reference_range_collection
-    ).delete()
-    for label, formulas in normal_data.items():
+) -> SyncSummary:
+    """Replaces the NormalData instances of a collection with those
+    declared in `normal_data`, writing only the differences.
+    """
+    with transaction.atomic():
+        summary = sync_reference_data(
+            reference_range_collection,
+            get_normal_data_objs(reference_range_collection, normal_data),
+            normal_data_model_cls(),
+        )
+        clear_content_hash(reference_range_collection)
+    compiled_reference_ranges.invalidate(reference_range_collection.pk)
+    return summary
+
+
+def get_normal_data_objs(
+    reference_range_collection: ReferenceRangeCollection,
+    normal_data: dict[str, list[Formula]] | None = None,
+) -> list[NormalData]:
+    """Returns a list of unsaved NormalData instances, one per
+    formula and gender.
+    """
+    objs = []
+    for label, formulas in (normal_data or {}).items():
         for formula in formulas:
             opts = {k: v for k, v in formula.__dict__.items() if k != "gender"}
-            for gender in formula.__dict__.get("gender"):
-                normal_data_model_cls().objects.create(
+            objs.extend(
+                normal_data_model_cls()(
                     reference_range_collection=reference_range_collection,
                     label=label,
                     gender=gender,
                     **opts,
                 )
+                for gender in formula.__dict__.get("gender")
+            )
+    prepare_reference_data(objs)
+    return objs
+
+
+def clear_content_hash(reference_range_collection: ReferenceRangeCollection) -> None:
+    """Clears the content hash so that the next call to
+    `load_reference_ranges` does not skip the collection.
+    """
+    reference_range_collection.content_hash = ""
+    reference_range_colllection_model_cls().objects.filter(
+        pk=reference_range_collection.pk
+    ).update(content_hash="")
@@ -0,0 +1,23 @@
+import multiprocessing
+
+from django.db import connections
+
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """Returns the "fork" context, if available, so that worker
+    processes inherit the configured Django environment.
+
+    Under "spawn" or "forkserver" a worker re-imports the module of
+    the submitted function before Django is set up.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def init_worker() -> None:
+    """Initializes a worker process of a `ProcessPoolExecutor`.
+
+    Each worker opens its own DB connection on first use.
+    """
+    connections.close_all()
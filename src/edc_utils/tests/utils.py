@@ -0,0 +1,29 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+
+class SerialThreadPoolExecutor(ThreadPoolExecutor):
+    """A stand-in for a process pool that runs each submitted call
+    on a worker thread, one at a time.
+
+    Tests the calls made by a pool without worker processes or
+    concurrent writers. `mp_context` is ignored and `initializer`
+    is run on each worker thread.
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, max_workers=None, mp_context=None, initializer=None, initargs=()):  # noqa: ARG002
+        super().__init__(max_workers=max_workers, initializer=initializer, initargs=initargs)
+
+    def submit(self, fn, /, *args, **kwargs):
+        def run_locked(*args, **kwargs):
+            with self.lock:
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    connection.close()
+
+        return super().submit(run_locked, *args, **kwargs)
@@ -1,2 +1,3 @@
 from .schedule import AlreadyRegisteredVisit, Schedule
+from .timepoint_plan import TimepointPlan, VisitTimepoint
 from .visit_collection import VisitCollection
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import re
-from copy import deepcopy
 from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
@@ -151,9 +150,13 @@ class Schedule:
         site_id: int | None = None,
         consent_definition: ConsentDefinition | None = None,
     ) -> VisitCollection:
-        """Returns a deep copy of visits collection filtered for a
+        """Returns a copy of visits collection filtered for a
         given consented subject.
 
+        The copy shares the Visit instances of the schedule. These
+        are not changed when calculating timepoint datetimes (see
+        `VisitCollection.timepoint_dates`).
+
         If not consented, returns an empty visit collection.
 
         Check if the consent definition `extended_by` attribute is
@@ -168,7 +171,7 @@ class Schedule:
             consent_definition=consent_definition,
         )
         if cdef.get_consent_for(subject_identifier=subject_identifier, site_id=site_id):
-            visits = deepcopy(self.visits)
+            visits = self.visit_collection_cls(self.visits)
             if cdef.extended_by:
                 visits = cdef.extended_by.update_visit_collection(
                     visits,
@@ -214,7 +217,18 @@ class Schedule:
     def crf_required_at(self, label_lower: str) -> list[str]:
         """Returns a list of visit codes where the CRF is required
         by default.
+
+        If this schedule is registered, uses the reverse index
+        of `site_visit_schedules`.
         """
+        if site_visit_schedules.loaded and site_visit_schedules.index.is_indexed(self):
+            return [
+                entry.visit_code
+                for entry in site_visit_schedules.get_forms_by_model(label_lower)
+                if entry.schedule is self
+                and entry.required
+                and not (entry.prn or entry.unscheduled or entry.panel_name)
+            ]
         visit_codes = []
         for visit_code, visit in self.visits.items():
             if label_lower in [form.model for form in visit.crfs if form.required]:
@@ -226,7 +240,18 @@ class Schedule:
         required by default.
 
         A requisition is found by its panel.
+
+        If this schedule is registered, uses the reverse index
+        of `site_visit_schedules`.
         """
+        if site_visit_schedules.loaded and site_visit_schedules.index.is_indexed(self):
+            return [
+                entry.visit_code
+                for entry in site_visit_schedules.get_forms_by_panel(requisition_panel.name)
+                if entry.schedule is self
+                and entry.required
+                and not (entry.prn or entry.unscheduled)
+            ]
         visit_codes = []
         for visit_code, visit in self.visits.items():
             if requisition_panel in [
@@ -301,9 +326,12 @@ class Schedule:
         self,
         subject_identifier: str,
         skip_get_current_site: bool | None = None,
-    ) -> None:
-        self.subject(subject_identifier).refresh_appointments(
-            skip_get_current_site=skip_get_current_site
+        skip_unchanged: bool | None = None,
+    ) -> bool:
+        """Wrapper of method SubjectSchedule.refresh_appointments."""
+        return self.subject(subject_identifier).refresh_appointments(
+            skip_get_current_site=skip_get_current_site,
+            skip_unchanged=skip_unchanged,
         )
 
     def take_off_schedule(
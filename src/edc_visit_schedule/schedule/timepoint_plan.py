@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..visit import Visit
+
+
+@dataclass(frozen=True)
+class VisitTimepoint:
+    """The calculated timepoint datetime and window period of a
+    visit relative to a base datetime.
+    """
+
+    visit: Visit
+    timepoint_datetime: datetime
+    lower: datetime
+    upper: datetime
+
+
+@dataclass(frozen=True)
+class TimepointPlan(Mapping):
+    """An immutable mapping of visit to timepoint datetime calculated
+    relative to `base_datetime`.
+
+    Returned by `VisitCollection.timepoint_dates`. Unlike setting
+    `visit.timepoint_datetime`, building a plan does not change the
+    visits of the schedule, which are shared by all requests/threads.
+
+    Use `get_timepoint` for the window period of a visit:
+
+        plan = schedule.visits.timepoint_dates(dt=onschedule_datetime)
+        plan[visit]
+        datetime(2025, 6, 25, ...)
+        plan.get_timepoint("1010").lower
+        datetime(2025, 6, 19, ...)
+    """
+
+    base_datetime: datetime
+    timepoints: tuple[VisitTimepoint, ...]
+    _index: dict = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_index", {tp.visit: tp for tp in self.timepoints})
+
+    def __getitem__(self, visit: Visit) -> datetime:
+        return self._index[visit].timepoint_datetime
+
+    def __iter__(self) -> Iterator[Visit]:
+        return (tp.visit for tp in self.timepoints)
+
+    def __len__(self) -> int:
+        return len(self.timepoints)
+
+    def __contains__(self, visit: object) -> bool:
+        return visit in self._index
+
+    def get_timepoint(self, visit: Visit | str) -> VisitTimepoint:
+        """Returns the VisitTimepoint for a visit or visit code."""
+        if isinstance(visit, str):
+            for tp in self.timepoints:
+                if tp.visit.code == visit:
+                    return tp
+            raise KeyError(visit)
+        return self._index[visit]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
+from django.conf import settings
+
 from edc_utils.date import to_local
 
 from ..ordered_collection import OrderedCollection
+from .timepoint_plan import TimepointPlan, VisitTimepoint
 
 if TYPE_CHECKING:
     from ..visit import Visit
@@ -15,6 +19,44 @@ class VisitCollectionError(Exception):
     pass
 
 
+@lru_cache(maxsize=1024)
+def get_timepoint_plan(
+    visits: tuple[Visit, ...],
+    dt: datetime,
+    time_zone: str,
+) -> TimepointPlan:
+    """Returns a TimepointPlan for the visits relative to `dt`.
+
+    Plans are immutable and cached per visits, base datetime and
+    settings.TIME_ZONE (see `to_local`).
+    """
+    timepoints = []
+    last_dte = None
+    for visit in visits:
+        try:
+            timepoint_datetime = to_local(dt) + visit.rbase
+        except TypeError as e:
+            raise VisitCollectionError(
+                f"Invalid visit.rbase. visit.rbase={visit.rbase}. See {visit!r}. Got {e}."
+            ) from e
+        if last_dte and not timepoint_datetime > last_dte:
+            raise VisitCollectionError(
+                "Wait! timepoint datetimes are not in sequence. "
+                f"Check visit.rbase in your visit collection. See {visits}."
+            )
+        last_dte = timepoint_datetime
+        lower, upper = visit.get_window(timepoint_datetime)
+        timepoints.append(
+            VisitTimepoint(
+                visit=visit,
+                timepoint_datetime=timepoint_datetime,
+                lower=lower,
+                upper=upper,
+            )
+        )
+    return TimepointPlan(base_datetime=dt, timepoints=tuple(timepoints))
+
+
 class VisitCollection(OrderedCollection):
     key: str = "code"
     ordering_attr: str = "timepoint"
@@ -28,34 +70,13 @@ class VisitCollection(OrderedCollection):
             )
         return value
 
-    def timepoint_dates(self, dt: datetime) -> dict:
-        """Returns an ordered dictionary of visit dates calculated
-        relative to the first visit.
+    def timepoint_dates(self, dt: datetime) -> TimepointPlan:
+        """Returns an immutable, ordered mapping of visit to
+        timepoint datetime calculated relative to the first visit.
+
+        The visits are not changed. See `TimepointPlan`.
         """
-        timepoint_dates = {}
-        for visit in self.values():
-            try:
-                timepoint_datetime = to_local(dt) + visit.rbase
-            except TypeError as e:
-                raise VisitCollectionError(
-                    f"Invalid visit.rbase. visit.rbase={visit.rbase}. See {visit!r}. Got {e}."
-                ) from e
-            else:
-                visit.timepoint_datetime = timepoint_datetime
-            timepoint_dates.update({visit: visit.timepoint_datetime})
-
-        last_dte = None
-        for dte in timepoint_dates.values():
-            if not last_dte:
-                last_dte = dte
-                continue
-            if dte and last_dte and not dte > last_dte:
-                raise VisitCollectionError(
-                    "Wait! timepoint datetimes are not in sequence. "
-                    f"Check visit.rbase in your visit collection. See {self}."
-                )
-
-        return timepoint_dates
+        return get_timepoint_plan(tuple(self.values()), dt, settings.TIME_ZONE)
 
     @property
     def timepoints(self) -> dict:
@@ -35,12 +35,15 @@ class Window:
         self.timepoint_datetime = to_local(timepoint_datetime)
         self.baseline_timepoint_datetime = to_local(baseline_timepoint_datetime)
 
+        # visits are shared by all requests/threads, do not set
+        # `visit.timepoint_datetime`.
         self.visit = visit
-        self.visit.timepoint_datetime = self.timepoint_datetime
+        self.lower, self.upper = self.visit.get_window(self.timepoint_datetime)
 
         self.next_visit = next_visit
+        self.next_timepoint_datetime = None
         if self.next_visit:
-            self.next_visit.timepoint_datetime = (
+            self.next_timepoint_datetime = (
                 self.baseline_timepoint_datetime + self.next_visit.rbase
             )
 
@@ -80,8 +83,8 @@ class Window:
         """
 
         gap_days = self.get_window_gap_days()
-        lower = floor_secs(to_local(self.visit.dates.lower) - relativedelta(days=gap_days))
-        upper = ceil_secs(to_local(self.visit.dates.upper))
+        lower = floor_secs(to_local(self.lower) - relativedelta(days=gap_days))
+        upper = ceil_secs(to_local(self.upper))
         if not (lower <= floor_secs(to_local(self.dt)) <= upper):
             lower_date = to_local(lower).strftime(
                 convert_php_dateformat(settings.SHORT_DATETIME_FORMAT)
@@ -115,7 +118,7 @@ class Window:
         formatted_dt = formatted_date(self.dt)
         if self.next_visit:
             in_window = floor_secs(to_local(self.dt)) < floor_secs(
-                to_local(self.next_visit.timepoint_datetime - self.next_visit.rlower)
+                to_local(self.next_timepoint_datetime - self.next_visit.rlower)
             )
             msg = _(
                 "Invalid datetime. Falls outside of the "
@@ -126,17 +129,14 @@ class Window:
                 "Got `%(visit_code)s`@`%(dt)s`. "
             ) % dict(
                 next_visit_code=self.next_visit.code,
-                dt_lower=formatted_date(
-                    self.next_visit.timepoint_datetime - self.next_visit.rlower
-                ),
+                dt_lower=formatted_date(self.next_timepoint_datetime - self.next_visit.rlower),
                 visit_code=self.visit.code,
                 dt=formatted_dt,
             )
         else:
             in_window = floor_secs(to_local(self.dt)) < floor_secs(
                 to_local(
-                    self.visit.timepoint_datetime
-                    + (self.visit.rupper_extended or self.visit.rupper)
+                    self.timepoint_datetime + (self.visit.rupper_extended or self.visit.rupper)
                 )
             )
             msg = _(
@@ -147,7 +147,7 @@ class Window:
             ) % dict(
                 dt_upper=formatted_date(
                     to_local(
-                        self.visit.timepoint_datetime
+                        self.timepoint_datetime
                         + (self.visit.rupper_extended or self.visit.rupper)
                     )
                 ),
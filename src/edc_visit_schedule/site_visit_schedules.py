@@ -14,6 +14,7 @@ from .exceptions import (
     RegistryNotLoaded,
     SiteVisitScheduleError,
 )
+from .visit_schedules_index import VisitSchedulesIndex
 
 if TYPE_CHECKING:
     from edc_consent.consent_definition import ConsentDefinition
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
     from .models import VisitSchedule as VisitScheduleModel
     from .schedule import Schedule
     from .visit_schedule import VisitSchedule
+    from .visit_schedules_index import FormScheduleEntry
 
 
 __all__ = ["site_visit_schedules"]
@@ -34,10 +36,34 @@ class SiteVisitSchedules:
     """
 
     def __init__(self):
+        self._index: VisitSchedulesIndex | None = None
         self._registry: dict = {}
         self._all_post_consent_models: dict[str, str] | None = None
         self.loaded: bool = False
 
+    @property
+    def _registry(self) -> dict[str, VisitSchedule]:
+        return self._visit_schedules
+
+    @_registry.setter
+    def _registry(self, value: dict[str, VisitSchedule]) -> None:
+        # reset the index if the registry is replaced, e.g. in tests
+        self._visit_schedules = value
+        self._index = None
+
+    @property
+    def index(self) -> VisitSchedulesIndex:
+        """Returns the reverse index of the registered visit
+        schedules.
+
+        The index is built on first use and reset when a visit
+        schedule is registered.
+        """
+        registry = self.registry  # raises if not loaded
+        if self._index is None:
+            self._index = VisitSchedulesIndex(registry)
+        return self._index
+
     @property
     def registry(self) -> dict[str, VisitSchedule]:
         if not self.loaded:
@@ -60,7 +86,11 @@ class SiteVisitSchedules:
             raise AlreadyRegisteredVisitSchedule(
                 f"Visit Schedule {visit_schedule} is already registered."
             )
+        for schedule in visit_schedule.schedules.values():
+            for visit in schedule.visits.values():
+                visit.compile_forms()
         self._all_post_consent_models = None
+        self._index = None
         self.get_offstudy_model()
 
     @property
@@ -99,22 +129,12 @@ class SiteVisitSchedules:
         """Returns a tuple of (visit schedule, schedule instances) that
         match this cdef or raises.
         """
-        visit_schedules = []
-        attr = "consent_definitions"
-        for visit_schedule in self.visit_schedules.values():
-            for schedule in visit_schedule.schedules.values():
-                try:
-                    consent_definitions = getattr(schedule, attr)
-                except (AttributeError, TypeError) as e:
-                    raise SiteVisitScheduleError(
-                        f"Invalid attr for Schedule. See {schedule}. Got `{attr}`."
-                    ) from e
-                for _cdef in consent_definitions:
-                    if _cdef == cdef:
-                        visit_schedules.append((visit_schedule, schedule))  # noqa: PERF401
+        visit_schedules = self.index.consent_definitions.get(
+            self.index.consent_definition_key(cdef)
+        )
         if not visit_schedules:
             raise SiteVisitScheduleError(
-                f"Schedule not found. No schedule exists for {attr}={cdef}."
+                f"Schedule not found. No schedule exists for consent_definitions={cdef}."
             )
         return tuple(visit_schedules)
 
@@ -147,30 +167,32 @@ class SiteVisitSchedules:
         return self.get_by_model(attr="loss_to_followup_model", model=loss_to_followup_model)
 
     def get_by_model(self, attr: str, model: str) -> tuple[VisitSchedule, Schedule]:
-        ret = []
-        model = model.lower()
-        for visit_schedule in self.visit_schedules.values():
-            for schedule in visit_schedule.schedules.values():
-                try:
-                    model_name = getattr(schedule, attr)
-                except (AttributeError, TypeError) as e:
-                    raise SiteVisitScheduleError(
-                        f"Invalid attr for Schedule. See {schedule}. Got {attr}."
-                    ) from e
-                if model_name and model_name == model:
-                    ret.append([visit_schedule, schedule])
+        ret = self.index.get_schedules_by_model(attr, model.lower())
         if not ret:
             raise SiteVisitScheduleError(
-                f"Schedule not found. No schedule exists for {attr}={model}."
+                f"Schedule not found. No schedule exists for {attr}={model.lower()}."
             )
         if len(ret) > 1:
             raise SiteVisitScheduleError(
                 f"Schedule is ambiguous. More than one schedule exists for "
-                f"{attr}={model}. Got {ret}"
+                f"{attr}={model.lower()}. Got {ret}"
             )
         visit_schedule, schedule = ret[0]
         return visit_schedule, schedule
 
+    def get_forms_by_model(self, model: str) -> list[FormScheduleEntry]:
+        """Returns a list of FormScheduleEntry for each visit of the
+        registered visit schedules that lists the CRF or requisition
+        model.
+        """
+        return self.index.forms.get(model.lower(), [])
+
+    def get_forms_by_panel(self, panel_name: str) -> list[FormScheduleEntry]:
+        """Returns a list of FormScheduleEntry for each visit of the
+        registered visit schedules that lists the requisition panel.
+        """
+        return self.index.panels.get(panel_name, [])
+
     def get_by_offstudy_model(self, offstudy_model: str) -> list[VisitSchedule]:
         """Returns a list of visit_schedules for the given
         offstudy model.
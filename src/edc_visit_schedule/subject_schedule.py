@@ -184,9 +184,23 @@ class SubjectSchedule:
                 skip_get_current_site=skip_get_current_site,
             )
 
-    def refresh_appointments(self, skip_get_current_site: bool | None = None):
+    def refresh_appointments(
+        self,
+        skip_get_current_site: bool | None = None,
+        skip_unchanged: bool | None = None,
+    ) -> bool:
+        """Updates or creates the appointments of the schedule
+        relative to the onschedule datetime.
+
+        If `skip_unchanged` is True, the appointments are first
+        planned in memory and, if the plan matches the stored
+        appointments, nothing is written.
+
+        Returns False if skipped, otherwise True.
+        """
+        onschedule_datetime = self.onschedule_obj.onschedule_datetime
         creator = self.appointments_creator_cls(
-            report_datetime=self.onschedule_obj.onschedule_datetime,
+            report_datetime=onschedule_datetime,
             subject_identifier=self.subject_identifier,
             schedule=self.schedule,
             visit_schedule=self.visit_schedule,
@@ -194,8 +208,13 @@ class SubjectSchedule:
             site_id=self.registered_or_raise().site.id,
             skip_baseline=True,
         )
+        if skip_unchanged and not creator.plan_appointments(
+            creator.get_timepoint_dates(onschedule_datetime),
+            skip_get_current_site=skip_get_current_site,
+        ):
+            return False
         creator.create_appointments(
-            self.onschedule_obj.onschedule_datetime,
+            onschedule_datetime,
             skip_get_current_site=skip_get_current_site,
         )
 
@@ -213,6 +232,7 @@ class SubjectSchedule:
                 visit_schedule_name=self.visit_schedule_name,
                 schedule_name=self.schedule_name,
             )
+        return True
 
     def take_off_schedule(self, offschedule_datetime: datetime):
         """Takes a subject off-schedule.
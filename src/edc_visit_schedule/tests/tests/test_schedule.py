@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from dataclasses import FrozenInstanceError
 from datetime import timedelta
 
 from clinicedc_tests.consents import consent_v1
@@ -456,3 +459,61 @@ class TestScheduleWithVisits(TestCase):
             self.schedule.add_visit(visit=visit)
         for index, (k, v) in enumerate(self.schedule.visits.timepoint_dates(dt=dt).items()):
             self.assertEqual(v - dt, timedelta(index * (index + 1)), msg=k)
+
+    def add_visits(self) -> None:
+        for seq in range(0, 5):
+            visit = Visit(
+                code=str(seq),
+                timepoint=seq,
+                rbase=relativedelta(days=seq * 7),
+                rlower=relativedelta(days=1),
+                rupper=relativedelta(days=2),
+            )
+            self.schedule.add_visit(visit=visit)
+
+    def test_timepoint_dates_does_not_change_visits(self):
+        self.add_visits()
+        self.schedule.visits.timepoint_dates(dt=timezone.now())
+        for visit in self.schedule.visits.values():
+            self.assertIsNone(visit.dates.base)
+
+    def test_timepoint_dates_window(self):
+        self.add_visits()
+        dt = timezone.now()
+        plan = self.schedule.visits.timepoint_dates(dt=dt)
+        timepoint = plan.get_timepoint("2")
+        self.assertEqual(timepoint.timepoint_datetime, dt + relativedelta(days=14))
+        self.assertEqual(plan[self.schedule.visits.get("2")], timepoint.timepoint_datetime)
+        visit = deepcopy(self.schedule.visits.get("2"))
+        visit.timepoint_datetime = timepoint.timepoint_datetime
+        self.assertEqual(timepoint.lower, visit.dates.lower)
+        self.assertEqual(timepoint.upper, visit.dates.upper)
+        self.assertRaises(KeyError, plan.get_timepoint, "BLAH")
+
+    def test_timepoint_dates_immutable(self):
+        self.add_visits()
+        plan = self.schedule.visits.timepoint_dates(dt=timezone.now())
+        with self.assertRaises(FrozenInstanceError):
+            plan.base_datetime = timezone.now()
+        with self.assertRaises(FrozenInstanceError):
+            plan.get_timepoint("1").timepoint_datetime = timezone.now()
+        with self.assertRaises(TypeError):
+            plan[self.schedule.visits.get("1")] = timezone.now()
+
+    def test_timepoint_dates_cached(self):
+        self.add_visits()
+        dt = timezone.now()
+        self.assertIs(
+            self.schedule.visits.timepoint_dates(dt=dt),
+            self.schedule.visits.timepoint_dates(dt=dt),
+        )
+
+    def test_timepoint_dates_threads(self):
+        self.add_visits()
+        dts = [timezone.now() + relativedelta(days=i) for i in range(0, 20)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            plans = list(executor.map(self.schedule.visits.timepoint_dates, dts))
+        for dt, plan in zip(dts, plans, strict=True):
+            self.assertEqual(plan.base_datetime, dt)
+            for visit, timepoint_datetime in plan.items():
+                self.assertEqual(timepoint_datetime, dt + visit.rbase)
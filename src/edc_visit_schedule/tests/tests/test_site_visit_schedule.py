@@ -1,4 +1,5 @@
 from clinicedc_tests.consents import consent_v1
+from dateutil.relativedelta import relativedelta
 from django.test import TestCase, tag
 
 from edc_visit_schedule.models import OffSchedule, OnSchedule
@@ -8,6 +9,7 @@ from edc_visit_schedule.site_visit_schedules import (
     SiteVisitScheduleError,
     site_visit_schedules,
 )
+from edc_visit_schedule.visit import Crf, CrfCollection, Visit
 from edc_visit_schedule.visit_schedule import VisitSchedule
 
 
@@ -138,3 +140,91 @@ class TestSiteVisitSchedule1(TestCase):
             "edc_visit_schedule.offschedule"
         )
         self.assertEqual(schedule.offschedule_model_cls, OffSchedule)
+
+    def test_get_by_consent_definition(self):
+        self.assertEqual(
+            site_visit_schedules.get_by_consent_definition(consent_v1),
+            (
+                (self.visit_schedule, self.schedule),
+                (self.visit_schedule_two, self.schedule_two),
+            ),
+        )
+
+    def test_index_reset_on_register(self):
+        index = site_visit_schedules.index
+        self.assertIs(index, site_visit_schedules.index)
+        site_visit_schedules._registry = {}
+        self.assertIsNot(index, site_visit_schedules.index)
+        self.assertRaises(
+            SiteVisitScheduleError,
+            site_visit_schedules.get_by_onschedule_model,
+            "edc_visit_schedule.onschedule",
+        )
+        index = site_visit_schedules.index
+        site_visit_schedules.register(self.visit_schedule)
+        self.assertIsNot(index, site_visit_schedules.index)
+        _, schedule = site_visit_schedules.get_by_onschedule_model(
+            "edc_visit_schedule.onschedule"
+        )
+        self.assertIs(schedule, self.schedule)
+
+
+@tag("visit_schedule")
+class TestSiteVisitSchedulesIndex(TestCase):
+    def setUp(self):
+        self.visit_schedule = VisitSchedule(
+            name="visit_schedule",
+            verbose_name="Visit Schedule",
+            offstudy_model="edc_offstudy.subjectoffstudy",
+            death_report_model="clinicedc_tests.deathreport",
+        )
+        self.schedule = Schedule(
+            name="schedule",
+            onschedule_model="edc_visit_schedule.onschedule",
+            offschedule_model="edc_visit_schedule.offschedule",
+            appointment_model="edc_appointment.appointment",
+            consent_definitions=[consent_v1],
+        )
+        for i in range(3):
+            self.schedule.add_visit(
+                Visit(
+                    code=f"{i}000",
+                    timepoint=i,
+                    rbase=relativedelta(days=i * 7),
+                    rlower=relativedelta(days=0),
+                    rupper=relativedelta(days=6),
+                    crfs=CrfCollection(
+                        Crf(show_order=100, model="x.one"),
+                        Crf(show_order=200, model="x.two", required=bool(i)),
+                    ),
+                    crfs_unscheduled=CrfCollection(Crf(show_order=100, model="x.one")),
+                    crfs_prn=CrfCollection(Crf(show_order=100, model="x.three")),
+                    allow_unscheduled=True,
+                )
+            )
+        self.visit_schedule.add_schedule(self.schedule)
+        site_visit_schedules._registry = {}
+        site_visit_schedules.register(self.visit_schedule)
+
+    def test_get_forms_by_model(self):
+        entries = site_visit_schedules.get_forms_by_model("x.one")
+        self.assertEqual(len(entries), 6)
+        self.assertEqual(
+            [(e.visit_code, e.unscheduled) for e in entries if e.visit_code == "1000"],
+            [("1000", False), ("1000", True)],
+        )
+        self.assertEqual(entries[0].schedule_name, "schedule")
+        self.assertTrue(all(e.prn for e in site_visit_schedules.get_forms_by_model("x.three")))
+        self.assertEqual(site_visit_schedules.get_forms_by_model("x.blah"), [])
+
+    def test_crf_required_at(self):
+        self.assertTrue(site_visit_schedules.index.is_indexed(self.schedule))
+        self.assertEqual(self.schedule.crf_required_at("x.one"), ["0000", "1000", "2000"])
+        self.assertEqual(self.schedule.crf_required_at("x.two"), ["1000", "2000"])
+        self.assertEqual(self.schedule.crf_required_at("x.three"), [])
+
+    def test_crf_required_at_not_registered(self):
+        site_visit_schedules._registry = {}
+        site_visit_schedules.loaded = True
+        self.assertFalse(site_visit_schedules.index.is_indexed(self.schedule))
+        self.assertEqual(self.schedule.crf_required_at("x.two"), ["1000", "2000"])
@@ -2,9 +2,16 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from dateutil.relativedelta import relativedelta
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 
-from edc_visit_schedule.visit import Visit, VisitCodeError, WindowPeriod
+from edc_visit_schedule.visit import (
+    Crf,
+    CrfCollection,
+    FormsCollectionError,
+    Visit,
+    VisitCodeError,
+    WindowPeriod,
+)
 from edc_visit_schedule.visit.visit import BaseDatetimeNotSet
 
 
@@ -209,3 +216,103 @@ class TestVisit(TestCase):
             rupper=relativedelta(days=6),
             timepoint=1,
         )
+
+    @override_settings(SITE_ID=10)
+    def test_get_crf_models(self):
+        visit = Visit(
+            code="1000",
+            rbase=relativedelta(days=0),
+            rlower=relativedelta(days=0),
+            rupper=relativedelta(days=6),
+            timepoint=1,
+            crfs=CrfCollection(
+                Crf(show_order=100, model="x.one"),
+                Crf(show_order=200, model="x.two"),
+            ),
+            crfs_unscheduled=CrfCollection(Crf(show_order=100, model="x.three")),
+            crfs_prn=CrfCollection(Crf(show_order=100, model="x.four")),
+            allow_unscheduled=True,
+        )
+        self.assertEqual(visit.get_crf_models(0), frozenset({"x.one", "x.two", "x.four"}))
+        self.assertEqual(visit.get_crf_models(1), frozenset({"x.three", "x.four"}))
+        # cached on the instance
+        self.assertIs(visit.get_crf_models(0), visit.get_crf_models(0))
+
+    def get_visit_with_crfs(self) -> Visit:
+        return Visit(
+            code="1000",
+            rbase=relativedelta(days=0),
+            rlower=relativedelta(days=0),
+            rupper=relativedelta(days=6),
+            timepoint=1,
+            crfs=CrfCollection(
+                Crf(show_order=100, model="x.one"),
+                Crf(show_order=200, model="x.two"),
+            ),
+            crfs_unscheduled=CrfCollection(
+                Crf(show_order=100, model="x.one"), Crf(show_order=200, model="x.three")
+            ),
+            crfs_prn=CrfCollection(Crf(show_order=300, model="x.four")),
+            allow_unscheduled=True,
+        )
+
+    def test_all_crfs(self):
+        visit = self.get_visit_with_crfs()
+        self.assertEqual(
+            [crf.model for crf in visit.all_crfs],
+            [
+                "edc_visit_tracking.subjectvisitmissed",
+                "x.one",
+                "x.two",
+                "x.three",
+                "x.four",
+            ],
+        )
+        # built once and frozen
+        self.assertIs(visit.all_crfs, visit.all_crfs)
+        self.assertRaises(
+            FormsCollectionError, visit.all_crfs.append, Crf(show_order=400, model="x.five")
+        )
+
+    def test_all_crfs_rebuilt_if_collection_changes(self):
+        visit = self.get_visit_with_crfs()
+        self.assertNotIn("x.five", [crf.model for crf in visit.all_crfs])
+        visit.crfs.append(Crf(show_order=400, model="x.five"))
+        self.assertIn("x.five", [crf.model for crf in visit.all_crfs])
+        visit.crfs_prn = CrfCollection(Crf(show_order=300, model="x.six"))
+        self.assertIn("x.six", [crf.model for crf in visit.all_crfs])
+        self.assertIn("x.six", visit.get_crf_models(0))
+
+    def test_get_crf(self):
+        visit = self.get_visit_with_crfs()
+        self.assertEqual(visit.get_crf("x.two").model, "x.two")
+        self.assertIsNone(visit.get_crf("x.three"))
+        self.assertIsNone(visit.get_crf("x.blah"))
+
+    def test_get_crfs(self):
+        visit = self.get_visit_with_crfs()
+        self.assertEqual(
+            [crf.model for crf in visit.get_crfs(0)], ["x.one", "x.two", "x.four"]
+        )
+        self.assertEqual(
+            [crf.model for crf in visit.get_crfs(1)], ["x.one", "x.three", "x.four"]
+        )
+        self.assertIs(visit.get_crfs(1), visit.get_crfs(1))
+
+    def test_forms_cached_per_site(self):
+        with override_settings(SITE_ID=20):
+            visit = Visit(
+                code="1000",
+                rbase=relativedelta(days=0),
+                rlower=relativedelta(days=0),
+                rupper=relativedelta(days=6),
+                timepoint=1,
+                crfs=CrfCollection(
+                    Crf(show_order=100, model="x.one"),
+                    Crf(show_order=200, model="x.two", site_ids=[20]),
+                ),
+            )
+            self.assertEqual([crf.model for crf in visit.scheduled_forms], ["x.one", "x.two"])
+        with override_settings(SITE_ID=10):
+            self.assertEqual([crf.model for crf in visit.scheduled_forms], ["x.one"])
+            self.assertEqual(visit.get_crf_models(0), frozenset({"x.one"}))
@@ -43,15 +43,14 @@ def get_lower_datetime(instance: Appointment) -> datetime:
     if instance.related_visit:
         dte = instance.appt_datetime
     else:
-        instance.visit.dates.base = instance.first.timepoint_datetime
-        dte = instance.visit.dates.lower
+        dte, _ = instance.visit.get_window(instance.first.timepoint_datetime)
     return dte
 
 
 def get_upper_datetime(instance) -> datetime:
     """Returns the datetime of the upper window"""
-    instance.visit.dates.base = instance.first.timepoint_datetime
-    return instance.visit.dates.upper
+    _, upper = instance.visit.get_window(instance.first.timepoint_datetime)
+    return upper
 
 
 def is_baseline(
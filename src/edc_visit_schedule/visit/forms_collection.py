@@ -19,9 +19,11 @@ class FormsCollection:
         *forms: Crf | Requisition,
         name: str | None = None,
         check_sequence: bool | None = None,
+        frozen: bool | None = None,
         **kwargs,  # noqa: ARG002
     ):
         check_sequence = True if check_sequence is None else check_sequence
+        self.frozen = bool(frozen)
         self.collection_is_unique_or_raise(forms)
         self._forms: tuple[Crf | Requisition] | None = None
         self.name = name or uuid4().hex
@@ -62,7 +64,14 @@ class FormsCollection:
     def collection_is_unique_or_raise(forms):
         pass
 
+    def frozen_or_raise(self) -> None:
+        if self.frozen:
+            raise FormsCollectionError(
+                f"Collection is frozen and cannot be changed. See {self!r}."
+            )
+
     def append(self, value):
+        self.frozen_or_raise()
         if value:
             forms = list(self._forms)
             for item in forms:
@@ -75,6 +84,7 @@ class FormsCollection:
             self._forms = forms
 
     def extend(self, value: tuple | list):
+        self.frozen_or_raise()
         if value:
             for v in value:
                 self.append(v)
@@ -83,6 +93,7 @@ class FormsCollection:
             self._forms = tuple(forms)
 
     def insert(self, index, value):
+        self.frozen_or_raise()
         if value:
             forms = list(self._forms)
             for _, item in forms:
@@ -95,6 +106,7 @@ class FormsCollection:
             self._forms = tuple(forms)
 
     def remove(self, value):
+        self.frozen_or_raise()
         if value:
             forms = list(self._forms)
             for index, item in enumerate(forms):
@@ -106,11 +118,13 @@ class FormsCollection:
                 raise FormsCollectionError("Remove failed. Item not found")
 
     def pop(self, index):
+        self.frozen_or_raise()
         forms = list(self._forms)
         forms.pop(index)
         self._forms = tuple(forms)
 
     def insert_last(self, value):
+        self.frozen_or_raise()
         forms = list(self._forms)
         value.show_order = 100 + max([item.show_order for item in forms or []])
         self.append(value)
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.apps import apps as django_apps
+from django.conf import settings
 from django.utils import timezone
 
 from edc_facility.utils import get_default_facility_name, get_facility
@@ -17,6 +18,7 @@ from .requisition_collection import RequisitionCollection
 from .window_period import WindowPeriod
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from datetime import datetime
 
     from dateutil.relativedelta import relativedelta
@@ -76,7 +78,13 @@ class VisitDate:
     @base.setter
     def base(self, dt: datetime):
         self._base = to_local(dt)
-        self._lower, self._upper = self._window_period.get_window(dt=self._base)
+        self._lower, self._upper = self.get_window(self._base)
+
+    def get_window(self, dt: datetime) -> tuple[datetime, datetime]:
+        """Returns a tuple of the lower and upper datetimes, in local
+        time, for base datetime `dt` without setting `base`.
+        """
+        return self._window_period.get_window(dt=to_local(dt))
 
     @property
     def lower(self) -> datetime:
@@ -145,6 +153,7 @@ class Visit:
             clinic closure. Defaults to ``False`` (bump past holidays).
         """
         self.next = None
+        self._forms_cache: dict[tuple, tuple[tuple, Any]] = {}
         if isinstance(base_timepoint, (float,)):
             base_timepoint = Decimal(str(base_timepoint))
         elif isinstance(base_timepoint, (int,)):
@@ -221,80 +230,203 @@ class Visit:
 
     @property
     def scheduled_forms(self) -> FormsCollection:
-        """Returns a FormsCollection of scheduled forms."""
-        return FormsCollection(*self.crfs, *self.requisitions, name="scheduled_forms")
+        """Returns a frozen FormsCollection of scheduled forms."""
+        return self.get_cached_forms(
+            "scheduled_forms",
+            lambda: FormsCollection(
+                *self.crfs, *self.requisitions, name="scheduled_forms", frozen=True
+            ),
+        )
 
     @property
     def unscheduled_forms(self) -> FormsCollection:
-        """Returns a FormsCollection of unscheduled forms."""
-        return FormsCollection(
-            *self.crfs_unscheduled,
-            *self.requisitions_unscheduled,
-            name="unscheduled_forms",
+        """Returns a frozen FormsCollection of unscheduled forms."""
+        return self.get_cached_forms(
+            "unscheduled_forms",
+            lambda: FormsCollection(
+                *self.crfs_unscheduled,
+                *self.requisitions_unscheduled,
+                name="unscheduled_forms",
+                frozen=True,
+            ),
         )
 
     @property
     def prn_forms(self) -> FormsCollection:
-        """Returns a FormsCollection of prn forms."""
-        return FormsCollection(*self.crfs_prn, *self.requisitions_prn, name="prn_forms")
+        """Returns a frozen FormsCollection of prn forms."""
+        return self.get_cached_forms(
+            "prn_forms",
+            lambda: FormsCollection(
+                *self.crfs_prn, *self.requisitions_prn, name="prn_forms", frozen=True
+            ),
+        )
 
     @property
     def all_crfs(self) -> CrfCollection:
-        """Return a new collection containing all crfs.
+        """Return a frozen collection containing all crfs.
 
-        The new collection contains:
+        The collection contains:
              * crfs
              * crfs_unscheduled
              * crfs_prn
              * crfs_missed
         """
-        crfs = list(self.crfs) + [
-            crf
-            for crf in self.crfs_unscheduled
-            if crf.model not in [crf.model for crf in self.crfs]
-        ]
-        crfs = crfs + [
-            crf for crf in self.crfs_missed if crf.model not in [crf.model for crf in crfs]
-        ]
-        crfs = crfs + [
-            crf for crf in self.crfs_prn if crf.model not in [crf.model for crf in crfs]
-        ]
-        return CrfCollection(*crfs, name="all_crfs", check_sequence=False)
+        return self.get_cached_forms("all_crfs", self._get_all_crfs)
+
+    def _get_all_crfs(self) -> CrfCollection:
+        crfs = list(self.crfs)
+        models = {crf.model for crf in crfs}
+        crfs.extend(crf for crf in self.crfs_unscheduled if crf.model not in models)
+        for collection in [self.crfs_missed, self.crfs_prn]:
+            models = {crf.model for crf in crfs}
+            crfs.extend(crf for crf in collection if crf.model not in models)
+        return CrfCollection(*crfs, name="all_crfs", check_sequence=False, frozen=True)
 
     @property
     def all_requisitions(self) -> RequisitionCollection:
-        """Return a new collection containing all requisitions.
+        """Return a frozen collection containing all requisitions.
 
-        The new collection contains:
+        The collection contains:
              * requisitions
              * requisitions_unscheduled
              * requisitions_prn
         """
-        names = [r.name for r in self.requisitions]
-        requisitions = list(self.requisitions) + [
-            r for r in self.requisitions_unscheduled if r.name not in names
-        ]
-        names = list(set([r.name for r in requisitions]))
-        requisitions = requisitions + [r for r in self.requisitions_prn if r.name not in names]
+        return self.get_cached_forms("all_requisitions", self._get_all_requisitions)
+
+    def _get_all_requisitions(self) -> RequisitionCollection:
+        requisitions = list(self.requisitions)
+        names = {r.name for r in requisitions}
+        requisitions.extend(r for r in self.requisitions_unscheduled if r.name not in names)
+        names = {r.name for r in requisitions}
+        requisitions.extend(r for r in self.requisitions_prn if r.name not in names)
         return RequisitionCollection(
-            *requisitions, name="all_requisitions", check_sequence=False
+            *requisitions, name="all_requisitions", check_sequence=False, frozen=True
+        )
+
+    def get_crfs(self, visit_code_sequence: int | None = None) -> CrfCollection:
+        """Returns a frozen collection of CRFs, including PRNs, for
+        the scheduled (visit_code_sequence=0) or unscheduled visit.
+        """
+        return self.get_cached_forms(
+            ("crfs_for_visit", bool(visit_code_sequence)),
+            lambda: CrfCollection(
+                *(self.crfs_unscheduled if visit_code_sequence else self.crfs),
+                *self.crfs_prn,
+                name="crfs_for_visit",
+                frozen=True,
+            ),
+        )
+
+    def get_crf_models(self, visit_code_sequence: int | None = None) -> frozenset[str]:
+        """Returns the set of CRF models, including PRNs, for the
+        scheduled (visit_code_sequence=0) or unscheduled visit.
+        """
+        return self.get_cached_forms(
+            ("crfs", bool(visit_code_sequence)),
+            lambda: frozenset(
+                crf.model
+                for crf in [
+                    *(self.crfs_unscheduled if visit_code_sequence else self.crfs),
+                    *self.crfs_prn,
+                ]
+                if not crf.site_ids or settings.SITE_ID in crf.site_ids
+            ),
+        )
+
+    def get_requisition_panel_names(
+        self, visit_code_sequence: int | None = None
+    ) -> frozenset[str]:
+        """Returns the set of requisition panel names, including PRNs,
+        for the scheduled (visit_code_sequence=0) or unscheduled visit.
+        """
+        return self.get_cached_forms(
+            ("requisitions", bool(visit_code_sequence)),
+            lambda: frozenset(
+                requisition.panel.name
+                for requisition in [
+                    *(
+                        self.requisitions_unscheduled
+                        if visit_code_sequence
+                        else self.requisitions
+                    ),
+                    *self.requisitions_prn,
+                ]
+                if not requisition.site_ids or settings.SITE_ID in requisition.site_ids
+            ),
         )
 
     def get_crf(self, model=None) -> Crf | None:
-        get_crf = None
+        """Returns the scheduled Crf for the model or None."""
+        return self.get_cached_forms("crfs_by_model", self._get_crfs_by_model).get(model)
+
+    def _get_crfs_by_model(self) -> dict[str, Crf]:
+        crfs_by_model = {}
         for crf in self.crfs:
-            if crf.model == model:
-                get_crf = crf
-                break
-        return get_crf
+            crfs_by_model.setdefault(crf.model, crf)
+        return crfs_by_model
 
     def get_requisition(self, model=None, panel_name=None) -> Requisition | None:
-        get_requisition = None
+        """Returns the scheduled Requisition for the model and panel
+        or None.
+        """
+        return self.get_cached_forms(
+            "requisitions_by_model", self._get_requisitions_by_model
+        ).get((model, panel_name))
+
+    def _get_requisitions_by_model(self) -> dict[tuple[str, str], Requisition]:
+        requisitions_by_model = {}
         for requisition in self.requisitions:
-            if requisition.model == model and requisition.panel.name == panel_name:
-                get_requisition = requisition
-                break
-        return get_requisition
+            requisitions_by_model.setdefault(
+                (requisition.model, requisition.panel.name), requisition
+            )
+        return requisitions_by_model
+
+    def get_cached_forms(self, name: str | tuple, build: Callable[[], Any]) -> Any:
+        """Returns the value returned by `build`, computed once per
+        site and cached on this instance.
+
+        The value is rebuilt if any form collection of this visit is
+        replaced or changed (e.g. `visit.crfs.append(...)`).
+        """
+        key = (name, settings.SITE_ID)
+        sources = self._get_forms_sources()
+        try:
+            cached_sources, value = self._forms_cache[key]
+        except KeyError:
+            pass
+        else:
+            if all(a is b for a, b in zip(cached_sources, sources, strict=True)):
+                return value
+        value = build()
+        self._forms_cache[key] = (sources, value)
+        return value
+
+    def _get_forms_sources(self) -> tuple:
+        return (
+            self.crfs.forms,
+            self.crfs_unscheduled.forms,
+            self.crfs_missed.forms,
+            self.crfs_prn.forms,
+            self.requisitions.forms,
+            self.requisitions_unscheduled.forms,
+            self.requisitions_prn.forms,
+        )
+
+    def compile_forms(self) -> None:
+        """Builds and caches the form lookups of this visit for the
+        current site.
+
+        Called when the visit schedule is registered. Collections
+        that validate the show order (e.g. `scheduled_forms`) are
+        built on first access.
+        """
+        self.all_crfs  # noqa: B018
+        self.all_requisitions  # noqa: B018
+        for visit_code_sequence in [0, 1]:
+            self.get_crf_models(visit_code_sequence)
+            self.get_requisition_panel_names(visit_code_sequence)
+        self.get_crf()
+        self.get_requisition()
 
     def get_models(self) -> list:
         models = [django_apps.get_model(crf.model) for crf in self.crfs]
@@ -310,6 +442,15 @@ class Visit:
             return get_facility(name=self.facility_name)
         return None
 
+    def get_window(self, timepoint_datetime: datetime) -> tuple[datetime, datetime]:
+        """Returns a tuple of the lower and upper datetimes of the
+        window period for the given timepoint datetime.
+
+        Unlike setting `timepoint_datetime`, does not change this
+        instance, which may be shared by all requests/threads.
+        """
+        return self.dates.get_window(timepoint_datetime)
+
     @property
     def timepoint_datetime(self) -> datetime:
         return self.dates.base
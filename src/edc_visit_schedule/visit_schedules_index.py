@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .exceptions import SiteVisitScheduleError
+
+if TYPE_CHECKING:
+    from edc_consent.consent_definition import ConsentDefinition
+
+    from .schedule import Schedule
+    from .visit_schedule import VisitSchedule
+
+
+@dataclass(frozen=True)
+class FormScheduleEntry:
+    """A visit where a CRF or requisition is listed."""
+
+    visit_schedule: VisitSchedule
+    schedule: Schedule
+    visit_code: str
+    required: bool
+    prn: bool = False
+    unscheduled: bool = False
+    panel_name: str | None = None
+
+    @property
+    def visit_schedule_name(self) -> str:
+        return self.visit_schedule.name
+
+    @property
+    def schedule_name(self) -> str:
+        return self.schedule.name
+
+
+class VisitSchedulesIndex:
+    """A reverse index of the registered visit schedules.
+
+    Built by `site_visit_schedules` on first use and rebuilt after
+    a visit schedule is registered. Indexes:
+        * CRF/requisition model -> list of FormScheduleEntry;
+        * requisition panel name -> list of FormScheduleEntry;
+        * schedule model attr (e.g. onschedule_model) -> schedules,
+          built per attr on first use;
+        * consent definition -> schedules.
+    """
+
+    def __init__(self, visit_schedules: dict[str, VisitSchedule]):
+        self.visit_schedules = visit_schedules
+        self.schedules: set[int] = set()
+        self.forms: dict[str, list[FormScheduleEntry]] = {}
+        self.panels: dict[str, list[FormScheduleEntry]] = {}
+        self.consent_definitions: dict[tuple, list[tuple[VisitSchedule, Schedule]]] = {}
+        self._schedules_by_model: dict[
+            str, dict[str, list[tuple[VisitSchedule, Schedule]]]
+        ] = {}
+        for visit_schedule in visit_schedules.values():
+            for schedule in visit_schedule.schedules.values():
+                self.schedules.add(id(schedule))
+                for cdef in schedule.consent_definitions or []:
+                    self.consent_definitions.setdefault(
+                        self.consent_definition_key(cdef), []
+                    ).append((visit_schedule, schedule))
+                for visit in schedule.visits.values():
+                    self.add_forms(visit_schedule, schedule, visit)
+
+    def add_forms(self, visit_schedule, schedule, visit) -> None:
+        for collection, prn, unscheduled in [
+            (visit.crfs, False, False),
+            (visit.crfs_unscheduled, False, True),
+            (visit.crfs_prn, True, False),
+            (visit.requisitions, False, False),
+            (visit.requisitions_unscheduled, False, True),
+            (visit.requisitions_prn, True, False),
+        ]:
+            for form in collection:
+                panel_name = getattr(getattr(form, "panel", None), "name", None)
+                entry = FormScheduleEntry(
+                    visit_schedule=visit_schedule,
+                    schedule=schedule,
+                    visit_code=visit.code,
+                    required=form.required,
+                    prn=prn,
+                    unscheduled=unscheduled,
+                    panel_name=panel_name,
+                )
+                self.forms.setdefault(form.model, []).append(entry)
+                if panel_name:
+                    self.panels.setdefault(panel_name, []).append(entry)
+
+    @staticmethod
+    def consent_definition_key(cdef: ConsentDefinition) -> tuple:
+        """Returns the fields compared by `ConsentDefinition.__eq__`."""
+        return cdef.start, cdef.sort_index
+
+    def is_indexed(self, schedule: Schedule) -> bool:
+        return id(schedule) in self.schedules
+
+    def get_schedules_by_model(
+        self, attr: str, model: str
+    ) -> list[tuple[VisitSchedule, Schedule]]:
+        """Returns a list of (visit_schedule, schedule) where the
+        schedule's `attr` is `model`.
+        """
+        if attr not in self._schedules_by_model:
+            schedules_by_model = {}
+            for visit_schedule in self.visit_schedules.values():
+                for schedule in visit_schedule.schedules.values():
+                    try:
+                        model_name = getattr(schedule, attr)
+                    except (AttributeError, TypeError) as e:
+                        raise SiteVisitScheduleError(
+                            f"Invalid attr for Schedule. See {schedule}. Got {attr}."
+                        ) from e
+                    if model_name and isinstance(model_name, str):
+                        schedules_by_model.setdefault(model_name, []).append(
+                            (visit_schedule, schedule)
+                        )
+            self._schedules_by_model[attr] = schedules_by_model
+        return self._schedules_by_model[attr].get(model, [])